@@ -152,6 +152,14 @@ typedef struct {
     int tracemalloc;
 
     int import_time;        /* PYTHONPROFILEIMPORTTIME, -X importtime */
+    int lazy_imports;       /* PYTHONLAZYIMPORTS, -X lazy_imports */
+
+    /* If equal to 0, do not import the standard library modules frozen in
+       the interpreter (see Python/frozen_stdlib.h) but their source and
+       bytecode files.
+
+       Set to 0 by -X frozen_modules=off, default: 1. */
+    int use_frozen_modules;
     int show_ref_count;     /* -X showrefcount */
     int show_alloc_count;   /* -X showalloccount */
     int dump_refs;          /* PYTHONDUMPREFS */
@@ -10,6 +10,20 @@ PyAPI_FUNC(PyObject *) _PyImport_FindBuiltin(
     const char *name             /* UTF-8 encoded string */
     );
 
+extern PyObject * _PyImport_LazyImportModuleLevelObject(
+    PyThreadState *tstate,
+    PyObject *name,
+    PyObject *globals,
+    PyObject *locals,
+    PyObject *fromlist,
+    int level
+    );
+
+/* Standard library modules frozen by Tools/scripts/freeze_modules.py,
+   see Python/frozen.c.  They are not used if config.use_frozen_modules
+   is 0. */
+extern const struct _frozen *_PyImport_FrozenStdlib;
+
 extern void _PyImport_ReInitLock(void);
 extern void _PyImport_Cleanup(PyThreadState *tstate);
 
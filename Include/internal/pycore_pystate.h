@@ -112,6 +112,9 @@ struct _is {
 
     PyObject *builtins_copy;
     PyObject *import_func;
+    /* Set to config.lazy_imports once the site module is imported, so that
+       the imports of site and of .pth files are not deferred. */
+    int lazy_imports;
     /* Initialized to PyEval_EvalFrameDefault(). */
     _PyFrameEvalFunction eval_frame;
 
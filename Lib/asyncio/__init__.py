@@ -44,6 +44,9 @@ if sys.platform == 'win32':  # pragma: no cover
 else:
     from .unix_events import *  # pragma: no cover
     __all__ += unix_events.__all__
+    if sys.platform.startswith('linux'):  # pragma: no cover
+        from .uring_events import *
+        __all__ += uring_events.__all__
 
 
 __all__ += ('StreamReader', 'StreamWriter', 'StreamReaderProtocol')  # deprecated
@@ -1825,11 +1825,12 @@ class BaseEventLoop(events.AbstractEventLoop):
         # they will be run the next time (after another I/O poll).
         # Use an idiom that is thread-safe without using locks.
         ntodo = len(self._ready)
-        for i in range(ntodo):
-            handle = self._ready.popleft()
-            if handle._cancelled:
-                continue
-            if self._debug:
+        popleft = self._ready.popleft
+        if self._debug:
+            for i in range(ntodo):
+                handle = popleft()
+                if handle._cancelled:
+                    continue
                 try:
                     self._current_handle = handle
                     t0 = self.time()
@@ -1840,8 +1841,12 @@ class BaseEventLoop(events.AbstractEventLoop):
                                        _format_handle(handle), dt)
                 finally:
                     self._current_handle = None
-            else:
-                handle._run()
+        else:
+            # Fast path: keep the per-callback work to the bare minimum
+            for i in range(ntodo):
+                handle = popleft()
+                if not handle._cancelled:
+                    handle._run()
         handle = None  # Needed to break cycles when an exception occurs.
 
     def _set_coroutine_origin_tracking(self, enabled):
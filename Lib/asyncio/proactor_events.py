@@ -159,7 +159,11 @@ class _ProactorBasePipeTransport(transports._FlowControlMixin,
             # just close our end.  First calling shutdown() seems to
             # cure it, but maybe using DisconnectEx() would be better.
             if hasattr(self._sock, 'shutdown'):
-                self._sock.shutdown(socket.SHUT_RDWR)
+                try:
+                    self._sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    # Not connected: datagram socket or connection reset
+                    pass
             self._sock.close()
             self._sock = None
             server = self._server
@@ -765,7 +769,8 @@ class BaseProactorEventLoop(base_events.BaseEventLoop):
     def _loop_self_reading(self, f=None):
         try:
             if f is not None:
-                f.result()  # may raise
+                data = f.result()  # may raise
+                self._process_self_data(data)
             f = self._proactor.recv(self._ssock, 4096)
         except exceptions.CancelledError:
             # _close_self_pipe() has been called, stop waiting for data
@@ -782,6 +787,9 @@ class BaseProactorEventLoop(base_events.BaseEventLoop):
             self._self_reading_future = f
             f.add_done_callback(self._loop_self_reading)
 
+    def _process_self_data(self, data):
+        pass
+
     def _write_to_self(self):
         try:
             self._csock.send(b'\0')
@@ -572,18 +572,25 @@ class BaseSelectorEventLoop(base_events.BaseEventLoop):
             self._transports[transp._sock_fd] = transp
 
     def _process_events(self, event_list):
+        # The reader and writer handles are registered once and reused for
+        # each readiness event: just queue the ones which are not cancelled
+        # and make them ready all at once.
+        EVENT_READ = selectors.EVENT_READ
+        EVENT_WRITE = selectors.EVENT_WRITE
+        ready = []
         for key, mask in event_list:
             fileobj, (reader, writer) = key.fileobj, key.data
-            if mask & selectors.EVENT_READ and reader is not None:
+            if mask & EVENT_READ and reader is not None:
                 if reader._cancelled:
                     self._remove_reader(fileobj)
                 else:
-                    self._add_callback(reader)
-            if mask & selectors.EVENT_WRITE and writer is not None:
+                    ready.append(reader)
+            if mask & EVENT_WRITE and writer is not None:
                 if writer._cancelled:
                     self._remove_writer(fileobj)
                 else:
-                    self._add_callback(writer)
+                    ready.append(writer)
+        self._ready.extend(ready)
 
     def _stop_serving(self, sock):
         self._remove_reader(sock.fileno())
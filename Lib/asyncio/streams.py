@@ -25,6 +25,133 @@ from . import tasks
 
 
 _DEFAULT_LIMIT = 2 ** 16  # 64 KiB
+_READ_SIZE = 2 ** 16  # 64 KiB
+_MIN_READ_SIZE = 2 ** 12  # 4 KiB
+
+
+class _ReceiveBuffer:
+    """Buffer of received data, filled in place by the transport.
+
+    The data is kept in self._data[self._start:self._end].  get_buffer()
+    returns a view of the free space at the end of the bytearray, so
+    that the transport can receive into it directly, and reads consume
+    data by advancing self._start.  The bytearray itself is never
+    resized: it is compacted or replaced by a larger one when more free
+    space is needed.
+
+    The free space offered to the transport starts small and doubles each
+    time the transport fills it, up to _READ_SIZE.  A bytearray grown
+    larger than that by big reads is released once all its data is read.
+
+    readview() returns views of the bytearray itself.  self._exported is
+    the end of the data they may expose: the bytearray is replaced rather
+    than compacted or reused while it is not zero.
+    """
+
+    __slots__ = ('_data', '_start', '_end', '_read_size', '_exported')
+
+    def __init__(self):
+        self._data = bytearray()
+        self._start = self._end = 0
+        self._read_size = _MIN_READ_SIZE
+        self._exported = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __eq__(self, other):
+        return self._data[self._start:self._end] == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {len(self)} bytes>'
+
+    def get_buffer(self, sizehint=-1):
+        """Return a writable memoryview of at least sizehint free bytes."""
+        sizehint = max(sizehint, self._read_size)
+        data = self._data
+        if len(data) - self._end < sizehint:
+            size = self._end - self._start
+            if size + sizehint <= len(data) and not self._exported:
+                # Move the unread data to the beginning of the buffer.
+                view = memoryview(data)
+                view[:size] = view[self._start:self._end]
+            else:
+                if size + sizehint > len(data):
+                    data = bytearray(max(2 * len(data), size + sizehint))
+                else:
+                    # Views returned by readview() expose the beginning
+                    # of the current bytearray.
+                    data = bytearray(len(data))
+                data[:size] = memoryview(self._data)[self._start:self._end]
+                self._data = data
+                self._exported = 0
+            self._start = 0
+            self._end = size
+        return memoryview(data)[self._end:]
+
+    def buffer_updated(self, nbytes):
+        """Add nbytes written by the transport in the get_buffer() view."""
+        if (nbytes >= len(self._data) - self._end and
+                self._read_size < _READ_SIZE):
+            self._read_size *= 2
+        self._end += nbytes
+
+    def extend(self, data):
+        nbytes = len(data)
+        self.get_buffer(nbytes)[:nbytes] = data
+        self._end += nbytes
+
+    def find(self, sub, start=0):
+        index = self._data.find(sub, self._start + start, self._end)
+        if index >= 0:
+            index -= self._start
+        return index
+
+    def startswith(self, prefix, start=0):
+        return self._data.startswith(prefix, self._start + start, self._end)
+
+    def consume(self, n):
+        """Discard the first n bytes."""
+        self._start = min(self._start + n, self._end)
+        if self._start == self._end:
+            self.clear()
+
+    def clear(self):
+        self._start = self._end = 0
+        if self._exported or len(self._data) > self._read_size:
+            self._data = bytearray()
+            self._exported = 0
+
+    def read(self, n=-1):
+        """Remove and return up to n bytes (all data if n < 0)."""
+        if n < 0 or n > len(self):
+            n = len(self)
+        data = bytes(memoryview(self._data)[self._start:self._start + n])
+        self.consume(n)
+        return data
+
+    def readinto(self, buf):
+        """Copy up to len(buf) bytes into buf and return their number."""
+        view = memoryview(buf).cast('B')
+        n = min(len(view), len(self))
+        view[:n] = memoryview(self._data)[self._start:self._start + n]
+        self.consume(n)
+        return n
+
+    def readview(self, n=-1):
+        """Remove and return up to n bytes as a read-only memoryview.
+
+        The view references the current bytearray without copying: the
+        data it exposes is never overwritten.
+        """
+        if n < 0 or n > len(self):
+            n = len(self)
+        start = self._start
+        self._start += n
+        self._exported = self._start
+        return memoryview(self._data)[start:self._start].toreadonly()
 
 
 class StreamMode(enum.Flag):
@@ -615,7 +742,7 @@ class FlowControlMixin(protocols.Protocol):
 
 # begin legacy stream APIs
 
-class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
+class StreamReaderProtocol(FlowControlMixin, protocols.BufferedProtocol):
     """Helper class to adapt between Protocol and StreamReader.
 
     (This is a helper class instead of making StreamReader itself a
@@ -632,6 +759,11 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
         self._client_connected_cb = client_connected_cb
         self._over_ssl = False
         self._closed = self._loop.create_future()
+        # Subclasses overriding data_received() still get the data there,
+        # received in a separate buffer.
+        self._data_received_overridden = (
+            type(self).data_received is not StreamReaderProtocol.data_received)
+        self._recv_buffer = bytearray()
 
     def connection_made(self, transport):
         self._stream_reader.set_transport(transport)
@@ -660,7 +792,21 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
         self._stream_reader = None
         self._stream_writer = None
 
+    def get_buffer(self, sizehint):
+        if self._data_received_overridden:
+            if len(self._recv_buffer) < max(sizehint, _READ_SIZE):
+                self._recv_buffer = bytearray(max(sizehint, _READ_SIZE))
+            return self._recv_buffer
+        return self._stream_reader._get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        if self._data_received_overridden:
+            self.data_received(bytes(memoryview(self._recv_buffer)[:nbytes]))
+        else:
+            self._stream_reader._buffer_updated(nbytes)
+
     def data_received(self, data):
+        # Transports not supporting buffered protocols, such as pipes.
         self._stream_reader.feed_data(data)
 
     def eof_received(self):
@@ -769,7 +915,7 @@ class StreamReader:
             self._loop = events.get_event_loop()
         else:
             self._loop = loop
-        self._buffer = bytearray()
+        self._buffer = _ReceiveBuffer()
         self._eof = False    # Whether we're done.
         self._waiter = None  # A future used by _wait_for_data()
         self._exception = None
@@ -838,6 +984,18 @@ class StreamReader:
             return
 
         self._buffer.extend(data)
+        self._data_received()
+
+    def _get_buffer(self, sizehint):
+        assert not self._eof, 'get_buffer after feed_eof'
+
+        return self._buffer.get_buffer(sizehint)
+
+    def _buffer_updated(self, nbytes):
+        self._buffer.buffer_updated(nbytes)
+        self._data_received()
+
+    def _data_received(self):
         self._wakeup_waiter()
 
         if (self._transport is not None and
@@ -905,7 +1063,7 @@ class StreamReader:
             return e.partial
         except exceptions.LimitOverrunError as e:
             if self._buffer.startswith(sep, e.consumed):
-                del self._buffer[:e.consumed + seplen]
+                self._buffer.consume(e.consumed + seplen)
             else:
                 self._buffer.clear()
             self._maybe_resume_transport()
@@ -987,8 +1145,7 @@ class StreamReader:
             # adds data which makes separator be found. That's why we check for
             # EOF *ater* inspecting the buffer.
             if self._eof:
-                chunk = bytes(self._buffer)
-                self._buffer.clear()
+                chunk = self._buffer.read()
                 raise exceptions.IncompleteReadError(chunk, None)
 
             # _wait_for_data() will resume reading if stream was paused.
@@ -998,10 +1155,9 @@ class StreamReader:
             raise exceptions.LimitOverrunError(
                 'Separator is found, but chunk is longer than limit', isep)
 
-        chunk = self._buffer[:isep + seplen]
-        del self._buffer[:isep + seplen]
+        chunk = self._buffer.read(isep + seplen)
         self._maybe_resume_transport()
-        return bytes(chunk)
+        return chunk
 
     async def read(self, n=-1):
         """Read up to `n` bytes from the stream.
@@ -1047,9 +1203,61 @@ class StreamReader:
             await self._wait_for_data('read')
 
         # This will work right even if buffer is less than n bytes
-        data = bytes(self._buffer[:n])
-        del self._buffer[:n]
+        data = self._buffer.read(n)
+
+        self._maybe_resume_transport()
+        return data
+
+    async def readinto(self, buf):
+        """Read up to `len(buf)` bytes from the stream into `buf`.
+
+        `buf` must be a writable bytes-like object.  Return the number of
+        bytes read, which may be less than `len(buf)` but at least one.
+        If EOF was received before any byte is read, return zero.
+
+        This is like read(len(buf)), except that the data is copied
+        from the internal buffer directly into `buf` instead of into a
+        new bytes object.
+
+        If stream was paused, this function will automatically resume it if
+        needed.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        if not memoryview(buf).nbytes:
+            return 0
+
+        if not self._buffer and not self._eof:
+            await self._wait_for_data('readinto')
+
+        nbytes = self._buffer.readinto(buf)
+        self._maybe_resume_transport()
+        return nbytes
+
+    async def readview(self, n=-1):
+        """Read up to `n` bytes from the stream as a memoryview.
+
+        This is like read(n), except that the returned read-only
+        memoryview references the internal buffer of the stream instead
+        of a copy of the data.  The stream starts filling a new buffer,
+        so the data seen through the view is never modified.
+
+        If n is not provided, or set to -1, read until EOF.
+
+        If stream was paused, this function will automatically resume it if
+        needed.
+        """
+        if self._exception is not None:
+            raise self._exception
 
+        if n < 0:
+            while not self._eof:
+                await self._wait_for_data('readview')
+        elif n and not self._buffer and not self._eof:
+            await self._wait_for_data('readview')
+
+        data = self._buffer.readview(n)
         self._maybe_resume_transport()
         return data
 
@@ -1079,18 +1287,12 @@ class StreamReader:
 
         while len(self._buffer) < n:
             if self._eof:
-                incomplete = bytes(self._buffer)
-                self._buffer.clear()
+                incomplete = self._buffer.read()
                 raise exceptions.IncompleteReadError(incomplete, n)
 
             await self._wait_for_data('readexactly')
 
-        if len(self._buffer) == n:
-            data = bytes(self._buffer)
-            self._buffer.clear()
-        else:
-            data = bytes(self._buffer[:n])
-            del self._buffer[:n]
+        data = self._buffer.read(n)
         self._maybe_resume_transport()
         return data
 
@@ -1107,7 +1309,7 @@ class StreamReader:
 # end legacy stream APIs
 
 
-class _BaseStreamProtocol(FlowControlMixin, protocols.Protocol):
+class _BaseStreamProtocol(FlowControlMixin, protocols.BufferedProtocol):
     """Helper class to adapt between Protocol and StreamReader.
 
     (This is a helper class instead of making StreamReader itself a
@@ -1124,6 +1326,11 @@ class _BaseStreamProtocol(FlowControlMixin, protocols.Protocol):
         self._transport = None
         self._over_ssl = False
         self._closed = self._loop.create_future()
+        # Subclasses overriding data_received() still get the data there,
+        # received in a separate buffer.
+        self._data_received_overridden = (
+            type(self).data_received is not _BaseStreamProtocol.data_received)
+        self._recv_buffer = bytearray()
 
     def connection_made(self, transport):
         self._transport = transport
@@ -1144,7 +1351,25 @@ class _BaseStreamProtocol(FlowControlMixin, protocols.Protocol):
         super().connection_lost(exc)
         self._transport = None
 
+    def get_buffer(self, sizehint):
+        stream = self._stream
+        if stream is None or self._data_received_overridden:
+            # The data is discarded or passed to data_received().
+            if len(self._recv_buffer) < max(sizehint, _READ_SIZE):
+                self._recv_buffer = bytearray(max(sizehint, _READ_SIZE))
+            return self._recv_buffer
+        return stream._get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        if self._data_received_overridden:
+            self.data_received(bytes(memoryview(self._recv_buffer)[:nbytes]))
+            return
+        stream = self._stream
+        if stream is not None:
+            stream._buffer_updated(nbytes)
+
     def data_received(self, data):
+        # Transports not supporting buffered protocols, such as pipes.
         stream = self._stream
         if stream is not None:
             stream.feed_data(data)
@@ -1311,7 +1536,7 @@ class Stream:
             self._loop = events.get_event_loop()
         else:
             self._loop = loop
-        self._buffer = bytearray()
+        self._buffer = _ReceiveBuffer()
         self._eof = False    # Whether we're done.
         self._waiter = None  # A future used by _wait_for_data()
         self._exception = None
@@ -1493,6 +1718,19 @@ class Stream:
             return
 
         self._buffer.extend(data)
+        self._data_received()
+
+    def _get_buffer(self, sizehint):
+        _ensure_can_read(self._mode)
+        assert not self._eof, 'get_buffer after feed_eof'
+
+        return self._buffer.get_buffer(sizehint)
+
+    def _buffer_updated(self, nbytes):
+        self._buffer.buffer_updated(nbytes)
+        self._data_received()
+
+    def _data_received(self):
         self._wakeup_waiter()
 
         if (self._transport is not None and
@@ -1561,7 +1799,7 @@ class Stream:
             return e.partial
         except exceptions.LimitOverrunError as e:
             if self._buffer.startswith(sep, e.consumed):
-                del self._buffer[:e.consumed + seplen]
+                self._buffer.consume(e.consumed + seplen)
             else:
                 self._buffer.clear()
             self._maybe_resume_transport()
@@ -1644,8 +1882,7 @@ class Stream:
             # adds data which makes separator be found. That's why we check for
             # EOF *ater* inspecting the buffer.
             if self._eof:
-                chunk = bytes(self._buffer)
-                self._buffer.clear()
+                chunk = self._buffer.read()
                 raise exceptions.IncompleteReadError(chunk, None)
 
             # _wait_for_data() will resume reading if stream was paused.
@@ -1655,10 +1892,9 @@ class Stream:
             raise exceptions.LimitOverrunError(
                 'Separator is found, but chunk is longer than limit', isep)
 
-        chunk = self._buffer[:isep + seplen]
-        del self._buffer[:isep + seplen]
+        chunk = self._buffer.read(isep + seplen)
         self._maybe_resume_transport()
-        return bytes(chunk)
+        return chunk
 
     async def read(self, n=-1):
         """Read up to `n` bytes from the stream.
@@ -1705,12 +1941,64 @@ class Stream:
             await self._wait_for_data('read')
 
         # This will work right even if buffer is less than n bytes
-        data = bytes(self._buffer[:n])
-        del self._buffer[:n]
+        data = self._buffer.read(n)
 
         self._maybe_resume_transport()
         return data
 
+    async def readinto(self, buf):
+        """Read up to `len(buf)` bytes from the stream into `buf`.
+
+        `buf` must be a writable bytes-like object.  Return the number of
+        bytes read, which may be less than `len(buf)` but at least one.
+        If EOF was received before any byte is read, return zero.
+
+        This is like read(len(buf)), except that the data is copied
+        from the internal buffer directly into `buf` instead of into a
+        new bytes object.
+
+        If stream was paused, this function will automatically resume it if
+        needed.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        if not memoryview(buf).nbytes:
+            return 0
+
+        if not self._buffer and not self._eof:
+            await self._wait_for_data('readinto')
+
+        nbytes = self._buffer.readinto(buf)
+        self._maybe_resume_transport()
+        return nbytes
+
+    async def readview(self, n=-1):
+        """Read up to `n` bytes from the stream as a memoryview.
+
+        This is like read(n), except that the returned read-only
+        memoryview references the internal buffer of the stream instead
+        of a copy of the data.  The stream starts filling a new buffer,
+        so the data seen through the view is never modified.
+
+        If n is not provided, or set to -1, read until EOF.
+
+        If stream was paused, this function will automatically resume it if
+        needed.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        if n < 0:
+            while not self._eof:
+                await self._wait_for_data('readview')
+        elif n and not self._buffer and not self._eof:
+            await self._wait_for_data('readview')
+
+        data = self._buffer.readview(n)
+        self._maybe_resume_transport()
+        return data
+
     async def readexactly(self, n):
         """Read exactly `n` bytes.
 
@@ -1738,18 +2026,12 @@ class Stream:
 
         while len(self._buffer) < n:
             if self._eof:
-                incomplete = bytes(self._buffer)
-                self._buffer.clear()
+                incomplete = self._buffer.read()
                 raise exceptions.IncompleteReadError(incomplete, n)
 
             await self._wait_for_data('readexactly')
 
-        if len(self._buffer) == n:
-            data = bytes(self._buffer)
-            self._buffer.clear()
-        else:
-            data = bytes(self._buffer[:n])
-            del self._buffer[:n]
+        data = self._buffer.read(n)
         self._maybe_resume_transport()
         return data
 
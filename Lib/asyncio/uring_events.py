@@ -0,0 +1,476 @@
+"""Proactor event loop for Linux using io_uring."""
+
+import errno
+import itertools
+import os
+import select
+import socket
+import sys
+import time
+import warnings
+
+from . import events
+from . import futures
+from . import proactor_events
+from . import unix_events
+from .log import logger
+
+try:
+    import _uring
+except ImportError:  # pragma: no cover
+    _uring = None
+
+
+__all__ = (
+    'UringEventLoop', 'UringProactor', 'UringEventLoopPolicy',
+)
+
+
+# Size of the submission queue; more operations can be pending since the
+# queue is submitted whenever it is full
+DEFAULT_ENTRIES = 256
+
+# Returned by completion callbacks which submitted a new operation for the
+# same future
+_PENDING = object()
+
+
+def _check_result(res):
+    if res < 0:
+        raise OSError(-res, os.strerror(-res))
+    return res
+
+
+_supported = None
+
+
+def is_supported():
+    """Return True if the kernel supports the io_uring features used by
+    UringProactor."""
+    global _supported
+    if _supported is None:
+        try:
+            _uring.Ring(1).close()
+        except (AttributeError, OSError):
+            _supported = False
+        else:
+            _supported = True
+    return _supported
+
+
+class _UringFuture(futures.Future):
+    """Subclass of Future which represents an operation of the ring.
+
+    Cancelling it will cancel the operation in the kernel.
+    """
+
+    def __init__(self, proactor, *, loop=None):
+        super().__init__(loop=loop)
+        if self._source_traceback:
+            del self._source_traceback[-1]
+        self._proactor = proactor
+        self._key = None
+
+    def _repr_info(self):
+        info = super()._repr_info()
+        if self._key is not None:
+            info.insert(1, f'key={self._key}')
+        return info
+
+    def cancel(self):
+        if self._key is not None and not self.done():
+            try:
+                self._proactor._cancel(self._key)
+            except OSError as exc:
+                context = {
+                    'message': 'Cancelling a future failed',
+                    'exception': exc,
+                    'future': self,
+                }
+                if self._source_traceback:
+                    context['source_traceback'] = self._source_traceback
+                self._loop.call_exception_handler(context)
+        return super().cancel()
+
+
+class UringProactor:
+    """Proactor implementation using io_uring.
+
+    Operations are queued in the submission queue of the ring, and all the
+    operations queued during an iteration of the event loop are submitted
+    by a single system call which also waits for completions.
+    """
+
+    def __init__(self, entries=DEFAULT_ENTRIES):
+        if _uring is None:
+            raise OSError(errno.ENOSYS, 'io_uring is not available')
+        self._loop = None
+        self._results = []
+        self._ring = _uring.Ring(entries)
+        self._keys = itertools.count(1)
+        # key => (future, obj, callback, discard)
+        self._cache = {}
+
+    def _check_closed(self):
+        if self._ring is None:
+            raise RuntimeError('UringProactor is closed')
+
+    def __repr__(self):
+        info = ['pending#=%s' % len(self._cache),
+                'result#=%s' % len(self._results)]
+        if self._ring is None:
+            info.append('closed')
+        return '<%s %s>' % (self.__class__.__name__, " ".join(info))
+
+    def set_loop(self, loop):
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if not self._results:
+            self._poll(timeout)
+        tmp = self._results
+        self._results = []
+        return tmp
+
+    def _result(self, value):
+        fut = self._loop.create_future()
+        fut.set_result(value)
+        return fut
+
+    def _future(self):
+        fut = _UringFuture(self, loop=self._loop)
+        if fut._source_traceback:
+            del fut._source_traceback[-1]
+        return fut
+
+    def recv(self, conn, nbytes, flags=0):
+        buf = bytearray(nbytes)
+
+        def finish_recv(res):
+            del buf[res:]
+            return bytes(buf)
+
+        if not isinstance(conn, socket.socket) and not _readable(conn):
+            # The write end of a pipe is "read" to detect when the reader
+            # closes it, which poll reports with POLLERR.
+            def finish_poll(res):
+                _check_result(res)
+                return b''
+
+            fut = self._future()
+            self._submit(fut, conn, finish_poll, self._ring.poll,
+                         conn.fileno(), 0)
+            return fut
+        return self._recv_into(conn, buf, flags, finish_recv)
+
+    def recv_into(self, conn, buf, flags=0):
+        return self._recv_into(conn, buf, flags, None)
+
+    def _recv_into(self, conn, buf, flags, callback):
+        fut = self._future()
+        if isinstance(conn, socket.socket):
+            self._submit_retry(fut, conn, callback, select.POLLIN,
+                               self._ring.recv, conn.fileno(), buf, flags)
+        else:
+            self._submit_retry(fut, conn, callback, select.POLLIN,
+                               self._ring.read, conn.fileno(), buf)
+        return fut
+
+    def send(self, conn, buf, flags=0):
+        fut = self._future()
+        view = memoryview(buf).cast('B')
+        total = len(view)
+        if isinstance(conn, socket.socket):
+            op = self._ring.send
+            args = (flags,)
+        else:
+            op = self._ring.write
+            args = ()
+
+        def finish_send(res):
+            nonlocal view
+            if res < len(view):
+                # Partial write: send the remaining data
+                view = view[res:]
+                self._submit_retry(fut, conn, finish_send, select.POLLOUT,
+                                   op, conn.fileno(), view, *args)
+                return _PENDING
+            return total
+
+        self._submit_retry(fut, conn, finish_send, select.POLLOUT,
+                           op, conn.fileno(), view, *args)
+        return fut
+
+    def recvfrom(self, conn, nbytes, flags=0):
+        return self._when_ready(conn, select.POLLIN,
+                                lambda: conn.recvfrom(nbytes, flags))
+
+    def sendto(self, conn, buf, flags=0, addr=None):
+        return self._when_ready(conn, select.POLLOUT,
+                                lambda: conn.sendto(buf, flags, addr),
+                                eager=True)
+
+    def accept(self, listener):
+        fut = self._future()
+
+        def finish_accept(res):
+            _check_result(res)
+            conn = socket.socket(listener.family,
+                                 listener.type | socket.SOCK_NONBLOCK,
+                                 listener.proto, fileno=res)
+            try:
+                return conn, conn.getpeername()
+            except OSError:
+                conn.close()
+                raise
+
+        self._submit(fut, listener, finish_accept, self._ring.accept,
+                     listener.fileno(),
+                     socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                     discard=os.close)
+        return fut
+
+    def connect(self, conn, address):
+        try:
+            conn.connect(address)
+        except (BlockingIOError, InterruptedError):
+            pass
+        else:
+            return self._result(None)
+
+        def finish_connect(res):
+            _check_result(res)
+            err = conn.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err != 0:
+                raise OSError(err, f'Connect call failed {address}')
+
+        fut = self._future()
+        self._submit(fut, conn, finish_connect, self._ring.poll,
+                     conn.fileno(), select.POLLOUT)
+        return fut
+
+    def sendfile(self, sock, file, offset, count):
+        fileno = file.fileno()
+        total_sent = 0
+
+        def send():
+            nonlocal offset, count, total_sent
+            while count > 0:
+                try:
+                    sent = os.sendfile(sock.fileno(), fileno, offset, count)
+                except (BlockingIOError, InterruptedError):
+                    raise
+                except OSError:
+                    # Leave the file position after the data sent, as the
+                    # Unix selector loop does
+                    if total_sent:
+                        file.seek(offset)
+                    raise
+                if not sent:
+                    # EOF
+                    break
+                offset += sent
+                count -= sent
+                total_sent += sent
+            return total_sent
+
+        return self._when_ready(sock, select.POLLOUT, send, eager=True)
+
+    def _when_ready(self, obj, events, func, eager=False):
+        # Call the non-blocking function func() when obj is ready for the
+        # poll events; call it again on BlockingIOError.
+        fut = self._future()
+
+        def finish_poll(res):
+            _check_result(res)
+            try:
+                return func()
+            except (BlockingIOError, InterruptedError):
+                self._submit(fut, obj, finish_poll, self._ring.poll,
+                             obj.fileno(), events)
+                return _PENDING
+
+        if eager:
+            try:
+                value = finish_poll(0)
+            except OSError as exc:
+                fut.set_exception(exc)
+            else:
+                if value is not _PENDING:
+                    fut.set_result(value)
+        else:
+            self._submit(fut, obj, finish_poll, self._ring.poll,
+                         obj.fileno(), events)
+        return fut
+
+    def _submit_retry(self, fut, obj, callback, events, op, fd, *args):
+        # Submit the operation.  If the kernel does not wait for a
+        # non-blocking file and fails with EAGAIN, wait until the file is
+        # ready for the poll events and submit the operation again.
+        def finish(res):
+            if res == -errno.EAGAIN:
+                self._submit(fut, obj, retry, self._ring.poll, fd, events)
+                return _PENDING
+            _check_result(res)
+            if callback is None:
+                return res
+            return callback(res)
+
+        def retry(res):
+            _check_result(res)
+            self._submit(fut, obj, finish, op, fd, *args)
+            return _PENDING
+
+        self._submit(fut, obj, finish, op, fd, *args)
+
+    def _submit(self, fut, obj, callback, op, *args, discard=None):
+        # Queue the operation op(key, *args) and call callback() with its
+        # result when it completes; the future is set with the value
+        # returned by callback().  If the future is cancelled but the
+        # operation succeeds anyway, discard() is called with the result.
+        self._check_closed()
+        key = next(self._keys)
+        op(key, *args)
+        fut._key = key
+        # Store obj to prevent it from being garbage collected too early.
+        self._cache[key] = (fut, obj, callback, discard)
+
+    def _cancel(self, key):
+        if self._ring is not None and key in self._cache:
+            self._ring.cancel(next(self._keys), key)
+
+    def _poll(self, timeout=None):
+        if timeout is not None and timeout < 0:
+            raise ValueError("negative timeout")
+
+        for key, res in self._ring.wait(timeout):
+            try:
+                fut, obj, callback, discard = self._cache.pop(key)
+            except KeyError:
+                # Completion of a cancel request
+                continue
+
+            if fut.done():
+                # The future has been cancelled
+                if res >= 0 and discard is not None:
+                    discard(res)
+                continue
+
+            try:
+                value = callback(res)
+            except OSError as e:
+                fut.set_exception(e)
+                self._results.append(fut)
+            else:
+                if value is not _PENDING:
+                    fut.set_result(value)
+                    self._results.append(fut)
+
+    def _stop_serving(self, obj):
+        # obj is a listening socket.  The loop cancelled the pending accept
+        # and is going to close the socket; closing a file does not abort
+        # the operations using it, so submit the cancellation right away.
+        self._ring.submit()
+
+    def close(self):
+        if self._ring is None:
+            # already closed
+            return
+
+        # Cancel remaining registered operations.
+        for key, (fut, obj, callback, discard) in list(self._cache.items()):
+            if not fut.done():
+                fut.cancel()
+            else:
+                self._cancel(key)
+
+        # Wait until all cancelled operations complete: the kernel may write
+        # into their buffers until then. Display progress every second if
+        # the loop is still running.
+        msg_update = 1.0
+        start_time = time.monotonic()
+        next_msg = start_time + msg_update
+        while self._cache:
+            if next_msg <= time.monotonic():
+                logger.debug('%r is running after closing for %.1f seconds',
+                             self, time.monotonic() - start_time)
+                next_msg = time.monotonic() + msg_update
+
+            # handle a few events, or timeout
+            self._poll(msg_update)
+
+        self._results = []
+
+        self._ring.close()
+        self._ring = None
+
+    def __del__(self):
+        self.close()
+
+
+def _readable(f):
+    try:
+        return f.readable()
+    except AttributeError:
+        return True
+
+
+_UnixLoop = unix_events._UnixSelectorEventLoop
+
+
+class UringEventLoop(proactor_events.BaseProactorEventLoop):
+    """Proactor event loop using io_uring.
+
+    Adds signal handling, UNIX Domain Socket and subprocess support as
+    SelectorEventLoop does on Unix.  Raise OSError if the kernel does not
+    support io_uring.
+    """
+
+    def __init__(self, proactor=None):
+        if proactor is None:
+            proactor = UringProactor()
+        super().__init__(proactor)
+        self._signal_handlers = {}
+        # Keep reading the self-pipe between runs of the loop, cancelling
+        # the read could lose signal numbers.
+        self.call_soon(self._loop_self_reading)
+
+    def close(self):
+        super().close()
+        if not sys.is_finalizing():
+            for sig in list(self._signal_handlers):
+                self.remove_signal_handler(sig)
+        else:
+            if self._signal_handlers:
+                warnings.warn(f"Closing the loop {self!r} "
+                              f"on interpreter shutdown "
+                              f"stage, skipping signal handlers removal",
+                              ResourceWarning,
+                              source=self)
+                self._signal_handlers.clear()
+
+    # Signal numbers are written to the self-pipe, which is read by
+    # _loop_self_reading(): handle them as the Unix selector loop does.
+    _process_self_data = _UnixLoop._process_self_data
+    add_signal_handler = _UnixLoop.add_signal_handler
+    _handle_signal = _UnixLoop._handle_signal
+    remove_signal_handler = _UnixLoop.remove_signal_handler
+    _check_signal = _UnixLoop._check_signal
+
+    _make_subprocess_transport = _UnixLoop._make_subprocess_transport
+    _child_watcher_callback = _UnixLoop._child_watcher_callback
+
+    create_unix_connection = _UnixLoop.create_unix_connection
+    create_unix_server = _UnixLoop.create_unix_server
+
+
+def _new_event_loop():
+    if is_supported():
+        return UringEventLoop()
+    return unix_events.SelectorEventLoop()
+
+
+class UringEventLoopPolicy(unix_events.DefaultEventLoopPolicy):
+    """UNIX event loop policy creating UringEventLoop instances, or
+    SelectorEventLoop instances if the kernel does not support io_uring."""
+    _loop_factory = staticmethod(_new_event_loop)
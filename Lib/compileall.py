@@ -18,7 +18,7 @@ import struct
 
 from functools import partial
 
-__all__ = ["compile_dir","compile_file","compile_path"]
+__all__ = ["compile_dir","compile_file","compile_path","compile_bundle"]
 
 def _walk_dir(dir, ddir=None, maxlevels=10, quiet=0):
     if quiet < 2 and isinstance(dir, os.PathLike):
@@ -217,6 +217,123 @@ def compile_path(skip_curdir=1, maxlevels=0, force=False, quiet=0,
             )
     return success
 
+def _bundle_modules(dirs, quiet=0):
+    """Return a dict mapping the names of the modules found in the dirs to
+    (path, is_package), or to None for the modules that have no source.
+
+    Modules are looked up the way the path based finder does: a package
+    takes precedence over a module, extension modules over source files
+    and source files over bytecode files, and the first directory wins.
+    """
+    from importlib.machinery import (EXTENSION_SUFFIXES, SOURCE_SUFFIXES,
+                                     BYTECODE_SUFFIXES)
+    suffixes = ([(suffix, False) for suffix in EXTENSION_SUFFIXES] +
+                [(suffix, True) for suffix in SOURCE_SUFFIXES] +
+                [(suffix, False) for suffix in BYTECODE_SUFFIXES])
+    modules = {}
+
+    def add_directory(dir, prefix):
+        if not quiet:
+            print('Listing {!r}...'.format(dir))
+        try:
+            names = os.listdir(dir)
+        except OSError:
+            if quiet < 2:
+                print("Can't list {!r}".format(dir))
+            return
+        bases = set()
+        for name in names:
+            for suffix, _ in suffixes:
+                if name.endswith(suffix):
+                    bases.add(name[:-len(suffix)])
+            bases.add(name)
+        for base in sorted(bases):
+            fullname = prefix + base
+            if (not base.isidentifier() or fullname in modules
+                    or prefix and base == '__init__'):
+                continue
+            path = os.path.join(dir, base)
+            found = None
+            if os.path.isdir(path):
+                for suffix, is_source in suffixes:
+                    init = os.path.join(path, '__init__' + suffix)
+                    if os.path.isfile(init):
+                        found = init, is_source, True
+                        break
+            if found is None:
+                for suffix, is_source in suffixes:
+                    if os.path.isfile(path + suffix):
+                        found = path + suffix, is_source, False
+                        break
+            if found is None:
+                continue
+            filename, is_source, is_package = found
+            modules[fullname] = (filename, is_package) if is_source else None
+            if is_package:
+                add_directory(path, fullname + '.')
+
+    for dir in dirs:
+        add_directory(os.fspath(dir) or os.getcwd(), '')
+    return modules
+
+def compile_bundle(filename, dirs=None, rx=None, quiet=0, optimize=-1):
+    """Byte-compile the modules of the given directories into a bundle.
+
+    Arguments (only filename is required):
+
+    filename: the bytecode bundle to write
+    dirs:     the directories to search for modules and packages, in the
+              order of sys.path (default sys.path)
+    rx:       if given, skip the source files matching this regexp
+    quiet:    full output with False or 0, errors only with 1,
+              no output with 2
+    optimize: optimization level or -1 for level of the interpreter
+
+    The bundle is a single file holding the code objects of all the source
+    modules found in the directories, for use with -X bytecode_bundle.  The
+    code objects are not checked against their sources at import time.
+    Modules which fail to compile are left out of the bundle.
+    """
+    import marshal
+    from importlib import _bootstrap_external
+    if dirs is None:
+        dirs = sys.path
+    success = True
+    data = bytearray(16)
+    index = {}
+    for name, entry in sorted(_bundle_modules(dirs, quiet).items()):
+        if entry is None:
+            continue
+        fullname, is_package = entry
+        if rx is not None and rx.search(fullname):
+            continue
+        if not quiet:
+            print('Compiling {!r}...'.format(fullname))
+        try:
+            with open(fullname, 'rb') as file:
+                source = file.read()
+            code = compile(source, fullname, 'exec', dont_inherit=True,
+                           optimize=optimize)
+        except (SyntaxError, ValueError, UnicodeError, OSError) as e:
+            success = False
+            if quiet >= 2:
+                continue
+            elif quiet:
+                print('*** Error compiling {!r}...'.format(fullname))
+            else:
+                print('*** ', end='')
+            print(e.__class__.__name__ + ':', e)
+            continue
+        blob = marshal.dumps(code)
+        index[name] = (len(data), len(blob), fullname, is_package)
+        data.extend(blob)
+    blob = marshal.dumps(index)
+    data[:16] = struct.pack('<4s4sLL', _bootstrap_external._BUNDLE_MAGIC,
+                            importlib.util.MAGIC_NUMBER, len(data), len(blob))
+    data.extend(blob)
+    _bootstrap_external._write_atomic(filename, data)
+    return success
+
 
 def main():
     """Script main program."""
@@ -265,6 +382,14 @@ def main():
                               '"checked-hash" if the SOURCE_DATE_EPOCH '
                               'environment variable is set, and '
                               '"timestamp" otherwise.'))
+    parser.add_argument('--import-index', metavar='FILE', dest='import_index',
+                        help=('write an import index of the directories '
+                              'to FILE, for use with -X importindex'))
+    parser.add_argument('--bundle', metavar='FILE', dest='bundle',
+                        help=('write the bytecode of the modules of the '
+                              'directories to the bundle FILE, for use with '
+                              '-X bytecode_bundle, instead of compiling '
+                              '.pyc files'))
 
     args = parser.parse_args()
     compile_dests = args.compile_dest
@@ -296,6 +421,20 @@ def main():
     else:
         invalidation_mode = None
 
+    if args.bundle:
+        directories = None
+        if compile_dests:
+            directories = [dest for dest in compile_dests
+                           if os.path.isdir(dest)]
+        try:
+            return compile_bundle(args.bundle, directories, args.rx,
+                                  args.quiet)
+        except OSError as exc:
+            if args.quiet < 2:
+                print("Error writing bytecode bundle {}: {}".format(
+                    args.bundle, exc))
+            return False
+
     success = True
     try:
         if compile_dests:
@@ -311,16 +450,29 @@ def main():
                                        args.legacy, workers=args.workers,
                                        invalidation_mode=invalidation_mode):
                         success = False
-            return success
         else:
-            return compile_path(legacy=args.legacy, force=args.force,
-                                quiet=args.quiet,
-                                invalidation_mode=invalidation_mode)
+            success = compile_path(legacy=args.legacy, force=args.force,
+                                   quiet=args.quiet,
+                                   invalidation_mode=invalidation_mode)
     except KeyboardInterrupt:
         if args.quiet < 2:
             print("\n[interrupted]")
         return False
-    return True
+
+    if args.import_index:
+        import importlib.util
+        directories = None
+        if compile_dests:
+            directories = [dest for dest in compile_dests
+                           if os.path.isdir(dest)]
+        try:
+            importlib.util.write_import_index(args.import_index, directories)
+        except OSError as exc:
+            if args.quiet < 2:
+                print("Error writing import index {}: {}".format(
+                    args.import_index, exc))
+            return False
+    return success
 
 
 if __name__ == '__main__':
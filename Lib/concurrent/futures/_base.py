@@ -4,9 +4,11 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import collections
+import itertools
 import logging
 import threading
 import time
+import weakref
 
 FIRST_COMPLETED = 'FIRST_COMPLETED'
 FIRST_EXCEPTION = 'FIRST_EXCEPTION'
@@ -544,6 +546,38 @@ class Future(object):
             self._condition.notify_all()
         self._invoke_callbacks()
 
+def _get_chunks(*iterables, chunksize):
+    """ Iterates over zip()ed iterables in chunks. """
+    it = zip(*iterables)
+    while True:
+        chunk = tuple(itertools.islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def _process_chunk(fn, chunk):
+    """ Processes a chunk of an iterable passed to map.
+
+    Runs the function passed to map() on a chunk of the
+    iterable passed to map.
+
+    This function is run in a worker thread or in a separate process.
+
+    """
+    return [fn(*args) for args in chunk]
+
+def _chain_from_iterable_of_lists(iterable):
+    """
+    Specialized implementation of itertools.chain.from_iterable.
+    Each item in *iterable* should be a list.  This function is
+    careful not to keep references to yielded objects.
+    """
+    for element in iterable:
+        element.reverse()
+        while element:
+            yield element.pop()
+
+
 class Executor(object):
     """This is an abstract base class for concrete asynchronous executors."""
 
@@ -558,7 +592,20 @@ class Executor(object):
         """
         raise NotImplementedError()
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def submit_many(self, fn, iterable):
+        """Submits a callable to be executed once per argument tuple.
+
+        This is equivalent to [self.submit(fn, *args) for args in iterable],
+        but executors may schedule the whole batch at once, which is cheaper
+        than submitting the calls one at a time.
+
+        Returns:
+            A list of Futures, one per element of iterable and in the same
+            order.
+        """
+        return [self.submit(fn, *args) for args in iterable]
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -567,9 +614,12 @@ class Executor(object):
             timeout: The maximum number of seconds to wait. If None, then there
                 is no limit on the wait time.
             chunksize: The size of the chunks the iterable will be broken into
-                before being passed to a child process. This argument is only
-                used by ProcessPoolExecutor; it is ignored by
-                ThreadPoolExecutor.
+                before being passed to a worker. It is ignored by this base
+                implementation.
+            buffersize: If None, all the calls are submitted before returning.
+                Otherwise, at most buffersize calls are submitted and the
+                iterables are consumed lazily: another call is submitted each
+                time a result is retrieved from the returned iterator.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -580,10 +630,20 @@ class Executor(object):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if buffersize is not None and buffersize < 1:
+            raise ValueError("buffersize must be None or >= 1.")
+
         if timeout is not None:
             end_time = timeout + time.monotonic()
 
-        fs = [self.submit(fn, *args) for args in zip(*iterables)]
+        zipped_iterables = zip(*iterables)
+        if buffersize is None:
+            fs = self.submit_many(fn, zipped_iterables)
+        else:
+            fs = collections.deque(self.submit_many(
+                fn, itertools.islice(zipped_iterables, buffersize)))
+            # Don't keep the executor alive from the result iterator
+            executor_reference = weakref.ref(self)
 
         # Yield must be hidden in closure so that the futures are submitted
         # before the first iterator value is required.
@@ -592,6 +652,19 @@ class Executor(object):
                 # reverse to keep finishing order
                 fs.reverse()
                 while fs:
+                    if buffersize is not None:
+                        # Wait for the oldest call before refilling the
+                        # buffer, so that at most buffersize calls are in
+                        # flight
+                        if timeout is None:
+                            fs[-1].result()
+                        else:
+                            fs[-1].result(end_time - time.monotonic())
+                        args = next(zipped_iterables, None)
+                        executor = executor_reference()
+                        if args is not None and executor is not None:
+                            fs.appendleft(executor.submit(fn, *args))
+                        del executor
                     # Careful not to keep a reference to the popped future
                     if timeout is None:
                         yield fs.pop().result()
@@ -46,18 +46,23 @@ Process #1..n:
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import atexit
+import io
 import os
+import pickle
 from concurrent.futures import _base
 import queue
 from queue import Full
 import multiprocessing as mp
 import multiprocessing.connection
 from multiprocessing.queues import Queue
+from multiprocessing.reduction import ForkingPickler
 import threading
 import weakref
 from functools import partial
+import importlib
 import itertools
 import sys
+import time
 import traceback
 
 # Workers are created as daemon threads and processes. This is done to allow the
@@ -110,6 +115,15 @@ def _python_exit():
 EXTRA_QUEUED_CALLS = 1
 
 
+# Time that map() aims to spend processing each chunk when chunksize is None.
+# Longer chunks amortize the cost of inter-process communication better while
+# shorter ones balance the load more evenly between the workers.
+ADAPTIVE_CHUNK_DURATION = 0.05
+
+# Upper bound on the size of the chunks when chunksize is None.
+_MAX_ADAPTIVE_CHUNKSIZE = 1 << 16
+
+
 # On Windows, WaitForMultipleObjects is used to wait for processes to finish.
 # It can wait on, at most, 63 objects. There is an overhead of two objects:
 # - the result queue reader
@@ -157,6 +171,126 @@ class _CallItem(object):
         self.args = args
         self.kwargs = kwargs
 
+class _WorkerReady(object):
+    def __init__(self, pid, spawn_time):
+        self.pid = pid
+        self.spawn_time = spawn_time
+
+
+class _SharedMemoryPickler(ForkingPickler):
+    """Pickles large bytes and bytearray objects, as well as memoryviews, as
+    out-of-band buffers (see PEP 574)."""
+    def __init__(self, file, threshold, buffer_callback):
+        # ForkingPickler.__init__() only accepts positional arguments
+        super().__init__(file, 5, True, buffer_callback)
+        self._threshold = threshold
+
+    def reducer_override(self, obj):
+        cls = type(obj)
+        if cls is bytes or cls is bytearray:
+            if len(obj) >= self._threshold:
+                return cls, (pickle.PickleBuffer(obj),)
+        elif cls is memoryview and obj.c_contiguous:
+            return _rebuild_memoryview, (pickle.PickleBuffer(obj),
+                                         obj.format, obj.shape)
+        return NotImplemented
+
+
+def _rebuild_memoryview(buf, format, shape):
+    m = memoryview(buf).cast('B')
+    if format != 'B' or len(shape) != 1:
+        m = m.cast(format, shape)
+    return m
+
+
+class _SharedMemoryPayload(object):
+    """Wraps an object so that the out-of-band buffers of at least threshold
+    bytes are sent through shared memory segments rather than through the
+    pipe when the wrapper is pickled.  The receiving process unpickles the
+    wrapped object itself.
+    """
+    def __init__(self, obj, threshold):
+        self.obj = obj
+        self.threshold = threshold
+
+    def __reduce__(self):
+        from multiprocessing import shared_memory
+
+        segments = []
+        def buffer_callback(buf):
+            m = buf.raw()
+            if m.nbytes < self.threshold:
+                # Serialize small buffers in-band
+                return True
+            shm = shared_memory.SharedMemory(create=True, size=m.nbytes)
+            try:
+                segments.append((shm.name, m.nbytes))
+                shm.buf[:m.nbytes] = m
+            finally:
+                shm.close()
+            return False
+
+        f = io.BytesIO()
+        try:
+            _SharedMemoryPickler(f, self.threshold, buffer_callback).dump(
+                self.obj)
+        except BaseException:
+            for name, _ in segments:
+                shared_memory.SharedMemory(name).unlink()
+            raise
+        return _load_shared_memory_payload, (f.getvalue(), segments)
+
+
+# Shared memory segments attached by _load_shared_memory_payload() which are
+# still referenced by unpickled objects, e.g. memoryviews.
+_attached_segments = []
+_attached_segments_lock = threading.Lock()
+
+def _load_shared_memory_payload(data, segments):
+    from multiprocessing import shared_memory
+
+    buffers = []
+    with _attached_segments_lock:
+        for name, size in segments:
+            shm = shared_memory.SharedMemory(name)
+            # The segment is destroyed once its last mapping is closed
+            shm.unlink()
+            _attached_segments.append(shm)
+            buffers.append(shm.buf[:size])
+    obj = pickle.loads(data, buffers=buffers)
+    del buffers
+    with _attached_segments_lock:
+        still_attached = []
+        for shm in _attached_segments:
+            try:
+                shm.close()
+            except BufferError:
+                still_attached.append(shm)
+        _attached_segments[:] = still_attached
+    return obj
+
+
+def _start_forkserver(preload):
+    """Adds the given modules to those imported by the fork server and makes
+    sure it is running.
+
+    The fork server outlives the executors: if it is already running, the
+    modules it did not import are imported by the workers themselves.  The
+    preload list of the forkserver module is restored once the server is
+    running, so the modules are only added for this start.
+    """
+    from multiprocessing import forkserver
+    previous = forkserver._forkserver._preload_modules
+    modules = list(previous)
+    for name in preload:
+        if name not in modules:
+            modules.append(name)
+    forkserver.set_forkserver_preload(modules)
+    try:
+        forkserver.ensure_running()
+    finally:
+        forkserver.set_forkserver_preload(previous)
+
 
 class _SafeQueue(Queue):
     """Safe Queue set exception to the future object linked to a job"""
@@ -165,6 +299,8 @@ class _SafeQueue(Queue):
         super().__init__(max_size, ctx=ctx)
 
     def _on_queue_feeder_error(self, e, obj):
+        if isinstance(obj, _SharedMemoryPayload):
+            obj = obj.obj
         if isinstance(obj, _CallItem):
             tb = traceback.format_exception(type(e), e, e.__traceback__)
             e.__cause__ = _RemoteTraceback('\n"""\n{}"""'.format(''.join(tb)))
@@ -177,25 +313,57 @@ class _SafeQueue(Queue):
             super()._on_queue_feeder_error(e, obj)
 
 
-def _get_chunks(*iterables, chunksize):
-    """ Iterates over zip()ed iterables in chunks. """
-    it = zip(*iterables)
-    while True:
-        chunk = tuple(itertools.islice(it, chunksize))
-        if not chunk:
-            return
-        yield chunk
-
-def _process_chunk(fn, chunk):
-    """ Processes a chunk of an iterable passed to map.
+def _process_timed_chunk(fn, chunk):
+    """ Processes a chunk of an iterable passed to map() with an adaptive
+    chunk size.
 
-    Runs the function passed to map() on a chunk of the
-    iterable passed to map.
+    Returns the time taken by the calls along with their results.
 
     This function is run in a separate process.
 
     """
-    return [fn(*args) for args in chunk]
+    start = time.perf_counter()
+    results = [fn(*args) for args in chunk]
+    return time.perf_counter() - start, results
+
+
+class _AdaptiveChunker(object):
+    """Chops the iterables passed to map() into chunks whose size follows the
+    time taken by the calls of the chunks already processed."""
+    def __init__(self):
+        self.chunksize = 1
+        # Moving average of the time taken by a single call
+        self.call_duration = None
+
+    def chunks(self, *iterables):
+        it = zip(*iterables)
+        while True:
+            chunk = tuple(itertools.islice(it, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def update(self, ncalls, elapsed):
+        call_duration = elapsed / ncalls
+        if self.call_duration is not None:
+            call_duration = (self.call_duration + call_duration) / 2
+        self.call_duration = call_duration
+        if call_duration > 0:
+            chunksize = int(ADAPTIVE_CHUNK_DURATION / call_duration)
+        else:
+            chunksize = _MAX_ADAPTIVE_CHUNKSIZE
+        # Grow progressively but shrink immediately
+        self.chunksize = max(1, min(chunksize, 2 * self.chunksize,
+                                    _MAX_ADAPTIVE_CHUNKSIZE))
+
+    def results(self, iterable):
+        """Like _chain_from_iterable_of_lists() but for the results of
+        _process_timed_chunk(), which are used to size the next chunks."""
+        for elapsed, results in iterable:
+            self.update(len(results), elapsed)
+            results.reverse()
+            while results:
+                yield results.pop()
 
 
 def _sendback_result(result_queue, work_id, result=None, exception=None):
@@ -208,7 +376,8 @@ def _sendback_result(result_queue, work_id, result=None, exception=None):
         result_queue.put(_ResultItem(work_id, exception=exc))
 
 
-def _process_worker(call_queue, result_queue, initializer, initargs):
+def _process_worker(call_queue, result_queue, initializer, initargs,
+                    shared_memory_threshold=None, preload=(), spawn_time=None):
     """Evaluates calls from call_queue and places the results in result_queue.
 
     This worker is run in a separate process.
@@ -220,7 +389,24 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             to by the worker.
         initializer: A callable initializer, or None
         initargs: A tuple of args for the initializer
+        shared_memory_threshold: The minimum size of the buffers of a result
+            sent through shared memory, or None to send results through
+            result_queue only.
+        preload: A tuple of names of modules to import before running the
+            initializer.  They are usually already imported when the worker
+            is started by a fork server.
+        spawn_time: The time.monotonic() of the parent when it started this
+            worker, sent back to the parent once the worker is ready, or
+            None.  The parent compares it with its own clock only.
     """
+    try:
+        for name in preload:
+            importlib.import_module(name)
+    except BaseException:
+        _base.LOGGER.critical('Exception in preload:', exc_info=True)
+        # The parent will notice that the process stopped and
+        # mark the pool broken
+        return
     if initializer is not None:
         try:
             initializer(*initargs)
@@ -229,6 +415,8 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             # The parent will notice that the process stopped and
             # mark the pool broken
             return
+    if spawn_time is not None:
+        result_queue.put(_WorkerReady(os.getpid(), spawn_time))
     while True:
         call_item = call_queue.get(block=True)
         if call_item is None:
@@ -241,6 +429,8 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             exc = _ExceptionWithTraceback(e, e.__traceback__)
             _sendback_result(result_queue, call_item.work_id, exception=exc)
         else:
+            if shared_memory_threshold is not None:
+                r = _SharedMemoryPayload(r, shared_memory_threshold)
             _sendback_result(result_queue, call_item.work_id, result=r)
             del r
 
@@ -251,7 +441,8 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
 
 def _add_call_item_to_queue(pending_work_items,
                             work_ids,
-                            call_queue):
+                            call_queue,
+                            shared_memory_threshold=None):
     """Fills call_queue with _WorkItems from pending_work_items.
 
     This function never blocks.
@@ -265,6 +456,9 @@ def _add_call_item_to_queue(pending_work_items,
             call_queue.
         call_queue: A multiprocessing.Queue that will be filled with _CallItems
             derived from _WorkItems.
+        shared_memory_threshold: The minimum size of the buffers of a call
+            sent through shared memory, or None to send calls through
+            call_queue only.
     """
     while True:
         if call_queue.full():
@@ -277,11 +471,14 @@ def _add_call_item_to_queue(pending_work_items,
             work_item = pending_work_items[work_id]
 
             if work_item.future.set_running_or_notify_cancel():
-                call_queue.put(_CallItem(work_id,
-                                         work_item.fn,
-                                         work_item.args,
-                                         work_item.kwargs),
-                               block=True)
+                call_item = _CallItem(work_id,
+                                      work_item.fn,
+                                      work_item.args,
+                                      work_item.kwargs)
+                if shared_memory_threshold is not None:
+                    call_item = _SharedMemoryPayload(call_item,
+                                                     shared_memory_threshold)
+                call_queue.put(call_item, block=True)
             else:
                 del pending_work_items[work_id]
                 continue
@@ -293,7 +490,8 @@ def _queue_management_worker(executor_reference,
                              work_ids_queue,
                              call_queue,
                              result_queue,
-                             thread_wakeup):
+                             thread_wakeup,
+                             shared_memory_threshold=None):
     """Manages the communication between this process and the worker processes.
 
     This function is run in a local thread.
@@ -314,6 +512,8 @@ def _queue_management_worker(executor_reference,
         thread_wakeup: A _ThreadWakeup to allow waking up the
             queue_manager_thread from the main Thread and avoid deadlocks
             caused by permanently locked queues.
+        shared_memory_threshold: The minimum size of the buffers of a call
+            sent through shared memory, or None.
     """
     executor = None
 
@@ -351,7 +551,19 @@ def _queue_management_worker(executor_reference,
     while True:
         _add_call_item_to_queue(pending_work_items,
                                 work_ids_queue,
-                                call_queue)
+                                call_queue,
+                                shared_memory_threshold)
+
+        # The cancelled work items were just removed: if they were the last
+        # ones, no result will wake us up anymore.
+        if not pending_work_items:
+            executor = executor_reference()
+            if shutting_down():
+                if executor is not None:
+                    executor._shutdown_thread = True
+                shutdown_worker()
+                return
+            executor = None
 
         # Wait for a result to be ready in the result_queue while checking
         # that all worker processes are still running, or for a wake up
@@ -401,7 +613,13 @@ def _queue_management_worker(executor_reference,
                 p.terminate()
             shutdown_worker()
             return
-        if isinstance(result_item, int):
+        if isinstance(result_item, _WorkerReady):
+            executor = executor_reference()
+            if executor is not None:
+                executor._spawn_latencies[result_item.pid] = (
+                    time.monotonic() - result_item.spawn_time)
+            del result_item
+        elif isinstance(result_item, int):
             # Clean shutdown of a worker using its PID
             # (avoids marking the executor broken)
             assert shutting_down()
@@ -475,18 +693,6 @@ def _check_system_limits():
     raise NotImplementedError(_system_limited)
 
 
-def _chain_from_iterable_of_lists(iterable):
-    """
-    Specialized implementation of itertools.chain.from_iterable.
-    Each item in *iterable* should be a list.  This function is
-    careful not to keep references to yielded objects.
-    """
-    for element in iterable:
-        element.reverse()
-        while element:
-            yield element.pop()
-
-
 class BrokenProcessPool(_base.BrokenExecutor):
     """
     Raised when a process in a ProcessPoolExecutor terminated abruptly
@@ -496,7 +702,8 @@ class BrokenProcessPool(_base.BrokenExecutor):
 
 class ProcessPoolExecutor(_base.Executor):
     def __init__(self, max_workers=None, mp_context=None,
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *,
+                 shared_memory_threshold=None, preload=None):
         """Initializes a new ProcessPoolExecutor instance.
 
         Args:
@@ -507,6 +714,16 @@ class ProcessPoolExecutor(_base.Executor):
                 object should provide SimpleQueue, Queue and Process.
             initializer: A callable used to initialize worker processes.
             initargs: A tuple of arguments to pass to the initializer.
+            shared_memory_threshold: If not None, calls and results are
+                pickled with protocol 5 and their out-of-band buffers of at
+                least this many bytes, including those of large bytes and
+                bytearray objects and of memoryviews, are sent through
+                shared memory segments instead of through pipes.
+            preload: An iterable of names of modules to import in the worker
+                processes before the initializer is called.  With the
+                "forkserver" start method, they are imported once by the fork
+                server, which is started right away, and the workers forked
+                from it start with these modules already imported.
         """
         _check_system_limits()
 
@@ -534,6 +751,29 @@ class ProcessPoolExecutor(_base.Executor):
         self._initializer = initializer
         self._initargs = initargs
 
+        if shared_memory_threshold is not None:
+            if sys.platform == 'win32':
+                # Windows destroys a named shared memory block as soon as its
+                # creator closes it, before the receiving process attaches.
+                raise ValueError("shared_memory_threshold is not supported "
+                                 "on Windows")
+            if shared_memory_threshold <= 0:
+                raise ValueError("shared_memory_threshold must be greater "
+                                 "than 0")
+        self._shared_memory_threshold = shared_memory_threshold
+
+        if preload is None:
+            preload = ()
+        else:
+            preload = tuple(preload)
+            if not all(isinstance(name, str) for name in preload):
+                raise TypeError("preload must be an iterable of module names")
+            if preload and mp_context.get_start_method() == 'forkserver':
+                _start_forkserver(preload)
+        self._preload = preload
+        # Map of pids to the time taken by the worker processes to be ready
+        self._spawn_latencies = {}
+
         # Management thread
         self._queue_management_thread = None
 
@@ -590,7 +830,8 @@ class ProcessPoolExecutor(_base.Executor):
                       self._work_ids,
                       self._call_queue,
                       self._result_queue,
-                      self._queue_management_thread_wakeup),
+                      self._queue_management_thread_wakeup,
+                      self._shared_memory_threshold),
                 name="QueueManagerThread")
             self._queue_management_thread.daemon = True
             self._queue_management_thread.start()
@@ -598,16 +839,34 @@ class ProcessPoolExecutor(_base.Executor):
                 self._queue_management_thread_wakeup
 
     def _adjust_process_count(self):
+        if self._shared_memory_threshold is not None:
+            # The workers must share the resource tracker of this process:
+            # shared memory segments are registered by the process creating
+            # them and unregistered by the one receiving them.
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
         for _ in range(len(self._processes), self._max_workers):
             p = self._mp_context.Process(
                 target=_process_worker,
                 args=(self._call_queue,
                       self._result_queue,
                       self._initializer,
-                      self._initargs))
+                      self._initargs,
+                      self._shared_memory_threshold,
+                      self._preload,
+                      time.monotonic()))
             p.start()
             self._processes[p.pid] = p
 
+    def spawn_latencies(self):
+        """Returns the time, in seconds, taken by each worker process between
+        its start and the moment it was ready to run calls, including the
+        import of the preloaded modules and the initializer.
+
+        Workers which are still starting are not included.
+        """
+        return list(self._spawn_latencies.values())
+
     def submit(self, fn, /, *args, **kwargs):
         with self._shutdown_lock:
             if self._broken:
@@ -631,7 +890,7 @@ class ProcessPoolExecutor(_base.Executor):
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -642,6 +901,13 @@ class ProcessPoolExecutor(_base.Executor):
             chunksize: If greater than one, the iterables will be chopped into
                 chunks of size chunksize and submitted to the process pool.
                 If set to one, the items in the list will be sent one at a time.
+                If None, the size of the chunks adapts to the time taken by
+                the calls, so that each chunk takes about
+                ADAPTIVE_CHUNK_DURATION seconds to process.
+            buffersize: If not None, the maximum number of chunks submitted
+                whose results have not been retrieved yet; the iterables are
+                then consumed lazily.  If chunksize is None, it defaults to
+                twice the number of workers.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -652,13 +918,25 @@ class ProcessPoolExecutor(_base.Executor):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if chunksize is None:
+            # The size of the next chunks is only known once the previous
+            # ones have been processed, so they must be submitted lazily.
+            if buffersize is None:
+                buffersize = 2 * self._max_workers
+            chunker = _AdaptiveChunker()
+            results = super().map(partial(_process_timed_chunk, fn),
+                                  chunker.chunks(*iterables),
+                                  timeout=timeout, buffersize=buffersize)
+            return chunker.results(results)
+
         if chunksize < 1:
             raise ValueError("chunksize must be >= 1.")
 
-        results = super().map(partial(_process_chunk, fn),
-                              _get_chunks(*iterables, chunksize=chunksize),
-                              timeout=timeout)
-        return _chain_from_iterable_of_lists(results)
+        results = super().map(partial(_base._process_chunk, fn),
+                              _base._get_chunks(*iterables,
+                                                chunksize=chunksize),
+                              timeout=timeout, buffersize=buffersize)
+        return _base._chain_from_iterable_of_lists(results)
 
     def shutdown(self, wait=True):
         with self._shutdown_lock:
@@ -7,6 +7,8 @@ __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import atexit
 from concurrent.futures import _base
+import collections
+from functools import partial
 import itertools
 import queue
 import threading
@@ -45,6 +47,10 @@ def _python_exit():
 
 atexit.register(_python_exit)
 
+# Put in the work queue of a work-stealing executor to wake up an idle worker
+# so that it steals work from the local deque of a busy one.
+_STEAL = object()
+
 
 class _WorkItem(object):
     def __init__(self, future, fn, args, kwargs):
@@ -67,7 +73,7 @@ class _WorkItem(object):
             self.future.set_result(result)
 
 
-def _worker(executor_reference, work_queue, initializer, initargs):
+def _initialize_worker(executor_reference, initializer, initargs):
     if initializer is not None:
         try:
             initializer(*initargs)
@@ -76,7 +82,13 @@ def _worker(executor_reference, work_queue, initializer, initargs):
             executor = executor_reference()
             if executor is not None:
                 executor._initializer_failed()
-            return
+            return False
+    return True
+
+
+def _worker(executor_reference, work_queue, initializer, initargs):
+    if not _initialize_worker(executor_reference, initializer, initargs):
+        return
     try:
         while True:
             work_item = work_queue.get(block=True)
@@ -110,6 +122,83 @@ def _worker(executor_reference, work_queue, initializer, initargs):
         _base.LOGGER.critical('Exception in worker', exc_info=True)
 
 
+def _steal(deques, index):
+    # Take the most recently queued work item from the local deque of another
+    # worker, starting with the next one so that victims are spread evenly.
+    n = len(deques)
+    for i in range(index + 1, index + n):
+        try:
+            return deques[i % n].pop()
+        except IndexError:
+            pass
+    return None
+
+
+def _wake_idle_workers(work_queue, idle, count):
+    for _ in range(min(count, idle.count(True))):
+        work_queue.put(_STEAL)
+
+
+def _work_stealing_worker(executor_reference, work_queue, deques, idle, index,
+                          worker_local, initializer, initargs):
+    if not _initialize_worker(executor_reference, initializer, initargs):
+        return
+    # New work items are appended to the right end of a local deque.  Its
+    # owner pops from the left end while thieves pop from the right end.
+    local_deque = deques[index]
+    worker_local.deque = local_deque
+    try:
+        while True:
+            try:
+                work_item = local_deque.popleft()
+            except IndexError:
+                work_item = _steal(deques, index)
+                if work_item is None:
+                    # Advertise that we are about to block before looking for
+                    # work one last time.  A worker pushing onto its local
+                    # deque checks the idle flags after the push, so either it
+                    # sees our flag and wakes us up or we see its work item.
+                    idle[index] = True
+                    work_item = _steal(deques, index)
+                    if work_item is None:
+                        work_item = work_queue.get(block=True)
+                    idle[index] = False
+
+            if work_item is None:
+                executor = executor_reference()
+                # Exit if:
+                #   - The interpreter is shutting down OR
+                #   - The executor that owns the worker has been collected OR
+                #   - The executor that owns the worker has been shutdown.
+                if _shutdown or executor is None or executor._shutdown:
+                    if executor is not None:
+                        executor._shutdown = True
+                    # Notice other workers
+                    work_queue.put(None)
+                    return
+                del executor
+            elif work_item is _STEAL:
+                continue
+            elif type(work_item) is list:
+                # A batch of work items from submit_many().  Keep it on the
+                # local deque where idle workers can steal from it.
+                local_deque.extend(work_item)
+                del work_item
+                _wake_idle_workers(work_queue, idle, len(local_deque) - 1)
+            else:
+                work_item.run()
+                # Delete references to object. See issue16284
+                del work_item
+
+                # attempt to increment idle count
+                executor = executor_reference()
+                if executor is not None:
+                    executor._idle_semaphore.release()
+                del executor
+    except BaseException:
+        _base.LOGGER.critical('Exception in worker', exc_info=True)
+
+
 class BrokenThreadPool(_base.BrokenExecutor):
     """
     Raised when a worker thread in a ThreadPoolExecutor failed initializing.
@@ -122,7 +211,7 @@ class ThreadPoolExecutor(_base.Executor):
     _counter = itertools.count().__next__
 
     def __init__(self, max_workers=None, thread_name_prefix='',
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *, work_stealing=False):
         """Initializes a new ThreadPoolExecutor instance.
 
         Args:
@@ -131,6 +220,11 @@ class ThreadPoolExecutor(_base.Executor):
             thread_name_prefix: An optional name prefix to give our threads.
             initializer: A callable used to initialize worker threads.
             initargs: A tuple of arguments to pass to the initializer.
+            work_stealing: If true, each worker thread keeps a local deque
+                of work items.  Calls submitted from a worker thread and
+                batches from submit_many() and map() are queued on a local
+                deque and idle workers steal from busy ones instead of
+                contending on the shared work queue.
         """
         if max_workers is None:
             # ThreadPoolExecutor is often used to:
@@ -158,26 +252,109 @@ class ThreadPoolExecutor(_base.Executor):
                                     ("ThreadPoolExecutor-%d" % self._counter()))
         self._initializer = initializer
         self._initargs = initargs
+        self._work_stealing = work_stealing
+        if work_stealing:
+            # Local deques and idle flags of the workers, indexed by worker
+            self._deques = []
+            self._idle = []
+            self._worker_local = threading.local()
+
+    def _check_can_submit(self):
+        if self._broken:
+            raise BrokenThreadPool(self._broken)
+
+        if self._shutdown:
+            raise RuntimeError('cannot schedule new futures after shutdown')
+        if _shutdown:
+            raise RuntimeError('cannot schedule new futures after '
+                               'interpreter shutdown')
+
+    def _put_work_item(self, work_item):
+        # A list of work items is queued as a single batch
+        if self._work_stealing:
+            local_deque = getattr(self._worker_local, 'deque', None)
+            if local_deque is not None:
+                # Submitted from one of our workers: keep the work local
+                # and let idle workers steal it.
+                if type(work_item) is list:
+                    local_deque.extend(work_item)
+                    count = len(work_item)
+                else:
+                    local_deque.append(work_item)
+                    count = 1
+                _wake_idle_workers(self._work_queue, self._idle, count)
+                return
+        elif type(work_item) is list:
+            for w in work_item:
+                self._work_queue.put(w)
+            return
+        self._work_queue.put(work_item)
 
     def submit(self, fn, /, *args, **kwargs):
         with self._shutdown_lock, _global_shutdown_lock:
-            if self._broken:
-                raise BrokenThreadPool(self._broken)
-
-            if self._shutdown:
-                raise RuntimeError('cannot schedule new futures after shutdown')
-            if _shutdown:
-                raise RuntimeError('cannot schedule new futures after '
-                                   'interpreter shutdown')
+            self._check_can_submit()
 
             f = _base.Future()
             w = _WorkItem(f, fn, args, kwargs)
 
-            self._work_queue.put(w)
+            self._put_work_item(w)
             self._adjust_thread_count()
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
+    def submit_many(self, fn, iterable):
+        # Build the work items before taking the locks: iterating could run
+        # arbitrary code.
+        kwargs = {}
+        work_items = [_WorkItem(_base.Future(), fn, args, kwargs)
+                      for args in iterable]
+        if not work_items:
+            return []
+        with self._shutdown_lock, _global_shutdown_lock:
+            self._check_can_submit()
+
+            self._put_work_item(work_items if len(work_items) > 1
+                                else work_items[0])
+            for _ in range(min(len(work_items), self._max_workers)):
+                self._adjust_thread_count()
+            return [w.future for w in work_items]
+    submit_many.__doc__ = _base.Executor.submit_many.__doc__
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
+        """Returns an iterator equivalent to map(fn, iter).
+
+        Args:
+            fn: A callable that will take as many arguments as there are
+                passed iterables.
+            timeout: The maximum number of seconds to wait. If None, then there
+                is no limit on the wait time.
+            chunksize: If greater than one, the iterables will be chopped into
+                chunks of size chunksize and each chunk will be executed as a
+                single call by a worker thread, which saves creating a Future
+                per item.
+            buffersize: If not None, the maximum number of calls (or chunks
+                of calls) submitted whose results have not been retrieved
+                yet; the iterables are then consumed lazily.
+
+        Returns:
+            An iterator equivalent to: map(func, *iterables) but the calls may
+            be evaluated out-of-order.
+
+        Raises:
+            TimeoutError: If the entire result iterator could not be generated
+                before the given timeout.
+            Exception: If fn(*args) raises for any values.
+        """
+        if chunksize <= 1:
+            return super().map(fn, *iterables, timeout=timeout,
+                               buffersize=buffersize)
+
+        results = super().map(partial(_base._process_chunk, fn),
+                              _base._get_chunks(*iterables,
+                                                chunksize=chunksize),
+                              timeout=timeout, buffersize=buffersize)
+        return _base._chain_from_iterable_of_lists(results)
+
     def _adjust_thread_count(self):
         # if idle threads are available, don't spin new threads
         if self._idle_semaphore.acquire(timeout=0):
@@ -192,11 +369,25 @@ class ThreadPoolExecutor(_base.Executor):
         if num_threads < self._max_workers:
             thread_name = '%s_%d' % (self._thread_name_prefix or self,
                                      num_threads)
-            t = threading.Thread(name=thread_name, target=_worker,
-                                 args=(weakref.ref(self, weakref_cb),
-                                       self._work_queue,
-                                       self._initializer,
-                                       self._initargs))
+            if self._work_stealing:
+                self._deques.append(collections.deque())
+                self._idle.append(False)
+                target = _work_stealing_worker
+                args = (weakref.ref(self, weakref_cb),
+                        self._work_queue,
+                        self._deques,
+                        self._idle,
+                        num_threads,
+                        self._worker_local,
+                        self._initializer,
+                        self._initargs)
+            else:
+                target = _worker
+                args = (weakref.ref(self, weakref_cb),
+                        self._work_queue,
+                        self._initializer,
+                        self._initargs)
+            t = threading.Thread(name=thread_name, target=target, args=args)
             t.daemon = True
             t.start()
             self._threads.add(t)
@@ -207,13 +398,25 @@ class ThreadPoolExecutor(_base.Executor):
             self._broken = ('A thread initializer failed, the thread pool '
                             'is not usable anymore')
             # Drain work queue and mark pending futures failed
+            work_items = []
             while True:
                 try:
                     work_item = self._work_queue.get_nowait()
                 except queue.Empty:
                     break
-                if work_item is not None:
-                    work_item.future.set_exception(BrokenThreadPool(self._broken))
+                if type(work_item) is list:
+                    work_items.extend(work_item)
+                elif work_item is not None and work_item is not _STEAL:
+                    work_items.append(work_item)
+            if self._work_stealing:
+                for local_deque in self._deques:
+                    while True:
+                        try:
+                            work_items.append(local_deque.popleft())
+                        except IndexError:
+                            break
+            for work_item in work_items:
+                work_item.future.set_exception(BrokenThreadPool(self._broken))
 
     def shutdown(self, wait=True):
         with self._shutdown_lock:
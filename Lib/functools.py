@@ -10,14 +10,17 @@
 # See C source code for _functools credits/copyright
 
 __all__ = ['update_wrapper', 'wraps', 'WRAPPER_ASSIGNMENTS', 'WRAPPER_UPDATES',
-           'total_ordering', 'cmp_to_key', 'lru_cache', 'reduce', 'partial',
-           'partialmethod', 'singledispatch', 'singledispatchmethod']
+           'total_ordering', 'cmp_to_key', 'lru_cache', 'ttl_cache', 'reduce',
+           'partial', 'partialmethod', 'singledispatch',
+           'singledispatchmethod']
 
 from abc import get_cache_token
-from collections import namedtuple
+from collections import namedtuple, deque, OrderedDict
 # import types, weakref  # Deferred to single_dispatch()
+# import inspect  # Deferred to ttl_cache()
 from reprlib import recursive_repr
 from _thread import RLock
+from time import monotonic as _monotonic
 
 
 ################################################################################
@@ -632,6 +635,180 @@ except ImportError:
     pass
 
 
+################################################################################
+### ttl_cache() - size, weight and time bounded cache decorator
+################################################################################
+
+_TTLCacheInfo = namedtuple("TTLCacheInfo",
+                           ["hits", "misses", "evictions", "expirations",
+                            "maxsize", "currsize", "maxweight", "currweight"])
+
+def ttl_cache(maxsize=128, ttl=None, *, typed=False, maxweight=None,
+              sizeof=None, timer=_monotonic):
+    """Least-recently-used cache decorator with expiry and weighted entries.
+
+    Results are cached for at most *ttl* seconds, as measured by *timer*.
+    If *ttl* is None, they never expire.
+
+    If *maxsize* is set to None, the number of entries is not bounded.
+
+    Each entry weighs sizeof(result), or 1 if *sizeof* is None.  If
+    *maxweight* is not None, least recently used entries are evicted to keep
+    the total weight under *maxweight*, and results heavier than *maxweight*
+    are not cached.
+
+    If *typed* is True, arguments of different types will be cached separately.
+
+    If the decorated function is a coroutine function, the result of awaiting
+    it is cached, rather than the coroutine object.
+
+    Arguments to the cached function must be hashable.
+
+    View the cache statistics named tuple (hits, misses, evictions,
+    expirations, maxsize, currsize, maxweight, currweight) with
+    f.cache_info().  Clear the cache and statistics with f.cache_clear().
+    Access the underlying function with f.__wrapped__.
+
+    """
+    if isinstance(maxsize, int):
+        # Negative maxsize is treated as 0
+        if maxsize < 0:
+            maxsize = 0
+    elif callable(maxsize) and ttl is None:
+        # The user_function was passed in directly via the maxsize argument
+        user_function, maxsize = maxsize, 128
+        wrapper = _ttl_cache_wrapper(user_function, maxsize, ttl, typed,
+                                     maxweight, sizeof, timer)
+        return update_wrapper(wrapper, user_function)
+    elif maxsize is not None:
+        raise TypeError(
+            'Expected first argument to be an integer, a callable, or None')
+    if ttl is not None and ttl <= 0:
+        raise ValueError('ttl must be None or greater than 0')
+    if maxweight is not None and maxweight < 0:
+        raise ValueError('maxweight must be None or non-negative')
+
+    def decorating_function(user_function):
+        wrapper = _ttl_cache_wrapper(user_function, maxsize, ttl, typed,
+                                     maxweight, sizeof, timer)
+        return update_wrapper(wrapper, user_function)
+
+    return decorating_function
+
+def _ttl_cache_wrapper(user_function, maxsize, ttl, typed, maxweight, sizeof,
+                       timer):
+    import inspect
+
+    sentinel = object()          # unique object used to signal cache misses
+    make_key = _make_key         # build a key from the function arguments
+    RESULT, EXPIRES, WEIGHT = 0, 1, 2   # names for the entry fields
+
+    cache = OrderedDict()        # entries ordered from least recently used
+    expiries = deque()           # (expires, key) pairs in order of expiry
+    hits = misses = evictions = expirations = 0
+    weight = 0
+    lock = RLock()               # because OrderedDict updates aren't atomic
+
+    def remove(key):
+        # Called with the lock held
+        nonlocal weight
+        entry = cache.pop(key)
+        weight -= entry[WEIGHT]
+
+    def lookup(key):
+        nonlocal hits, misses, expirations
+        with lock:
+            entry = cache.get(key)
+            if entry is not None:
+                if ttl is None or timer() < entry[EXPIRES]:
+                    cache.move_to_end(key)
+                    hits += 1
+                    return entry[RESULT]
+                remove(key)
+                expirations += 1
+            misses += 1
+            return sentinel
+
+    def store(key, result):
+        nonlocal weight, evictions, expirations
+        entry_weight = 1 if sizeof is None else sizeof(result)
+        with lock:
+            if ttl is not None:
+                # Since the ttl is fixed, entries expire in insertion order;
+                # drop those which expired without being looked up again.
+                now = timer()
+                while expiries and expiries[0][0] <= now:
+                    expires, oldkey = expiries.popleft()
+                    entry = cache.get(oldkey)
+                    if entry is not None and entry[EXPIRES] == expires:
+                        remove(oldkey)
+                        expirations += 1
+                expires = now + ttl
+            else:
+                expires = None
+            if key in cache:
+                # Getting here means that this same key was added to the
+                # cache while the lock was released.
+                return
+            if maxsize == 0 or (maxweight is not None
+                                and entry_weight > maxweight):
+                return
+            cache[key] = [result, expires, entry_weight]
+            weight += entry_weight
+            if expires is not None:
+                expiries.append((expires, key))
+            while ((maxsize is not None and len(cache) > maxsize)
+                   or (maxweight is not None and weight > maxweight)):
+                oldkey = next(iter(cache))
+                remove(oldkey)
+                evictions += 1
+            if len(expiries) > 2 * len(cache):
+                # Drop the pairs of the entries evicted or expired on lookup,
+                # to keep expiries within twice the size of the cache.
+                live = [(e, k) for e, k in expiries
+                        if k in cache and cache[k][EXPIRES] == e]
+                expiries.clear()
+                expiries.extend(live)
+
+    if inspect.iscoroutinefunction(user_function):
+
+        async def wrapper(*args, **kwds):
+            key = make_key(args, kwds, typed)
+            result = lookup(key)
+            if result is sentinel:
+                result = await user_function(*args, **kwds)
+                store(key, result)
+            return result
+
+    else:
+
+        def wrapper(*args, **kwds):
+            key = make_key(args, kwds, typed)
+            result = lookup(key)
+            if result is sentinel:
+                result = user_function(*args, **kwds)
+                store(key, result)
+            return result
+
+    def cache_info():
+        """Report cache statistics"""
+        with lock:
+            return _TTLCacheInfo(hits, misses, evictions, expirations,
+                                 maxsize, len(cache), maxweight, weight)
+
+    def cache_clear():
+        """Clear the cache and cache statistics"""
+        nonlocal hits, misses, evictions, expirations, weight
+        with lock:
+            cache.clear()
+            expiries.clear()
+            hits = misses = evictions = expirations = weight = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
 ################################################################################
 ### singledispatch() - single-dispatch generic function decorator
 ################################################################################
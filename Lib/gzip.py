@@ -7,6 +7,8 @@ but random access is not allowed."""
 
 import struct, sys, time, os
 import zlib
+import bisect
+import marshal
 import builtins
 import io
 import _compression
@@ -17,6 +19,9 @@ FTEXT, FHCRC, FEXTRA, FNAME, FCOMMENT = 1, 2, 4, 8, 16
 
 READ, WRITE = 1, 2
 
+_WINDOW_SIZE = 32768    # Size of the history of deflate
+_INDEX_MAGIC = "gzip index 1"
+
 _COMPRESS_LEVEL_FAST = 1
 _COMPRESS_LEVEL_TRADEOFF = 6
 _COMPRESS_LEVEL_BEST = 9
@@ -109,6 +114,11 @@ class _PaddedFile:
         self._buffer = None
         return self.file.seek(off)
 
+    def tell(self):
+        if self._read is None:
+            return self.file.tell()
+        return self.file.tell() - self._length + self._read
+
     def seekable(self):
         return True  # Allows fast-forwarding even in unseekable streams
 
@@ -131,7 +141,8 @@ class GzipFile(_compression.BaseStream):
     myfileobj = None
 
     def __init__(self, filename=None, mode=None,
-                 compresslevel=_COMPRESS_LEVEL_BEST, fileobj=None, mtime=None):
+                 compresslevel=_COMPRESS_LEVEL_BEST, fileobj=None, mtime=None,
+                 *, max_workers=None):
         """Constructor for the GzipFile class.
 
         At least one of fileobj and filename must be given a
@@ -163,12 +174,19 @@ class GzipFile(_compression.BaseStream):
         to the last modification time field in the stream when compressing.
         If omitted or None, the current time is used.
 
+        When reading, the max_workers argument is the number of threads
+        decompressing the file in parallel, between the access points of the
+        index or the members of a BGZF file.  If omitted or None, the file is
+        decompressed in the calling thread.
+
         """
 
         if mode and ('t' in mode or 'U' in mode):
             raise ValueError("Invalid mode: {!r}".format(mode))
         if mode and 'b' not in mode:
             mode += 'b'
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
         if fileobj is None:
             fileobj = self.myfileobj = builtins.open(filename, mode or 'rb')
         if filename is None:
@@ -182,7 +200,10 @@ class GzipFile(_compression.BaseStream):
 
         if mode.startswith('r'):
             self.mode = READ
-            raw = _GzipReader(fileobj)
+            fd = None
+            if self.myfileobj is not None and hasattr(os, 'pread'):
+                fd = fileobj.fileno()
+            raw = _GzipReader(fileobj, max_workers, fd)
             self._buffer = io.BufferedReader(raw)
             self.name = filename
 
@@ -383,14 +404,271 @@ class GzipFile(_compression.BaseStream):
         self._check_not_closed()
         return self._buffer.readline(size)
 
+    def build_index(self, spacing=1 << 20):
+        """Decompress the whole file, recording an access point to the
+        compressed stream every spacing bytes of uncompressed data.
+
+        seek() then resumes decompression from the closest access point
+        before the new position, instead of from the start of the file.
+        The current position is kept.
+        """
+        self._check_not_closed()
+        if self.mode != READ:
+            raise OSError("Can't build an index in write mode")
+        pos = self._buffer.tell()
+        self._buffer.seek(0)
+        self._buffer.raw._set_access_points([], spacing)
+        self._buffer.seek(0, io.SEEK_END)
+        self._buffer.raw._parallel = None   # Decompress from the new index
+        self._buffer.seek(pos)
+
+    def export_index(self):
+        """Return the index built by build_index() or given to
+        import_index(), as a bytes object."""
+        self._check_not_closed()
+        raw = self._buffer.raw
+        if self.mode != READ or raw._points is None:
+            raise ValueError("No index to export")
+        # Compress the windows of the access points
+        points = [(offset, position, bits, window and zlib.compress(window))
+                  for offset, position, bits, window in raw._points]
+        return marshal.dumps((_INDEX_MAGIC, raw._signature(), raw._spacing,
+                              points))
+
+    def import_index(self, data):
+        """Use the index returned by export_index() for the same file.
+
+        Access points are still recorded after the last one of the index,
+        when reading past it.  Raise ValueError if data is not a valid
+        index of the file.
+        """
+        self._check_not_closed()
+        if self.mode != READ:
+            raise OSError("Can't import an index in write mode")
+        raw = self._buffer.raw
+        try:
+            magic, signature, spacing, points = marshal.loads(data)
+            if magic != _INDEX_MAGIC:
+                raise ValueError
+            points = [(offset, position, bits,
+                       window and zlib.decompress(window))
+                      for offset, position, bits, window in points]
+        except (EOFError, ValueError, TypeError, zlib.error):
+            raise ValueError("Invalid gzip index") from None
+        if signature != raw._signature():
+            raise ValueError("The index does not match the file")
+        raw._set_access_points(points, spacing)
+
+
+def _bgzf_block_size(extra):
+    """Return the size of the member minus 1 recorded in the extra field of
+    a BGZF member, or None."""
+    i = 0
+    while i + 4 <= len(extra):
+        length, = struct.unpack_from("<H", extra, i + 2)
+        if extra[i:i + 2] == b"BC" and length == 2 and i + 6 <= len(extra):
+            return struct.unpack_from("<H", extra, i + 4)[0]
+        i += 4 + length
+    return None
+
+def _decompress_range(read_at, start, end, size):
+    """Decompress size bytes of data from the access point start, with the
+    compressed data ending at position end."""
+    offset, position, bits, window = start
+    if window is None:
+        # Start of a member: zlib checks the CRC if the member ends there
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif window:
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=window)
+    else:
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    if bits:
+        data = read_at(position - 1, end - position + 1)
+        decompressor._prime(bits, data[0] >> (8 - bits))
+        data = decompressor.decompress(memoryview(data)[1:])
+    else:
+        data = decompressor.decompress(read_at(position, end - position))
+    if len(data) < size:
+        raise EOFError("Compressed file ended before the "
+                       "end-of-stream marker was reached")
+    return data[:size]
+
 
 class _GzipReader(_compression.DecompressReader):
-    def __init__(self, fp):
+    def __init__(self, fp, max_workers=None, fd=None):
         super().__init__(_PaddedFile(fp), zlib.decompressobj,
                          wbits=-zlib.MAX_WBITS)
         # Set flag indicating start of a new member
         self._new_member = True
         self._last_mtime = None
+        self._points = None     # Access points for random access
+        self._max_workers = max_workers
+        self._fd = fd           # File descriptor to read with os.pread()
+        self._parallel = None   # Decided on the first read
+        self._executor = None
+        self._pending = None    # Ranges being decompressed by the threads
+        self._chunk = None      # Last range decompressed by the threads
+        self._chunk_offset = 0
+
+    def _set_access_points(self, points, spacing):
+        if not hasattr(self._decompressor, "_decompress_block"):
+            raise OSError("Access points are not supported by zlib %s" %
+                          zlib.ZLIB_RUNTIME_VERSION)
+        self._stop_parallel()
+        pos = self._pos
+        self._points = points
+        self._offsets = [point[0] for point in points]
+        self._spacing = spacing
+        self._parallel = None
+        # Decompress again up to the current position, to record the
+        # windows of the new access points
+        self._rewind()
+        self.seek(pos)
+
+    def _signature(self):
+        """Return the size and the trailer of the compressed file, which
+        identify it in an index."""
+        self._stop_parallel()
+        file = self._fp.file
+        pos = file.tell()
+        size = file.seek(0, io.SEEK_END)
+        file.seek(max(size - 8, 0))
+        signature = (size, file.read(8))
+        file.seek(pos)
+        return signature
+
+    def _add_point(self, offset, position, bits):
+        """Record an access point at the end of a deflate block, or at the
+        start of a member if bits is None."""
+        offsets = self._offsets
+        if offsets and offset <= offsets[-1]:
+            if (bits is None and offset == offsets[-1] and
+                    self._points[-1][3] is not None):
+                # The previous member ended with a block ending at the same
+                # offset: a raw inflate from there would not stop at the
+                # member end, so start from the new member header instead.
+                self._points[-1] = (offset, position, bits, None)
+            return      # Already recorded
+        if bits is None:
+            window = None
+        elif offsets and offset - offsets[-1] < self._spacing:
+            return
+        else:
+            window = b"".join(self._recent)[-_WINDOW_SIZE:]
+        self._points.append((offset, position, bits, window))
+        offsets.append(offset)
+
+    def _add_recent(self, data):
+        """Keep the last 32 KiB of uncompressed data of the member."""
+        if not data:
+            return
+        self._recent.append(data)
+        self._recent_size += len(data)
+        while self._recent_size - len(self._recent[0]) >= _WINDOW_SIZE:
+            self._recent_size -= len(self._recent.pop(0))
+
+    def _start_parallel(self):
+        """Decide whether to decompress with threads, which requires access
+        points from an index or from the headers of a BGZF file."""
+        if (self._max_workers is not None and self._points is None and
+                self._pos == 0 and
+                hasattr(self._decompressor, "_decompress_block")):
+            points = self._scan_members()
+            if points is not None:
+                self._set_access_points(points, 1 << 20)
+        self._parallel = (self._max_workers is not None and
+                          self._points is not None and
+                          len(self._points) > 1 and self._offsets[0] == 0)
+        if self._parallel and self._executor is None:
+            import collections
+            import threading
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(self._max_workers)
+            self._lock = threading.Lock()
+            self._pending = collections.deque()
+
+    def _stop_parallel(self):
+        """Cancel the pending decompressions, and wait for the running ones.
+        """
+        while self._pending:
+            i, future = self._pending.popleft()
+            if not future.cancel():
+                future.exception()
+        self._chunk = None
+
+    def _scan_members(self):
+        """Return an access point at the start of every member, if all the
+        members record their size like in BGZF files, else None."""
+        try:
+            self._fp.seek(0)
+        except (AttributeError, OSError):
+            return None     # Not seekable
+        points = []
+        offset = position = 0
+        try:
+            while self._read_gzip_header():
+                if self._block_size is None:
+                    return None
+                if not points or offset > points[-1][0]:
+                    points.append((offset, position, None, None))
+                position += self._block_size + 1
+                self._fp.seek(position - 4)
+                isize, = struct.unpack("<I", self._read_exact(4))
+                offset += isize
+        except (EOFError, BadGzipFile):
+            return None
+        finally:
+            self._fp.seek(0)
+        return points
+
+    def _read_at(self, position, size):
+        """Read the compressed file from a thread."""
+        if self._fd is not None:
+            return os.pread(self._fd, size, position)
+        with self._lock:
+            file = self._fp.file
+            file.seek(position)
+            return file.read(size)
+
+    def _read_parallel(self, size):
+        """Read the data decompressed by the threads, which decompress the
+        ranges between the access points ahead of the current position."""
+        chunk = self._chunk
+        if (chunk is None or self._pos < self._chunk_offset or
+                self._pos >= self._chunk_offset + len(chunk)):
+            i = bisect.bisect_right(self._offsets, self._pos) - 1
+            pending = self._pending
+            if pending and pending[0][0] != i:
+                self._stop_parallel()
+            if not pending:
+                self._next_range = i
+            while (len(pending) < 2 * self._max_workers and
+                   self._next_range < len(self._points) - 1):
+                j = self._next_range
+                start, end = self._points[j], self._points[j + 1]
+                future = self._executor.submit(_decompress_range,
+                                               self._read_at, start, end[1],
+                                               end[0] - start[0])
+                pending.append((j, future))
+                self._next_range += 1
+            i, future = pending.popleft()
+            chunk = self._chunk = future.result()
+            self._chunk_offset = self._offsets[i]
+        start = self._pos - self._chunk_offset
+        data = chunk[start:start + size]
+        self._pos += len(data)
+        if self._pos >= self._offsets[-1]:
+            # Continue in this thread from the last access point
+            self._stop_parallel()
+            self._restore(self._points[-1])
+        return data
+
+    def close(self):
+        if self._executor is not None:
+            self._stop_parallel()
+            self._executor.shutdown()
+            self._executor = None
+        return super().close()
 
     def _init_read(self):
         self._crc = zlib.crc32(b"")
@@ -425,10 +703,12 @@ class _GzipReader(_compression.DecompressReader):
         if method != 8:
             raise BadGzipFile('Unknown compression method')
 
+        self._block_size = None
         if flag & FEXTRA:
-            # Read & discard the extra field, if present
+            # Read the extra field, if present, which records the size of
+            # the member in BGZF files
             extra_len, = struct.unpack("<H", self._read_exact(2))
-            self._read_exact(extra_len)
+            self._block_size = _bgzf_block_size(self._read_exact(extra_len))
         if flag & FNAME:
             # Read and discard a null-terminated string containing the filename
             while True:
@@ -451,6 +731,10 @@ class _GzipReader(_compression.DecompressReader):
         # size=0 is special because decompress(max_length=0) is not supported
         if not size:
             return b""
+        if self._parallel is None:
+            self._start_parallel()
+        if self._parallel and self._pos < self._offsets[-1]:
+            return self._read_parallel(size)
 
         # For certain input data, a single
         # call to decompress() may not return
@@ -470,15 +754,27 @@ class _GzipReader(_compression.DecompressReader):
                 # If the _new_member flag is set, we have to
                 # jump to the next member, if there is one.
                 self._init_read()
+                if self._points is not None:
+                    position = self._fp.tell()
                 if not self._read_gzip_header():
                     self._size = self._pos
                     return b""
                 self._new_member = False
+                if self._points is not None:
+                    self._recent = []
+                    self._recent_size = 0
+                    self._add_point(self._pos, position, None)
 
             # Read a chunk of data from the file
             buf = self._fp.read(io.DEFAULT_BUFFER_SIZE)
 
-            uncompress = self._decompressor.decompress(buf, size)
+            if self._points is not None:
+                # Stop at the end of deflate blocks, where the state of the
+                # decompressor can be restored
+                uncompress, bits = self._decompressor._decompress_block(buf,
+                                                                        size)
+            else:
+                uncompress = self._decompressor.decompress(buf, size)
             if self._decompressor.unconsumed_tail != b"":
                 self._fp.prepend(self._decompressor.unconsumed_tail)
             elif self._decompressor.unused_data != b"":
@@ -486,6 +782,11 @@ class _GzipReader(_compression.DecompressReader):
                 # be seen by _read_eof() and _read_gzip_header()
                 self._fp.prepend(self._decompressor.unused_data)
 
+            if self._points is not None:
+                self._add_recent(uncompress)
+                if bits >= 0:
+                    self._add_point(self._pos + len(uncompress),
+                                    self._fp.tell(), bits)
             if uncompress != b"":
                 break
             if buf == b"":
@@ -497,6 +798,8 @@ class _GzipReader(_compression.DecompressReader):
         return uncompress
 
     def _add_read_data(self, data):
+        if self._crc is None:
+            return      # Read from an access point within the member
         self._crc = zlib.crc32(data, self._crc)
         self._stream_size = self._stream_size + len(data)
 
@@ -506,7 +809,9 @@ class _GzipReader(_compression.DecompressReader):
         # uncompressed data matches the stored values.  Note that the size
         # stored is the true file size mod 2**32.
         crc32, isize = struct.unpack("<II", self._read_exact(8))
-        if crc32 != self._crc:
+        if self._crc is None:
+            pass
+        elif crc32 != self._crc:
             raise BadGzipFile("CRC check failed %s != %s" % (hex(crc32),
                                                              hex(self._crc)))
         elif isize != (self._stream_size & 0xffffffff):
@@ -525,6 +830,58 @@ class _GzipReader(_compression.DecompressReader):
         super()._rewind()
         self._new_member = True
 
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset = self._pos + offset
+            whence = io.SEEK_SET
+        elif whence == io.SEEK_END and self._size >= 0:
+            offset = self._size + offset
+            whence = io.SEEK_SET
+        if self._parallel:
+            if whence == io.SEEK_SET and offset < self._offsets[-1]:
+                # The threads decompress from the new position
+                self._pos = max(offset, 0)
+                self._eof = False
+                return self._pos
+            if self._pos < self._offsets[-1]:
+                self._stop_parallel()
+                self._restore(self._points[-1])
+        if self._points and whence == io.SEEK_SET:
+            i = bisect.bisect_right(self._offsets, offset) - 1
+            if i >= 0 and (offset < self._pos or
+                           self._offsets[i] > self._pos):
+                self._restore(self._points[i])
+        return super().seek(offset, whence)
+
+    def _restore(self, point):
+        """Continue decompressing from an access point."""
+        offset, position, bits, window = point
+        self._eof = False
+        self._pos = offset
+        self._recent = []
+        self._recent_size = 0
+        if window is None:
+            self._fp.seek(position)
+            self._new_member = True
+            self._decompressor = self._decomp_factory(**self._decomp_args)
+            return
+        if bits:
+            self._fp.seek(position - 1)
+            value = self._read_exact(1)[0] >> (8 - bits)
+        else:
+            self._fp.seek(position)
+        if window:
+            self._decompressor = self._decomp_factory(zdict=window,
+                                                      **self._decomp_args)
+            self._add_recent(window)
+        else:
+            self._decompressor = self._decomp_factory(**self._decomp_args)
+        if bits:
+            self._decompressor._prime(bits, value)
+        self._new_member = False
+        # The CRC of the member can't be checked
+        self._crc = None
+
 def compress(data, compresslevel=_COMPRESS_LEVEL_BEST, *, mtime=None):
     """Compress data in one shot and return the compressed string.
     Optional argument is the compression level, in range of 0-9.
@@ -96,6 +96,7 @@ import io
 import mimetypes
 import os
 import posixpath
+import re
 import select
 import shutil
 import socket # For gethostbyaddr()
@@ -708,9 +709,17 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
         try:
             fs = os.fstat(f.fileno())
+            etag = '"%x-%x"' % (fs.st_mtime_ns, fs.st_size)
+            last_modified = self.date_time_string(fs.st_mtime)
             # Use browser cache if possible
-            if ("If-Modified-Since" in self.headers
-                    and "If-None-Match" not in self.headers):
+            if "If-None-Match" in self.headers:
+                if _etag_matches(self.headers["If-None-Match"], etag):
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    f.close()
+                    return None
+            elif "If-Modified-Since" in self.headers:
                 # compare If-Modified-Since and time of last file modification
                 try:
                     ims = email.utils.parsedate_to_datetime(
@@ -732,15 +741,44 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
                         if last_modif <= ims:
                             self.send_response(HTTPStatus.NOT_MODIFIED)
+                            self.send_header("ETag", etag)
                             self.end_headers()
                             f.close()
                             return None
 
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-type", ctype)
-            self.send_header("Content-Length", str(fs[6]))
-            self.send_header("Last-Modified",
-                self.date_time_string(fs.st_mtime))
+            size = fs.st_size
+            byte_range = None
+            # A Range header is only honoured for GET requests, and if the
+            # If-Range validator, if any, matches the current file.
+            if ("Range" in self.headers and self.command == "GET" and
+                    self.headers.get("If-Range", etag) in (etag,
+                                                           last_modified)):
+                try:
+                    byte_range = _parse_range(self.headers["Range"], size)
+                except ValueError:
+                    self.send_response(
+                        HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", "bytes */%d" % size)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    f.close()
+                    return None
+
+            if byte_range is None:
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Length", str(size))
+            else:
+                first, last = byte_range
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Range",
+                                 "bytes %d-%d/%d" % (first, last, size))
+                self.send_header("Content-Length", str(last - first + 1))
+                f = _FileRange(f, first, last - first + 1)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
             self.end_headers()
             return f
         except:
@@ -848,7 +886,26 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
         -- note however that this the default server uses this
         to copy binary data as well.
 
+        When copying a regular file to the connection, the data is sent
+        with socket.sendfile(), which uses os.sendfile() where available
+        to avoid copying the file contents through user space.
+
         """
+        if isinstance(source, _FileRange):
+            file, offset, count = source.file, source.offset, source.length
+        else:
+            file, offset, count = source, None, None
+        if outputfile is self.wfile and hasattr(os, 'sendfile'):
+            try:
+                file.fileno()
+            except (AttributeError, OSError):
+                pass
+            else:
+                if offset is None:
+                    offset = file.tell()
+                outputfile.flush()
+                self.connection.sendfile(file, offset, count)
+                return
         shutil.copyfileobj(source, outputfile)
 
     def guess_type(self, path):
@@ -888,6 +945,74 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
 # Utilities for CGIHTTPRequestHandler
 
+class _FileRange:
+    """Part of a file, returned by send_head() for a range request."""
+
+    def __init__(self, file, offset, length):
+        self.file = file
+        self.offset = offset
+        self.length = length
+        self._remaining = length
+        file.seek(offset)
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self.file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _etag_matches(header, etag):
+    """Return True if the If-None-Match header value matches etag.
+
+    The weak comparison is used, so a W/ prefix is ignored.
+    """
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _parse_range(header, size):
+    """Parse the Range header of a request for a file of size bytes.
+
+    Return the (first, last) byte positions of the range, or None if the
+    header must be ignored: it is invalid or has several ranges, which
+    are not supported.  Raise ValueError if the range is not satisfiable.
+    """
+    match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", header,
+                         re.ASCII)
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first:
+        first = int(first)
+        if not last:
+            last = size - 1
+        elif int(last) < first:
+            return None
+        else:
+            last = int(last)
+    elif last:
+        # Suffix range: the last N bytes
+        first = max(size - int(last), 0)
+        last = size - 1
+    else:
+        return None
+    if first >= size:
+        raise ValueError("range not satisfiable")
+    return first, min(last, size - 1)
+
+
 def _url_collapse_path(path):
     """
     Given a URL path, remove extra '/'s and '.' path elements and collapse
@@ -1244,7 +1369,10 @@ def test(HandlerClass=BaseHTTPRequestHandler,
     """
     ServerClass.address_family, addr = _get_best_family(bind, port)
 
-    HandlerClass.protocol_version = protocol
+    if isinstance(HandlerClass, partial):
+        HandlerClass.func.protocol_version = protocol
+    else:
+        HandlerClass.protocol_version = protocol
     with ServerClass(addr, HandlerClass) as httpd:
         host, port = httpd.socket.getsockname()[:2]
         url_host = f'[{host}]' if ':' in host else host
@@ -1274,10 +1402,16 @@ if __name__ == '__main__':
                         default=8000, type=int,
                         nargs='?',
                         help='Specify alternate port [default: 8000]')
+    parser.add_argument('--protocol', '-p', metavar='VERSION',
+                        default='HTTP/1.0',
+                        help='Specify the HTTP version to conform to, '
+                             'HTTP/1.1 keeps connections alive '
+                             '[default: HTTP/1.0]')
     args = parser.parse_args()
     if args.cgi:
         handler_class = CGIHTTPRequestHandler
     else:
         handler_class = partial(SimpleHTTPRequestHandler,
                                 directory=args.directory)
-    test(HandlerClass=handler_class, port=args.port, bind=args.bind)
+    test(HandlerClass=handler_class, port=args.port, bind=args.bind,
+         protocol=args.protocol)
@@ -953,7 +953,7 @@ def _sanity_check(name, package, level):
 _ERR_MSG_PREFIX = 'No module named '
 _ERR_MSG = _ERR_MSG_PREFIX + '{!r}'
 
-def _find_and_load_unlocked(name, import_):
+def _find_and_load_unlocked(name, import_, lazy=False):
     path = None
     parent = name.rpartition('.')[0]
     if parent:
@@ -968,9 +968,14 @@ def _find_and_load_unlocked(name, import_):
         except AttributeError:
             msg = (_ERR_MSG + '; {!r} is not a package').format(name, parent)
             raise ModuleNotFoundError(msg, name=name) from None
+        # Executing a deferred parent package may have imported the module.
+        if name in sys.modules:
+            return sys.modules[name]
     spec = _find_spec(name, path)
     if spec is None:
         raise ModuleNotFoundError(_ERR_MSG.format(name), name=name)
+    elif lazy and _can_defer(spec):
+        module = _defer_unlocked(spec)
     else:
         module = _load_unlocked(spec)
     if parent:
@@ -983,12 +988,16 @@ def _find_and_load_unlocked(name, import_):
 _NEEDS_LOADING = object()
 
 
-def _find_and_load(name, import_):
-    """Find and load the module."""
+def _find_and_load(name, import_, lazy=False):
+    """Find and load the module.
+
+    If lazy is true and the module is not imported yet, its execution may be
+    deferred.
+    """
     with _ModuleLockManager(name):
         module = sys.modules.get(name, _NEEDS_LOADING)
         if module is _NEEDS_LOADING:
-            return _find_and_load_unlocked(name, import_)
+            return _find_and_load_unlocked(name, import_, lazy)
 
     if module is None:
         message = ('import of {} halted; '
@@ -1115,6 +1124,109 @@ def __import__(name, globals=None, locals=None, fromlist=(), level=0):
         return module
 
 
+# Lazy imports ################################################################
+
+# Modules which may be deferred by lazy imports: None for all modules, or the
+# names of the modules and packages.
+_lazy_imports_allow = None
+# Modules and packages which are never deferred by lazy imports.
+_lazy_imports_deny = frozenset()
+
+# The class of the deferred modules, a subclass of the module type created by
+# _setup().
+_LazyModule = None
+
+
+def _may_defer(name):
+    """Return whether a lazy import may defer the module name."""
+    allowed = _lazy_imports_allow is None
+    while name:
+        if name in _lazy_imports_deny:
+            return False
+        if not allowed and name in _lazy_imports_allow:
+            allowed = True
+        name = name.rpartition('.')[0]
+    return allowed
+
+
+def _can_defer(spec):
+    """Return whether the execution of the module of spec can be deferred.
+
+    This is only the case for modules executing code, whose loader creates
+    nothing before their execution.
+    """
+    return isinstance(spec.loader, (_bootstrap_external.SourceLoader,
+                                    _bootstrap_external.SourcelessFileLoader,
+                                    _bootstrap_external.BytecodeBundleFinder))
+
+
+def _defer_unlocked(spec):
+    """Create the module of spec and add it to sys.modules, deferring its
+    execution to the first attribute access."""
+    module = module_from_spec(spec)
+    module.__class__ = _LazyModule
+    sys.modules[spec.name] = module
+    _verbose_message('import {!r} # deferred', spec.name)
+    return module
+
+
+def _load_deferred(module):
+    """Execute a deferred module, unless it is already executed or executing
+    in this thread."""
+    module_type = type(sys)
+    spec = module_type.__getattribute__(module, '__spec__')
+    with _ModuleLockManager(spec.name):
+        if (type(module) is not _LazyModule
+                or getattr(spec, '_initializing', False)):
+            return
+        spec._initializing = True
+        try:
+            spec.loader.exec_module(module)
+        except:
+            # The module stays deferred: the names bound to it execute it
+            # again on their next access, raising the error again.
+            if sys.modules.get(spec.name) is module:
+                del sys.modules[spec.name]
+            raise
+        finally:
+            spec._initializing = False
+        module_type.__setattr__(module, '__class__', module_type)
+        _verbose_message('import {!r} # {!r}', spec.name, spec.loader)
+
+
+def _lazy_gcd_import(name, package=None, level=0):
+    """Import the module like _gcd_import(), but defer its execution if it is
+    not imported yet."""
+    _sanity_check(name, package, level)
+    if level > 0:
+        name = _resolve_name(name, package, level)
+    return _find_and_load(name, _gcd_import, _may_defer(name))
+
+
+def _lazy_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """Import a module for an import statement when lazy imports are enabled.
+
+    The module, or the submodules in fromlist, are deferred if they are not
+    imported yet: they are executed on first attribute access.  The parent
+    packages, and the module itself if other names are in fromlist, are
+    imported as usual.
+
+    """
+    if fromlist:
+        if level > 0:
+            package = _calc___package__(globals if globals is not None else {})
+            module = _gcd_import(name, package, level)
+        else:
+            module = _gcd_import(name)
+        if hasattr(module, '__path__'):
+            return _handle_fromlist(module, fromlist, _lazy_gcd_import)
+        return module
+    elif level == 0:
+        _lazy_gcd_import(name)
+        return _gcd_import(name.partition('.')[0])
+    return __import__(name, globals, locals, fromlist, level)
+
+
 def _builtin_from_name(name):
     spec = BuiltinImporter.find_spec(name)
     if spec is None:
@@ -1130,7 +1242,7 @@ def _setup(sys_module, _imp_module):
     modules, those two modules must be explicitly passed in.
 
     """
-    global _imp, sys
+    global _imp, sys, _LazyModule
     _imp = _imp_module
     sys = sys_module
 
@@ -1147,6 +1259,23 @@ def _setup(sys_module, _imp_module):
             spec = _spec_from_module(module, loader)
             _init_module_attrs(spec, module)
 
+    class _LazyModule(module_type):
+
+        """A module deferred by a lazy import, executed on first attribute
+        access."""
+
+        def __getattribute__(self, attr):
+            _load_deferred(self)
+            return module_type.__getattribute__(self, attr)
+
+        def __setattr__(self, attr, value):
+            _load_deferred(self)
+            module_type.__setattr__(self, attr, value)
+
+        def __delattr__(self, attr):
+            _load_deferred(self)
+            module_type.__delattr__(self, attr)
+
     # Directly load built-in modules needed during bootstrap.
     self_module = sys.modules[__name__]
     for builtin_name in ('_thread', '_warnings', '_weakref'):
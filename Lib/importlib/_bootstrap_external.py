@@ -84,6 +84,10 @@ def _path_stat(path):
     (e.g. cache stat results).
 
     """
+    if _import_index is not None:
+        stat_info = _index_stat(path)
+        if stat_info is not None:
+            return stat_info
     return _os.stat(path)
 
 
@@ -142,6 +146,108 @@ def _write_atomic(path, data, mode=0o666):
 _code_type = type(_write_atomic.__code__)
 
 
+# Import index ###############################################################
+
+# The import index records the directories of sys.path entries and of their
+# packages, to find and validate modules without listing the directories or
+# calling stat() on the modules.  It maps the path of each directory to the
+# marshalled tuple (stat result, names in the directory, {module file name:
+# stat result}), where a stat result is (st_mode, st_mtime, st_size), and the
+# tuple once it is checked.  See importlib.util.write_import_index().
+_import_index = None
+
+
+class _IndexStat:
+
+    """The stat result of a path recorded in the import index."""
+
+    __slots__ = ('st_mode', 'st_mtime', 'st_size')
+
+    def __init__(self, st_mode, st_mtime, st_size):
+        self.st_mode = st_mode
+        self.st_mtime = st_mtime
+        self.st_size = st_size
+
+
+def _indexed_directory(path):
+    """Return the entry of the directory at path in the import index, or None
+    if the directory is not indexed or was modified since.
+
+    The modification time of a directory is checked the first time its entry
+    is used.
+    """
+    entry = _import_index.get(path)
+    if type(entry) is bytes:
+        entry = marshal.loads(entry)
+        try:
+            mtime = _os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != entry[0][1]:
+            _bootstrap._verbose_message('import index: {} was modified', path)
+            del _import_index[path]
+            return None
+        _import_index[path] = entry
+    return entry
+
+
+def _index_stat(path):
+    """Return the stat result of path recorded in the import index, or None
+    if it is not recorded.
+
+    Raise FileNotFoundError if path is missing from an indexed directory.
+    """
+    entry = _indexed_directory(path)
+    if entry is not None:
+        return _IndexStat(*entry[0])
+    parent, name = _path_split(path)
+    entry = _indexed_directory(parent)
+    if entry is None:
+        return None
+    if name not in entry[1]:
+        raise FileNotFoundError(2, 'No such file or directory', path)
+    stat_info = entry[2].get(name)
+    if stat_info is None:
+        return None
+    return _IndexStat(*stat_info)
+
+
+def _startup_file(xoption, env_key):
+    """Return the path of the file given by the -X option xoption or by the
+    environment variable env_key, or None."""
+    path = sys._xoptions.get(xoption)
+    if path is None and not sys.flags.ignore_environment:
+        if sys.platform.startswith('win'):
+            path = _os.environ.get(env_key)
+        else:
+            path = _os.environ.get(env_key.encode())
+    if not path or path is True:
+        return None
+    return path
+
+
+def _load_import_index():
+    """Load the import index file given by -X importindex or the
+    PYTHONIMPORTINDEX environment variable, if any."""
+    global _import_index
+    path = _startup_file('importindex', 'PYTHONIMPORTINDEX')
+    if path is None:
+        return
+    try:
+        with _io.FileIO(path, 'r') as file:
+            data = file.read()
+        magic, index = marshal.loads(data)
+        if magic != MAGIC_NUMBER:
+            raise ValueError('bad magic number')
+        if type(index) is not dict:
+            raise TypeError('bad index')
+    except (OSError, EOFError, ValueError, TypeError) as exc:
+        _bootstrap._verbose_message('import index {!r} not loaded: {}',
+                                    path, exc)
+        return
+    _import_index = index
+
+
 # Finder/loader utility code ###############################################
 
 # Magic word to reject .pyc files generated by other Python versions.
@@ -1244,6 +1350,8 @@ class PathFinder:
     def invalidate_caches(cls):
         """Call the invalidate_caches() method on all path entry finders
         stored in sys.path_importer_caches (where implemented)."""
+        global _import_index
+        _import_index = None
         for name, finder in list(sys.path_importer_cache.items()):
             if finder is None:
                 del sys.path_importer_cache[name]
@@ -1528,12 +1636,18 @@ class FileFinder:
     def _fill_cache(self):
         """Fill the cache of potential modules and packages for this directory."""
         path = self.path
-        try:
-            contents = _os.listdir(path or _os.getcwd())
-        except (FileNotFoundError, PermissionError, NotADirectoryError):
-            # Directory has either been removed, turned into a file, or made
-            # unreadable.
-            contents = []
+        contents = None
+        if _import_index is not None:
+            entry = _indexed_directory(path)
+            if entry is not None:
+                contents = entry[1]
+        if contents is None:
+            try:
+                contents = _os.listdir(path or _os.getcwd())
+            except (FileNotFoundError, PermissionError, NotADirectoryError):
+                # Directory has either been removed, turned into a file, or
+                # made unreadable.
+                contents = []
         # We store two cached versions, to handle runtime changes of the
         # PYTHONCASEOK environment variable.
         if not sys.platform.startswith('win'):
@@ -1578,6 +1692,112 @@ class FileFinder:
         return 'FileFinder({!r})'.format(self.path)
 
 
+# The header of a bytecode bundle is _BUNDLE_MAGIC, MAGIC_NUMBER, and the
+# offset and size of the index, which is the marshalled dict {module name:
+# (offset of the marshalled code, size, path of the source, is package)}.
+_BUNDLE_MAGIC = b'PYB\x00'
+
+
+class BytecodeBundleFinder(_LoaderBasics):
+
+    """Meta path finder and loader for the modules of a bytecode bundle.
+
+    A bytecode bundle is a single file holding the code objects of modules,
+    written by compileall.compile_bundle().  The code objects are not checked
+    against their source files.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = _io.FileIO(path, 'r')
+        try:
+            if not hasattr(_os, 'pread'):
+                self._lock = _thread.allocate_lock()
+            header = self._read(0, 16)
+            if (len(header) != 16 or header[:4] != _BUNDLE_MAGIC
+                    or header[4:8] != MAGIC_NUMBER):
+                raise ImportError('bad bytecode bundle {!r}'.format(path),
+                                  path=path)
+            data = self._read(_unpack_uint32(header[8:12]),
+                              _unpack_uint32(header[12:16]))
+            try:
+                self._index = marshal.loads(data)
+            except (EOFError, ValueError, TypeError) as exc:
+                raise ImportError('bad bytecode bundle {!r}'.format(path),
+                                  path=path) from exc
+        except:
+            self._file.close()
+            raise
+
+    def _read(self, offset, size):
+        """Read size bytes of the bundle at offset."""
+        if hasattr(_os, 'pread'):
+            return _os.pread(self._file.fileno(), size, offset)
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+    def _entry(self, fullname):
+        try:
+            return self._index[fullname]
+        except KeyError:
+            raise ImportError('{!r} is not in the bytecode bundle'
+                              .format(fullname), name=fullname) from None
+
+    def find_spec(self, fullname, path=None, target=None):
+        """Return the spec of the module if it is in the bundle."""
+        entry = self._index.get(fullname)
+        if entry is None:
+            return None
+        origin, is_package = entry[2], entry[3]
+        if is_package:
+            locations = [_path_split(origin)[0]]
+        else:
+            locations = None
+        return spec_from_file_location(fullname, origin, loader=self,
+                                       submodule_search_locations=locations)
+
+    def is_package(self, fullname):
+        return self._entry(fullname)[3]
+
+    def get_filename(self, fullname):
+        """Return the path of the source of the module."""
+        return self._entry(fullname)[2]
+
+    def get_code(self, fullname):
+        """Return the code object of the module."""
+        offset, size = self._entry(fullname)[:2]
+        return marshal.loads(self._read(offset, size))
+
+    def get_source(self, fullname):
+        """Return the source of the module, or None if it is not available."""
+        try:
+            with _io.FileIO(self.get_filename(fullname), 'r') as file:
+                return decode_source(file.read())
+        except OSError:
+            return None
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.path)
+
+
+def _install_bytecode_bundle():
+    """Add a finder for the bytecode bundle given by -X bytecode_bundle or the
+    PYTHONBYTECODEBUNDLE environment variable, if any, before PathFinder in
+    sys.meta_path."""
+    path = _startup_file('bytecode_bundle', 'PYTHONBYTECODEBUNDLE')
+    if path is None:
+        return
+    try:
+        finder = BytecodeBundleFinder(path)
+    except (OSError, ImportError) as exc:
+        _bootstrap._verbose_message('bytecode bundle {!r} not loaded: {}',
+                                    path, exc)
+        return
+    sys.meta_path.insert(sys.meta_path.index(PathFinder), finder)
+
+
 # Import setup ###############################################################
 
 def _fix_up_module(ns, name, pathname, cpathname=None):
@@ -1685,3 +1905,5 @@ def _install(_bootstrap_module):
     supported_loaders = _get_supported_file_loaders()
     sys.path_hooks.extend([FileFinder.path_hook(*supported_loaders)])
     sys.meta_path.append(PathFinder)
+    _load_import_index()
+    _install_bytecode_bundle()
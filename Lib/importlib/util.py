@@ -1,19 +1,26 @@
 """Utility code for constructing importers, etc."""
 from . import abc
+from . import _bootstrap
 from ._bootstrap import module_from_spec
 from ._bootstrap import _resolve_name
 from ._bootstrap import spec_from_loader
 from ._bootstrap import _find_spec
 from ._bootstrap_external import MAGIC_NUMBER
 from ._bootstrap_external import _RAW_MAGIC_NUMBER
+from ._bootstrap_external import _path_join
+from ._bootstrap_external import _write_atomic
 from ._bootstrap_external import cache_from_source
 from ._bootstrap_external import decode_source
 from ._bootstrap_external import source_from_cache
 from ._bootstrap_external import spec_from_file_location
+from .machinery import all_suffixes
 
 from contextlib import contextmanager
 import _imp
 import functools
+import marshal
+import os
+import stat
 import sys
 import types
 import warnings
@@ -39,6 +46,63 @@ def resolve_name(name, package):
     return _resolve_name(name[level:], package, level)
 
 
+def write_import_index(filename, path=None):
+    """Write an import index of the directories in path to filename.
+
+    The index records the names in the directories and in the directories of
+    their packages, and the stat results of the modules they contain.  When
+    the interpreter is given the index with -X importindex or the
+    PYTHONIMPORTINDEX environment variable, it finds and validates these
+    modules without listing the directories or calling stat() on the modules.
+    The directories of path should be given as they appear in sys.path, which
+    is the default.
+    """
+    if path is None:
+        path = sys.path
+    suffixes = tuple(all_suffixes())
+    index = {}
+    seen = set()
+
+    def add_directory(directory, st):
+        if (st.st_dev, st.st_ino) in seen:
+            return      # Symbolic link loop
+        seen.add((st.st_dev, st.st_ino))
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        files = {}
+        for name in names:
+            if not name.isidentifier() and not name.endswith(suffixes):
+                continue
+            entry = _path_join(directory, name)
+            try:
+                entry_st = os.stat(entry)
+            except OSError:
+                continue
+            if stat.S_ISDIR(entry_st.st_mode):
+                if name.isidentifier():
+                    add_directory(entry, entry_st)
+            elif name.endswith(suffixes):
+                files[name] = (entry_st.st_mode, entry_st.st_mtime,
+                               entry_st.st_size)
+        # Each directory is unmarshalled when it is first used
+        index[directory] = marshal.dumps(((st.st_mode, st.st_mtime,
+                                           st.st_size),
+                                          frozenset(names), files))
+
+    for directory in path:
+        if not isinstance(directory, str) or not directory:
+            continue
+        try:
+            st = os.stat(directory)
+        except OSError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            add_directory(directory, st)
+    _write_atomic(filename, marshal.dumps((MAGIC_NUMBER, index)))
+
+
 def _find_spec_from_path(name, path=None):
     """Return the spec for the specified module.
 
@@ -298,3 +362,18 @@ class LazyLoader(abc.Loader):
         loader_state['__class__'] = module.__class__
         module.__spec__.loader_state = loader_state
         module.__class__ = _LazyModule
+
+
+def set_lazy_imports_filter(allow=None, deny=()):
+    """Select the modules deferred by import statements when lazy imports are
+    enabled with -X lazy_imports or PYTHONLAZYIMPORTS.
+
+    If allow is not None, only the modules it names are deferred.  The modules
+    named in deny are never deferred.  The name of a package also applies to
+    its submodules.
+    """
+    if isinstance(allow, str) or isinstance(deny, str):
+        raise TypeError('allow and deny must be collections of module names, '
+                        'not str')
+    _bootstrap._lazy_imports_allow = None if allow is None else frozenset(allow)
+    _bootstrap._lazy_imports_deny = frozenset(deny)
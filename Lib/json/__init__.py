@@ -97,13 +97,13 @@ Using json.tool from the shell to validate and pretty-print::
 """
 __version__ = '2.0.9'
 __all__ = [
-    'dump', 'dumps', 'load', 'loads',
-    'JSONDecoder', 'JSONDecodeError', 'JSONEncoder',
+    'dump', 'dumps', 'load', 'loads', 'iterload',
+    'JSONDecoder', 'JSONDecodeError', 'JSONEncoder', 'JSONIncrementalDecoder',
 ]
 
 __author__ = 'Bob Ippolito <bob@redivi.com>'
 
-from .decoder import JSONDecoder, JSONDecodeError
+from .decoder import JSONDecoder, JSONDecodeError, JSONIncrementalDecoder
 from .encoder import JSONEncoder
 import codecs
 
@@ -166,14 +166,20 @@ def dump(obj, fp, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         check_circular and allow_nan and
         cls is None and indent is None and separators is None and
         default is None and not sort_keys and not kw):
-        iterable = _default_encoder.iterencode(obj)
+        encoder = _default_encoder
     else:
         if cls is None:
             cls = JSONEncoder
-        iterable = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+        encoder = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
             check_circular=check_circular, allow_nan=allow_nan, indent=indent,
             separators=separators,
-            default=default, sort_keys=sort_keys, **kw).iterencode(obj)
+            default=default, sort_keys=sort_keys, **kw)
+    if type(encoder).iterencode is JSONEncoder.iterencode:
+        # The C encoder passes chunks of bounded size to fp.write() instead
+        # of yielding every token.
+        iterable = encoder.iterencode(obj, _one_shot=True, _write=fp.write)
+    else:
+        iterable = encoder.iterencode(obj)
     # could accelerate with writelines in some versions of Python, at
     # a debuggability cost
     for chunk in iterable:
@@ -368,3 +374,33 @@ def loads(s, *, cls=None, object_hook=None, parse_float=None,
     if parse_constant is not None:
         kw['parse_constant'] = parse_constant
     return cls(**kw).decode(s)
+
+
+def iterload(fp, *, items=False, chunk_size=64 * 1024, cls=None, **kw):
+    """Deserialize ``fp`` (a ``.read()``-supporting file-like object
+    containing JSON documents) incrementally, yielding Python objects as
+    they are decoded.
+
+    If ``items`` is false, ``fp`` contains a sequence of JSON documents
+    separated by optional whitespace, such as one document per line, and
+    each of them is yielded.  If ``items`` is true, ``fp`` contains a single
+    JSON array, and its elements are yielded.  ``fp`` is read by chunks of
+    ``chunk_size`` characters or bytes, so that only the data not decoded
+    yet is kept in memory.
+
+    To use a custom ``JSONDecoder`` subclass, specify it with the ``cls``
+    kwarg; otherwise ``JSONDecoder`` is used.  Other keyword arguments are
+    passed to its constructor, as with ``load()``.
+    """
+    if cls is None and not kw:
+        decoder = _default_decoder
+    else:
+        if cls is None:
+            cls = JSONDecoder
+        decoder = cls(**kw)
+    incremental_decoder = JSONIncrementalDecoder(decoder, items=items)
+    while True:
+        chunk = fp.read(chunk_size)
+        yield from incremental_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            break
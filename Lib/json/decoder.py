@@ -2,13 +2,15 @@
 """
 import re
 
+import codecs
+
 from json import scanner
 try:
     from _json import scanstring as c_scanstring
 except ImportError:
     c_scanstring = None
 
-__all__ = ['JSONDecoder', 'JSONDecodeError']
+__all__ = ['JSONDecoder', 'JSONDecodeError', 'JSONIncrementalDecoder']
 
 FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
 
@@ -354,3 +356,206 @@ class JSONDecoder(object):
         except StopIteration as err:
             raise JSONDecodeError("Expecting value", s, err.value) from None
         return obj, end
+
+
+def _truncated(err):
+    """Return whether the JSONDecodeError err may only be due to the end of
+    the document not being there yet."""
+    s, pos = err.doc, err.pos
+    if err.msg.startswith("Invalid control character"):
+        # The pure Python scanner reports the position after the character
+        return False
+    if pos >= len(s):
+        return True
+    if err.msg == "Unterminated string starting at":
+        return True
+    if err.msg == "Invalid \\uXXXX escape":
+        # The escape may be cut before the end of the string
+        return s.find('"', pos) < 0
+    rest = s[pos:pos + 10]
+    if err.msg == "Expecting value":
+        # The prefix of a constant
+        return any(literal.startswith(rest) for literal in
+                   ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity'))
+    # The fraction or exponent of a number, after its end in a container
+    return (len(rest) <= 2 and not rest.strip('.eE+-') and
+            s[pos - 1] in '0123456789')
+
+
+class JSONIncrementalDecoder(object):
+    """Incremental JSON decoder.
+
+    Decodes a JSON text fed by chunks with ``decode()``, returning the
+    values completed by each chunk, so that large or chunked inputs can be
+    decoded without holding the whole text in memory.
+
+    If ``items`` is false, the text is a sequence of JSON documents separated
+    by optional whitespace (for instance one document per line), and each
+    document is returned as soon as it is complete.  If ``items`` is true,
+    the text is a single JSON array, and its elements are returned as soon as
+    they are complete.
+
+    Chunks can be ``str``, ``bytes`` or ``bytearray`` instances.  The
+    encoding of ``bytes`` is detected as ``loads()`` does unless
+    ``encoding`` is specified.
+
+    The values are decoded by the scanner of ``decoder``, a ``JSONDecoder``
+    instance which defaults to ``JSONDecoder()``.  Only the text which has
+    not been decoded yet is kept in memory.
+
+    """
+    def __init__(self, decoder=None, *, items=False, encoding=None):
+        if decoder is None:
+            decoder = JSONDecoder()
+        self.decoder = decoder
+        self.items = items
+        self.encoding = encoding
+        self.reset()
+
+    def reset(self):
+        """Reset the decoder to its initial state."""
+        self._bytes_decoder = None
+        self._pending_bytes = b''
+        self._buffer = ''
+        # Chunks received while waiting for the buffer to reach the retry
+        # length, joined lazily to avoid copying the buffer for each chunk
+        self._chunks = []
+        self._chunks_length = 0
+        self._at_start = True
+        # Length the buffer must reach before a failed scan is retried
+        self._retry_length = 0
+        # For items: '[' before the array, ',' before an element or after an
+        # element, ']' after the array
+        self._state = '['
+        self._first_item = True
+
+    def decode(self, data, final=False):
+        """Decode a chunk and return the list of completed values.
+
+        If ``final`` is true, the chunk is the last one: any incomplete
+        data raises a ``JSONDecodeError``.  Invalid data raises a
+        ``JSONDecodeError`` once enough of it has been fed; the decoder must
+        then be reset before being used again.
+
+        """
+        if isinstance(data, str):
+            if self._bytes_decoder is not None or self._pending_bytes:
+                raise TypeError('cannot mix str and bytes chunks')
+            text = data
+        elif isinstance(data, (bytes, bytearray)):
+            text = self._decode_bytes(data, final)
+        else:
+            raise TypeError(f'the JSON object must be str, bytes or '
+                            f'bytearray, not {data.__class__.__name__}')
+        if self._at_start and text:
+            self._at_start = False
+            if text.startswith('\ufeff'):
+                raise JSONDecodeError("Unexpected UTF-8 BOM (decode using "
+                                      "utf-8-sig)", text, 0)
+        self._chunks.append(text)
+        self._chunks_length += len(text)
+        if (not final and
+                len(self._buffer) + self._chunks_length < self._retry_length):
+            return []
+        self._buffer += ''.join(self._chunks)
+        self._chunks.clear()
+        self._chunks_length = 0
+        self._retry_length = 0
+        values = []
+        if self.items:
+            end = self._decode_items(values, final)
+        else:
+            end = self._decode_documents(values, final)
+        # Only keep the text which has not been decoded yet
+        self._buffer = self._buffer[end:]
+        self._retry_length = max(self._retry_length - end, 0)
+        return values
+
+    def _decode_bytes(self, data, final):
+        if self._bytes_decoder is None:
+            encoding = self.encoding
+            if encoding is None:
+                # The encoding is detected from the first four bytes
+                self._pending_bytes += data
+                if len(self._pending_bytes) < 4 and not final:
+                    return ''
+                from json import detect_encoding
+                encoding = detect_encoding(self._pending_bytes)
+                data, self._pending_bytes = self._pending_bytes, b''
+            self._bytes_decoder = codecs.getincrementaldecoder(encoding)(
+                'surrogatepass')
+        return self._bytes_decoder.decode(data, final)
+
+    def _scan(self, s, idx, final):
+        # Return (value, end), or None if more text is needed.  A value
+        # followed by the end of the buffer or by a character which could
+        # continue a number may be a truncated number.
+        try:
+            value, end = self.decoder.scan_once(s, idx)
+        except StopIteration as err:
+            error = JSONDecodeError("Expecting value", s, err.value)
+        except JSONDecodeError as err:
+            error = err
+        else:
+            if final or (end < len(s) and s[end] not in '0123456789.eE+-'):
+                return value, end
+            error = None
+        if error is not None and (final or not _truncated(error)):
+            raise error
+        # Rescanning the same incomplete value for every chunk would take a
+        # quadratic time, so wait for the pending text to double.
+        self._retry_length = idx + 2 * (len(s) - idx)
+        return None
+
+    def _decode_documents(self, values, final, _w=WHITESPACE.match):
+        s = self._buffer
+        idx = 0
+        while True:
+            idx = _w(s, idx).end()
+            if idx == len(s):
+                return idx
+            scanned = self._scan(s, idx, final)
+            if scanned is None:
+                return idx
+            value, idx = scanned
+            values.append(value)
+
+    def _decode_items(self, values, final, _w=WHITESPACE.match):
+        s = self._buffer
+        idx = _w(s, 0).end()
+        while idx < len(s):
+            if self._state == '[':
+                if s[idx] != '[':
+                    raise JSONDecodeError("Expecting '['", s, idx)
+                self._state = ','
+                idx += 1
+            elif self._state == ',':
+                if s[idx] == ']':
+                    self._state = ']'
+                    idx += 1
+                elif self._first_item:
+                    scanned = self._scan(s, idx, final)
+                    if scanned is None:
+                        return idx
+                    value, idx = scanned
+                    values.append(value)
+                    self._first_item = False
+                elif s[idx] == ',':
+                    next_idx = _w(s, idx + 1).end()
+                    if next_idx == len(s) and not final:
+                        return idx
+                    scanned = self._scan(s, next_idx, final)
+                    if scanned is None:
+                        return idx
+                    value, idx = scanned
+                    values.append(value)
+                else:
+                    raise JSONDecodeError("Expecting ',' delimiter", s, idx)
+            else:
+                raise JSONDecodeError("Extra data", s, idx)
+            idx = _w(s, idx).end()
+        if final and self._state != ']':
+            if self._state == '[':
+                raise JSONDecodeError("Expecting '['", s, idx)
+            raise JSONDecodeError("Expecting ']'", s, idx)
+        return idx
@@ -185,6 +185,15 @@ _srcfile = os.path.normcase(addLevelName.__code__.co_filename)
 #if not hasattr(sys, '_getframe'):
 #    _srcfile = None
 
+_srcfile_co_filename = addLevelName.__code__.co_filename
+
+def _is_srcfile(filename):
+    # The code objects of this module share the same filename object, so
+    # normcase() is only needed for the frames of other modules.
+    if filename is _srcfile_co_filename:
+        return True
+    return os.path.normcase(filename) == _srcfile
+
 
 def _checkLevel(level):
     if isinstance(level, int):
@@ -269,6 +278,9 @@ else:
 #   The logging record
 #---------------------------------------------------------------------------
 
+# The LogRecord attributes which are computed on first access
+_lazyRecordAttributes = frozenset(['filename', 'module', 'processName'])
+
 class LogRecord(object):
     """
     A LogRecord instance represents an event being logged.
@@ -314,12 +326,9 @@ class LogRecord(object):
         self.levelname = getLevelName(level)
         self.levelno = level
         self.pathname = pathname
-        try:
-            self.filename = os.path.basename(pathname)
-            self.module = os.path.splitext(self.filename)[0]
-        except (TypeError, ValueError, AttributeError):
-            self.filename = pathname
-            self.module = "Unknown module"
+        # filename, module and processName are computed on first access,
+        # see __getattr__(), as many records are discarded by filters
+        # without using them.
         self.exc_info = exc_info
         self.exc_text = None      # used to cache the traceback text
         self.stack_info = sinfo
@@ -336,8 +345,24 @@ class LogRecord(object):
             self.threadName = None
         if not logMultiprocessing: # pragma: no cover
             self.processName = None
+        if logProcesses and hasattr(os, 'getpid'):
+            self.process = os.getpid()
         else:
-            self.processName = 'MainProcess'
+            self.process = None
+
+    def __getattr__(self, name):
+        # Only called for the lazily computed attributes, or for missing
+        # attributes.
+        d = self.__dict__
+        if name in ('filename', 'module'):
+            try:
+                d['filename'] = os.path.basename(self.pathname)
+                d['module'] = os.path.splitext(d['filename'])[0]
+            except (TypeError, ValueError, AttributeError):
+                d['filename'] = self.pathname
+                d['module'] = "Unknown module"
+        elif name == 'processName':
+            d['processName'] = 'MainProcess'
             mp = sys.modules.get('multiprocessing')
             if mp is not None:
                 # Errors may occur if multiprocessing has not finished loading
@@ -345,13 +370,30 @@ class LogRecord(object):
                 # to run when multiprocessing calls import. See issue 8200
                 # for an example
                 try:
-                    self.processName = mp.current_process().name
+                    d['processName'] = mp.current_process().name
                 except Exception: #pragma: no cover
                     pass
-        if logProcesses and hasattr(os, 'getpid'):
-            self.process = os.getpid()
         else:
-            self.process = None
+            raise AttributeError("%r object has no attribute %r"
+                                 % (type(self).__name__, name))
+        return d[name]
+
+    def _resolve(self):
+        """
+        Compute the lazy attributes, so that they are in __dict__.
+
+        This is done when the record passes the filters of a handler,
+        while still on the thread which logged it.
+        """
+        d = self.__dict__
+        if 'module' not in d:
+            self.__getattr__('module')
+        if 'processName' not in d:
+            self.__getattr__('processName')
+
+    def __getstate__(self):
+        self._resolve()
+        return self.__dict__
 
     def __repr__(self):
         return '<LogRecord: %s, %s, %s, %s, "%s">'%(self.name, self.levelno,
@@ -432,6 +474,8 @@ class PercentStyle(object):
         return self._fmt % record.__dict__
 
     def format(self, record):
+        if isinstance(record, LogRecord):
+            record._resolve()
         try:
             return self._format(record)
         except KeyError as e:
@@ -945,6 +989,8 @@ class Handler(Filterer):
         """
         rv = self.filter(record)
         if rv:
+            if isinstance(record, LogRecord):
+                record._resolve()
             self.acquire()
             try:
                 self.emit(record)
@@ -1520,8 +1566,7 @@ class Logger(Filterer):
         rv = "(unknown file)", 0, "(unknown function)", None
         while hasattr(f, "f_code"):
             co = f.f_code
-            filename = os.path.normcase(co.co_filename)
-            if filename == _srcfile:
+            if _is_srcfile(co.co_filename):
                 f = f.f_back
                 continue
             sinfo = None
@@ -1547,7 +1592,8 @@ class Logger(Filterer):
                              sinfo)
         if extra is not None:
             for key in extra:
-                if (key in ["message", "asctime"]) or (key in rv.__dict__):
+                if (key in ["message", "asctime"]) or (key in rv.__dict__) or \
+                   (key in _lazyRecordAttributes):
                     raise KeyError("Attempt to overwrite %r in LogRecord" % key)
                 rv.__dict__[key] = extra[key]
         return rv
@@ -1558,6 +1604,8 @@ class Logger(Filterer):
         Low-level logging routine which creates a LogRecord and then calls
         all the handlers of this logger to handle the record.
         """
+        if not self._hasHandlerFor(level):
+            return
         sinfo = None
         if _srcfile:
             #IronPython doesn't track Python frames, so findCaller raises an
@@ -1632,6 +1680,33 @@ class Logger(Filterer):
                 c = c.parent
         return rv
 
+    def _hasHandlerFor(self, level):
+        """
+        Return False if no handler would handle a record of this level.
+
+        This allows _log() to skip looking for the caller and creating the
+        record.  Records are still created if this logger has filters, or
+        if handle() or callHandlers() are overridden, as they may be
+        interested in all records.
+        """
+        if self.disabled:
+            return False
+        if (self.filters or type(self).handle is not Logger.handle or
+                type(self).callHandlers is not Logger.callHandlers):
+            return True
+        c = self
+        found = False
+        while c:
+            for hdlr in c.handlers:
+                if level >= hdlr.level:
+                    return True
+                found = True
+            if not c.propagate:
+                break
+            c = c.parent
+        # Without any handler, let callHandlers() use lastResort.
+        return not found
+
     def callHandlers(self, record):
         """
         Pass a record to all relevant handlers.
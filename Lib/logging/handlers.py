@@ -25,9 +25,11 @@ To use, simply 'import logging.handlers' and log away!
 
 import logging, socket, os, pickle, struct, time, re
 from stat import ST_DEV, ST_INO, ST_MTIME
+import collections
 import queue
 import threading
 import copy
+import traceback
 
 #
 # Some constants...
@@ -48,7 +50,8 @@ class BaseRotatingHandler(logging.FileHandler):
     Not meant to be instantiated directly.  Instead, use RotatingFileHandler
     or TimedRotatingFileHandler.
     """
-    def __init__(self, filename, mode, encoding=None, delay=False, errors=None):
+    def __init__(self, filename, mode, encoding=None, delay=False, errors=None,
+                 flushInterval=None, backgroundRollover=False):
         """
         Use the specified filename for streamed logging
         """
@@ -60,6 +63,22 @@ class BaseRotatingHandler(logging.FileHandler):
         self.errors = errors
         self.namer = None
         self.rotator = None
+        self.flushInterval = flushInterval
+        self.backgroundRollover = backgroundRollover
+        self._rolloverCount = 0
+
+    def createLock(self):
+        """
+        Create the lock, and forget the flush and rollover threads.
+        """
+        logging.FileHandler.createLock(self)
+        # This is also called in the child process after a fork, where
+        # neither thread exists.
+        self._flushThread = None
+        self._flushWakeup = None
+        self._flushStop = None
+        self._rollovers = None
+        self._rolloverThread = None
 
     def emit(self, record):
         """
@@ -71,10 +90,112 @@ class BaseRotatingHandler(logging.FileHandler):
         try:
             if self.shouldRollover(record):
                 self.doRollover()
-            logging.FileHandler.emit(self, record)
+            self._write(self.format(record) + self.terminator)
+        except RecursionError:  # See issue 36272
+            raise
         except Exception:
             self.handleError(record)
 
+    def _write(self, msg):
+        """
+        Write msg to the stream, flushing it now or scheduling a flush
+        within flushInterval seconds.
+        """
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.write(msg)
+        if not self.flushInterval:
+            self.flush()
+            return
+        if self._flushThread is None:
+            self._flushWakeup = threading.Event()
+            self._flushStop = threading.Event()
+            self._flushThread = threading.Thread(
+                target=self._flushWorker,
+                args=(self._flushWakeup, self._flushStop), daemon=True)
+            self._flushThread.start()
+        if not self._flushWakeup.is_set():
+            self._flushWakeup.set()
+
+    def _flushWorker(self, wakeup, stop):
+        # Flush the stream flushInterval seconds after the first write
+        # following the last flush, until the handler is closed.
+        while True:
+            wakeup.wait()
+            if stop.wait(self.flushInterval):
+                break
+            self.acquire()
+            try:
+                wakeup.clear()
+                self.flush()
+            finally:
+                self.release()
+
+    def _rollover(self, func, *args):
+        """
+        Call func(source, *args) to rotate the log file, which was just
+        closed.
+
+        If backgroundRollover is set, the file is first renamed out of the
+        way, so that logging can carry on with a new file, and func() is
+        called by a background thread, with the temporary name as source.
+        """
+        if not self.backgroundRollover:
+            func(self.baseFilename, *args)
+            return
+        # The process ID keeps the temporary names of processes logging
+        # to the same file apart, and the counter skips any file left
+        # behind by a process which crashed.
+        while True:
+            self._rolloverCount += 1
+            source = "%s.rollover-%d-%d" % (self.baseFilename, os.getpid(),
+                                            self._rolloverCount)
+            if not os.path.exists(source):
+                break
+        # Issue 18940: A file may not have been created if delay is True.
+        if os.path.exists(self.baseFilename):
+            os.replace(self.baseFilename, source)
+        if self._rolloverThread is None:
+            self._rollovers = queue.SimpleQueue()
+            self._rolloverThread = threading.Thread(
+                target=self._rolloverWorker, args=(self._rollovers,),
+                daemon=True)
+            self._rolloverThread.start()
+        self._rollovers.put((func, source, args))
+
+    def _rolloverWorker(self, rollovers):
+        # Rollovers are done one at a time, in order, so that successive
+        # ones do not step on each other's files.
+        while True:
+            job = rollovers.get()
+            if job is None:
+                break
+            func, source, args = job
+            try:
+                func(source, *args)
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+
+    def close(self):
+        """
+        Close the stream, after waiting for pending rollovers to finish.
+        """
+        self.acquire()
+        try:
+            if self._flushThread is not None:
+                # The stream is flushed below, the thread just exits.
+                self._flushStop.set()
+                self._flushWakeup.set()
+                self._flushThread = None
+            if self._rolloverThread is not None:
+                self._rollovers.put(None)
+                self._rolloverThread.join()
+                self._rolloverThread = None
+            logging.FileHandler.close(self)
+        finally:
+            self.release()
+
     def rotation_filename(self, default_name):
         """
         Modify the filename of a log file when rotating.
@@ -115,13 +236,53 @@ class BaseRotatingHandler(logging.FileHandler):
         else:
             self.rotator(source, dest)
 
+class CompressingRotator(object):
+    """
+    A rotator which compresses rotated log files. Set an instance as the
+    rotator attribute of a rotating handler, and its namer() method as the
+    namer attribute, so that the names of the rotated files get the
+    extension of the compression format.
+    """
+    _extensions = {'gzip': '.gz', 'bz2': '.bz2', 'lzma': '.xz'}
+
+    def __init__(self, compression='gzip'):
+        if compression not in self._extensions:
+            raise ValueError("Unknown compression format: %r" % compression)
+        self.compression = compression
+        self.extension = self._extensions[compression]
+
+    def namer(self, default_name):
+        """
+        Add the extension of the compression format to the name.
+        """
+        return default_name + self.extension
+
+    def __call__(self, source, dest):
+        """
+        Compress source into dest, then remove source.
+        """
+        # Issue 18940: A file may not have been created if delay is True.
+        if not os.path.exists(source):
+            return
+        import shutil
+        if self.compression == 'gzip':
+            import gzip as module
+        elif self.compression == 'bz2':
+            import bz2 as module
+        else:
+            import lzma as module
+        with open(source, 'rb') as src, module.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
 class RotatingFileHandler(BaseRotatingHandler):
     """
     Handler for logging to a set of files, which switches from one file
     to the next when the current file reaches a certain size.
     """
     def __init__(self, filename, mode='a', maxBytes=0, backupCount=0,
-                 encoding=None, delay=False, errors=None):
+                 encoding=None, delay=False, errors=None, flushInterval=None,
+                 backgroundRollover=False):
         """
         Open the specified file and use it as the stream for logging.
 
@@ -141,6 +302,11 @@ class RotatingFileHandler(BaseRotatingHandler):
         respectively.
 
         If maxBytes is zero, rollover never occurs.
+
+        If flushInterval is given, records are not flushed to the file one
+        by one, but at most flushInterval seconds after they were written.
+        If backgroundRollover is true, the rotated files are renamed (and
+        possibly compressed by the rotator) by a background thread.
         """
         # If rotation/rollover is wanted, it doesn't make sense to use another
         # mode. If for example 'w' were specified, then if there were multiple
@@ -150,7 +316,9 @@ class RotatingFileHandler(BaseRotatingHandler):
         if maxBytes > 0:
             mode = 'a'
         BaseRotatingHandler.__init__(self, filename, mode, encoding=encoding,
-                                     delay=delay, errors=errors)
+                                     delay=delay, errors=errors,
+                                     flushInterval=flushInterval,
+                                     backgroundRollover=backgroundRollover)
         self.maxBytes = maxBytes
         self.backupCount = backupCount
 
@@ -162,21 +330,64 @@ class RotatingFileHandler(BaseRotatingHandler):
             self.stream.close()
             self.stream = None
         if self.backupCount > 0:
-            for i in range(self.backupCount - 1, 0, -1):
-                sfn = self.rotation_filename("%s.%d" % (self.baseFilename, i))
-                dfn = self.rotation_filename("%s.%d" % (self.baseFilename,
-                                                        i + 1))
-                if os.path.exists(sfn):
-                    if os.path.exists(dfn):
-                        os.remove(dfn)
-                    os.rename(sfn, dfn)
-            dfn = self.rotation_filename(self.baseFilename + ".1")
-            if os.path.exists(dfn):
-                os.remove(dfn)
-            self.rotate(self.baseFilename, dfn)
+            self._rollover(self._rotateBackups)
         if not self.delay:
             self.stream = self._open()
 
+    def _rotateBackups(self, source):
+        for i in range(self.backupCount - 1, 0, -1):
+            sfn = self.rotation_filename("%s.%d" % (self.baseFilename, i))
+            dfn = self.rotation_filename("%s.%d" % (self.baseFilename,
+                                                    i + 1))
+            if os.path.exists(sfn):
+                if os.path.exists(dfn):
+                    os.remove(dfn)
+                os.rename(sfn, dfn)
+        dfn = self.rotation_filename(self.baseFilename + ".1")
+        if os.path.exists(dfn):
+            os.remove(dfn)
+        self.rotate(source, dfn)
+
+    def _open(self):
+        """
+        Open the base file, and note its current size.
+        """
+        stream = BaseRotatingHandler._open(self)
+        stream.seek(0, 2)  #due to non-posix-compliant Windows feature
+        self._size = stream.tell()
+        return stream
+
+    def emit(self, record):
+        """
+        Emit a record.
+
+        The record is formatted only once, and the size of the file is
+        counted as records are written, rather than asked to the stream
+        before each record.
+        """
+        if type(self).shouldRollover is not RotatingFileHandler.shouldRollover:
+            # Let a custom shouldRollover() decide.
+            BaseRotatingHandler.emit(self, record)
+            return
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:                 # delay was set...
+                self.stream = self._open()
+            size = len(msg)
+            if not msg.isascii():
+                size = len(msg.encode(self.stream.encoding,
+                                      self.stream.errors))
+            if os.linesep != '\n':
+                size += msg.count('\n') * (len(os.linesep) - 1)
+            if self.maxBytes > 0 and self._size + size >= self.maxBytes:
+                self.doRollover()
+            self._write(msg)
+            self._size += size
+        except RecursionError:  # See issue 36272
+            raise
+        except Exception:
+            self.handleError(record)
+
     def shouldRollover(self, record):
         """
         Determine if rollover should occur.
@@ -203,9 +414,11 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
     """
     def __init__(self, filename, when='h', interval=1, backupCount=0,
                  encoding=None, delay=False, utc=False, atTime=None,
-                 errors=None):
+                 errors=None, flushInterval=None, backgroundRollover=False):
         BaseRotatingHandler.__init__(self, filename, 'a', encoding=encoding,
-                                     delay=delay, errors=errors)
+                                     delay=delay, errors=errors,
+                                     flushInterval=flushInterval,
+                                     backgroundRollover=backgroundRollover)
         self.when = when.upper()
         self.backupCount = backupCount
         self.utc = utc
@@ -369,6 +582,14 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
             result = result[:len(result) - self.backupCount]
         return result
 
+    def _rotateFile(self, source, dfn):
+        if os.path.exists(dfn):
+            os.remove(dfn)
+        self.rotate(source, dfn)
+        if self.backupCount > 0:
+            for s in self.getFilesToDelete():
+                os.remove(s)
+
     def doRollover(self):
         """
         do a rollover; in this case, a date/time stamp is appended to the filename
@@ -397,12 +618,7 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
                 timeTuple = time.localtime(t + addend)
         dfn = self.rotation_filename(self.baseFilename + "." +
                                      time.strftime(self.suffix, timeTuple))
-        if os.path.exists(dfn):
-            os.remove(dfn)
-        self.rotate(self.baseFilename, dfn)
-        if self.backupCount > 0:
-            for s in self.getFilesToDelete():
-                os.remove(s)
+        self._rollover(self._rotateFile, dfn)
         if not self.delay:
             self.stream = self._open()
         newRolloverAt = self.computeRollover(currentTime)
@@ -1518,3 +1734,208 @@ class QueueListener(object):
         self.enqueue_sentinel()
         self._thread.join()
         self._thread = None
+
+
+class BackgroundHandler(logging.Handler):
+    """
+    This handler passes records to other handlers on a background thread.
+
+    Records are appended to a bounded buffer without taking the handler
+    lock or formatting them, and a writer thread hands them to the target
+    handlers in batches. The arguments of a record are merged into its
+    message beforehand, on a copy of the record. When the buffer is
+    full, the logging thread either waits for the writer to make room
+    (policy 'block') or discards the record (policy 'drop').
+    """
+
+    def __init__(self, *handlers, capacity=10000, policy='block',
+                 batch_size=100, respect_handler_level=False):
+        """
+        Initialise an instance with the handlers to pass records to.
+        """
+        if policy not in ('block', 'drop'):
+            raise ValueError("policy must be 'block' or 'drop', not %r"
+                             % (policy,))
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        self.handlers = handlers
+        self.capacity = capacity
+        self.policy = policy
+        self.batch_size = batch_size
+        self.respect_handler_level = respect_handler_level
+        self.dropped = 0
+        self.max_depth = 0
+        logging.Handler.__init__(self)
+
+    def createLock(self):
+        """
+        Create the locks and the buffer of the handler.
+        """
+        logging.Handler.createLock(self)
+        # This is also called in the child process after a fork, where the
+        # writer thread does not exist: start afresh, a new writer will be
+        # started by the next record.
+        self._records = collections.deque()
+        self._wakeup = threading.Event()
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+        self._busy = False
+        self._closing = False
+
+    @property
+    def depth(self):
+        """
+        The number of records waiting to be handled.
+        """
+        return len(self._records)
+
+    def handle(self, record):
+        """
+        Conditionally emit the specified logging record.
+
+        Unlike other handlers, the handler lock is not acquired: appending
+        to the buffer is thread-safe.
+        """
+        rv = self.filter(record)
+        if rv:
+            record._resolve()
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        """
+        Emit a record.
+
+        Appends the record to the buffer, starting the writer thread if
+        needed.
+        """
+        try:
+            if record.args:
+                # The arguments may be modified once the logging call
+                # returns: merge them now, as QueueHandler.prepare() does,
+                # leaving the record of the other handlers intact.
+                msg = record.getMessage()
+                record = copy.copy(record)
+                record.msg = msg
+                record.args = None
+            thread = self._thread
+            if thread is None:
+                thread = self._start()
+                if thread is None:
+                    # The handler is closed.
+                    self.handle_records((record,))
+                    return
+            records = self._records
+            if len(records) >= self.capacity:
+                if self.policy == 'drop':
+                    with self._cond:
+                        self.dropped += 1
+                    return
+                if thread is threading.current_thread():
+                    # A target handler is logging: don't wait for ourselves.
+                    self.handle_records((record,))
+                    return
+                with self._cond:
+                    while len(records) >= self.capacity and self._thread:
+                        self._cond.wait()
+                    thread = self._thread
+                if thread is None:
+                    self.handle_records((record,))
+                    return
+            records.append(record)
+            depth = len(records)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if not self._wakeup.is_set():
+                self._wakeup.set()
+        except Exception:
+            self.handleError(record)
+
+    def handle_records(self, records):
+        """
+        Pass a batch of records to the target handlers.
+
+        This is called on the writer thread.  An exception raised while
+        handling a record is reported by handleError(), and the next records
+        are still handled.
+        """
+        for record in records:
+            try:
+                for handler in self.handlers:
+                    if (not self.respect_handler_level or
+                            record.levelno >= handler.level):
+                        handler.handle(record)
+            except Exception:
+                self.handleError(record)
+
+    def _start(self):
+        with self._cond:
+            if self._thread is None and not self._closing:
+                self._thread = threading.Thread(
+                    target=self._writer, name='BackgroundHandler',
+                    daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def _writer(self):
+        records = self._records
+        wakeup = self._wakeup
+        cond = self._cond
+        while True:
+            wakeup.wait()
+            self._busy = True
+            wakeup.clear()
+            while records:
+                batch = []
+                try:
+                    for _ in range(self.batch_size):
+                        batch.append(records.popleft())
+                except IndexError:
+                    pass
+                try:
+                    self.handle_records(batch)
+                    for handler in self.handlers:
+                        handler.flush()
+                except Exception:
+                    # Raised by a flush() or an overridden handle_records()
+                    self.handleError(batch[-1])
+                with cond:
+                    cond.notify_all()
+            with cond:
+                self._busy = False
+                cond.notify_all()
+                if self._closing and not records:
+                    self._thread = None
+                    cond.notify_all()
+                    return
+
+    def flush(self):
+        """
+        Wait until all the records of the buffer are handled.
+        """
+        with self._cond:
+            if self._thread is threading.current_thread():
+                return
+            while (self._records or self._busy) and self._thread:
+                self._cond.wait()
+
+    def close(self):
+        """
+        Handle the remaining records, stop the writer thread and close
+        the handler.
+
+        The target handlers are not closed.
+        """
+        with self._cond:
+            self._closing = True
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            self._wakeup.set()
+            thread.join()
+            # Records appended while the writer was exiting
+            records = self._records
+            while records:
+                self.handle_records((records.popleft(),))
+        logging.Handler.close(self)
@@ -120,9 +120,12 @@ This module also defines an exception 'error'.
 """
 
 import enum
+import sys
+import _sre
 import sre_compile
 import sre_parse
 import functools
+import itertools
 try:
     import _locale
 except ImportError:
@@ -133,6 +136,7 @@ except ImportError:
 __all__ = [
     "match", "fullmatch", "search", "sub", "subn", "split",
     "findall", "finditer", "compile", "purge", "template", "escape",
+    "cache_info", "set_cache_size", "save_cache", "load_cache", "RegexSet",
     "error", "Pattern", "Match", "A", "I", "L", "M", "S", "X", "U",
     "ASCII", "IGNORECASE", "LOCALE", "MULTILINE", "DOTALL", "VERBOSE",
     "UNICODE",
@@ -251,9 +255,65 @@ def compile(pattern, flags=0):
 
 def purge():
     "Clear the regular expression caches"
+    global _cache_hits, _cache_misses
     _cache.clear()
+    _cache2.clear()
+    _cache_hits = itertools.count()
+    _cache_misses = itertools.count()
     _compile_repl.cache_clear()
 
+def cache_info():
+    """Return the statistics of the compiled pattern cache, as a named
+    tuple (hits, misses, maxsize, currsize)."""
+    # Read the counters without incrementing them
+    hits = _cache_hits.__reduce__()[1][0]
+    misses = _cache_misses.__reduce__()[1][0]
+    return functools._CacheInfo(hits, misses, _MAXCACHE, len(_cache))
+
+def set_cache_size(maxsize):
+    """Set the maximum number of compiled patterns kept in the cache,
+    dropping the least recently used ones if there are more."""
+    global _MAXCACHE, _MAXCACHE2
+    maxsize = int(maxsize)
+    if maxsize < 0:
+        raise ValueError("maxsize must be positive or zero")
+    _MAXCACHE = maxsize
+    _MAXCACHE2 = min(maxsize // 2, 256)
+    for cache, size in (_cache, _MAXCACHE), (_cache2, _MAXCACHE2):
+        while len(cache) > size:
+            try:
+                del cache[next(iter(cache))]
+            except (StopIteration, RuntimeError, KeyError):
+                pass
+
+def save_cache(file):
+    """Write the compiled patterns of the cache to a binary file, from
+    which load_cache() creates them again without compiling them."""
+    import marshal
+    entries = []
+    for (_, pattern, flags) in list(_cache):
+        p = sre_parse.parse(pattern, flags)
+        args = sre_compile._compile_args(pattern, p, flags)
+        # The opcodes are int subclasses that marshal does not support
+        code = list(map(int, args[2]))
+        entries.append((flags, args[:2] + (code,) + args[3:]))
+    marshal.dump((_cache_signature(), entries), file)
+
+def load_cache(file):
+    """Add to the cache the compiled patterns read from a binary file
+    written by save_cache() with the same version of Python."""
+    import marshal
+    signature, entries = marshal.load(file)
+    if signature != _cache_signature():
+        raise ValueError("incompatible regular expression cache")
+    if len(entries) > _MAXCACHE:
+        entries = entries[len(entries) - _MAXCACHE:]
+    for flags, args in entries:
+        pattern = args[0]
+        key = type(pattern), pattern, flags
+        if key not in _cache:
+            _cache_add(key, _sre.compile(*args))
+
 def template(pattern, flags=0):
     "Compile a template pattern, returning a Pattern object"
     return _compile(pattern, flags|T)
@@ -278,37 +338,156 @@ def escape(pattern):
 Pattern = type(sre_compile.compile('', 0))
 Match = type(sre_compile.compile('', 0).match(''))
 
+class RegexSet:
+    """A set of patterns, matched against a string together.
+
+    The match(), fullmatch() and search() methods return the sorted list
+    of the indices of the patterns which match.  Each pattern is only
+    tried if the string contains the literal prefix the pattern starts
+    with, if any, at the right place."""
+
+    def __init__(self, patterns, flags=0):
+        if isinstance(flags, RegexFlag):
+            flags = flags.value
+        compiled = []
+        self._unprefixed = []
+        self._prefixes = {}     # prefix -> [index]
+        for index, pattern in enumerate(patterns):
+            if isinstance(pattern, Pattern):
+                if flags:
+                    raise ValueError(
+                        "cannot process flags argument with a compiled pattern")
+                p = sre_parse.parse(pattern.pattern, pattern.flags)
+                prefix = sre_compile._literal_prefix(p, pattern.flags)
+            elif sre_compile.isstring(pattern):
+                p = sre_parse.parse(pattern, flags)
+                prefix = sre_compile._literal_prefix(p, flags)
+                pattern = _sre.compile(
+                    *sre_compile._compile_args(pattern, p, flags))
+            else:
+                raise TypeError("patterns must be strings or compiled "
+                                "patterns")
+            compiled.append(pattern)
+            if not prefix:
+                self._unprefixed.append(index)
+                continue
+            if isinstance(pattern.pattern, str):
+                prefix = ''.join(map(chr, prefix))
+            else:
+                prefix = bytes(prefix)
+            self._prefixes.setdefault(prefix, []).append(index)
+        self.patterns = tuple(compiled)
+        # At a given position, each length of prefix needs one lookup.
+        self._lengths = sorted({len(prefix) for prefix in self._prefixes})
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__,
+                           [p.pattern for p in self.patterns])
+
+    def _anchored_candidates(self, string, pos, endpos):
+        if not isinstance(string, (str, bytes)):
+            return range(len(self.patterns))
+        candidates = self._unprefixed
+        if pos < 0:
+            pos = 0
+        endpos = min(endpos, len(string))
+        for length in self._lengths:
+            if pos + length > endpos:
+                break
+            indices = self._prefixes.get(string[pos:pos+length])
+            if indices:
+                candidates = candidates + indices
+        return candidates
+
+    def match(self, string, pos=0, endpos=sys.maxsize):
+        """Return the sorted indices of the patterns which match at the
+        beginning of the string."""
+        return sorted(index
+                      for index in self._anchored_candidates(string, pos, endpos)
+                      if self.patterns[index].match(string, pos, endpos))
+
+    def fullmatch(self, string, pos=0, endpos=sys.maxsize):
+        """Return the sorted indices of the patterns which match all of
+        the string."""
+        return sorted(index
+                      for index in self._anchored_candidates(string, pos, endpos)
+                      if self.patterns[index].fullmatch(string, pos, endpos))
+
+    def search(self, string, pos=0, endpos=sys.maxsize):
+        """Return the sorted indices of the patterns which match anywhere
+        in the string."""
+        if not isinstance(string, (str, bytes)):
+            return [index for index, p in enumerate(self.patterns)
+                    if p.search(string, pos, endpos)]
+        candidates = self._unprefixed[:]
+        for prefix, indices in self._prefixes.items():
+            if string.find(prefix, pos, endpos) >= 0:
+                candidates += indices
+        return sorted(index for index in candidates
+                      if self.patterns[index].search(string, pos, endpos))
+
 # --------------------------------------------------------------------
 # internals
 
-_cache = {}  # ordered!
+_cache = {}  # LRU
+_cache2 = {}  # FIFO
+_cache_hits = itertools.count()
+_cache_misses = itertools.count()
 
 _MAXCACHE = 512
+_MAXCACHE2 = 256
 def _compile(pattern, flags):
     # internal: compile pattern
     if isinstance(flags, RegexFlag):
         flags = flags.value
     try:
-        return _cache[type(pattern), pattern, flags]
+        p = _cache2[type(pattern), pattern, flags]
     except KeyError:
         pass
-    if isinstance(pattern, Pattern):
-        if flags:
-            raise ValueError(
-                "cannot process flags argument with a compiled pattern")
-        return pattern
-    if not sre_compile.isstring(pattern):
-        raise TypeError("first argument must be string or compiled pattern")
-    p = sre_compile.compile(pattern, flags)
-    if not (flags & DEBUG):
-        if len(_cache) >= _MAXCACHE:
-            # Drop the oldest item
+    else:
+        next(_cache_hits)
+        return p
+    key = type(pattern), pattern, flags
+    # Item in _cache should be moved to the end if found.
+    p = _cache.pop(key, None)
+    if p is None:
+        if isinstance(pattern, Pattern):
+            if flags:
+                raise ValueError(
+                    "cannot process flags argument with a compiled pattern")
+            return pattern
+        if not sre_compile.isstring(pattern):
+            raise TypeError("first argument must be string or compiled pattern")
+        p = sre_compile.compile(pattern, flags)
+        next(_cache_misses)
+        if flags & DEBUG:
+            return p
+    else:
+        next(_cache_hits)
+    _cache_add(key, p)
+    return p
+
+def _cache_add(key, p):
+    # internal: add to the end of both caches, dropping their oldest items
+    # if they are full.  The small _cache2 spares the most recently used
+    # patterns the moving to the end of _cache.
+    for cache, size in (_cache, _MAXCACHE), (_cache2, _MAXCACHE2):
+        if len(cache) >= size:
+            if not size:
+                continue
             try:
-                del _cache[next(iter(_cache))]
+                del cache[next(iter(cache))]
             except (StopIteration, RuntimeError, KeyError):
                 pass
-        _cache[type(pattern), pattern, flags] = p
-    return p
+        cache[key] = p
+
+def _cache_signature():
+    # internal: what the compiled code saved by save_cache() depends on
+    return (_sre.MAGIC, _sre.CODESIZE, _sre.MAXREPEAT,
+            _sre.MAXGROUPS)
 
 @functools.lru_cache(_MAXCACHE)
 def _compile_repl(repl, pattern):
@@ -533,6 +533,37 @@ def _get_charset_prefix(pattern, flags):
         return charset
     return None
 
+def _literal_prefix(p, flags):
+    # internal: return the code points of the literal string which all
+    # matches of the parsed pattern start with (possibly empty)
+    flags = p.state.flags | flags
+    if flags & SRE_FLAG_IGNORECASE and flags & SRE_FLAG_LOCALE:
+        return []
+    return _get_literal_prefix(p, flags)[0]
+
+def _get_required_literal(pattern, flags):
+    # internal: return the longest string of literals which every match of
+    # the pattern contains, unless it is the literal prefix, which the
+    # search already uses
+    if flags & SRE_FLAG_IGNORECASE and flags & SRE_FLAG_LOCALE:
+        return []
+    runs = [[]]
+    _get_literal_runs(pattern, _get_iscased(flags), runs)
+    longest = max(runs, key=len)
+    if longest is runs[0]:
+        return []
+    return longest
+
+def _get_literal_runs(pattern, iscased, runs):
+    for op, av in pattern.data:
+        if op is LITERAL and not (iscased and iscased(av)):
+            runs[-1].append(av)
+        elif op is SUBPATTERN and not av[1] and not av[2]:
+            # a group without flags: its contents follow the previous ones
+            _get_literal_runs(av[3], iscased, runs)
+        elif runs[-1] or len(runs) == 1:
+            runs.append([])
+
 def _compile_info(code, pattern, flags):
     # internal: compile an info block.  in the current version,
     # this contains min/max pattern width, and an optional literal
@@ -765,6 +796,11 @@ def compile(p, flags=0):
     else:
         pattern = None
 
+    return _sre.compile(*_compile_args(pattern, p, flags))
+
+def _compile_args(pattern, p, flags):
+    # internal: return the arguments of _sre.compile() for a parsed pattern
+
     code = _code(p, flags)
 
     if flags & SRE_FLAG_DEBUG:
@@ -777,8 +813,7 @@ def compile(p, flags=0):
     for k, i in groupindex.items():
         indexgroup[i] = k
 
-    return _sre.compile(
-        pattern, flags | p.state.flags, code,
-        p.state.groups-1,
-        groupindex, tuple(indexgroup)
-        )
+    return (pattern, flags | p.state.flags, code,
+            p.state.groups-1,
+            groupindex, tuple(indexgroup),
+            _get_required_literal(p, flags | p.state.flags) or None)
@@ -46,6 +46,8 @@ import time
 import struct
 import copy
 import re
+import collections
+import marshal
 
 try:
     import pwd
@@ -357,6 +359,7 @@ class _Stream:
         self.buf      = b""
         self.pos      = 0
         self.closed   = False
+        self.ended    = False     # no member follows the last one read
 
         try:
             if comptype == "gz":
@@ -529,6 +532,8 @@ class _Stream:
         c = len(self.dbuf)
         t = [self.dbuf]
         while c < size:
+            if self.cmp.eof and not self._next_member():
+                break
             # Skip underlying buffer to avoid unaligned double buffering.
             if self.buf:
                 buf = self.buf
@@ -547,6 +552,31 @@ class _Stream:
         self.dbuf = t[size:]
         return t[:size]
 
+    def _next_member(self):
+        """Start decompressing the next gzip member, bzip2 stream or xz
+           stream that follows the current one, as written by parallel
+           compressors. Return False if there is none.
+        """
+        if self.ended:
+            return False
+        self.buf = self.cmp.unused_data + self.buf
+        if self.comptype == "gz":
+            self.__read(8)      # CRC32 and ISIZE of the previous member
+            magic = self.__read(2)
+            self.buf = magic + self.buf
+            if magic != b"\037\213":
+                self.ended = True
+                return False
+            self._init_read_gz()
+        else:
+            data = self.__read(1)
+            if not data:
+                self.ended = True
+                return False
+            self.buf = data + self.buf
+            self.cmp = type(self.cmp)()
+        return True
+
     def __read(self, size):
         """Return size bytes from stream. If internal buffer is empty,
            read another block from the stream.
@@ -564,6 +594,83 @@ class _Stream:
         return t[:size]
 # class _Stream
 
+class _ParallelCompressor:
+    """Class that compresses the data written to it in blocks, using a
+       pool of threads.  Every block is compressed on its own by the
+       compress function, as a gzip member, bzip2 stream or xz stream,
+       and written to fileobj in order.  Decompressors read such
+       concatenations as a single stream.
+
+       _ParallelCompressor is intended to be used only internally.
+    """
+
+    def __init__(self, name, mode, fileobj, compress, blocksize, max_workers):
+        """Construct a _ParallelCompressor object.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers)
+
+        self._extfileobj = True
+        if fileobj is None:
+            fileobj = bltn_open(name, mode + "b")
+            self._extfileobj = False
+
+        self.fileobj     = fileobj
+        self.compress    = compress
+        self.blocksize   = blocksize
+        self.max_pending = 2 * max_workers
+        self.pending     = collections.deque()
+        self.blocks      = 0
+        self.buf         = bytearray()
+        self.pos         = 0
+        self.closed      = False
+
+    def write(self, s):
+        """Write string s to the stream.
+        """
+        self.buf += s
+        self.pos += len(s)
+        while len(self.buf) >= self.blocksize:
+            self._submit(bytes(self.buf[:self.blocksize]))
+            del self.buf[:self.blocksize]
+
+    def _submit(self, block):
+        """Compress block in the pool.  Write the blocks already compressed,
+           and wait for the oldest ones when too many are held in memory.
+        """
+        first = not self.blocks
+        self.blocks += 1
+        self.pending.append(self.executor.submit(self.compress, block, first))
+        while self.pending and (self.pending[0].done() or
+                                len(self.pending) > self.max_pending):
+            self.fileobj.write(self.pending.popleft().result())
+
+    def tell(self):
+        """Return the stream's file pointer position.
+        """
+        return self.pos
+
+    def close(self):
+        """Close the _ParallelCompressor object. No operation should be
+           done on it afterwards.
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        try:
+            if self.buf or not self.blocks:
+                self._submit(bytes(self.buf))
+                self.buf = bytearray()
+            while self.pending:
+                self.fileobj.write(self.pending.popleft().result())
+        finally:
+            self.pending.clear()
+            self.executor.shutdown()
+            if not self._extfileobj:
+                self.fileobj.close()
+# class _ParallelCompressor
+
 class _StreamProxy(object):
     """Small proxy class that enables transparent compression
        detection for the Stream interface (mode 'r|*').
@@ -1436,6 +1543,9 @@ class TarFile(object):
 
     fileobject = ExFileObject   # The file-object for extractfile().
 
+    gzip_blocksize = 1 << 20    # Size of the blocks compressed in parallel
+    xz_blocksize = 1 << 23      # when max_workers is given.
+
     def __init__(self, name=None, mode="r", fileobj=None, format=None,
             tarinfo=None, dereference=None, ignore_zeros=None, encoding=None,
             errors="surrogateescape", pax_headers=None, debug=None,
@@ -1647,12 +1757,20 @@ class TarFile(object):
         return cls(name, mode, fileobj, **kwargs)
 
     @classmethod
-    def gzopen(cls, name, mode="r", fileobj=None, compresslevel=9, **kwargs):
+    def gzopen(cls, name, mode="r", fileobj=None, compresslevel=9, *,
+               max_workers=None, index=None, **kwargs):
         """Open gzip compressed tar archive name for reading or writing.
-           Appending is not allowed.
+           Appending is not allowed. When writing, max_workers threads
+           compress blocks of the archive as separate gzip members, and
+           when reading, they decompress them. When reading, index is the
+           path of a file recording the members and the index of the gzip
+           file, which is created with a full scan of the archive if it
+           does not match it.
         """
         if mode not in ("r", "w", "x"):
             raise ValueError("mode must be 'r', 'w' or 'x'")
+        if index is not None and mode != "r":
+            raise ValueError("index is only supported for reading")
 
         try:
             import gzip
@@ -1660,13 +1778,37 @@ class TarFile(object):
         except (ImportError, AttributeError):
             raise CompressionError("gzip module is not available")
 
+        if max_workers is not None and mode != "r":
+            if name is None:
+                name = getattr(fileobj, "name", None)
+                if not isinstance(name, (str, bytes)):
+                    name = None
+            mtime = time.time()
+            def compress(block, first):
+                buf = io.BytesIO()
+                with gzip.GzipFile(name if first else "", "wb",
+                                   compresslevel, buf, mtime) as f:
+                    f.write(block)
+                return buf.getvalue()
+            fileobj = _ParallelCompressor(name, mode, fileobj, compress,
+                                          cls.gzip_blocksize, max_workers)
+            return cls._compressedopen(name, mode, fileobj, **kwargs)
+
         try:
-            fileobj = gzip.GzipFile(name, mode + "b", compresslevel, fileobj)
+            fileobj = gzip.GzipFile(name, mode + "b", compresslevel, fileobj,
+                                    max_workers=max_workers)
         except OSError:
             if fileobj is not None and mode == 'r':
                 raise ReadError("not a gzip file")
             raise
 
+        if index is not None:
+            try:
+                members = cls._gzreadindex(fileobj, index)
+            except:
+                fileobj.close()
+                raise
+
         try:
             t = cls.taropen(name, mode, fileobj, **kwargs)
         except OSError:
@@ -1678,12 +1820,64 @@ class TarFile(object):
             fileobj.close()
             raise
         t._extfileobj = False
+
+        if index is not None:
+            try:
+                if members is None:
+                    fileobj.build_index()
+                    t._load()
+                    t._gzwriteindex(index, fileobj.export_index())
+                else:
+                    t.members = []
+                    for values in members:
+                        tarinfo = t.tarinfo()
+                        for attr, value in zip(cls._index_attrs, values):
+                            setattr(tarinfo, attr, value)
+                        t.members.append(tarinfo)
+                    t._loaded = True
+            except:
+                t.close()
+                raise
         return t
 
+    # Attributes of the TarInfo objects recorded in gzip index files.
+    _index_attrs = ("name", "mode", "uid", "gid", "size", "mtime", "chksum",
+                    "type", "linkname", "uname", "gname", "devmajor",
+                    "devminor", "offset", "offset_data", "pax_headers",
+                    "sparse")
+    _index_magic = "tarfile gzip index 1"
+
+    @staticmethod
+    def _gzreadindex(fileobj, index):
+        """Read the index file index of the gzip compressed archive fileobj
+           and import its gzip index. Return the members recorded, or None
+           if the index does not match the archive.
+        """
+        try:
+            with bltn_open(index, "rb") as f:
+                magic, members, gzindex = marshal.load(f)
+            if magic != TarFile._index_magic:
+                return None
+            fileobj.import_index(gzindex)
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            return None
+        return members
+
+    def _gzwriteindex(self, index, gzindex):
+        """Write the members and the gzip index gzindex of the archive to
+           the index file index.
+        """
+        members = [tuple(getattr(tarinfo, attr) for attr in self._index_attrs)
+                   for tarinfo in self.members]
+        with bltn_open(index, "wb") as f:
+            marshal.dump((self._index_magic, members, gzindex), f)
+
     @classmethod
-    def bz2open(cls, name, mode="r", fileobj=None, compresslevel=9, **kwargs):
+    def bz2open(cls, name, mode="r", fileobj=None, compresslevel=9, *,
+                max_workers=None, **kwargs):
         """Open bzip2 compressed tar archive name for reading or writing.
-           Appending is not allowed.
+           Appending is not allowed. When writing, max_workers threads
+           compress blocks of the archive as separate bzip2 streams.
         """
         if mode not in ("r", "w", "x"):
             raise ValueError("mode must be 'r', 'w' or 'x'")
@@ -1693,6 +1887,13 @@ class TarFile(object):
         except ImportError:
             raise CompressionError("bz2 module is not available")
 
+        if max_workers is not None and mode != "r":
+            def compress(block, first):
+                return bz2.compress(block, compresslevel)
+            fileobj = _ParallelCompressor(name, mode, fileobj, compress,
+                                          compresslevel * 100000, max_workers)
+            return cls._compressedopen(name, mode, fileobj, **kwargs)
+
         fileobj = bz2.BZ2File(fileobj or name, mode,
                               compresslevel=compresslevel)
 
@@ -1710,9 +1911,11 @@ class TarFile(object):
         return t
 
     @classmethod
-    def xzopen(cls, name, mode="r", fileobj=None, preset=None, **kwargs):
+    def xzopen(cls, name, mode="r", fileobj=None, preset=None, *,
+               max_workers=None, **kwargs):
         """Open lzma compressed tar archive name for reading or writing.
-           Appending is not allowed.
+           Appending is not allowed. When writing, max_workers threads
+           compress blocks of the archive as separate xz streams.
         """
         if mode not in ("r", "w", "x"):
             raise ValueError("mode must be 'r', 'w' or 'x'")
@@ -1722,6 +1925,13 @@ class TarFile(object):
         except ImportError:
             raise CompressionError("lzma module is not available")
 
+        if max_workers is not None and mode != "r":
+            def compress(block, first):
+                return lzma.compress(block, preset=preset)
+            fileobj = _ParallelCompressor(name, mode, fileobj, compress,
+                                          cls.xz_blocksize, max_workers)
+            return cls._compressedopen(name, mode, fileobj, **kwargs)
+
         fileobj = lzma.LZMAFile(fileobj or name, mode, preset=preset)
 
         try:
@@ -1737,6 +1947,19 @@ class TarFile(object):
         t._extfileobj = False
         return t
 
+    @classmethod
+    def _compressedopen(cls, name, mode, fileobj, **kwargs):
+        """Open a tar archive for writing to fileobj, a _ParallelCompressor
+           which is closed with it.
+        """
+        try:
+            t = cls.taropen(name, mode, fileobj, **kwargs)
+        except:
+            fileobj.close()
+            raise
+        t._extfileobj = False
+        return t
+
     # All *open() methods are registered here.
     OPEN_METH = {
         "tar": "taropen",   # uncompressed tar
@@ -181,7 +181,7 @@ def dash_R_cleanup(fs, ps, pic, zdc, abcs):
 
 def clear_caches():
     # Clear the warnings registry, so they can be displayed again
-    for mod in sys.modules.values():
+    for mod in list(sys.modules.values()):
         if hasattr(mod, '__warningregistry__'):
             del mod.__warningregistry__
 
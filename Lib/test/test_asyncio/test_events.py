@@ -2064,6 +2064,57 @@ else:
         def create_event_loop(self):
             return asyncio.SelectorEventLoop(selectors.SelectSelector())
 
+    if sys.platform.startswith('linux'):
+        from asyncio import uring_events
+
+        @unittest.skipUnless(uring_events.is_supported(),
+                             'io_uring is not supported')
+        class UringEventLoopTests(UnixEventLoopTestsMixin,
+                                  SubprocessTestsMixin,
+                                  test_utils.TestCase):
+
+            def create_event_loop(self):
+                return asyncio.UringEventLoop()
+
+            def test_reader_callback(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_reader()")
+
+            def test_reader_callback_cancel(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_reader()")
+
+            def test_writer_callback(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_writer()")
+
+            def test_writer_callback_cancel(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_writer()")
+
+            def test_remove_fds_after_closing(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_reader()")
+
+            def test_write_pipe(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop submits writes at the next iteration "
+                    "of the loop, the test reads them before")
+
+            def test_write_pty(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop submits writes at the next iteration "
+                    "of the loop, the test reads them before")
+
+            def test_bidirectional_pty(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop submits writes at the next iteration "
+                    "of the loop, the test reads them before")
+
+            def test_unclosed_pipe_transport(self):
+                raise unittest.SkipTest(
+                    "test specific to the Unix pipe transports")
+
 
 def noop(*args, **kwargs):
     pass
@@ -317,13 +317,11 @@ class BaseSelectorEventLoopTests(test_utils.TestCase):
         reader = mock.Mock()
         reader._cancelled = False
 
-        self.loop._add_callback = mock.Mock()
         self.loop._process_events(
             [(selectors.SelectorKey(
                 1, 1, selectors.EVENT_READ, (reader, None)),
               selectors.EVENT_READ)])
-        self.assertTrue(self.loop._add_callback.called)
-        self.loop._add_callback.assert_called_with(reader)
+        self.assertEqual(list(self.loop._ready), [reader])
 
     def test_process_events_read_cancelled(self):
         reader = mock.Mock()
@@ -340,12 +338,30 @@ class BaseSelectorEventLoopTests(test_utils.TestCase):
         writer = mock.Mock()
         writer._cancelled = False
 
-        self.loop._add_callback = mock.Mock()
         self.loop._process_events(
             [(selectors.SelectorKey(1, 1, selectors.EVENT_WRITE,
                                     (None, writer)),
               selectors.EVENT_WRITE)])
-        self.loop._add_callback.assert_called_with(writer)
+        self.assertEqual(list(self.loop._ready), [writer])
+
+    def test_process_events_read_write(self):
+        reader = mock.Mock()
+        reader._cancelled = False
+        writer = mock.Mock()
+        writer._cancelled = False
+        cancelled = mock.Mock()
+        cancelled._cancelled = True
+        self.loop._remove_reader = mock.Mock()
+
+        self.loop._process_events(
+            [(selectors.SelectorKey(1, 1, selectors.EVENT_READ |
+                                    selectors.EVENT_WRITE, (reader, writer)),
+              selectors.EVENT_READ | selectors.EVENT_WRITE),
+             (selectors.SelectorKey(2, 2, selectors.EVENT_READ,
+                                    (cancelled, None)),
+              selectors.EVENT_READ)])
+        self.assertEqual(list(self.loop._ready), [reader, writer])
+        self.loop._remove_reader.assert_called_with(2)
 
     def test_process_events_write_cancelled(self):
         writer = mock.Mock()
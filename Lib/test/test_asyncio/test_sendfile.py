@@ -553,3 +553,14 @@ else:
 
         def create_event_loop(self):
             return asyncio.SelectorEventLoop(selectors.SelectSelector())
+
+    if sys.platform.startswith('linux'):
+        from asyncio import uring_events
+
+        @unittest.skipUnless(uring_events.is_supported(),
+                             'io_uring is not supported')
+        class UringEventLoopTests(SendfileTestsBase,
+                                  test_utils.TestCase):
+
+            def create_event_loop(self):
+                return asyncio.UringEventLoop()
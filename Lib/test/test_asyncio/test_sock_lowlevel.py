@@ -1,6 +1,7 @@
 import socket
 import asyncio
 import sys
+import unittest
 from asyncio import proactor_events
 from itertools import cycle, islice
 from test.test_asyncio import utils as test_utils
@@ -341,3 +342,14 @@ else:
 
         def create_event_loop(self):
             return asyncio.SelectorEventLoop(selectors.SelectSelector())
+
+    if sys.platform.startswith('linux'):
+        from asyncio import uring_events
+
+        @unittest.skipUnless(uring_events.is_supported(),
+                             'io_uring is not supported')
+        class UringEventLoopTests(BaseSockTestsMixin,
+                                  test_utils.TestCase):
+
+            def create_event_loop(self):
+                return asyncio.UringEventLoop()
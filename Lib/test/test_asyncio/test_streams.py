@@ -634,6 +634,164 @@ class StreamTests(test_utils.TestCase):
         self.assertRaises(
             ValueError, self.loop.run_until_complete, stream.readexactly(2))
 
+    def test_readinto(self):
+        stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
+                                loop=self.loop,
+                                _asyncio_internal=True)
+        buf = bytearray(10)
+        read_task = asyncio.Task(stream.readinto(buf), loop=self.loop)
+
+        def cb():
+            stream.feed_data(self.DATA)
+        self.loop.call_soon(cb)
+
+        nbytes = self.loop.run_until_complete(read_task)
+        self.assertEqual(nbytes, 10)
+        self.assertEqual(buf, self.DATA[:10])
+        self.assertEqual(self.DATA[10:], stream._buffer)
+
+        buf = bytearray(100)
+        nbytes = self.loop.run_until_complete(stream.readinto(buf))
+        self.assertEqual(buf[:nbytes], self.DATA[10:])
+        self.assertEqual(b'', stream._buffer)
+
+        self.assertEqual(
+            self.loop.run_until_complete(stream.readinto(bytearray())), 0)
+        stream.feed_eof()
+        self.assertEqual(self.loop.run_until_complete(stream.readinto(buf)),
+                         0)
+
+    def test_readview(self):
+        stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
+                                loop=self.loop,
+                                _asyncio_internal=True)
+        stream.feed_data(self.DATA)
+
+        data = self.loop.run_until_complete(stream.readview(6))
+        self.assertIsInstance(data, memoryview)
+        self.assertTrue(data.readonly)
+        self.assertEqual(data, b'line1\n')
+        # The data seen through the view is not overwritten by new data
+        stream.feed_data(b'x' * 100000)
+        self.assertEqual(data, b'line1\n')
+        self.assertEqual(self.DATA[6:] + b'x' * 100000, stream._buffer)
+
+        read_task = asyncio.Task(stream.readview(), loop=self.loop)
+
+        def cb():
+            stream.feed_data(b'end')
+            stream.feed_eof()
+        self.loop.call_soon(cb)
+
+        data = self.loop.run_until_complete(read_task)
+        self.assertEqual(data, self.DATA[6:] + b'x' * 100000 + b'end')
+        self.assertEqual(b'', stream._buffer)
+
+    def test_readview_no_copy(self):
+        stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
+                                loop=self.loop,
+                                _asyncio_internal=True)
+        stream.feed_data(b'a' * 3000)
+        views = [self.loop.run_until_complete(stream.readview(1000))
+                 for i in range(3)]
+        # The views expose the buffer itself
+        for view in views:
+            self.assertIs(view.obj, stream._buffer._data)
+        # The buffer is not compacted or reused over them
+        stream.feed_data(b'b' * 3000)
+        views.append(self.loop.run_until_complete(stream.readview(10)))
+        stream._buffer.clear()
+        stream.feed_data(b'c' * 3000)
+        self.assertEqual([bytes(view) for view in views],
+                         [b'a' * 1000] * 3 + [b'b' * 10])
+        self.assertEqual(b'c' * 3000, stream._buffer)
+
+    def test_buffered_protocol(self):
+        stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
+                                loop=self.loop,
+                                _asyncio_internal=True)
+        protocol = _StreamProtocol(stream, loop=self.loop,
+                                   _asyncio_internal=True)
+        self.assertIsInstance(protocol, asyncio.BufferedProtocol)
+        stream.feed_data(b'ab')
+        self.loop.run_until_complete(stream.readexactly(1))
+
+        # The transport receives data directly into the stream's buffer,
+        # which is reused once the data is consumed.
+        for i in range(10):
+            buf = protocol.get_buffer(-1)
+            self.assertGreaterEqual(len(buf), len(self.DATA))
+            buf[:len(self.DATA)] = self.DATA
+            protocol.buffer_updated(len(self.DATA))
+            line = self.loop.run_until_complete(stream.readline())
+            self.assertEqual(line, b'b' + self.DATA[:6] if i == 0
+                             else self.DATA[:6])
+            self.assertEqual(self.DATA[6:], stream._buffer)
+            self.loop.run_until_complete(stream.readexactly(12))
+
+        buf = protocol.get_buffer(2 ** 20)
+        self.assertGreaterEqual(len(buf), 2 ** 20)
+        buf[:3] = b'abc'
+        protocol.buffer_updated(3)
+        self.assertEqual(b'abc', stream._buffer)
+
+    def test_buffer_size(self):
+        stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
+                                loop=self.loop,
+                                _asyncio_internal=True)
+        protocol = _StreamProtocol(stream, loop=self.loop,
+                                   _asyncio_internal=True)
+        # The buffer starts small and grows while the transport fills it
+        sizes = []
+        for i in range(8):
+            buf = protocol.get_buffer(-1)
+            sizes.append(len(buf))
+            protocol.buffer_updated(len(buf))
+            self.loop.run_until_complete(stream.readexactly(len(buf)))
+        self.assertLess(sizes[0], 2 ** 16)
+        self.assertEqual(sizes[-1], 2 ** 16)
+        self.assertEqual(sizes, sorted(sizes))
+
+        # A buffer grown by a large read is released once drained
+        buf = protocol.get_buffer(2 ** 20)
+        protocol.buffer_updated(2 ** 20)
+        self.assertGreaterEqual(len(stream._buffer._data), 2 ** 20)
+        self.loop.run_until_complete(stream.readexactly(2 ** 20))
+        self.assertLessEqual(len(stream._buffer._data), 2 ** 16)
+
+    def test_data_received_override(self):
+        received = []
+
+        class Protocol(asyncio.streams.StreamReaderProtocol):
+            def data_received(self, data):
+                received.append(data)
+
+        reader = asyncio.streams.StreamReader(loop=self.loop)
+        protocol = Protocol(reader, loop=self.loop, _asyncio_internal=True)
+        buf = protocol.get_buffer(-1)
+        buf[:4] = b'spam'
+        protocol.buffer_updated(4)
+        buf = protocol.get_buffer(-1)
+        buf[:3] = b'egg'
+        protocol.buffer_updated(3)
+        self.assertEqual(received, [b'spam', b'egg'])
+        self.assertEqual(len(reader._buffer), 0)
+
+        class StreamProtocol(_StreamProtocol):
+            def data_received(self, data):
+                received.append(data)
+
+        stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
+                                loop=self.loop,
+                                _asyncio_internal=True)
+        protocol = StreamProtocol(stream, loop=self.loop,
+                                  _asyncio_internal=True)
+        buf = protocol.get_buffer(-1)
+        buf[:3] = b'ham'
+        protocol.buffer_updated(3)
+        self.assertEqual(received[-1], b'ham')
+        self.assertEqual(len(stream._buffer), 0)
+
     def test_exception(self):
         stream = asyncio.Stream(mode=asyncio.StreamMode.READ,
                                 loop=self.loop,
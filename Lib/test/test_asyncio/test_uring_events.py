@@ -0,0 +1,201 @@
+import errno
+import socket
+import sys
+import unittest
+from unittest import mock
+
+if not sys.platform.startswith('linux'):
+    raise unittest.SkipTest('Linux only')
+
+import asyncio
+from asyncio import uring_events
+from test.test_asyncio import utils as test_utils
+
+if not uring_events.is_supported():
+    raise unittest.SkipTest('io_uring is not supported')
+
+import _uring
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class RingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = _uring.Ring(4)
+        self.addCleanup(self.ring.close)
+        self.a, self.b = socket.socketpair()
+        self.addCleanup(self.a.close)
+        self.addCleanup(self.b.close)
+
+    def test_recv_send(self):
+        buf = bytearray(10)
+        self.ring.recv(1, self.a.fileno(), buf)
+        self.ring.send(2, self.b.fileno(), b'abc')
+        results = self.ring.wait(5)
+        if len(results) < 2:
+            results += self.ring.wait(5)
+        self.assertEqual(sorted(results), [(1, 3), (2, 3)])
+        self.assertEqual(buf[:3], b'abc')
+
+    def test_wait_timeout(self):
+        self.assertEqual(self.ring.wait(0), [])
+        self.ring.recv(1, self.a.fileno(), bytearray(10))
+        self.assertEqual(self.ring.wait(0.01), [])
+
+    def test_cancel(self):
+        self.ring.poll(1, self.a.fileno(), 1)
+        self.ring.cancel(2, 1)
+        results = self.ring.wait(5)
+        if len(results) < 2:
+            results += self.ring.wait(5)
+        self.assertEqual(sorted(results), [(1, -errno.ECANCELED), (2, 0)])
+
+    def test_errors(self):
+        self.ring.recv(1, self.a.fileno(), bytearray(10))
+        with self.assertRaises(ValueError):
+            self.ring.recv(1, self.a.fileno(), bytearray(10))
+        with self.assertRaises(TypeError):
+            self.ring.recv(2, self.a.fileno(), b'read-only')
+        self.ring.read(3, -1, bytearray(10))
+        self.assertIn((3, -errno.EBADF), self.ring.wait(5))
+
+    def test_many_operations(self):
+        # More operations than entries in the submission queue
+        for i in range(10):
+            self.ring.poll(i, self.b.fileno(), 4)
+        results = []
+        while len(results) < 10:
+            results += self.ring.wait(5)
+        self.assertEqual(sorted(results), [(i, 4) for i in range(10)])
+
+    def test_close(self):
+        self.ring.close()
+        self.assertTrue(self.ring.closed)
+        with self.assertRaises(ValueError):
+            self.ring.wait(0)
+        with self.assertRaises(ValueError):
+            self.ring.fileno()
+
+
+class UringProactorTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.UringEventLoop()
+        self.set_event_loop(self.loop)
+
+    def test_batched_submission(self):
+        socks = [socket.socketpair() for i in range(4)]
+        for a, b in socks:
+            a.setblocking(False)
+            b.setblocking(False)
+            self.addCleanup(a.close)
+            self.addCleanup(b.close)
+
+        async def echo():
+            reads = [self.loop.sock_recv(a, 10) for a, b in socks]
+            writes = [self.loop.sock_sendall(b, b'x%d' % i)
+                      for i, (a, b) in enumerate(socks)]
+            return await asyncio.gather(*reads, *writes)
+
+        ring = self.loop._proactor._ring
+        completions = []
+
+        def wait(timeout):
+            result = ring.wait(timeout)
+            completions.append(len(result))
+            return result
+
+        with mock.patch.object(self.loop._proactor, '_ring',
+                               mock.Mock(wraps=ring, wait=wait)):
+            results = self.loop.run_until_complete(echo())
+        self.assertEqual(results[:4], [b'x0', b'x1', b'x2', b'x3'])
+        # The 8 operations were submitted by a single system call, which
+        # also returned their completions.
+        self.assertIn(8, completions)
+
+    def test_recv_cancel(self):
+        a, b = socket.socketpair()
+        a.setblocking(False)
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(
+                asyncio.wait_for(self.loop.sock_recv(a, 10), 0.01))
+        test_utils.run_briefly(self.loop)
+        # Only the read of the self-pipe is left
+        self.assertEqual(len(self.loop._proactor._cache), 1)
+
+        b.send(b'data')
+        data = self.loop.run_until_complete(self.loop.sock_recv(a, 10))
+        self.assertEqual(data, b'data')
+
+    def test_accept_connect(self):
+        listener = socket.socket()
+        listener.setblocking(False)
+        self.addCleanup(listener.close)
+        listener.bind(('127.0.0.1', 0))
+        listener.listen()
+        client = socket.socket()
+        client.setblocking(False)
+        self.addCleanup(client.close)
+
+        async def connect():
+            return await asyncio.gather(
+                self.loop.sock_accept(listener),
+                self.loop.sock_connect(client, listener.getsockname()))
+
+        (conn, addr), _ = self.loop.run_until_complete(connect())
+        self.addCleanup(conn.close)
+        self.assertEqual(addr, client.getsockname())
+        self.assertEqual(conn.gettimeout(), 0)
+        self.assertTrue(conn.get_inheritable() is False)
+
+    def test_connect_refused(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        addr = sock.getsockname()
+        sock.close()
+        client = socket.socket()
+        client.setblocking(False)
+        self.addCleanup(client.close)
+        with self.assertRaises(ConnectionRefusedError):
+            self.loop.run_until_complete(self.loop.sock_connect(client, addr))
+
+    def test_close_pending(self):
+        a, b = socket.socketpair()
+        a.setblocking(False)
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        fut = self.loop._proactor.recv(a, 10)
+        self.loop._proactor.close()
+        self.assertTrue(fut.cancelled())
+        self.assertEqual(self.loop._proactor._cache, {})
+
+
+class UringEventLoopPolicyTests(unittest.TestCase):
+
+    def test_new_event_loop(self):
+        policy = asyncio.UringEventLoopPolicy()
+        loop = policy.new_event_loop()
+        try:
+            self.assertIsInstance(loop, asyncio.UringEventLoop)
+        finally:
+            loop.close()
+
+    def test_fallback(self):
+        policy = asyncio.UringEventLoopPolicy()
+        with mock.patch.object(uring_events, '_supported', False):
+            loop = policy.new_event_loop()
+        try:
+            self.assertIsInstance(loop, asyncio.SelectorEventLoop)
+        finally:
+            loop.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import sys
 import compileall
 import importlib.util
 import test.test_importlib.util
+import marshal
 import os
 import pathlib
 import py_compile
@@ -554,6 +555,40 @@ class CommandLineTestsBase:
             data = fp.read()
         self.assertEqual(int.from_bytes(data[4:8], 'little'), 0b01)
 
+    def test_import_index(self):
+        index = os.path.join(self.directory, 'import.index')
+        self.assertRunOK('-q', '--import-index', index, self.pkgdir)
+        self.assertCompiled(self.barfn)
+        with open(index, 'rb') as file:
+            magic, entries = marshal.loads(file.read())
+        self.assertEqual(magic, importlib.util.MAGIC_NUMBER)
+        pycache = os.path.join(self.pkgdir, '__pycache__')
+        self.assertEqual(sorted(entries), [self.pkgdir, pycache])
+        st, names, files = marshal.loads(entries[self.pkgdir])
+        self.assertIn('bar.py', names)
+        self.assertIn('__pycache__', names)
+        self.assertEqual(files['bar.py'][2], os.stat(self.barfn).st_size)
+
+    def test_import_index_error(self):
+        index = os.path.join(self.directory, 'missing', 'import.index')
+        rc, out, err = self.assertRunNotOK('--import-index', index,
+                                           self.pkgdir)
+        self.assertRegex(out, b'Error writing import index')
+
+    def test_bundle(self):
+        bundle = os.path.join(self.directory, 'modules.pyb')
+        self.assertRunOK('-q', '--bundle', bundle, self.directory)
+        self.assertNotCompiled(self.barfn)
+        finder = importlib.machinery.BytecodeBundleFinder(bundle)
+        self.addCleanup(finder._file.close)
+        self.assertEqual(sorted(finder._index), ['foo', 'foo.bar'])
+        self.assertEqual(finder.get_filename('foo.bar'), self.barfn)
+
+    def test_bundle_error(self):
+        bundle = os.path.join(self.directory, 'missing', 'modules.pyb')
+        rc, out, err = self.assertRunNotOK('--bundle', bundle, self.pkgdir)
+        self.assertRegex(out, b'Error writing bytecode bundle')
+
     @skipUnless(_have_multiprocessing, "requires multiprocessing")
     def test_workers(self):
         bar2fn = script_helper.make_script(self.directory, 'bar2', '')
@@ -7,7 +7,9 @@ test.support.import_module('multiprocessing.synchronize')
 
 from test.support.script_helper import assert_python_ok
 
+import array
 import contextlib
+import functools
 import itertools
 import logging
 from logging.handlers import QueueHandler
@@ -71,6 +73,9 @@ def init(x):
 def get_init_status():
     return INITIALIZER_STATUS
 
+def is_imported(name):
+    return name in sys.modules
+
 def init_fail(log_queue=None):
     if log_queue is not None:
         logger = logging.getLogger('concurrent.futures')
@@ -81,6 +86,12 @@ def init_fail(log_queue=None):
     raise ValueError('error in initializer')
 
 
+def fork_join(executor, depth):
+    if depth == 0:
+        return 1
+    fs = [executor.submit(fork_join, executor, depth - 1) for _ in range(2)]
+    return sum(f.result() for f in fs)
+
 class MyObject(object):
     def my_method(self):
         pass
@@ -154,6 +165,11 @@ class ThreadPoolMixin(ExecutorMixin):
     executor_type = futures.ThreadPoolExecutor
 
 
+class ThreadPoolWorkStealingMixin(ExecutorMixin):
+    executor_type = functools.partial(futures.ThreadPoolExecutor,
+                                      work_stealing=True)
+
+
 class ProcessPoolForkMixin(ExecutorMixin):
     executor_type = futures.ProcessPoolExecutor
     ctx = "fork"
@@ -181,6 +197,7 @@ class ProcessPoolForkserverMixin(ExecutorMixin):
 
 def create_executor_tests(mixin, bases=(BaseTestCase,),
                           executor_mixins=(ThreadPoolMixin,
+                                           ThreadPoolWorkStealingMixin,
                                            ProcessPoolForkMixin,
                                            ProcessPoolForkserverMixin,
                                            ProcessPoolSpawnMixin)):
@@ -570,6 +587,11 @@ class ThreadPoolWaitTests(ThreadPoolMixin, WaitTests, BaseTestCase):
             sys.setswitchinterval(oldswitchinterval)
 
 
+class ThreadPoolWorkStealingWaitTests(ThreadPoolWorkStealingMixin,
+                                      ThreadPoolWaitTests):
+    pass
+
+
 create_executor_tests(WaitTests,
                       executor_mixins=(ProcessPoolForkMixin,
                                        ProcessPoolForkserverMixin,
@@ -685,6 +707,35 @@ class ExecutorTest:
                 list(self.executor.map(pow, range(10), range(10), chunksize=3)),
                 list(map(pow, range(10), range(10))))
 
+    def test_submit_many(self):
+        fs = self.executor.submit_many(pow, [(2, 8), (3, 2), (10, 3)])
+        self.assertEqual([f.result() for f in fs], [256, 9, 1000])
+        self.assertEqual(self.executor.submit_many(pow, []), [])
+
+    def test_submit_many_exception(self):
+        fs = self.executor.submit_many(divmod, [(1, 2), (1, 0), (1, 5)])
+        self.assertEqual(fs[0].result(), (0, 1))
+        self.assertRaises(ZeroDivisionError, fs[1].result)
+        self.assertEqual(fs[2].result(), (0, 1))
+
+    def test_map_buffersize(self):
+        ints = itertools.count()
+        results = self.executor.map(str, ints, buffersize=3)
+        self.assertEqual(list(itertools.islice(results, 10)),
+                         [str(i) for i in range(10)])
+        # The input is consumed lazily
+        self.assertLessEqual(next(ints), 14)
+
+        self.assertEqual(
+                list(self.executor.map(pow, range(10), range(10),
+                                       chunksize=3, buffersize=2)),
+                list(map(pow, range(10), range(10))))
+
+    def test_map_buffersize_invalid(self):
+        for buffersize in (0, -1):
+            with self.assertRaises(ValueError):
+                self.executor.map(str, range(4), buffersize=buffersize)
+
     def test_map_exception(self):
         i = self.executor.map(divmod, [1, 1, 1, 1], [2, 3, 0, 5])
         self.assertEqual(i.__next__(), (0, 1))
@@ -782,6 +833,33 @@ class ThreadPoolExecutorTest(ThreadPoolMixin, ExecutorTest, BaseTestCase):
         executor.shutdown(wait=True)
 
 
+class ThreadPoolWorkStealingExecutorTest(ThreadPoolWorkStealingMixin,
+                                         ThreadPoolExecutorTest):
+    def test_nested_submit(self):
+        # A worker waiting for the calls it submitted must not deadlock: the
+        # calls are queued on its local deque and stolen by idle workers.
+        self.assertEqual(
+            self.executor.submit(fork_join, self.executor, 2).result(), 4)
+
+    def test_nested_submit_many(self):
+        executor = self.executor
+        def fan_out(n):
+            return sum(f.result()
+                       for f in executor.submit_many(mul, [(i, 2)
+                                                           for i in range(n)]))
+
+        self.assertEqual(executor.submit(fan_out, 20).result(), 380)
+
+    def test_submit_many_batch(self):
+        executor = self.executor_type(4)
+        started = threading.Barrier(4, timeout=30)
+        # The batch is queued on the deque of a single worker and must be
+        # stolen by the other ones for the barrier to be passed.
+        fs = executor.submit_many(started.wait, [()] * 4)
+        self.assertEqual(sorted(f.result() for f in fs), [0, 1, 2, 3])
+        executor.shutdown(wait=True)
+
+
 class ProcessPoolExecutorTest(ExecutorTest):
 
     @unittest.skipUnless(sys.platform=='win32', 'Windows-only process limit')
@@ -853,6 +931,150 @@ class ProcessPoolExecutorTest(ExecutorTest):
 
         self.assertTrue(obj.event.wait(timeout=1))
 
+    def test_map_adaptive_chunksize(self):
+        self.assertEqual(
+                list(self.executor.map(pow, range(100), range(100),
+                                       chunksize=None)),
+                list(map(pow, range(100), range(100))))
+        ints = itertools.count()
+        results = self.executor.map(str, ints, chunksize=None, buffersize=2)
+        self.assertEqual(list(itertools.islice(results, 10)),
+                         [str(i) for i in range(10)])
+
+    def test_map_adaptive_chunksize_exception(self):
+        i = self.executor.map(divmod, [1] * 50, [1] * 40 + [0] + [1] * 9,
+                              chunksize=None)
+        results = []
+        with self.assertRaises(ZeroDivisionError):
+            for result in i:
+                results.append(result)
+        # The results computed in the same chunk as the failing call are lost
+        self.assertLessEqual(len(results), 40)
+        self.assertEqual(results, [(1, 0)] * len(results))
+
+    def _shared_memory_executor(self):
+        if sys.platform == 'win32':
+            self.skipTest('shared memory transport not supported on Windows')
+        test.support.import_module('_posixshmem')
+        return self.executor_type(max_workers=2,
+                                  mp_context=self.get_context(),
+                                  shared_memory_threshold=1024)
+
+    def test_shared_memory_threshold(self):
+        data = bytes(range(256)) * 1024
+        args = (data, bytearray(data), memoryview(data), b'small')
+        kwargs = {'mv': memoryview(array.array('i', range(1000)))}
+        with self._shared_memory_executor() as executor:
+            result_args, result_kwargs = executor.submit(capture, *args,
+                                                         **kwargs).result()
+            self.assertEqual(list(executor.map(len, [data] * 5,
+                                               chunksize=2)),
+                             [len(data)] * 5)
+        self.assertEqual(result_args, args)
+        self.assertEqual([type(arg) for arg in result_args],
+                         [bytes, bytearray, memoryview, bytes])
+        mv = result_kwargs['mv']
+        self.assertEqual(mv.format, 'i')
+        self.assertEqual(mv.tolist(), list(range(1000)))
+
+    def test_shared_memory_threshold_error(self):
+        with self._shared_memory_executor() as executor:
+            future = executor.submit(capture, b'x' * 4096, ErrorAtPickle())
+            with self.assertRaises(PicklingError):
+                future.result()
+            # The executor is still usable
+            self.assertEqual(executor.submit(len, b'x' * 4096).result(), 4096)
+
+    def test_shared_memory_threshold_invalid(self):
+        with self.assertRaises(ValueError):
+            self.executor_type(shared_memory_threshold=0)
+
+    def test_preload(self):
+        from multiprocessing import forkserver
+        preload_modules = forkserver._forkserver._preload_modules
+        with self.executor_type(max_workers=2,
+                                mp_context=self.get_context(),
+                                preload=['colorsys']) as executor:
+            self.assertTrue(executor.submit(is_imported, 'colorsys').result())
+        # The global preload list of the fork server is left unchanged
+        self.assertIs(forkserver._forkserver._preload_modules,
+                      preload_modules)
+
+    def test_preload_invalid(self):
+        with self.assertRaises(TypeError):
+            self.executor_type(preload=[sys])
+
+    def test_spawn_latencies(self):
+        self.assertEqual(self.executor.submit(abs, -1).result(), 1)
+        # The worker which ran the call was ready before sending its result
+        latencies = self.executor.spawn_latencies()
+        self.assertGreaterEqual(len(latencies), 1)
+        self.assertLessEqual(len(latencies), self.worker_count)
+        for latency in latencies:
+            self.assertGreaterEqual(latency, 0)
+
+
+class BufferedMapTests(unittest.TestCase):
+    def test_calls_in_flight(self):
+        # At most buffersize calls are submitted and not yet waited for.
+        in_flight = []
+
+        class ResultFuture(futures.Future):
+            def result(self, timeout=None):
+                if self in in_flight:
+                    in_flight.remove(self)
+                return super().result(timeout)
+
+        class ImmediateExecutor(futures.Executor):
+            def submit(self, fn, /, *args, **kwargs):
+                future = ResultFuture()
+                future.set_result(fn(*args, **kwargs))
+                in_flight.append(future)
+                self.max_in_flight = max(self.max_in_flight, len(in_flight))
+                return future
+
+        executor = ImmediateExecutor()
+        executor.max_in_flight = 0
+        results = executor.map(str, range(10), buffersize=3)
+        self.assertEqual(list(results), [str(i) for i in range(10)])
+        self.assertEqual(executor.max_in_flight, 3)
+
+
+class AdaptiveChunkerTests(unittest.TestCase):
+    def test_chunks(self):
+        chunker = futures.process._AdaptiveChunker()
+        chunks = chunker.chunks(range(10), 'abcdefghij')
+        self.assertEqual(next(chunks), ((0, 'a'),))
+        chunker.chunksize = 4
+        self.assertEqual(next(chunks), ((1, 'b'), (2, 'c'), (3, 'd'), (4, 'e')))
+        chunker.chunksize = 8
+        self.assertEqual(len(next(chunks)), 5)
+        self.assertRaises(StopIteration, next, chunks)
+
+    def test_update(self):
+        target = futures.process.ADAPTIVE_CHUNK_DURATION
+        chunker = futures.process._AdaptiveChunker()
+        # Fast calls: the chunk size at most doubles at each update
+        sizes = []
+        for _ in range(5):
+            chunker.update(chunker.chunksize, chunker.chunksize * target / 100)
+            sizes.append(chunker.chunksize)
+        self.assertEqual(sizes, [2, 4, 8, 16, 32])
+        for _ in range(5):
+            chunker.update(chunker.chunksize, chunker.chunksize * target / 100)
+        self.assertEqual(chunker.chunksize, 100)
+        # Slow calls: the chunk size shrinks immediately
+        chunker.update(100, 100 * target / 2)
+        self.assertLess(chunker.chunksize, 5)
+        chunker.update(5, 5 * target * 2)
+        self.assertEqual(chunker.chunksize, 1)
+
+    def test_results(self):
+        chunker = futures.process._AdaptiveChunker()
+        results = chunker.results([(0.0, [1, 2]), (0.1, [3])])
+        self.assertEqual(list(results), [1, 2, 3])
+        self.assertEqual(chunker.chunksize, 1)
+
 
 create_executor_tests(ProcessPoolExecutorTest,
                       executor_mixins=(ProcessPoolForkMixin,
@@ -343,6 +343,8 @@ class InitConfigTests(EmbeddingTestsMixin, unittest.TestCase):
         'faulthandler': 0,
         'tracemalloc': 0,
         'import_time': 0,
+        'lazy_imports': 0,
+        'use_frozen_modules': 1,
         'show_ref_count': 0,
         'show_alloc_count': 0,
         'dump_refs': 0,
@@ -688,6 +690,8 @@ class InitConfigTests(EmbeddingTestsMixin, unittest.TestCase):
             'hash_seed': 123,
             'tracemalloc': 2,
             'import_time': 1,
+            'lazy_imports': 1,
+            'use_frozen_modules': 0,
             'show_ref_count': 1,
             'show_alloc_count': 1,
             'malloc_stats': 1,
@@ -13,6 +13,7 @@
 import sys
 import unittest
 from test.support import captured_stdout
+from test.support import script_helper
 
 
 class TestFrozen(unittest.TestCase):
@@ -24,6 +25,20 @@ class TestFrozen(unittest.TestCase):
             import __hello__
         self.assertEqual(out.getvalue(), 'Hello world!\n')
 
+    def test_frozen_modules_off(self):
+        # The standard library modules frozen by "make regen-frozen-stdlib"
+        # are not used, but the other frozen modules are.
+        rc, out, err = script_helper.assert_python_ok(
+            '-X', 'frozen_modules=off', '-c',
+            'import os, __hello__; print(os.__spec__.origin)')
+        hello, origin = out.splitlines()
+        self.assertEqual(hello, b'Hello world!')
+        self.assertTrue(origin.endswith(b'os.py'), origin)
+        script_helper.assert_python_ok('-X', 'frozen_modules=on', '-c', 'pass')
+        rc, out, err = script_helper.assert_python_failure(
+            '-X', 'frozen_modules=spam', '-c', 'pass')
+        self.assertIn(b'invalid -X frozen_modules option value', err)
+
 
 if __name__ == '__main__':
     unittest.main()
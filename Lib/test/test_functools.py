@@ -1693,6 +1693,136 @@ class TestLRUC(TestLRU, unittest.TestCase):
         return 3 * x + y
 
 
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0
+
+    def timer(self):
+        return self.now
+
+    def test_ttl(self):
+        calls = []
+        @functools.ttl_cache(ttl=10, timer=self.timer)
+        def f(x):
+            calls.append(x)
+            return x * 2
+        self.assertEqual(f(1), 2)
+        self.now = 9
+        self.assertEqual(f(1), 2)
+        self.assertEqual(calls, [1])
+        self.now = 10
+        self.assertEqual(f(1), 2)
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(f.cache_info(),
+                         (1, 2, 0, 1, 128, 1, None, 1))
+
+    def test_expired_entries_are_dropped(self):
+        @functools.ttl_cache(maxsize=None, ttl=10, timer=self.timer)
+        def f(x):
+            return x
+        for i in range(5):
+            f(i)
+        self.now = 10
+        f(5)
+        info = f.cache_info()
+        self.assertEqual(info.currsize, 1)
+        self.assertEqual(info.expirations, 5)
+
+    def test_evicted_entries_are_dropped(self):
+        @functools.ttl_cache(maxsize=4, ttl=10, timer=self.timer)
+        def f(x):
+            return x
+        for i in range(1000):
+            f(i)
+        self.assertEqual(f.cache_info().evictions, 996)
+        # Look the expiry queue up in the closure of the wrapper
+        def closure(func):
+            return dict(zip(func.__code__.co_freevars,
+                            [cell.cell_contents for cell in func.__closure__]))
+        expiries = closure(closure(f)['store'])['expiries']
+        self.assertLessEqual(len(expiries), 8)
+        self.now = 10
+        f(-1)
+        self.assertEqual(f.cache_info().expirations, 4)
+        self.assertEqual(f.cache_info().currsize, 1)
+
+    def test_maxsize(self):
+        @functools.ttl_cache(maxsize=2)
+        def f(x):
+            return x
+        f(1)
+        f(2)
+        f(1)
+        f(3)
+        self.assertEqual(f.cache_info().evictions, 1)
+        # 2 was the least recently used entry
+        f(1)
+        self.assertEqual(f.cache_info().hits, 2)
+        f(2)
+        self.assertEqual(f.cache_info().misses, 4)
+
+    def test_maxweight(self):
+        @functools.ttl_cache(maxsize=None, maxweight=10, sizeof=len)
+        def f(n):
+            return 'x' * n
+        f(4)
+        f(5)
+        self.assertEqual(f.cache_info().currweight, 9)
+        f(3)
+        info = f.cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.currweight, 8)
+        self.assertEqual(info.evictions, 1)
+        # Too heavy to be cached at all
+        f(11)
+        self.assertEqual(f.cache_info().currweight, 8)
+        self.assertEqual(f.cache_info().evictions, 1)
+
+    def test_typed(self):
+        @functools.ttl_cache(typed=True)
+        def f(x):
+            return x
+        f(1)
+        f(1.0)
+        self.assertEqual(f.cache_info().misses, 2)
+
+    def test_bare_decorator(self):
+        @functools.ttl_cache
+        def f(x):
+            return x
+        self.assertEqual(f(1), 1)
+        self.assertEqual(f.cache_info().maxsize, 128)
+        self.assertEqual(f.__wrapped__(2), 2)
+
+    def test_cache_clear(self):
+        @functools.ttl_cache(ttl=1)
+        def f(x):
+            return x
+        f(1)
+        f(1)
+        f.cache_clear()
+        self.assertEqual(f.cache_info(), (0, 0, 0, 0, 128, 0, None, 0))
+
+    def test_coroutine_function(self):
+        asyncio = support.import_module('asyncio')
+        calls = []
+        @functools.ttl_cache
+        async def f(x):
+            calls.append(x)
+            return x * 2
+        async def main():
+            return [await f(1), await f(1)]
+        self.assertEqual(asyncio.run(main()), [2, 2])
+        self.assertEqual(calls, [1])
+        asyncio.set_event_loop_policy(None)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, functools.ttl_cache, ttl=0)
+        self.assertRaises(ValueError, functools.ttl_cache, maxweight=-1)
+        self.assertRaises(TypeError, functools.ttl_cache, 'x')
+
+
 class TestSingleDispatch(unittest.TestCase):
     def test_simple_overloads(self):
         @functools.singledispatch
@@ -14,6 +14,7 @@ from test import support
 from test.support import _4G, bigmemtest
 from test.support.script_helper import assert_python_ok, assert_python_failure
 
+zlib = support.import_module('zlib')
 gzip = support.import_module('gzip')
 
 data1 = b"""  int length=DEFAULTALLOC, err = Z_OK;
@@ -43,6 +44,11 @@ class UnseekableIO(io.BytesIO):
         raise io.UnsupportedOperation
 
 
+requires_access_points = unittest.skipUnless(
+    hasattr(zlib.decompressobj(), '_decompress_block'),
+    'requires zlib 1.2.3.4 or later')
+
+
 class BaseTest(unittest.TestCase):
     filename = support.TESTFN
 
@@ -275,6 +281,157 @@ class TestGzip(BaseTest):
             y = f.read(10)
         self.assertEqual(y, data1[20:30])
 
+    def write_members(self):
+        # Write a file of two members of random words
+        import random
+        rand = random.Random(1)
+        words = data1.split() + data2.split()
+        members = [b' '.join(rand.choice(words) for i in range(100000))
+                   for j in range(2)]
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            f.write(members[0])
+        with gzip.GzipFile(self.filename, 'ab') as f:
+            f.write(members[1])
+        return members
+
+    def check_seek(self, f, data, offsets):
+        # Seeking backwards doesn't decompress from the start
+        f._buffer.raw._rewind = None
+        for offset in offsets + [len(data) - 10, 100, 50000, len(data), 0]:
+            f.seek(offset)
+            self.assertEqual(f.read(200), data[offset:offset + 200])
+        f.seek(offsets[-2] + 10)
+        self.assertEqual(f.read(), data[offsets[-2] + 10:])
+
+    @requires_access_points
+    def test_build_index(self):
+        members = self.write_members()
+        data = b''.join(members)
+        with gzip.GzipFile(self.filename) as f:
+            self.assertEqual(f.read(10), data[:10])
+            f.build_index(1 << 14)
+            self.assertEqual(f.tell(), 10)
+            self.assertEqual(f.read(10), data[10:20])
+            points = f._buffer.raw._points
+            self.assertGreater(len(points), 4)
+            offsets = [point[0] for point in points]
+            self.assertEqual(offsets, sorted(offsets))
+            # Both members start with an access point
+            self.assertEqual([point[0] for point in points
+                              if point[2] is None], [0, len(members[0])])
+            self.check_seek(f, data, offsets)
+
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            self.assertRaises(OSError, f.build_index)
+
+    @requires_access_points
+    def test_export_import_index(self):
+        data = b''.join(self.write_members())
+        with gzip.GzipFile(self.filename) as f:
+            self.assertRaises(ValueError, f.export_index)
+            f.build_index(1 << 14)
+            index = f.export_index()
+            offsets = [point[0] for point in f._buffer.raw._points]
+        self.assertIsInstance(index, bytes)
+
+        with gzip.GzipFile(self.filename) as f:
+            f.seek(1000)
+            f.import_index(index)
+            self.assertEqual(f.tell(), 1000)
+            self.assertEqual([point[0] for point in f._buffer.raw._points],
+                             offsets)
+            self.assertEqual(f.export_index(), index)
+            self.check_seek(f, data, offsets)
+
+        with gzip.GzipFile(self.filename) as f:
+            self.assertRaises(ValueError, f.import_index, b'garbage')
+            self.assertRaises(ValueError, f.import_index, index[:-10])
+        # The index of another file is rejected
+        with gzip.GzipFile(self.filename, 'ab') as f:
+            f.write(b'more data')
+        with gzip.GzipFile(self.filename) as f:
+            self.assertRaises(ValueError, f.import_index, index)
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            self.assertRaises(OSError, f.import_index, index)
+
+    @requires_access_points
+    def test_max_workers_index(self):
+        data = b''.join(self.write_members())
+        with gzip.GzipFile(self.filename) as f:
+            f.build_index(1 << 14)
+            index = f.export_index()
+            offsets = [point[0] for point in f._buffer.raw._points]
+        with open(self.filename, 'rb') as f:
+            buf = io.BytesIO(f.read())
+        for fileobj in None, buf:
+            with gzip.GzipFile(self.filename, fileobj=fileobj,
+                               max_workers=2) as f:
+                f.import_index(index)
+                self.assertEqual(f.read(), data)
+                self.assertTrue(f._buffer.raw._parallel)
+                self.check_seek(f, data, offsets)
+        # Without index, a file which is not a BGZF file is decompressed
+        # serially
+        with gzip.GzipFile(self.filename, max_workers=2) as f:
+            self.assertEqual(f.read(), data)
+            self.assertFalse(f._buffer.raw._parallel)
+
+    @requires_access_points
+    def test_max_workers_sync_flushed_members(self):
+        # The end of the last block of a member is also the start of the
+        # next member
+        blocks = [bytes(range(256)) * 40, b'spam' * 3000]
+        with open(self.filename, 'wb') as f:
+            for block in blocks:
+                comp = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                f.write(comp.compress(block) + comp.flush(zlib.Z_SYNC_FLUSH) +
+                        comp.flush(zlib.Z_FINISH))
+        data = b''.join(blocks)
+        with gzip.GzipFile(self.filename) as f:
+            f.build_index(spacing=1000)
+            index = f.export_index()
+            points = f._buffer.raw._points
+            self.assertIn((len(blocks[0]), None),
+                          [(point[0], point[2]) for point in points])
+        with gzip.GzipFile(self.filename, max_workers=2) as f:
+            f.import_index(index)
+            self.assertEqual(f.read(), data)
+
+    @requires_access_points
+    def test_max_workers_bgzf(self):
+        data = b''.join(self.write_members())
+        def member(block):
+            comp = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+            comp = comp.compress(block) + comp.flush()
+            extra = b'BC' + struct.pack('<HH', 2, len(comp) + 25)
+            return (b'\x1f\x8b\x08\x04\0\0\0\0\0\xff' +
+                    struct.pack('<H', len(extra)) + extra + comp +
+                    struct.pack('<II', zlib.crc32(block), len(block)))
+        offsets = list(range(0, len(data), 65280))
+        with open(self.filename, 'wb') as f:
+            for offset in offsets:
+                f.write(member(data[offset:offset + 65280]))
+            f.write(member(b''))
+        offsets.append(len(data))
+
+        with gzip.GzipFile(self.filename, max_workers=2) as f:
+            self.assertEqual(f.read(), data)
+            self.assertTrue(f._buffer.raw._parallel)
+            self.assertEqual([point[0] for point in f._buffer.raw._points],
+                             offsets)
+            self.check_seek(f, data, offsets)
+            index = f.export_index()
+        with gzip.GzipFile(self.filename) as f:
+            f.import_index(index)
+            self.check_seek(f, data, offsets)
+
+    def test_max_workers_invalid(self):
+        with gzip.GzipFile(self.filename, 'wb') as f:
+            f.write(data1)
+        with support.check_no_resource_warning(self):
+            with self.assertRaises(ValueError):
+                gzip.GzipFile(self.filename, max_workers=0)
+
     def test_seek_write(self):
         # Try seek, write test
         with gzip.GzipFile(self.filename, 'w') as f:
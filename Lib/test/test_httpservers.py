@@ -24,6 +24,7 @@ import tempfile
 import time
 import datetime
 import threading
+from functools import partial
 from unittest import mock
 from io import BytesIO
 
@@ -495,10 +496,126 @@ class SimpleHTTPServerTestCase(BaseTestCase):
 
         headers = email.message.Message()
         headers['If-Modified-Since'] = self.last_modif_header
-        headers['If-None-Match'] = "*"
+        headers['If-None-Match'] = '"other-etag"'
         response = self.request(self.base_url + '/test', headers=headers)
         self.check_status_and_reason(response, HTTPStatus.OK)
 
+    def test_etag(self):
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        etag = response.getheader('ETag')
+        self.assertRegex(etag, r'^"[0-9a-f]+-[0-9a-f]+"$')
+
+        for value in (etag, 'W/' + etag, '"other", ' + etag, '*'):
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'If-None-Match': value})
+                self.check_status_and_reason(response,
+                                             HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.getheader('ETag'), etag)
+
+        # The ETag changes with the file
+        os.utime(os.path.join(self.tempdir, 'test'), (0, 0))
+        response = self.request(self.base_url + '/test',
+                                headers={'If-None-Match': etag})
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        self.assertNotEqual(response.getheader('ETag'), etag)
+
+    def test_range(self):
+        size = len(self.data)
+        for value, first, last in [('bytes=0-4', 0, 4),
+                                   ('bytes=7-', 7, size - 1),
+                                   ('bytes=-3', size - 3, size - 1),
+                                   ('bytes=-100', 0, size - 1),
+                                   ('bytes=10-1000', 10, size - 1)]:
+            with self.subTest(range=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(response,
+                                             HTTPStatus.PARTIAL_CONTENT,
+                                             data=self.data[first:last+1])
+                self.assertEqual(response.getheader('Content-Range'),
+                                 'bytes %d-%d/%d' % (first, last, size))
+                self.assertEqual(response.getheader('Content-Length'),
+                                 str(last - first + 1))
+
+        # Invalid and multiple ranges are ignored
+        for value in ('bytes=5-2', 'lines=1-2', 'bytes=0-1,3-4', 'bytes=-'):
+            with self.subTest(range=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(response, HTTPStatus.OK,
+                                             data=self.data)
+                self.assertEqual(response.getheader('Accept-Ranges'),
+                                 'bytes')
+
+        for value in ('bytes=%d-' % size, 'bytes=-0'):
+            with self.subTest(range=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(
+                    response, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.assertEqual(response.getheader('Content-Range'),
+                                 'bytes */%d' % size)
+
+        # Range is ignored for HEAD requests
+        response = self.request(self.base_url + '/test', method='HEAD',
+                                headers={'Range': 'bytes=0-4'})
+        self.check_status_and_reason(response, HTTPStatus.OK)
+
+    def test_if_range(self):
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        etag = response.getheader('ETag')
+
+        for value in (etag, self.last_modif_header):
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': 'bytes=0-1',
+                                                 'If-Range': value})
+                self.check_status_and_reason(
+                    response, HTTPStatus.PARTIAL_CONTENT, data=self.data[:2])
+
+        for value in ('"other"', 'W/' + etag,
+                      'Sat, 01 Jan 2000 00:00:00 GMT'):
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': 'bytes=0-1',
+                                                 'If-Range': value})
+                self.check_status_and_reason(response, HTTPStatus.OK,
+                                             data=self.data)
+
+    def test_copyfile_without_sendfile(self):
+        # Range requests work with a copyfile() using read()
+        def copyfile(handler, source, outputfile):
+            shutil.copyfileobj(source, outputfile)
+        with mock.patch.object(self.request_handler, 'copyfile', copyfile):
+            response = self.request(self.base_url + '/test',
+                                    headers={'Range': 'bytes=3-5'})
+            self.check_status_and_reason(response,
+                                         HTTPStatus.PARTIAL_CONTENT,
+                                         data=self.data[3:6])
+
+    def test_keep_alive(self):
+        # With HTTP/1.1, several files are served on the same connection
+        with mock.patch.object(self.request_handler, 'protocol_version',
+                               'HTTP/1.1'):
+            conn = http.client.HTTPConnection(self.HOST, self.PORT)
+            try:
+                for headers, data in [({}, self.data),
+                                      ({'Range': 'bytes=1-2'},
+                                       self.data[1:3]),
+                                      ({}, self.data)]:
+                    conn.request('GET', self.base_url + '/test',
+                                 headers=headers)
+                    response = conn.getresponse()
+                    self.assertEqual(response.read(), data)
+                    self.assertEqual(response.version, 11)
+                    self.assertFalse(response.will_close)
+            finally:
+                # The server handles one connection at a time
+                conn.close()
+
     def test_invalid_requests(self):
         response = self.request('/', method='FOO')
         self.check_status_and_reason(response, HTTPStatus.NOT_IMPLEMENTED)
@@ -1170,6 +1287,15 @@ class ScriptTestCase(unittest.TestCase):
             server.test(ServerClass=mock_server, bind=bind)
             self.assertEqual(mock_server.address_family, socket.AF_INET6)
 
+    @mock.patch('builtins.print')
+    def test_server_test_protocol(self, _):
+        class Handler(SimpleHTTPRequestHandler):
+            pass
+        mock_server = self.mock_server_class()
+        server.test(HandlerClass=partial(Handler, directory='.'),
+                    ServerClass=mock_server, protocol='HTTP/1.1')
+        self.assertEqual(Handler.protocol_version, 'HTTP/1.1')
+
     @mock.patch('builtins.print')
     def test_server_test_ipv4(self, _):
         for bind in self.ipv4_addrs:
@@ -0,0 +1,139 @@
+import compileall
+import importlib.util
+from importlib import machinery
+import os
+import unittest
+from test import support
+from test.support import script_helper
+
+
+class BytecodeBundleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.realpath(support.TESTFN)
+        self.bundle = self.directory + '.pyb'
+        os.mkdir(self.directory)
+        self.addCleanup(support.rmtree, self.directory)
+        self.addCleanup(support.unlink, self.bundle)
+        self.write('eggs.py', 'x = 1\n')
+        self.write(os.path.join('spam', '__init__.py'), 'x = 2\n')
+        self.write(os.path.join('spam', 'ham.py'), 'from . import x\n')
+
+    def write(self, name, source):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(source)
+        return path
+
+    def compile_bundle(self, dirs=None, **kwargs):
+        if dirs is None:
+            dirs = [self.directory]
+        with support.captured_stdout() as stdout:
+            success = compileall.compile_bundle(self.bundle, dirs, **kwargs)
+        return success, stdout.getvalue()
+
+    def finder(self):
+        finder = machinery.BytecodeBundleFinder(self.bundle)
+        self.addCleanup(finder._file.close)
+        return finder
+
+    def test_find_spec(self):
+        self.assertEqual(self.compile_bundle(quiet=1), (True, ''))
+        finder = self.finder()
+        spec = finder.find_spec('eggs')
+        self.assertIs(spec.loader, finder)
+        self.assertEqual(spec.origin, os.path.join(self.directory, 'eggs.py'))
+        self.assertIsNone(spec.submodule_search_locations)
+        spec = finder.find_spec('spam')
+        self.assertEqual(spec.submodule_search_locations,
+                         [os.path.join(self.directory, 'spam')])
+        self.assertTrue(finder.is_package('spam'))
+        self.assertFalse(finder.is_package('spam.ham'))
+        self.assertIsNone(finder.find_spec('bacon'))
+        with self.assertRaises(ImportError):
+            finder.get_code('bacon')
+
+    def test_load_module(self):
+        self.compile_bundle()
+        finder = self.finder()
+        spec = finder.find_spec('eggs')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.assertEqual(module.x, 1)
+        self.assertEqual(finder.get_source('eggs'), 'x = 1\n')
+        os.unlink(spec.origin)
+        self.assertIsNone(finder.get_source('eggs'))
+        # The code is not checked against the source.
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.assertEqual(module.x, 1)
+
+    def test_precedence(self):
+        other = os.path.join(self.directory, 'other')
+        self.write(os.path.join('other', 'eggs.py'), 'x = 3\n')
+        self.write(os.path.join('other', 'bacon.py'), 'x = 4\n')
+        self.write(os.path.join('other', 'spam.py'), 'x = 5\n')
+        self.write('ham.pyc', '')
+        self.write(os.path.join('ham', '__init__.py'), '')
+        self.write('bacon.pyc', '')
+        self.write(os.path.join('namespace', 'eggs.py'), '')
+        self.compile_bundle([self.directory, other])
+        finder = self.finder()
+        self.assertEqual(sorted(finder._index),
+                         ['eggs', 'ham', 'spam', 'spam.ham'])
+        self.assertEqual(finder.get_filename('eggs'),
+                         os.path.join(self.directory, 'eggs.py'))
+        self.assertTrue(finder.is_package('ham'))
+
+    def test_compile_error(self):
+        path = self.write('bacon.py', '1 +\n')
+        success, out = self.compile_bundle(quiet=1)
+        self.assertFalse(success)
+        self.assertIn('*** Error compiling {!r}'.format(path), out)
+        self.assertIn('SyntaxError', out)
+        self.assertNotIn('bacon', self.finder()._index)
+        self.assertEqual(self.compile_bundle(quiet=2), (False, ''))
+
+    def test_rx(self):
+        import re
+        self.compile_bundle(rx=re.compile('ham'))
+        self.assertEqual(sorted(self.finder()._index), ['eggs', 'spam'])
+
+    def test_bad_bundle(self):
+        for data in [b'', b'spam' * 4, b'PYB\0' + b'\0' * 12]:
+            with open(self.bundle, 'wb') as file:
+                file.write(data)
+            with self.assertRaises(ImportError):
+                machinery.BytecodeBundleFinder(self.bundle)
+
+    def test_startup(self):
+        self.compile_bundle()
+        code = ('import sys; sys.path.insert(0, {!r})\n'
+                'from importlib import machinery\n'
+                'import eggs, spam.ham\n'
+                'assert spam.ham.x == 2\n'
+                'assert type(eggs.__loader__) is '
+                'machinery.BytecodeBundleFinder\n'
+                'assert eggs.__loader__ in sys.meta_path\n'.format(
+                    self.directory))
+        script_helper.assert_python_ok(
+            '-X', 'bytecode_bundle=' + self.bundle, '-c', code)
+        script_helper.assert_python_ok(
+            '-c', code, PYTHONBYTECODEBUNDLE=self.bundle)
+
+    def test_startup_bad_bundle(self):
+        with open(self.bundle, 'wb') as file:
+            file.write(b'spam')
+        rc, out, err = script_helper.assert_python_ok(
+            '-v', '-X', 'bytecode_bundle=' + self.bundle, '-c',
+            'import sys\n'
+            'assert not any(type(f).__name__ == "BytecodeBundleFinder"\n'
+            '               for f in sys.meta_path)\n')
+        self.assertIn(
+            'bytecode bundle {!r} not loaded'.format(self.bundle).encode(),
+            err)
+
+
+if __name__ == '__main__':
+    unittest.main()
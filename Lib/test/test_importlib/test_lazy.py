@@ -1,9 +1,13 @@
 import importlib
 from importlib import abc
 from importlib import util
+import os
 import sys
+import textwrap
 import types
 import unittest
+from test import support
+from test.support import script_helper
 
 from . import util as test_util
 
@@ -141,5 +145,150 @@ class LazyLoaderTests(unittest.TestCase):
             module.__name__
 
 
+class LazyImportsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.realpath(support.TESTFN)
+        os.mkdir(self.directory)
+        self.addCleanup(support.rmtree, self.directory)
+        os.mkdir(os.path.join(self.directory, 'pkg'))
+        modules = {
+            'spam.py': 'import sys\nsys.executed.append(__name__)\nx = 1\n',
+            'slow.py': 'import sys, time\n'
+                       'time.sleep(0.1)\n'
+                       'sys.executed.append(__name__)\n',
+            'broken.py': 'import sys\nsys.executed.append(__name__)\n'
+                         'x = 1\n1/0\n',
+            os.path.join('pkg', '__init__.py'):
+                'import sys\nsys.executed.append(__name__)\n',
+            os.path.join('pkg', 'sub.py'):
+                'import sys\nsys.executed.append(__name__)\ny = 2\n',
+        }
+        for name, source in modules.items():
+            with open(os.path.join(self.directory, name), 'w') as file:
+                file.write(source)
+
+    def run_python(self, code, *args, **env_vars):
+        code = ('import sys\n'
+                'sys.executed = []\n'
+                'sys.path.insert(0, {!r})\n'.format(self.directory)
+                + textwrap.dedent(code))
+        return script_helper.assert_python_ok(*args, '-c', code, **env_vars)
+
+    def test_deferred(self):
+        self.run_python("""
+            import spam
+            assert sys.executed == []
+            assert spam.x == 1
+            assert sys.executed == ['spam']
+            import spam
+            assert sys.executed == ['spam']
+            """, '-X', 'lazy_imports')
+
+    def test_environment_variable(self):
+        code = """
+            import spam
+            assert sys.executed == [], sys.executed
+            """
+        self.run_python(code, PYTHONLAZYIMPORTS='1')
+        rc, out, err = script_helper.assert_python_failure(
+            '-E', '-c', 'import sys; sys.executed = []; '
+            'sys.path.insert(0, {!r}); import spam; '
+            'assert sys.executed == []'.format(self.directory),
+            PYTHONLAZYIMPORTS='1')
+        self.assertIn(b'AssertionError', err)
+
+    def test_disabled(self):
+        self.run_python("""
+            import spam
+            assert sys.executed == ['spam']
+            """)
+
+    def test_submodules(self):
+        self.run_python("""
+            import pkg.sub
+            assert sys.executed == ['pkg'], sys.executed
+            assert pkg.sub.y == 2
+            assert sys.executed == ['pkg', 'pkg.sub']
+            """, '-X', 'lazy_imports')
+        self.run_python("""
+            from pkg import sub
+            assert sys.executed == ['pkg'], sys.executed
+            assert sub.y == 2
+            from pkg.sub import y
+            assert sys.executed == ['pkg', 'pkg.sub']
+            """, '-X', 'lazy_imports')
+        self.run_python("""
+            import pkg
+            from pkg.sub import y
+            assert sys.executed == ['pkg', 'pkg.sub'], sys.executed
+            """, '-X', 'lazy_imports')
+
+    def test_missing_module(self):
+        self.run_python("""
+            try:
+                import eggs
+            except ModuleNotFoundError:
+                pass
+            else:
+                raise AssertionError
+            """, '-X', 'lazy_imports')
+
+    def test_error(self):
+        self.run_python("""
+            import broken
+            # The module is executed again, and fails again, on each access
+            for i in range(2):
+                try:
+                    broken.x
+                except ZeroDivisionError:
+                    pass
+                else:
+                    raise AssertionError
+            assert sys.executed == ['broken', 'broken'], sys.executed
+            assert 'broken' not in sys.modules
+            """, '-X', 'lazy_imports')
+        self.run_python("""
+            try:
+                import broken
+            except ZeroDivisionError:
+                pass
+            else:
+                raise AssertionError
+            """, '-X', 'lazy_imports')
+
+    def test_threads(self):
+        self.run_python("""
+            import threading
+            import slow
+            threads = [threading.Thread(target=getattr, args=(slow, 'x', 0))
+                       for i in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert sys.executed == ['slow'], sys.executed
+            """, '-X', 'lazy_imports')
+
+    def test_filter(self):
+        self.run_python("""
+            import importlib.util
+            importlib.util.set_lazy_imports_filter(deny=['spam', 'pkg'])
+            import spam, pkg.sub, slow
+            assert sys.executed == ['spam', 'pkg', 'pkg.sub'], sys.executed
+            """, '-X', 'lazy_imports')
+        self.run_python("""
+            import importlib.util
+            importlib.util.set_lazy_imports_filter(allow=['pkg'])
+            import spam, pkg.sub
+            assert sys.executed == ['spam', 'pkg'], sys.executed
+            importlib.util.set_lazy_imports_filter()
+            import slow
+            assert sys.executed == ['spam', 'pkg'], sys.executed
+            """, '-X', 'lazy_imports')
+        with self.assertRaises(TypeError):
+            util.set_lazy_imports_filter(deny='spam')
+
+
 if __name__ == '__main__':
     unittest.main()
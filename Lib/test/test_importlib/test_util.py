@@ -10,6 +10,7 @@ import pathlib
 import string
 import sys
 from test import support
+from test.support import script_helper
 import types
 import unittest
 import unittest.mock
@@ -836,6 +837,89 @@ class PEP3147Tests:
  ) = util.test_both(PEP3147Tests, util=importlib_util)
 
 
+class ImportIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.realpath(support.TESTFN)
+        self.index = self.directory + '.index'
+        os.mkdir(self.directory)
+        self.addCleanup(support.rmtree, self.directory)
+        self.addCleanup(support.unlink, self.index)
+        os.mkdir(os.path.join(self.directory, 'spam'))
+        for name in ['eggs.py', os.path.join('spam', '__init__.py'),
+                     os.path.join('spam', 'ham.py')]:
+            with open(os.path.join(self.directory, name), 'w') as file:
+                file.write('x = 1\n')
+
+    def touch(self, path):
+        # Make sure that the modification time changes, whatever the
+        # resolution of the file system timestamps.
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    def run_python(self, code, *args):
+        code = ('import sys; sys.path.insert(0, {!r})\n'.format(self.directory)
+                + code)
+        return script_helper.assert_python_ok(
+            '-X', 'importindex=' + self.index, *args, '-c', code)
+
+    def test_write_import_index(self):
+        importlib.util.write_import_index(self.index, [self.directory])
+        self.run_python(
+            'import importlib, importlib._bootstrap_external as b\n'
+            'import eggs, spam.ham\n'
+            'assert spam.ham.x == 1\n'
+            'assert type(b._import_index[{!r}]) is tuple\n'
+            'assert type(b._import_index[{!r}]) is tuple\n'
+            'importlib.invalidate_caches()\n'
+            'assert b._import_index is None\n'.format(
+                self.directory, os.path.join(self.directory, 'spam')))
+
+    def test_missing_module(self):
+        importlib.util.write_import_index(self.index, [self.directory])
+        self.run_python('try:\n'
+                        '    import ham\n'
+                        'except ModuleNotFoundError:\n'
+                        '    pass\n'
+                        'else:\n'
+                        '    raise AssertionError\n')
+
+    def test_modified_directory(self):
+        importlib.util.write_import_index(self.index, [self.directory])
+        package = os.path.join(self.directory, 'spam')
+        with open(os.path.join(package, 'bacon.py'), 'w') as file:
+            file.write('x = 2\n')
+        self.touch(package)
+        rc, out, err = self.run_python('import spam.bacon, spam.ham\n'
+                                       'assert spam.bacon.x == 2\n', '-v')
+        self.assertIn('import index: {} was modified'.format(package).encode(),
+                      err)
+
+    def test_bad_index(self):
+        with open(self.index, 'wb') as file:
+            file.write(b'spam')
+        rc, out, err = self.run_python('import eggs, spam.ham\n'
+                                       'import importlib._bootstrap_external '
+                                       'as b\n'
+                                       'assert b._import_index is None\n',
+                                       '-v')
+        self.assertIn(b'not loaded', err)
+
+    def test_environment_variable(self):
+        importlib.util.write_import_index(self.index, [self.directory])
+        code = ('import sys; sys.path.insert(0, {!r})\n'
+                'import importlib._bootstrap_external as b\n'
+                'import eggs\n'
+                'assert type(b._import_index[{!r}]) is tuple\n'.format(
+                    self.directory, self.directory))
+        script_helper.assert_python_ok('-c', code,
+                                       PYTHONIMPORTINDEX=self.index)
+        code = ('import importlib._bootstrap_external as b\n'
+                'assert b._import_index is None\n')
+        script_helper.assert_python_ok('-E', '-c', code,
+                                       PYTHONIMPORTINDEX=self.index)
+
+
 class MagicNumberTests(unittest.TestCase):
     """
     Test release compatibility issues relating to importlib
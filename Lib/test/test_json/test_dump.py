@@ -12,6 +12,16 @@ class TestDump:
     def test_dumps(self):
         self.assertEqual(self.dumps({}), '{}')
 
+    def test_dump_iterencode_override(self):
+        class Encoder(self.json.JSONEncoder):
+            def iterencode(self, o):
+                yield '['
+                yield from super().iterencode(o)
+                yield ']'
+        sio = StringIO()
+        self.json.dump({'a': 1}, sio, cls=Encoder)
+        self.assertEqual(sio.getvalue(), '[{"a": 1}]')
+
     def test_dump_skipkeys(self):
         v = {b'invalid_key': False, 'valid_key': True}
         with self.assertRaises(TypeError):
@@ -62,6 +72,36 @@ class TestPyDump(TestDump, PyTest): pass
 
 class TestCDump(TestDump, CTest):
 
+    def test_dump_chunks(self):
+        # The C encoder writes a few large chunks
+        chunks = []
+        class File:
+            def write(self, chunk):
+                chunks.append(chunk)
+        obj = [{'a': [1, 2.5, None], 'b': 'c'}] * 100
+        for kwargs in {}, {'indent': 2}, {'sort_keys': True}:
+            with self.subTest(**kwargs):
+                chunks.clear()
+                self.json.dump(obj, File(), **kwargs)
+                self.assertEqual(''.join(chunks), self.dumps(obj, **kwargs))
+                self.assertLess(len(chunks), 10)
+
+    def test_dump_streams(self):
+        # Large documents are written while being encoded
+        chunks = []
+        class File:
+            def write(self, chunk):
+                chunks.append(chunk)
+        def default(o):
+            written.append(len(chunks))
+            return 0
+        written = []
+        obj = list(range(200000)) + [object()]
+        self.json.dump(obj, File(), default=default)
+        self.assertEqual(''.join(chunks), self.dumps(obj, default=default))
+        self.assertGreater(written[0], 0)
+        self.assertGreater(len(chunks), 1)
+
     # The size requirement here is hopefully over-estimated (actual
     # memory consumption depending on implementation details, and also
     # system memory management, since this may allocate a lot of
@@ -0,0 +1,111 @@
+from io import BytesIO, StringIO
+from test.test_json import PyTest, CTest
+
+
+class TestIncremental:
+    def decode_chunks(self, chunks, **kwargs):
+        decoder = self.json.JSONIncrementalDecoder(**kwargs)
+        values = []
+        for chunk in chunks:
+            values.extend(decoder.decode(chunk))
+        values.extend(decoder.decode(chunks[0][:0], final=True))
+        return values
+
+    def split(self, text, size):
+        return [text[i:i+size] for i in range(0, len(text), size)]
+
+    def test_documents(self):
+        text = '{"a": [1, 2.5, "x"]}\n[true, null]\n"s" 123 -4e3\n'
+        expected = [{"a": [1, 2.5, "x"]}, [True, None], "s", 123, -4e3]
+        for size in (1, 2, 3, 7, len(text)):
+            with self.subTest(size=size):
+                self.assertEqual(self.decode_chunks(self.split(text, size)),
+                                 expected)
+
+    def test_items(self):
+        text = ' [ {"a": 1} , [2, 3], "\\u00e9t\\u00e9", 4.5e1, false ] '
+        expected = [{"a": 1}, [2, 3], "\xe9t\xe9", 45.0, False]
+        for size in (1, 2, 5, len(text)):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    self.decode_chunks(self.split(text, size), items=True),
+                    expected)
+        self.assertEqual(self.decode_chunks(['[', ' ', ']'], items=True), [])
+
+    def test_values_returned_when_complete(self):
+        decoder = self.json.JSONIncrementalDecoder(items=True)
+        self.assertEqual(decoder.decode('[{"a": 1}, 12'), [{"a": 1}])
+        # 12 could be the start of a longer number
+        self.assertEqual(decoder.decode('3, "b'), [123])
+        self.assertEqual(decoder.decode('c"]'), ["bc"])
+        self.assertEqual(decoder.decode('', final=True), [])
+
+    def test_number_at_end(self):
+        decoder = self.json.JSONIncrementalDecoder()
+        self.assertEqual(decoder.decode('12'), [])
+        self.assertEqual(decoder.decode('3', final=True), [123])
+
+    def test_bytes(self):
+        text = '["€", {"\xe9": 1}]'
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le',
+                         'utf-32-be'):
+            with self.subTest(encoding=encoding):
+                data = text.encode(encoding)
+                chunks = [data[i:i+1] for i in range(len(data))]
+                self.assertEqual(self.decode_chunks(chunks, items=True),
+                                 ["€", {"\xe9": 1}])
+        self.assertEqual(
+            self.decode_chunks([b'"\xe9"'], encoding='latin-1'), ['\xe9'])
+
+    def test_errors(self):
+        for text, items in [('[1, 2', True), ('{"a": 1', False),
+                            ('[1 2]', True), ('[1, 2] 3', True),
+                            ('{"a": 1} x', False), ('1', True),
+                            ('[1,]', True), ('\ufeff1', False)]:
+            with self.subTest(text=text):
+                with self.assertRaises(self.JSONDecodeError):
+                    self.decode_chunks(self.split(text, 1), items=items)
+        # Invalid data raises without waiting for the final chunk
+        for text in ['[1 2', '{"a" 1', '"\\x"', '{"a": tru ', '[-x',
+                     '[1.5 .', '"\\u12x"', '"\x01', 'x']:
+            with self.subTest(text=text):
+                decoder = self.json.JSONIncrementalDecoder()
+                with self.assertRaises(self.JSONDecodeError):
+                    decoder.decode(text)
+        # but not truncated data
+        for text in ['[1, tr', '{"a": -', '[1.', '[1e+', '"ab', '"\\u12',
+                     '{"a": 1', 'Infin', '[1, ']:
+            with self.subTest(text=text):
+                decoder = self.json.JSONIncrementalDecoder()
+                self.assertEqual(decoder.decode(text), [])
+                with self.assertRaises(self.JSONDecodeError):
+                    decoder.decode('', final=True)
+        with self.assertRaises(TypeError):
+            self.decode_chunks([1])
+        with self.assertRaises(TypeError):
+            self.decode_chunks(['1', b' '])
+
+    def test_decoder(self):
+        decoder = self.json.JSONDecoder(parse_int=str)
+        self.assertEqual(self.decode_chunks(['1 ', '2 '], decoder=decoder),
+                         ['1', '2'])
+
+    def test_reset(self):
+        decoder = self.json.JSONIncrementalDecoder(items=True)
+        with self.assertRaises(self.JSONDecodeError):
+            decoder.decode('[1 2', final=True)
+        decoder.reset()
+        self.assertEqual(decoder.decode('[3]', final=True), [3])
+
+    def test_iterload(self):
+        text = '[' + ', '.join(map(str, range(1000))) + ']'
+        it = self.json.iterload(StringIO(text), items=True, chunk_size=10)
+        self.assertEqual(list(it), list(range(1000)))
+        it = self.json.iterload(BytesIO(b'{"a": 1}\n{"b": 2}\n'),
+                                chunk_size=3, object_pairs_hook=list)
+        self.assertEqual(list(it), [[("a", 1)], [("b", 2)]])
+        self.assertEqual(list(self.json.iterload(StringIO(''))), [])
+
+
+class TestPyIncremental(TestIncremental, PyTest): pass
+class TestCIncremental(TestIncremental, CTest): pass
@@ -59,6 +59,17 @@ class TestEncode(CTest):
         with self.assertRaises(ZeroDivisionError):
             enc('spam', 4)
 
+    def test_indent(self):
+        encoder = self.json.encoder
+        enc = encoder.c_make_encoder(None, None, encoder.encode_basestring,
+                                     '  ', ': ', ',', False, False, False)
+        self.assertEqual(''.join(enc({'a': [1, {}], 'b': []}, 1)),
+                         '{\n    "a": [\n      1,\n      {}\n    ],\n'
+                         '    "b": []\n  }')
+        with self.assertRaises(TypeError):
+            encoder.c_make_encoder(None, None, None, 2, ': ', ',',
+                                   False, False, False)
+
     def test_bad_bool_args(self):
         def test(name):
             self.json.encoder.JSONEncoder(**{name: BadBool()}).encode({'a': 1})
@@ -47,6 +47,7 @@ import textwrap
 import threading
 import time
 import unittest
+from unittest import mock
 import warnings
 import weakref
 
@@ -3544,6 +3545,157 @@ class QueueHandlerTest(BaseTest):
         listener.stop()
         self.assertEqual(self.stream.getvalue().strip(), "que -> ERROR: error")
 
+class BackgroundHandlerTest(BaseTest):
+
+    class RecordingHandler(logging.Handler):
+        def __init__(self, gate=None):
+            logging.Handler.__init__(self)
+            self.gate = gate
+            self.records = []
+
+        def emit(self, record):
+            if self.gate is not None:
+                self.gate.wait()
+            self.records.append((record.getMessage(),
+                                 threading.current_thread()))
+
+    def setUp(self):
+        BaseTest.setUp(self)
+        self.logger = logging.getLogger('background')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+
+    def make_handler(self, *targets, **kwargs):
+        handler = logging.handlers.BackgroundHandler(*targets, **kwargs)
+        self.logger.addHandler(handler)
+        self.addCleanup(handler.close)
+        self.addCleanup(self.logger.removeHandler, handler)
+        return handler
+
+    def test_records_handled_in_background(self):
+        target = self.RecordingHandler()
+        handler = self.make_handler(target, batch_size=3)
+        for i in range(10):
+            self.logger.info('message %d', i)
+        handler.flush()
+        self.assertEqual([msg for msg, thread in target.records],
+                         ['message %d' % i for i in range(10)])
+        threads = {thread for msg, thread in target.records}
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads.pop(), threading.current_thread())
+        self.assertEqual(handler.depth, 0)
+        self.assertGreaterEqual(handler.max_depth, 1)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_respect_handler_level(self):
+        target = self.RecordingHandler()
+        target.setLevel(logging.ERROR)
+        handler = self.make_handler(target)
+        self.logger.info('info')
+        self.logger.error('error')
+        handler.flush()
+        self.assertEqual([msg for msg, thread in target.records],
+                         ['info', 'error'])
+
+        target = self.RecordingHandler()
+        target.setLevel(logging.ERROR)
+        handler = self.make_handler(target, respect_handler_level=True)
+        self.logger.info('info')
+        self.logger.error('error')
+        handler.flush()
+        self.assertEqual([msg for msg, thread in target.records], ['error'])
+
+    def test_drop_policy(self):
+        gate = threading.Event()
+        target = self.RecordingHandler(gate)
+        handler = self.make_handler(target, capacity=3, batch_size=1,
+                                    policy='drop')
+        self.logger.info('first')
+        # Wait until the writer thread is blocked on the first record
+        deadline = time.monotonic() + 60.0
+        while handler.depth and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for i in range(5):
+            self.logger.info('message %d', i)
+        self.assertEqual(handler.depth, 3)
+        self.assertEqual(handler.max_depth, 3)
+        self.assertEqual(handler.dropped, 2)
+        gate.set()
+        handler.flush()
+        self.assertEqual([msg for msg, thread in target.records],
+                         ['first', 'message 0', 'message 1', 'message 2'])
+
+    def test_block_policy(self):
+        gate = threading.Event()
+        target = self.RecordingHandler(gate)
+        handler = self.make_handler(target, capacity=1)
+
+        def log():
+            for i in range(5):
+                self.logger.info('message %d', i)
+        thread = threading.Thread(target=log)
+        thread.start()
+        thread.join(0.1)
+        # The logging thread waits for room in the buffer
+        self.assertTrue(thread.is_alive())
+        self.assertLessEqual(handler.depth, 1)
+        gate.set()
+        thread.join()
+        handler.flush()
+        self.assertEqual([msg for msg, thread in target.records],
+                         ['message %d' % i for i in range(5)])
+        self.assertEqual(handler.dropped, 0)
+
+    def test_close(self):
+        target = self.RecordingHandler()
+        handler = self.make_handler(target)
+        for i in range(100):
+            self.logger.info('message %d', i)
+        handler.close()
+        self.assertEqual(len(target.records), 100)
+        # Records are handled synchronously after close()
+        self.logger.info('last')
+        self.assertEqual(target.records[-1],
+                         ('last', threading.current_thread()))
+
+    def test_arguments_merged_on_logging_thread(self):
+        target = self.RecordingHandler(threading.Event())
+        handler = self.make_handler(target)
+        args = ['spam']
+        self.logger.info('message %s', args)
+        args.append('eggs')
+        target.gate.set()
+        handler.flush()
+        self.assertEqual(target.records[0][0], "message ['spam']")
+
+    def test_error_in_batch(self):
+        class FailingHandler(self.RecordingHandler):
+            def handle(self, record):
+                if record.msg == 'fail':
+                    raise ValueError
+                return logging.Handler.handle(self, record)
+
+        target = FailingHandler()
+        handler = self.make_handler(target, batch_size=10)
+        errors = []
+        handler.handleError = errors.append
+        gate = threading.Event()
+        target.gate = gate
+        for msg in ['one', 'fail', 'two', 'fail', 'three']:
+            self.logger.info(msg)
+        gate.set()
+        handler.flush()
+        self.assertEqual([msg for msg, thread in target.records],
+                         ['one', 'two', 'three'])
+        self.assertEqual([record.msg for record in errors], ['fail', 'fail'])
+
+    def test_invalid_arguments(self):
+        BackgroundHandler = logging.handlers.BackgroundHandler
+        self.assertRaises(ValueError, BackgroundHandler, policy='wait')
+        self.assertRaises(ValueError, BackgroundHandler, capacity=0)
+        self.assertRaises(ValueError, BackgroundHandler, batch_size=0)
+
+
 if hasattr(logging.handlers, 'QueueListener'):
     import multiprocessing
     from unittest.mock import patch
@@ -4266,6 +4418,48 @@ class LogRecordTest(BaseTest):
         except ImportError:
             pass
 
+    def test_lazy_attributes(self):
+        logger = logging.getLogger('lazy')
+        r = logger.makeRecord('lazy', logging.INFO, '/dir/file.py', 1, 'msg',
+                              (), None)
+        for name in ('filename', 'module', 'processName'):
+            self.assertNotIn(name, r.__dict__)
+        self.assertEqual(r.filename, 'file.py')
+        self.assertEqual(r.module, 'file')
+        self.assertIn('filename', r.__dict__)
+        with self.assertRaises(AttributeError):
+            r.spam
+
+        # The thread name is the one of the thread which created the record
+        r = logger.makeRecord('lazy', logging.INFO, 'file.py', 1, 'msg',
+                              (), None)
+        names = []
+        t = threading.Thread(target=lambda: names.append(r.threadName))
+        t.start()
+        t.join()
+        self.assertEqual(names, [threading.current_thread().name])
+
+        # extra cannot override the lazy attributes
+        for name in ('filename', 'module', 'processName'):
+            with self.assertRaises(KeyError):
+                logger.makeRecord('lazy', logging.INFO, 'file.py', 1, 'msg',
+                                  (), None, extra={name: 'spam'})
+
+        # They are resolved when the record is copied or pickled
+        r = logger.makeRecord('lazy', logging.INFO, 'file.py', 1, 'msg',
+                              (), None)
+        for r2 in (pickle.loads(pickle.dumps(r)), copy.copy(r)):
+            self.assertEqual(r2.__dict__['threadName'],
+                             threading.current_thread().name)
+            self.assertEqual(r2.__dict__['module'], 'file')
+
+        # and when the record is formatted
+        r = logger.makeRecord('lazy', logging.INFO, 'file.py', 1, 'msg',
+                              (), None)
+        formatter = logging.Formatter('%(module)s %(threadName)s')
+        self.assertEqual(formatter.format(r),
+                         'file ' + threading.current_thread().name)
+
     def test_optional(self):
         r = logging.makeLogRecord({})
         NOT_NONE = self.assertIsNotNone
@@ -4758,6 +4952,38 @@ class LoggerTest(BaseTest):
         with support.swap_attr(logging, 'raiseExceptions', False):
             self.logger.log('10', 'test message')  # no exception happens
 
+    def test_skip_record_without_handler_for_level(self):
+        self.recording.setLevel(logging.WARNING)
+        with mock.patch.object(self.logger, 'findCaller',
+                               wraps=self.logger.findCaller) as find_caller, \
+             mock.patch.object(self.logger, 'makeRecord',
+                               wraps=self.logger.makeRecord) as make_record:
+            self.logger.info('ignored')
+            self.assertFalse(find_caller.called)
+            self.assertFalse(make_record.called)
+            self.logger.warning('handled')
+            self.assertEqual(find_caller.call_count, 1)
+            self.assertEqual(make_record.call_count, 1)
+
+            # A handler of an ancestor logger accepts the record
+            parent = logging.getLogger('blah_parent')
+            self.logger.parent = parent
+            handler = RecordingHandler()
+            parent.addHandler(handler)
+            self.addCleanup(parent.removeHandler, handler)
+            self.logger.info('handled by the parent')
+            self.assertEqual(make_record.call_count, 2)
+            self.assertEqual(len(handler.records), 1)
+            self.logger.propagate = False
+            self.logger.info('ignored')
+            self.assertEqual(make_record.call_count, 2)
+
+            # Logger filters see all records
+            self.logger.addFilter(lambda record: True)
+            self.logger.info('filtered by the handler level')
+            self.assertEqual(make_record.call_count, 3)
+        self.assertEqual([r.msg for r in self.recording.records], ['handled'])
+
     def test_find_caller_with_stack_info(self):
         called = []
         support.patch(self, logging.traceback, 'print_stack',
@@ -5051,6 +5277,113 @@ class RotatingFileHandlerTest(BaseFileTest):
         self.assertFalse(os.path.exists(namer(self.fn + ".3")))
         rh.close()
 
+    def test_size_counted_once(self):
+        rh = logging.handlers.RotatingFileHandler(
+            self.fn, encoding="utf-8", maxBytes=30, backupCount=1)
+        formatter = logging.Formatter()
+        rh.setFormatter(formatter)
+        rec = logging.makeLogRecord({'msg': 'h\xe9llo wor'})
+        size = len(('h\xe9llo wor' + os.linesep).encode('utf-8'))
+        with mock.patch.object(formatter, 'format',
+                               wraps=formatter.format) as format:
+            rh.emit(rec)
+            rh.emit(rec)
+            self.assertEqual(format.call_count, 2)
+        self.assertEqual(os.path.getsize(self.fn), 2 * size)
+        self.assertEqual(rh._size, 2 * size)
+        # The third record would make the file reach maxBytes.
+        rh.emit(rec)
+        self.assertLogFile(self.fn + ".1")
+        self.assertEqual(os.path.getsize(self.fn + ".1"), 2 * size)
+        self.assertEqual(os.path.getsize(self.fn), size)
+        rh.close()
+
+    def test_flush_interval(self):
+        rh = logging.handlers.RotatingFileHandler(self.fn, flushInterval=60)
+        rh.emit(self.next_rec())
+        self.assertEqual(os.path.getsize(self.fn), 0)
+        thread = rh._flushThread
+        self.assertIsNotNone(thread)
+        rh.flush()
+        self.assertGreater(os.path.getsize(self.fn), 0)
+        rh.close()
+        self.assertIsNone(rh._flushThread)
+        thread.join()
+
+        # The same thread flushes the stream again and again
+        rh = logging.handlers.RotatingFileHandler(self.fn, flushInterval=0.01)
+        thread = None
+        for _ in range(3):
+            rh.emit(self.next_rec())
+            thread = thread or rh._flushThread
+            self.assertIs(rh._flushThread, thread)
+            size = os.path.getsize(self.fn)
+            for _ in range(500):
+                if os.path.getsize(self.fn) > size:
+                    break
+                time.sleep(0.01)
+            self.assertGreater(os.path.getsize(self.fn), size)
+        rh.close()
+        thread.join()
+
+    def test_emit_recursion_error(self):
+        class Handler(logging.handlers.RotatingFileHandler):
+            def shouldRollover(self, record):
+                return False
+
+        for cls in logging.handlers.RotatingFileHandler, Handler:
+            with self.subTest(cls=cls):
+                rh = cls(self.fn)
+                self.addCleanup(rh.close)
+                with mock.patch.object(rh, 'format',
+                                       side_effect=RecursionError):
+                    self.assertRaises(RecursionError, rh.emit,
+                                      self.next_rec())
+
+    @support.requires_gzip
+    def test_background_compressed_rollover(self):
+        rh = logging.handlers.RotatingFileHandler(
+            self.fn, maxBytes=1, backupCount=2, backgroundRollover=True)
+        rotator = logging.handlers.CompressingRotator('gzip')
+        rh.rotator = rotator
+        rh.namer = rotator.namer
+        records = [self.next_rec() for _ in range(4)]
+        for rec in records:
+            rh.emit(rec)
+        rh.close()
+        self.assertFalse(rh._rolloverThread)
+        import gzip
+        for i, rec in ((1, records[2]), (2, records[1])):
+            fn = self.fn + ".%d.gz" % i
+            self.assertLogFile(fn)
+            with gzip.open(fn) as f:
+                self.assertEqual(f.read(), (rec.msg + os.linesep).encode())
+        self.assertFalse(os.path.exists(self.fn + ".3.gz"))
+        dirname, basename = os.path.split(self.fn)
+        self.assertFalse([fn for fn in os.listdir(dirname)
+                          if fn.startswith(basename + ".rollover")])
+
+    def test_background_rollover_leftover(self):
+        # A temporary file left behind by a crashed process is not clobbered
+        leftover = "%s.rollover-%d-1" % (self.fn, os.getpid())
+        with open(leftover, "w") as f:
+            f.write("leftover")
+        self.rmfiles.append(leftover)
+        rh = logging.handlers.RotatingFileHandler(
+            self.fn, maxBytes=1, backupCount=1, backgroundRollover=True)
+        records = [self.next_rec() for _ in range(2)]
+        for rec in records:
+            rh.emit(rec)
+        rh.close()
+        with open(leftover) as f:
+            self.assertEqual(f.read(), "leftover")
+        with open(self.fn + ".1") as f:
+            self.assertEqual(f.read(), records[0].msg + "\n")
+
+    def test_compressing_rotator_invalid(self):
+        self.assertRaises(ValueError, logging.handlers.CompressingRotator,
+                          'zip')
+
 class TimedRotatingFileHandlerTest(BaseFileTest):
     # other test methods added below
     def test_rollover(self):
@@ -5095,6 +5428,33 @@ class TimedRotatingFileHandlerTest(BaseFileTest):
                     print(tf.read())
         self.assertTrue(found, msg=msg)
 
+    @support.requires_lzma
+    def test_background_rollover(self):
+        # Rotate hourly, so that only doRollover() rotates the file
+        fh = logging.handlers.TimedRotatingFileHandler(
+            self.fn, 'H', backupCount=1, backgroundRollover=True)
+        rotator = logging.handlers.CompressingRotator('lzma')
+        fh.rotator = rotator
+        fh.namer = rotator.namer
+        r1 = logging.makeLogRecord({'msg': 'testing - initial'})
+        fh.emit(r1)
+        fh.doRollover()
+        r2 = logging.makeLogRecord({'msg': 'testing - after rollover'})
+        fh.emit(r2)
+        fh.close()
+        with open(self.fn) as f:
+            self.assertEqual(f.read(), r2.msg + '\n')
+        dirname, basename = os.path.split(self.fn)
+        rotated = [fn for fn in os.listdir(dirname)
+                   if fn.startswith(basename + ".")]
+        self.assertEqual(len(rotated), 1)
+        fn = os.path.join(dirname, rotated[0])
+        self.rmfiles.append(fn)
+        self.assertTrue(fn.endswith(".xz"))
+        import lzma
+        with lzma.open(fn, 'rt') as f:
+            self.assertEqual(f.read(), r1.msg + '\n')
+
     def test_invalid(self):
         assertRaises = self.assertRaises
         assertRaises(ValueError, logging.handlers.TimedRotatingFileHandler,
@@ -5265,7 +5625,7 @@ def test_main():
         DatagramHandlerTest, MemoryTest, EncodingTest, WarningsTest,
         ConfigDictTest, ManagerTest, FormatterTest, BufferingFormatterTest,
         StreamHandlerTest, LogRecordFactoryTest, ChildLoggerTest,
-        QueueHandlerTest, ShutdownTest, ModuleLevelMiscTest, BasicConfigTest,
+        QueueHandlerTest, BackgroundHandlerTest, ShutdownTest, ModuleLevelMiscTest, BasicConfigTest,
         LoggerAdapterTest, LoggerTest, SMTPHandlerTest, FileHandlerTest,
         RotatingFileHandlerTest,  LastResortTest, LogRecordTest,
         ExceptionTest, SysLogHandlerTest, IPv6SysLogHandlerTest, HTTPHandlerTest,
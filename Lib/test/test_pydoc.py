@@ -718,6 +718,8 @@ class PydocDocTest(unittest.TestCase):
 
     @unittest.skipIf(sys.flags.optimize >= 2,
                      'Docstrings are omitted with -OO and above')
+    @unittest.skipUnless(hasattr(os, '__cached__'),
+                         'the os module is frozen in the interpreter')
     def test_synopsis_sourceless(self):
         expected = os.__doc__.splitlines()[0]
         filename = os.__cached__
@@ -3,8 +3,10 @@ from test.support import (gc_collect, bigmemtest, _2G,
 import locale
 import re
 import sre_compile
+import sre_parse
 import string
 import unittest
+from unittest import mock
 import warnings
 from re import Scanner
 from weakref import proxy
@@ -2188,6 +2190,56 @@ class ImplementationTest(unittest.TestCase):
     Test implementation details of the re module.
     """
 
+    def test_required_literal(self):
+        def required(pattern, flags=0):
+            p = sre_parse.parse(pattern, flags)
+            return ''.join(map(chr, sre_compile._get_required_literal(
+                p, flags | p.state.flags)))
+        self.assertEqual(required('.*ERROR.*timeout'), 'timeout')
+        self.assertEqual(required(r'\d+ERROR\d'), 'ERROR')
+        self.assertEqual(required(r'\d(ab)(?:c)d\d'), 'abcd')
+        self.assertEqual(required(r'\dab(?i:c)d'), 'ab')
+        self.assertEqual(required(r'\d(?:ab|cd)'), '')
+        self.assertEqual(required(r'\dab?'), 'a')
+        self.assertEqual(required(r'\d(?<=a)bc'), 'bc')
+        # The literal prefix is already used by the search
+        self.assertEqual(required('abc.*de'), '')
+        self.assertEqual(required('ab.*cde'), 'cde')
+        # Cased characters are not literal when ignoring case
+        self.assertEqual(required(r'\d-ab-', re.I), '-')
+        self.assertEqual(required(rb'\d-ab-', re.I | re.L), '')
+
+    def test_search_required_literal(self):
+        p = re.compile(r'(\w+) timeout')
+        self.assertIsNone(p.search('connection time out'))
+        self.assertEqual(p.search('a timeout').span(), (0, 9))
+        self.assertEqual(p.search('ab timeout', 1).span(), (1, 10))
+        self.assertIsNone(p.search('a timeout', 2))
+        self.assertIsNone(p.search('a timeout', 0, 8))
+        self.assertEqual(p.findall('a timeout, b timeout c timeou'),
+                         ['a', 'b'])
+        self.assertEqual([m.span() for m in p.finditer('a timeout b timeout')],
+                         [(0, 9), (10, 19)])
+        self.assertEqual(p.sub('X', 'a timeout b timeout c'), 'X X c')
+        self.assertEqual(p.split('a timeout b'), ['', 'a', ' b'])
+        self.assertEqual(re.search(rb'\d+ ms', b'took 12 ms').group(),
+                         b'12 ms')
+        self.assertIsNone(re.search(rb'\d+ ms', bytearray(b'took 12 m')))
+        self.assertEqual(re.search(r'(?i)\d+-ms-', '1-MS-').group(), '1-MS-')
+        # Characters which cannot occur in the string
+        self.assertIsNone(re.search('.\u20ac', 'latin-1 only \xe9'))
+        self.assertEqual(re.search('.\u20ac', 'x\u20ac').group(), 'x\u20ac')
+        self.assertEqual(re.search('.\U0001f600!', 'x\U0001f600!').group(),
+                         'x\U0001f600!')
+        # The remembered position of the literal must not be reused when
+        # searching again after it.
+        it = re.finditer(r'\d+ab', '1ab 2ab 3')
+        self.assertEqual([m.group() for m in it], ['1ab', '2ab'])
+        scanner = re.compile(r'\d+ab').scanner('1ab 2ab 3')
+        self.assertEqual(scanner.search().group(), '1ab')
+        self.assertEqual(scanner.search().group(), '2ab')
+        self.assertIsNone(scanner.search())
+
     def test_overlap_table(self):
         f = sre_compile._generate_overlap_table
         self.assertEqual(f(""), [])
@@ -2198,6 +2250,141 @@ class ImplementationTest(unittest.TestCase):
         self.assertEqual(f("abcabdac"), [0, 0, 0, 1, 2, 0, 1, 0])
 
 
+class CacheTests(unittest.TestCase):
+
+    def setUp(self):
+        re.purge()
+        self.addCleanup(re.purge)
+        self.addCleanup(re.set_cache_size, re.cache_info().maxsize)
+
+    def test_cache_info(self):
+        p = re.compile('cache-a')
+        self.assertEqual(re.cache_info(), (0, 1, re._MAXCACHE, 1))
+        self.assertIs(re.compile('cache-a'), p)
+        self.assertIsNotNone(re.match('cache-a', 'cache-a'))
+        re.compile(b'cache-a')
+        re.compile('cache-a', re.I)
+        info = re.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 3))
+        re.purge()
+        self.assertEqual(re.cache_info()[:2], (0, 0))
+        self.assertEqual(re.cache_info().currsize, 0)
+
+    def test_lru(self):
+        re.set_cache_size(3)
+        self.assertEqual(re.cache_info().maxsize, 3)
+        a = re.compile('cache-a')
+        re.compile('cache-b')
+        re.compile('cache-c')
+        self.assertIs(re.compile('cache-a'), a)
+        re.compile('cache-d')
+        # 'cache-b' was the least recently used
+        self.assertEqual([key[1] for key in re._cache],
+                         ['cache-c', 'cache-a', 'cache-d'])
+        self.assertIs(re.compile('cache-a'), a)
+        re.set_cache_size(1)
+        self.assertEqual(re.cache_info().currsize, 1)
+        self.assertIs(re.compile('cache-a'), a)
+        re.set_cache_size(0)
+        self.assertEqual(re.cache_info().currsize, 0)
+        self.assertIsNot(re.compile('cache-a'), a)
+        self.assertEqual(re.cache_info().currsize, 0)
+        self.assertRaises(ValueError, re.set_cache_size, -1)
+
+    def test_save_load(self):
+        import io
+        patterns = ['(?P<word>[a-z]+) (?P=word)', r'\d{2,4}', '(?i)abc']
+        for pattern in patterns:
+            re.compile(pattern)
+        re.compile(b'[\x80-\xff]+', re.I)
+        f = io.BytesIO()
+        re.save_cache(f)
+        re.purge()
+        f.seek(0)
+        with mock.patch('sre_compile.compile') as compile:
+            re.load_cache(f)
+            self.assertEqual(re.cache_info().currsize, 4)
+            p = re.compile(patterns[0])
+            self.assertEqual(p.groupindex, {'word': 1})
+            self.assertEqual(p.match('ab ab').group('word'), 'ab')
+            self.assertIsNone(p.match('ab ac'))
+            self.assertEqual(re.findall(patterns[1], 'a 1 12 12345'),
+                             ['12', '1234'])
+            self.assertTrue(re.match(patterns[2], 'ABC'))
+            self.assertEqual(re.match(b'[\x80-\xff]+', b'\xe9\xc9', re.I)
+                             .group(), b'\xe9\xc9')
+            compile.assert_not_called()
+        self.assertEqual(re.cache_info().hits, 4)
+
+    def test_load_incompatible(self):
+        import io
+        import marshal
+        f = io.BytesIO(marshal.dumps(((0, 0, 0, 0), [])))
+        self.assertRaises(ValueError, re.load_cache, f)
+
+
+class RegexSetTests(unittest.TestCase):
+
+    def test_match(self):
+        rs = re.RegexSet(['abc', 'ab', r'a\w', '(?i)AB', 'b', '', 'a+$'])
+        self.assertEqual(len(rs), 7)
+        self.assertEqual(rs.match('abc'), [0, 1, 2, 3, 5])
+        self.assertEqual(rs.match('Abc'), [3, 5])
+        self.assertEqual(rs.match('aaa'), [2, 5, 6])
+        self.assertEqual(rs.match('xabc'), [5])
+        self.assertEqual(rs.match('xabc', 1), [0, 1, 2, 3, 5])
+        self.assertEqual(rs.match('abc', 0, 2), [1, 2, 3, 5])
+        self.assertEqual(rs.match('abc', -5), rs.match('abc'))
+        self.assertEqual(rs.match('abc', 5), [5])
+        self.assertEqual(rs.fullmatch('ab'), [1, 2, 3])
+        self.assertEqual(rs.fullmatch('abc'), [0])
+        self.assertEqual(rs.fullmatch('xab', 1), [1, 2, 3])
+        self.assertEqual(rs.match(''), [5])
+
+    def test_search(self):
+        rs = re.RegexSet([r'error: (\d+)', 'warning', r'\d{3}', 'err'])
+        self.assertEqual(rs.search('an error: 404'), [0, 2, 3])
+        self.assertEqual(rs.search('a warning'), [1])
+        self.assertEqual(rs.search('nothing'), [])
+        self.assertEqual(rs.search('an error: 404', 4), [2])
+        self.assertEqual(rs.search('an error: 404', 0, 6), [3])
+
+    def test_bytes(self):
+        rs = re.RegexSet([b'ab', b'[a-z]c', re.compile(b'(?i)x')])
+        self.assertEqual(rs.match(b'abc'), [0])
+        self.assertEqual(rs.match(b'bc'), [1])
+        self.assertEqual(rs.match(bytearray(b'X')), [2])
+        self.assertEqual(rs.search(memoryview(b'xac')), [1, 2])
+        self.assertEqual(rs.search(b'xab'), [0, 2])
+
+    def test_patterns(self):
+        p = re.compile('a(?P<b>b)')
+        rs = re.RegexSet([p, 'c'])
+        self.assertIs(rs.patterns[0], p)
+        self.assertEqual(rs.patterns[1].pattern, 'c')
+        self.assertEqual(rs.match('abc'), [0])
+        rs = re.RegexSet(['a.b'], re.DOTALL)
+        self.assertEqual(rs.patterns[0].flags & re.DOTALL, re.DOTALL)
+        self.assertEqual(rs.match('a\nb'), [0])
+        self.assertRaises(ValueError, re.RegexSet, [p], re.I)
+        self.assertRaises(TypeError, re.RegexSet, [1])
+        self.assertRaises(re.error, re.RegexSet, ['('])
+        self.assertEqual(repr(re.RegexSet(['a', 'b'])), "RegexSet(['a', 'b'])")
+
+    def test_prefilter(self):
+        patterns = ['/users/%d/(\\d+)$' % i for i in range(100)]
+        rs = re.RegexSet(patterns + [r'/\w+/\d+/(\d+)$'])
+        tried = []
+        for p in rs.patterns:
+            m = mock.Mock(wraps=p)
+            m.pattern = p.pattern
+            tried.append(m)
+        rs.patterns = tuple(tried)
+        self.assertEqual(rs.match('/users/42/7'), [42, 100])
+        self.assertEqual([i for i, m in enumerate(tried) if m.match.called],
+                         [42, 100])
+
+
 class ExternalTests(unittest.TestCase):
 
     def test_re_benchmarks(self):
@@ -378,6 +378,8 @@ class ImportSideEffectTests(unittest.TestCase):
         """Restore sys.path"""
         sys.path[:] = self.sys_path
 
+    @unittest.skipUnless(hasattr(os, '__file__'),
+                         'the os module is frozen in the interpreter')
     def test_abs_paths(self):
         # Make sure all imported modules have their __file__ and __cached__
         # attributes as absolute paths.  Arranging to put the Lib directory on
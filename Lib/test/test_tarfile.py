@@ -649,6 +649,65 @@ class MiscReadTest(MiscReadTestBase, unittest.TestCase):
 class GzipMiscReadTest(GzipTest, MiscReadTestBase, unittest.TestCase):
     pass
 
+class GzipIndexReadTest(GzipTest, TarTest, unittest.TestCase):
+
+    indexname = os.path.join(TEMPDIR, "testtar.idx")
+
+    def setUp(self):
+        self.addCleanup(support.unlink, self.indexname)
+        with tarfile.open(self.tarname) as tar:
+            self.expected = [(t.get_info(), t.offset_data)
+                             for t in tar.getmembers()]
+
+    def check_members(self, tar):
+        self.assertEqual([(t.get_info(), t.offset_data)
+                          for t in tar.getmembers()], self.expected)
+        tarinfo = tar.getmember("ustar/regtype")
+        with tar.extractfile(tarinfo) as fobj:
+            self.assertEqual(md5sum(fobj.read()), md5_regtype)
+
+    def test_index(self):
+        with tarfile.open(self.tarname, "r:gz", index=self.indexname) as tar:
+            self.check_members(tar)
+        self.assertTrue(os.path.exists(self.indexname))
+
+        with unittest.mock.patch.object(tarfile.TarFile, "_load") as load:
+            with tarfile.open(self.tarname, "r:gz",
+                              index=self.indexname) as tar:
+                self.check_members(tar)
+                self.assertIsInstance(tar.getmembers()[0], tarfile.TarInfo)
+        load.assert_not_called()
+
+    def test_stale_index(self):
+        with tarfile.open(tmpname, "w:gz") as tar:
+            tar.addfile(tarfile.TarInfo("foo"))
+        with tarfile.open(tmpname, "r:gz", index=self.indexname) as tar:
+            self.assertEqual(tar.getnames(), ["foo"])
+
+        with tarfile.open(self.tarname, "r:gz", index=self.indexname) as tar:
+            self.check_members(tar)
+        with open(self.indexname, "wb") as fobj:
+            fobj.write(b"garbage")
+        with tarfile.open(self.tarname, "r:gz", index=self.indexname) as tar:
+            self.check_members(tar)
+        with unittest.mock.patch.object(tarfile.TarFile, "_load") as load:
+            with tarfile.open(self.tarname, "r:gz", index=self.indexname):
+                pass
+        load.assert_not_called()
+
+    def test_index_max_workers(self):
+        for i in range(2):
+            with tarfile.open(self.tarname, "r:gz", index=self.indexname,
+                              max_workers=2) as tar:
+                self.check_members(tar)
+                for tarinfo in tar:
+                    if tarinfo.isreg():
+                        tar.extractfile(tarinfo).read()
+
+    def test_index_write_mode(self):
+        with self.assertRaises(ValueError):
+            tarfile.open(tmpname, "w:gz", index=self.indexname)
+
 class Bz2MiscReadTest(Bz2Test, MiscReadTestBase, unittest.TestCase):
     def requires_name_attribute(self):
         self.skipTest("BZ2File have no name attribute")
@@ -1431,6 +1490,89 @@ class LzmaStreamWriteTest(LzmaTest, StreamWriteTest):
     decompressor = lzma.LZMADecompressor if lzma else None
 
 
+class ParallelWriteTestBase(TarTest):
+
+    prefix = "w:"
+
+    class TarFile(tarfile.TarFile):
+        gzip_blocksize = 10000
+        xz_blocksize = 20000
+
+    def write(self, max_workers=None, **kwargs):
+        with self.TarFile.open(tmpname, self.mode, max_workers=max_workers,
+                               **kwargs) as tar:
+            for i in range(10):
+                t = tarfile.TarInfo("foo%d" % i)
+                t.size = 3000 * i
+                tar.addfile(t, io.BytesIO(b"%d" % i * t.size))
+        with self.open(tmpname, "rb") as fobj:
+            return fobj.read()
+
+    def test_roundtrip(self):
+        data = self.write(max_workers=2)
+        self.assertEqual(data, self.write())
+        for mode in "r:" + self.suffix, "r|" + self.suffix, "r|*":
+            with self.subTest(mode=mode):
+                with tarfile.open(tmpname, mode) as tar:
+                    for i, t in enumerate(tar):
+                        self.assertEqual(t.name, "foo%d" % i)
+                        self.assertEqual(tar.extractfile(t).read(),
+                                         b"%d" % i * (3000 * i))
+                self.assertEqual(i, 9)
+
+    def test_multiple_streams(self):
+        self.write(max_workers=2)
+        with open(tmpname, "rb") as fobj:
+            data = fobj.read()
+        dec = self.decompressor()
+        dec.decompress(data)
+        self.assertTrue(dec.eof)
+        self.assertTrue(dec.unused_data, "found a single stream")
+
+    def test_fileobj_no_close(self):
+        fobj = io.BytesIO()
+        with self.TarFile.open(fileobj=fobj, mode=self.mode,
+                               max_workers=2) as tar:
+            tar.addfile(tarfile.TarInfo("foo"))
+        self.assertFalse(fobj.closed, "external fileobjs must never closed")
+        with tarfile.open(fileobj=io.BytesIO(fobj.getvalue())) as tar:
+            self.assertEqual(tar.getnames(), ["foo"])
+
+    def test_empty(self):
+        self.TarFile.open(tmpname, self.mode, max_workers=2).close()
+        with tarfile.open(tmpname) as tar:
+            self.assertEqual(tar.getmembers(), [])
+
+class GzipParallelWriteTest(GzipTest, ParallelWriteTestBase,
+                            unittest.TestCase):
+    @staticmethod
+    def decompressor():
+        import zlib
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def test_stream_end(self):
+        # Data following the last member is not read again on each read
+        data = gzip.compress(b"data") + b"trailing garbage"
+        stream = tarfile._Stream(None, "r", "gz", io.BytesIO(data),
+                                 tarfile.RECORDSIZE)
+        self.assertEqual(stream.read(100), b"data")
+        buf = stream.buf
+        for i in range(2):
+            self.assertEqual(stream.read(100), b"")
+            self.assertEqual(stream.buf, buf)
+
+class Bz2ParallelWriteTest(Bz2Test, ParallelWriteTestBase, unittest.TestCase):
+    decompressor = bz2.BZ2Decompressor if bz2 else None
+
+    def write(self, max_workers=None):
+        # Blocks of 100 kB
+        return super().write(max_workers, compresslevel=1)
+
+class LzmaParallelWriteTest(LzmaTest, ParallelWriteTestBase,
+                            unittest.TestCase):
+    decompressor = lzma.LZMADecompressor if lzma else None
+
+
 class GNUWriteTest(unittest.TestCase):
     # This testcase checks for correct creation of GNU Longname
     # and Longlink extended headers (cp. bug #812325).
@@ -0,0 +1,80 @@
+"""Tests for the freeze_modules script in the Tools directory."""
+
+import marshal
+import os
+import tempfile
+import unittest
+
+from test.test_tools import skip_if_missing, import_tool
+
+skip_if_missing()
+
+
+class FreezeModulesTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.freeze_modules = import_tool('freeze_modules')
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.libdir = tmpdir.name
+        self.write('spam.py', 'x = 1\n')
+        self.write(os.path.join('eggs', '__init__.py'), '')
+        self.write(os.path.join('eggs', 'ham.py'), '')
+        self.write(os.path.join('eggs', 'bacon', '__init__.py'), '')
+        self.write(os.path.join('eggs', 'not-a-module.py'), '')
+        self.write(os.path.join('eggs', 'data', 'spam.py'), '')
+
+    def write(self, name, source):
+        path = os.path.join(self.libdir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(source)
+
+    def test_find_modules(self):
+        modules = self.freeze_modules.find_modules(self.libdir,
+                                                   ['spam', 'eggs'])
+        self.assertEqual(sorted(modules),
+                         ['eggs', 'eggs.bacon', 'eggs.ham', 'spam'])
+        self.assertEqual(modules['eggs'],
+                         (os.path.join(self.libdir, 'eggs', '__init__.py'),
+                          True))
+        self.assertEqual(modules['spam'],
+                         (os.path.join(self.libdir, 'spam.py'), False))
+        with self.assertRaises(ValueError):
+            self.freeze_modules.find_modules(self.libdir, ['ham'])
+
+    def test_freeze_modules(self):
+        source = self.freeze_modules.freeze_modules(
+            self.libdir, ['spam', 'eggs.bacon'], '/usr/lib/python')
+        self.assertIn('    {"spam", M_spam, (int)sizeof(M_spam)},', source)
+        self.assertIn('    {"eggs.bacon", M_eggs_bacon, '
+                      '-(int)sizeof(M_eggs_bacon)},', source)
+        start = source.index('M_spam[] = {') + len('M_spam[] = {')
+        data = source[start:source.index('};', start)]
+        code = marshal.loads(bytes(int(byte) for byte in data.split(',')
+                                   if byte.strip()))
+        self.assertEqual(code.co_filename,
+                         os.path.join('/usr/lib/python', 'spam.py'))
+        namespace = {}
+        exec(code, namespace)
+        self.assertEqual(namespace['x'], 1)
+
+    def test_no_modules(self):
+        source = self.freeze_modules.freeze_modules(self.libdir, [])
+        self.assertTrue(
+            source.endswith('\n#define _Py_FROZEN_STDLIB_MODULES\n'))
+
+    def test_main(self):
+        output = os.path.join(self.libdir, 'frozen_stdlib.h')
+        self.freeze_modules.main(['-l', self.libdir, '-o', output, 'spam'])
+        with open(output) as file:
+            self.assertIn('"spam"', file.read())
+        with self.assertRaises(SystemExit):
+            self.freeze_modules.main(['-l', self.libdir, '-o', output, 'ham'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ import os
 import pathlib
 import posixpath
 import struct
+import threading
 import time
 import unittest
 import zipfile
@@ -13,6 +14,7 @@ import zipfile
 from tempfile import TemporaryFile
 from random import randint, random, getrandbits
 
+from test import support
 from test.support import script_helper
 from test.support import (TESTFN, findfile, unlink, rmtree, temp_dir, temp_cwd,
                           requires_zlib, requires_bz2, requires_lzma,
@@ -863,6 +865,67 @@ class AbstractWriterTests:
             self.assertRaises(ValueError, w.write, b'')
             self.assertEqual(zipf.read('test'), data)
 
+    def make_test_archive(self, f, max_workers=None, readable=True):
+        with zipfile.ZipFile(f, "w", self.compression,
+                             max_workers=max_workers) as zipf:
+            for i in range(10):
+                zinfo = zipfile.ZipInfo('str%d' % i, (1980, 1, 1, 0, 0, 0))
+                zinfo.compress_type = self.compression
+                zipf.writestr(zinfo, b'data %d' % i * (1000 * i))
+                zipf.write(TESTFN, 'file%d' % i)
+                if i == 5:
+                    zipf.write(os.curdir, 'dir')
+                    with zipf.open(zipfile.ZipInfo('open', zinfo.date_time),
+                                   'w') as w:
+                        w.write(b'open')
+                    if readable:
+                        self.assertEqual(zipf.read('str4'), b'data 4' * 4000)
+            zipf.writestr(zinfo, b'duplicate')
+            self.assertEqual(len(zipf.infolist()), 23)
+            zipf.writestr(zipfile.ZipInfo('last', zinfo.date_time), b'')
+
+    def test_max_workers(self):
+        with open(TESTFN, "wb") as f:
+            f.write(b'file\n' * 10000)
+        self.addCleanup(unlink, TESTFN)
+        with self.assertWarns(UserWarning):
+            self.make_test_archive(TESTFN2)
+        with open(TESTFN2, "rb") as f:
+            expected = f.read()
+        for wrapper in None, Tellable, Unseekable:
+            with self.subTest(wrapper=wrapper):
+                f = io.BytesIO()
+                with self.assertWarns(UserWarning):
+                    self.make_test_archive(wrapper(f) if wrapper else f,
+                                           max_workers=2,
+                                           readable=wrapper is None)
+                if wrapper is None:
+                    self.assertEqual(f.getvalue(), expected)
+                with zipfile.ZipFile(f) as zipf:
+                    self.assertIsNone(zipf.testzip())
+                    self.assertEqual(len(zipf.namelist()), 24)
+                    self.assertEqual(zipf.read('str8'), b'data 8' * 8000)
+                    self.assertEqual(zipf.read('str9'), b'duplicate')
+                    self.assertEqual(zipf.read('file3'), b'file\n' * 10000)
+
+    def test_max_workers_read_mode(self):
+        with zipfile.ZipFile(TESTFN2, "w") as zipf:
+            pass
+        with zipfile.ZipFile(TESTFN2, "r", max_workers=2) as zipf:
+            self.assertRaises(ValueError, zipf.writestr, 'test', b'data')
+
+    def test_max_workers_checks(self):
+        # Members are checked when they are submitted, not when written
+        with zipfile.ZipFile(io.BytesIO(), "w", self.compression,
+                             max_workers=2) as zipf:
+            zipf.writestr('a', b'data')
+            with self.assertWarns(UserWarning):
+                zipf.writestr('a', b'data')
+            zinfo = zipfile.ZipInfo('b')
+            zinfo.compress_type = -1
+            self.assertRaises(NotImplementedError, zipf.writestr, zinfo, b'')
+            self.assertEqual(len(zipf._pending) + len(zipf._filelist), 2)
+
 class StoredWriterTests(AbstractWriterTests, unittest.TestCase):
     compression = zipfile.ZIP_STORED
 
@@ -2209,10 +2272,119 @@ class TestsWithMultipleOpens(unittest.TestCase):
         with zipfile.ZipFile(TESTFN2) as zipf:
             self.assertEqual(zipf.read('twos'), self.data2)
 
+    @unittest.skipUnless(hasattr(os, 'pread'), 'requires os.pread()')
+    def test_concurrent_reads(self):
+        self.make_test_archive(TESTFN2)
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            # Readers do not seek the shared file, nor take its lock
+            with zipf.open('ones') as zopen1:
+                self.assertIsNotNone(zopen1._fileobj._fd)
+                zipf.fp.seek(0)
+                with zipf._lock:
+                    data = zopen1.read()
+                self.assertEqual(zipf.fp.tell(), 0)
+            self.assertEqual(data, self.data1)
+            results = {}
+            def read(name):
+                for i in range(20):
+                    with zipf.open(name) as zopen:
+                        results[name, i] = zopen.read()
+            threads = [threading.Thread(target=read, args=(name,))
+                       for name in ('ones', 'twos', 'ones', 'twos')]
+            with support.start_threads(threads):
+                pass
+            self.assertEqual(len(results), 40)
+            for (name, i), data in results.items():
+                self.assertEqual(data, self.data1 if name == 'ones'
+                                 else self.data2)
+        # File objects of the caller are still read under the lock
+        with open(TESTFN2, 'rb') as f, zipfile.ZipFile(f) as zipf:
+            with zipf.open('ones') as zopen1:
+                self.assertIsNone(zopen1._fileobj._fd)
+                self.assertEqual(zopen1.read(), self.data1)
+
     def tearDown(self):
         unlink(TESTFN2)
 
 
+class LazyCentralDirectoryTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(unlink, TESTFN2)
+
+    def make_test_archive(self, names):
+        with zipfile.ZipFile(TESTFN2, "w") as zipfp:
+            for i, name in enumerate(names):
+                zipfp.writestr(name, b'%d' % i)
+
+    def test_getinfo(self):
+        names = ['file%d' % i for i in range(100)] + ['dir/file5', '\xe9t\xe9']
+        self.make_test_archive(names)
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            self.assertIsNotNone(zipf._centralDir)
+            info = zipf.getinfo('file5')
+            self.assertEqual(zipf.read('file5'), b'5')
+            self.assertEqual(zipf.read('dir/file5'), b'100')
+            self.assertEqual(zipf.read('\xe9t\xe9'), b'101')
+            self.assertEqual(zipf.read('file99'), b'99')
+            self.assertRaises(KeyError, zipf.getinfo, 'file')
+            self.assertRaises(KeyError, zipf.getinfo, 'ile5')
+            self.assertRaises(KeyError, zipf.getinfo, 'file100')
+            # Only the ZipInfo instances looked at were created
+            self.assertIsNotNone(zipf._centralDir)
+            self.assertLess(len(zipf._centralDir.infos), 10)
+            self.assertEqual(zipf.namelist(), names)
+            self.assertIsNone(zipf._centralDir)
+            self.assertIs(zipf.getinfo('file5'), info)
+            self.assertIs(zipf.infolist()[5], info)
+            self.assertEqual(info.header_offset, zipf.infolist()[4].header_offset
+                             + zipfile.sizeFileHeader + len('file4') + 1)
+
+    def test_duplicate_names(self):
+        with self.assertWarns(UserWarning):
+            self.make_test_archive(['a', 'b', 'a', 'c'])
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            self.assertEqual(zipf.read('a'), b'2')
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            zipf.namelist()
+            self.assertEqual(zipf.read('a'), b'2')
+
+    def test_normalized_names(self):
+        self.make_test_archive(['a', 'b_c'])
+        with open(TESTFN2, 'rb') as f:
+            data = f.read()
+        with open(TESTFN2, 'wb') as f:
+            f.write(data.replace(b'b_c', b'b\0c'))
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            self.assertEqual(zipf.read('b'), b'1')
+            self.assertIsNone(zipf._centralDir)
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            self.assertRaises(KeyError, zipf.getinfo, 'b\0c')
+            self.assertRaises(KeyError, zipf.getinfo, '')
+
+    def test_append(self):
+        self.make_test_archive(['a', 'b'])
+        with zipfile.ZipFile(TESTFN2, 'a') as zipf:
+            self.assertIsNone(zipf._centralDir)
+            zipf.writestr('c', b'2')
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            self.assertEqual(zipf.namelist(), ['a', 'b', 'c'])
+            self.assertEqual(zipf.read('c'), b'2')
+
+    def test_set_tables(self):
+        self.make_test_archive(['a', 'b'])
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            info = zipf.getinfo('b')
+            zipf.filelist = [info]
+            self.assertIsNone(zipf._centralDir)
+            self.assertEqual(zipf.namelist(), ['b'])
+            self.assertEqual(zipf.read('a'), b'0')
+        with zipfile.ZipFile(TESTFN2) as zipf:
+            zipf.NameToInfo = {'c': zipf.getinfo('a')}
+            self.assertEqual(zipf.read('c'), b'0')
+            self.assertRaises(KeyError, zipf.getinfo, 'a')
+            self.assertEqual(zipf.namelist(), ['a', 'b'])
+
+
 class TestWithDirectory(unittest.TestCase):
     def setUp(self):
         os.mkdir(TESTFN2)
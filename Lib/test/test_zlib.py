@@ -703,6 +703,41 @@ class CompressObjectTestCase(BaseCompressTestCase, unittest.TestCase):
         self.assertRaises(ValueError, copy.copy, d)
         self.assertRaises(ValueError, copy.deepcopy, d)
 
+    @unittest.skipUnless(hasattr(zlib.decompressobj(), "_decompress_block"),
+                         'requires Decompress._decompress_block()')
+    def test_decompress_block(self):
+        # Restore the state of the decompressor at the end of blocks
+        random.seed(1)
+        lines = HAMLET_SCENE.split(b'\n')
+        data = b'\n'.join(random.choice(lines) + b'%d' % random.randrange(1000)
+                          for i in range(30000))
+        co = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        comp = co.compress(data) + co.flush()
+        dco = zlib.decompressobj(-zlib.MAX_WBITS)
+        out = b''
+        pos = 0
+        points = []
+        while not dco.eof:
+            chunk = comp[pos:pos + 1000]
+            buf, bits = dco._decompress_block(chunk, 5000)
+            self.assertLessEqual(len(buf), 5000)
+            pos += len(chunk) - len(dco.unconsumed_tail)
+            out += buf
+            if bits >= 0:
+                self.assertLess(bits, 8)
+                points.append((len(out), pos, bits, out[-32768:]))
+        self.assertEqual(out, data)
+        self.assertEqual(dco.unconsumed_tail, b'')
+        self.assertGreater(len(points), 2)
+        self.assertIn(True, [bits > 0 for _, _, bits, _ in points])
+
+        for offset, pos, bits, window in points:
+            dco = zlib.decompressobj(-zlib.MAX_WBITS, zdict=window)
+            if bits:
+                dco._prime(bits, comp[pos - 1] >> (8 - bits))
+            self.assertEqual(dco.decompress(comp[pos:]), data[offset:])
+            self.assertTrue(dco.eof)
+
     def test_compresspickle(self):
         for proto in range(pickle.HIGHEST_PROTOCOL + 1):
             with self.assertRaises((TypeError, pickle.PicklingError)):
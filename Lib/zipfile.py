@@ -3,7 +3,9 @@ Read and write ZIP files.
 
 XXX references to utf-8 need further investigation.
 """
+import array
 import binascii
+import collections
 import functools
 import importlib.util
 import io
@@ -719,17 +721,39 @@ def _get_decompressor(compress_type):
             raise NotImplementedError("compression type %d" % (compress_type,))
 
 
+_unpackCentralDir = struct.Struct(structCentralDir).unpack_from
+
+class _CentralDir:
+    """The central directory of a ZIP file read, before ZipFile creates
+    all the ZipInfo instances."""
+    def __init__(self, data, offsets, concat):
+        self.data = data                # the central directory
+        self.offsets = offsets          # positions of the records in data
+        self.concat = concat            # offset of the archive in the file
+        self.names = None               # index of the raw names
+        self.normalized = None          # whether some names get normalized
+        self.infos = {}                 # ZipInfo instances already created
+
 class _SharedFile:
-    def __init__(self, file, pos, close, lock, writing):
+    def __init__(self, file, pos, close, lock, writing, fd=None):
         self._file = file
         self._pos = pos
         self._close = close
         self._lock = lock
         self._writing = writing
+        # Given the file descriptor of a file which is only read, reads use
+        # os.pread() and neither take the lock nor move the shared position.
+        self._fd = fd
         self.seekable = file.seekable
-        self.tell = file.tell
+        self.tell = file.tell if fd is None else self._tell
+
+    def _tell(self):
+        return self._pos
 
     def seek(self, offset, whence=0):
+        if self._fd is not None and whence in (0, 1):
+            self._pos = offset if whence == 0 else self._pos + offset
+            return self._pos
         with self._lock:
             if self._writing():
                 raise ValueError("Can't reposition in the ZIP file while "
@@ -740,6 +764,10 @@ class _SharedFile:
             return self._pos
 
     def read(self, n=-1):
+        if self._fd is not None and n is not None and n >= 0:
+            data = os.pread(self._fd, n, self._pos)
+            self._pos += len(data)
+            return data
         with self._lock:
             if self._writing():
                 raise ValueError("Can't read from the ZIP file while there "
@@ -1153,6 +1181,31 @@ class _ZipWriteFile(io.BufferedIOBase):
 
 
 
+def _compressMember(zinfo, chunks):
+    """Compress the chunks of data of a member.  Return its CRC, its size
+    and the list of compressed chunks."""
+    compressor = _get_compressor(zinfo.compress_type, zinfo._compresslevel)
+    crc = 0
+    file_size = 0
+    data = []
+    for chunk in chunks:
+        file_size += len(chunk)
+        crc = crc32(chunk, crc)
+        if compressor:
+            chunk = compressor.compress(chunk)
+        data.append(chunk)
+    if compressor:
+        data.append(compressor.flush())
+    return crc, file_size, data
+
+def _compressFile(zinfo, filename):
+    with open(filename, "rb") as src:
+        return _compressMember(zinfo, iter(lambda: src.read(1 << 20), b''))
+
+def _compressData(zinfo, data):
+    return _compressMember(zinfo, (data,))
+
+
 class ZipFile:
     """ Class with methods to open, read, write, close, list zip files.
 
@@ -1173,6 +1226,8 @@ class ZipFile:
                    When using ZIP_STORED or ZIP_LZMA this keyword has no effect.
                    When using ZIP_DEFLATED integers 0 through 9 are accepted.
                    When using ZIP_BZIP2 integers 1 through 9 are accepted.
+    max_workers: None (default) or the number of threads write() and
+                 writestr() use to compress members concurrently.
 
     """
 
@@ -1180,7 +1235,8 @@ class ZipFile:
     _windows_illegal_name_trans_table = None
 
     def __init__(self, file, mode="r", compression=ZIP_STORED, allowZip64=True,
-                 compresslevel=None, *, strict_timestamps=True):
+                 compresslevel=None, *, strict_timestamps=True,
+                 max_workers=None):
         """Open the ZIP file with mode read 'r', write 'w', exclusive create 'x',
         or append 'a'."""
         if mode not in ('r', 'w', 'x', 'a'):
@@ -1191,14 +1247,18 @@ class ZipFile:
         self._allowZip64 = allowZip64
         self._didModify = False
         self.debug = 0  # Level of printing: 0 through 3
-        self.NameToInfo = {}    # Find file info given name
-        self.filelist = []      # List of ZipInfo instances for archive
+        self._NameToInfo = {}   # Find file info given name
+        self._filelist = []     # List of ZipInfo instances for archive
+        self._centralDir = None # Central directory not loaded yet, if any
         self.compression = compression  # Method of compression
         self.compresslevel = compresslevel
         self.mode = mode
         self.pwd = None
         self._comment = b''
         self._strict_timestamps = strict_timestamps
+        self._maxWorkers = max_workers
+        self._executor = None
+        self._pending = collections.deque()    # Members being compressed
 
         # Check if we were passed a file-like object
         if isinstance(file, os.PathLike):
@@ -1317,55 +1377,171 @@ class ZipFile:
         self.start_dir = offset_cd + concat
         fp.seek(self.start_dir, 0)
         data = fp.read(size_cd)
-        fp = io.BytesIO(data)
-        total = 0
-        while total < size_cd:
-            centdir = fp.read(sizeCentralDir)
-            if len(centdir) != sizeCentralDir:
+        # Only check the records of the central directory and note where
+        # they start: the ZipInfo instances are created when needed.
+        offsets = array.array('Q')
+        pos = 0
+        while pos < size_cd:
+            if len(data) - pos < sizeCentralDir:
                 raise BadZipFile("Truncated central directory")
-            centdir = struct.unpack(structCentralDir, centdir)
+            centdir = _unpackCentralDir(data, pos)
             if centdir[_CD_SIGNATURE] != stringCentralDir:
                 raise BadZipFile("Bad magic number for central directory")
             if self.debug > 2:
                 print(centdir)
-            filename = fp.read(centdir[_CD_FILENAME_LENGTH])
-            flags = centdir[5]
-            if flags & 0x800:
-                # UTF-8 file names extension
-                filename = filename.decode('utf-8')
-            else:
-                # Historical ZIP filename encoding
-                filename = filename.decode('cp437')
-            # Create ZipInfo instance to store file information
-            x = ZipInfo(filename)
-            x.extra = fp.read(centdir[_CD_EXTRA_FIELD_LENGTH])
-            x.comment = fp.read(centdir[_CD_COMMENT_LENGTH])
-            x.header_offset = centdir[_CD_LOCAL_HEADER_OFFSET]
-            (x.create_version, x.create_system, x.extract_version, x.reserved,
-             x.flag_bits, x.compress_type, t, d,
-             x.CRC, x.compress_size, x.file_size) = centdir[1:12]
-            if x.extract_version > MAX_EXTRACT_VERSION:
+            if centdir[_CD_EXTRACT_VERSION] > MAX_EXTRACT_VERSION:
                 raise NotImplementedError("zip file version %.1f" %
-                                          (x.extract_version / 10))
-            x.volume, x.internal_attr, x.external_attr = centdir[15:18]
-            # Convert date/time code to (year, month, day, hour, min, sec)
-            x._raw_time = t
-            x.date_time = ( (d>>9)+1980, (d>>5)&0xF, d&0x1F,
-                            t>>11, (t>>5)&0x3F, (t&0x1F) * 2 )
-
-            x._decodeExtra()
-            x.header_offset = x.header_offset + concat
-            self.filelist.append(x)
-            self.NameToInfo[x.filename] = x
-
-            # update total bytes read from central directory
-            total = (total + sizeCentralDir + centdir[_CD_FILENAME_LENGTH]
-                     + centdir[_CD_EXTRA_FIELD_LENGTH]
-                     + centdir[_CD_COMMENT_LENGTH])
+                                          (centdir[_CD_EXTRACT_VERSION] / 10))
+            offsets.append(pos)
+            pos = (pos + sizeCentralDir + centdir[_CD_FILENAME_LENGTH]
+                   + centdir[_CD_EXTRA_FIELD_LENGTH]
+                   + centdir[_CD_COMMENT_LENGTH])
 
             if self.debug > 2:
-                print("total", total)
+                print("total", pos)
+
+        self._centralDir = _CentralDir(data, offsets, concat)
+        if self.mode != 'r':
+            self._loadCentralDir()
+
+    def _infoAt(self, index):
+        """Return the ZipInfo instance of an entry of the central directory
+        which has not been loaded yet."""
+        cd = self._centralDir
+        info = cd.infos.get(index)
+        if info is not None:
+            return info
+        data = cd.data
+        pos = cd.offsets[index]
+        centdir = _unpackCentralDir(data, pos)
+        pos += sizeCentralDir
+        filename = data[pos:pos + centdir[_CD_FILENAME_LENGTH]]
+        pos += centdir[_CD_FILENAME_LENGTH]
+        flags = centdir[5]
+        if flags & 0x800:
+            # UTF-8 file names extension
+            filename = filename.decode('utf-8')
+        else:
+            # Historical ZIP filename encoding
+            filename = filename.decode('cp437')
+        # Create ZipInfo instance to store file information
+        x = ZipInfo(filename)
+        x.extra = data[pos:pos + centdir[_CD_EXTRA_FIELD_LENGTH]]
+        pos += centdir[_CD_EXTRA_FIELD_LENGTH]
+        x.comment = data[pos:pos + centdir[_CD_COMMENT_LENGTH]]
+        x.header_offset = centdir[_CD_LOCAL_HEADER_OFFSET]
+        (x.create_version, x.create_system, x.extract_version, x.reserved,
+         x.flag_bits, x.compress_type, t, d,
+         x.CRC, x.compress_size, x.file_size) = centdir[1:12]
+        x.volume, x.internal_attr, x.external_attr = centdir[15:18]
+        # Convert date/time code to (year, month, day, hour, min, sec)
+        x._raw_time = t
+        x.date_time = ( (d>>9)+1980, (d>>5)&0xF, d&0x1F,
+                        t>>11, (t>>5)&0x3F, (t&0x1F) * 2 )
+
+        x._decodeExtra()
+        x.header_offset = x.header_offset + cd.concat
+        cd.infos[index] = x
+        return x
+
+    def _findInfo(self, name):
+        """Look name up in the central directory which has not been loaded
+        yet, without creating the ZipInfo instances of the other entries.
+        Return None if it is not there, or if that is not known."""
+        cd = self._centralDir
+        if not name:
+            self._loadCentralDir()
+            return self._NameToInfo.get(name)
+        if cd.names is None:
+            # Map the raw names and whether they are UTF-8 to the index of
+            # their entries; the last entry with a name wins, as in
+            # NameToInfo
+            names = {}
+            data = cd.data
+            for index, pos in enumerate(cd.offsets):
+                centdir = _unpackCentralDir(data, pos)
+                start = pos + sizeCentralDir
+                raw = data[start:start + centdir[_CD_FILENAME_LENGTH]]
+                names[raw, bool(centdir[5] & 0x800)] = index
+            cd.names = names
+        found = -1
+        for encoding, utf8 in ('utf-8', True), ('cp437', False):
+            try:
+                raw = name.encode(encoding)
+            except UnicodeEncodeError:
+                continue
+            found = max(found, cd.names.get((raw, utf8), -1))
+        if found >= 0:
+            info = self._infoAt(found)
+            if info.filename == name:
+                return info
+        if cd.normalized is None:
+            # See ZipInfo.__init__()
+            chars = [b'\0']
+            if os.sep != "/":
+                chars.append(os.sep.encode())
+            cd.normalized = False
+            for pos in cd.offsets:
+                start = pos + sizeCentralDir
+                end = start + _unpackCentralDir(cd.data, pos)[_CD_FILENAME_LENGTH]
+                if any(cd.data.find(c, start, end) >= 0 for c in chars):
+                    cd.normalized = True
+                    break
+        if cd.normalized:
+            # The name may only match once normalized
+            self._loadCentralDir()
+            return self._NameToInfo.get(name)
+        return None
 
+    def _loadCentralDir(self):
+        """Create the ZipInfo instances of all the entries of the central
+        directory."""
+        with self._lock:
+            if self._centralDir is None:
+                return
+            filelist = []
+            nameToInfo = {}
+            for index in range(len(self._centralDir.offsets)):
+                x = self._infoAt(index)
+                filelist.append(x)
+                nameToInfo[x.filename] = x
+            self._filelist = filelist
+            self._NameToInfo = nameToInfo
+            self._centralDir = None
+
+    @property
+    def filelist(self):
+        """List of ZipInfo instances for archive."""
+        if self._centralDir is not None:
+            self._loadCentralDir()
+        if self._pending:
+            self._flushPending()
+        return self._filelist
+
+    @filelist.setter
+    def filelist(self, filelist):
+        if self._centralDir is not None:
+            self._loadCentralDir()
+        if self._pending:
+            self._flushPending()
+        self._filelist = filelist
+
+    @property
+    def NameToInfo(self):
+        """Find file info given name."""
+        if self._centralDir is not None:
+            self._loadCentralDir()
+        if self._pending:
+            self._flushPending()
+        return self._NameToInfo
+
+    @NameToInfo.setter
+    def NameToInfo(self, nameToInfo):
+        if self._centralDir is not None:
+            self._loadCentralDir()
+        if self._pending:
+            self._flushPending()
+        self._NameToInfo = nameToInfo
 
     def namelist(self):
         """Return a list of file names in the archive."""
@@ -1400,7 +1576,12 @@ class ZipFile:
 
     def getinfo(self, name):
         """Return the instance of ZipInfo given 'name'."""
-        info = self.NameToInfo.get(name)
+        if self._pending:
+            self._flushPending()
+        if self._centralDir is not None:
+            info = self._findInfo(name)
+        else:
+            info = self._NameToInfo.get(name)
         if info is None:
             raise KeyError(
                 'There is no item named %r in the archive' % name)
@@ -1464,6 +1645,8 @@ class ZipFile:
         if not self.fp:
             raise ValueError(
                 "Attempt to use ZIP archive that was already closed")
+        if self._pending:
+            self._flushPending()
 
         # Make sure we have an info object
         if isinstance(name, ZipInfo):
@@ -1487,8 +1670,13 @@ class ZipFile:
 
         # Open for reading:
         self._fileRefCnt += 1
+        if self.mode == 'r' and not self._filePassed and hasattr(os, 'pread'):
+            fd = self.fp.fileno()
+        else:
+            fd = None
         zef_file = _SharedFile(self.fp, zinfo.header_offset,
-                               self._fpclose, self._lock, lambda: self._writing)
+                               self._fpclose, self._lock, lambda: self._writing,
+                               fd)
         try:
             # Skip the file header:
             fheader = zef_file.read(sizeFileHeader)
@@ -1685,7 +1873,9 @@ class ZipFile:
 
     def _writecheck(self, zinfo):
         """Check for errors before writing a file to the archive."""
-        if zinfo.filename in self.NameToInfo:
+        if (zinfo.filename in self._NameToInfo or
+            any(zinfo.filename == pending[0].filename
+                for pending in self._pending)):
             import warnings
             warnings.warn('Duplicate name: %r' % zinfo.filename, stacklevel=3)
         if self.mode not in ('w', 'x', 'a'):
@@ -1696,7 +1886,8 @@ class ZipFile:
         _check_compression(zinfo.compress_type)
         if not self._allowZip64:
             requires_zip64 = None
-            if len(self.filelist) >= ZIP_FILECOUNT_LIMIT:
+            count = len(self._filelist) + len(self._pending)
+            if count >= ZIP_FILECOUNT_LIMIT:
                 requires_zip64 = "Files count"
             elif zinfo.file_size > ZIP64_LIMIT:
                 requires_zip64 = "Filesize"
@@ -1737,6 +1928,8 @@ class ZipFile:
 
         if zinfo.is_dir():
             with self._lock:
+                if self._pending:
+                    self._flushPending()
                 if self._seekable:
                     self.fp.seek(self.start_dir)
                 zinfo.header_offset = self.fp.tell()  # Start of header bytes
@@ -1751,6 +1944,8 @@ class ZipFile:
                 self.NameToInfo[zinfo.filename] = zinfo
                 self.fp.write(zinfo.FileHeader(False))
                 self.start_dir = self.fp.tell()
+        elif self._maxWorkers:
+            self._submit(zinfo, _compressFile, filename)
         else:
             with open(filename, "rb") as src, self.open(zinfo, 'w') as dest:
                 shutil.copyfileobj(src, dest, 1024*8)
@@ -1792,10 +1987,64 @@ class ZipFile:
             zinfo._compresslevel = compresslevel
 
         zinfo.file_size = len(data)            # Uncompressed size
+        if self._maxWorkers:
+            self._submit(zinfo, _compressData, bytes(data))
+            return
         with self._lock:
             with self.open(zinfo, mode='w') as dest:
                 dest.write(data)
 
+    def _submit(self, zinfo, func, arg):
+        """Compress a member in the thread pool.  It is written once the
+        members submitted before it are."""
+        with self._lock:
+            self._writecheck(zinfo)
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(self._maxWorkers)
+            self._didModify = True
+            self._pending.append((zinfo, self._executor.submit(func, zinfo, arg)))
+            # Write the members already compressed, and wait for the oldest
+            # ones when too many compressed members are held in memory.
+            while self._pending and (self._pending[0][1].done() or
+                                     len(self._pending) > 2 * self._maxWorkers):
+                self._writePending()
+
+    def _flushPending(self):
+        """Wait for all the members being compressed and write them."""
+        with self._lock:
+            while self._pending:
+                self._writePending()
+
+    def _writePending(self):
+        """Write the oldest member submitted for compression."""
+        zinfo, future = self._pending.popleft()
+        zinfo.CRC, zinfo.file_size, data = future.result()
+        zinfo.compress_size = sum(map(len, data))
+
+        # Sizes are known, no data descriptor is needed
+        zinfo.flag_bits = 0x00
+        if zinfo.compress_type == ZIP_LZMA:
+            # Compressed data includes an end-of-stream (EOS) marker
+            zinfo.flag_bits |= 0x02
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16  # permissions: ?rw-------
+        zip64 = self._allowZip64 and (zinfo.file_size > ZIP64_LIMIT or
+                                      zinfo.compress_size > ZIP64_LIMIT)
+
+        if self._seekable:
+            self.fp.seek(self.start_dir)
+        zinfo.header_offset = self.fp.tell()
+        # The other checks were done when the member was submitted
+        if not self._allowZip64 and zinfo.header_offset > ZIP64_LIMIT:
+            raise LargeZipFile("Zipfile size would require ZIP64 extensions")
+        self.fp.write(zinfo.FileHeader(zip64))
+        for chunk in data:
+            self.fp.write(chunk)
+        self.start_dir = self.fp.tell()
+        self._filelist.append(zinfo)
+        self._NameToInfo[zinfo.filename] = zinfo
+
     def __del__(self):
         """Call the "close()" method in case the user forgot."""
         self.close()
@@ -1814,10 +2063,15 @@ class ZipFile:
         try:
             if self.mode in ('w', 'x', 'a') and self._didModify: # write ending records
                 with self._lock:
+                    self._flushPending()
                     if self._seekable:
                         self.fp.seek(self.start_dir)
                     self._write_end_record()
         finally:
+            if self._executor is not None:
+                self._pending.clear()
+                self._executor.shutdown()
+                self._executor = None
             fp = self.fp
             self.fp = None
             self._fpclose(fp)
@@ -59,6 +59,7 @@ typedef struct _PyEncoderObject {
     char skipkeys;
     int allow_nan;
     PyCFunction fast_encode;
+    PyObject *write;  /* borrowed, only set while encoder_call() runs */
 } PyEncoderObject;
 
 static PyMemberDef encoder_members[] = {
@@ -114,6 +115,8 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc, PyObject *seq, Py_ssiz
 static int
 encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc, PyObject *obj, Py_ssize_t indent_level);
 static int
+encoder_flush(PyEncoderObject *s, _PyAccu *acc);
+static int
 encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc, PyObject *dct, Py_ssize_t indent_level);
 static PyObject *
 _encoded_const(PyObject *obj);
@@ -1314,6 +1317,12 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
                      "not %.200s", Py_TYPE(markers)->tp_name);
         return NULL;
     }
+    if (indent != Py_None && !PyUnicode_Check(indent)) {
+        PyErr_Format(PyExc_TypeError,
+                     "make_encoder() argument 4 must be str or None, "
+                     "not %.200s", Py_TYPE(indent)->tp_name);
+        return NULL;
+    }
 
     s = (PyEncoderObject *)type->tp_alloc(type, 0);
     if (s == NULL)
@@ -1329,6 +1338,7 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     s->skipkeys = skipkeys;
     s->allow_nan = allow_nan;
     s->fast_encode = NULL;
+    s->write = NULL;
     if (PyCFunction_Check(s->encoder)) {
         PyCFunction f = PyCFunction_GetFunction(s->encoder);
         if (f == (PyCFunction)py_encode_basestring_ascii ||
@@ -1350,26 +1360,58 @@ static PyObject *
 encoder_call(PyObject *self, PyObject *args, PyObject *kwds)
 {
     /* Python callable interface to encode_listencode_obj */
-    static char *kwlist[] = {"obj", "_current_indent_level", NULL};
+    static char *kwlist[] = {"obj", "_current_indent_level", "_write", NULL};
     PyObject *obj;
     Py_ssize_t indent_level;
+    PyObject *write = Py_None;
+    PyObject *prev_write;
     PyEncoderObject *s;
     _PyAccu acc;
+    int rv;
 
     assert(PyEncoder_Check(self));
     s = (PyEncoderObject *)self;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "On:_iterencode", kwlist,
-        &obj, &indent_level))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "On|O:_iterencode", kwlist,
+        &obj, &indent_level, &write))
         return NULL;
     if (_PyAccu_Init(&acc))
         return NULL;
-    if (encoder_listencode_obj(s, &acc, obj, indent_level)) {
+    /* The encoder can be called again from the default function */
+    prev_write = s->write;
+    s->write = (write == Py_None) ? NULL : write;
+    rv = encoder_listencode_obj(s, &acc, obj, indent_level);
+    if (rv == 0)
+        rv = encoder_flush(s, &acc);
+    s->write = prev_write;
+    if (rv) {
         _PyAccu_Destroy(&acc);
         return NULL;
     }
     return _PyAccu_FinishAsList(&acc);
 }
 
+static int
+encoder_flush(PyEncoderObject *s, _PyAccu *acc)
+{
+    /* Pass the large strings joined by the accumulator to s->write, so that
+       at most one of them is kept in memory when encoding to a file. */
+    Py_ssize_t i, n;
+
+    if (s->write == NULL || acc->large == NULL)
+        return 0;
+    n = PyList_GET_SIZE(acc->large);
+    for (i = 0; i < n; i++) {
+        PyObject *res = _PyObject_CallOneArg(s->write,
+                                             PyList_GET_ITEM(acc->large, i));
+        if (res == NULL)
+            return -1;
+        Py_DECREF(res);
+    }
+    if (n == 0)
+        return 0;
+    return PyList_SetSlice(acc->large, 0, n, NULL);
+}
+
 static PyObject *
 _encoded_const(PyObject *obj)
 {
@@ -1459,6 +1501,25 @@ _steal_accumulate(_PyAccu *acc, PyObject *stolen)
     return rval;
 }
 
+static PyObject *
+encoder_newline_indent(PyEncoderObject *s, Py_ssize_t indent_level)
+{
+    /* Return '\n' + indent * indent_level */
+    PyObject *newline_indent;
+    PyObject *indent;
+
+    newline_indent = PyUnicode_FromOrdinal('\n');
+    if (newline_indent == NULL || indent_level == 0)
+        return newline_indent;
+    indent = PySequence_Repeat(s->indent, indent_level);
+    if (indent == NULL) {
+        Py_DECREF(newline_indent);
+        return NULL;
+    }
+    PyUnicode_AppendAndDel(&newline_indent, indent);
+    return newline_indent;
+}
+
 static int
 encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
                        PyObject *obj, Py_ssize_t indent_level)
@@ -1568,6 +1629,8 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
     PyObject *it = NULL;
     PyObject *items;
     PyObject *item = NULL;
+    PyObject *newline_indent = NULL;
+    PyObject *separator = NULL;
     Py_ssize_t idx;
 
     if (open_dict == NULL || close_dict == NULL || empty_dict == NULL) {
@@ -1600,13 +1663,19 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         goto bail;
 
     if (s->indent != Py_None) {
-        /* TODO: DOES NOT RUN */
         indent_level += 1;
-        /*
-            newline_indent = '\n' + (' ' * (_indent * _current_indent_level))
-            separator = _item_separator + newline_indent
-            buf += newline_indent
-        */
+        newline_indent = encoder_newline_indent(s, indent_level);
+        if (newline_indent == NULL)
+            goto bail;
+        separator = PyUnicode_Concat(s->item_separator, newline_indent);
+        if (separator == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
+    }
+    else {
+        separator = s->item_separator;
+        Py_INCREF(separator);
     }
 
     items = PyMapping_Items(dct);
@@ -1662,7 +1731,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         }
 
         if (idx) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (_PyAccu_Accumulate(acc, separator))
                 goto bail;
         }
 
@@ -1681,6 +1750,8 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         value = PyTuple_GET_ITEM(item, 1);
         if (encoder_listencode_obj(s, acc, value, indent_level))
             goto bail;
+        if (encoder_flush(s, acc))
+            goto bail;
         idx += 1;
         Py_DECREF(item);
     }
@@ -1693,12 +1764,17 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
             goto bail;
         Py_CLEAR(ident);
     }
-    /* TODO DOES NOT RUN; dead code
-    if (s->indent != Py_None) {
+    if (newline_indent != NULL) {
         indent_level -= 1;
-
-        yield '\n' + (' ' * (_indent * _current_indent_level))
-    }*/
+        Py_SETREF(newline_indent,
+                  encoder_newline_indent(s, indent_level));
+        if (newline_indent == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
+        Py_CLEAR(newline_indent);
+    }
+    Py_CLEAR(separator);
     if (_PyAccu_Accumulate(acc, close_dict))
         goto bail;
     return 0;
@@ -1708,6 +1784,8 @@ bail:
     Py_XDECREF(item);
     Py_XDECREF(kstr);
     Py_XDECREF(ident);
+    Py_XDECREF(newline_indent);
+    Py_XDECREF(separator);
     return -1;
 }
 
@@ -1722,6 +1800,8 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
     static PyObject *empty_array = NULL;
     PyObject *ident = NULL;
     PyObject *s_fast = NULL;
+    PyObject *newline_indent = NULL;
+    PyObject *separator = NULL;
     Py_ssize_t i;
 
     if (open_array == NULL || close_array == NULL || empty_array == NULL) {
@@ -1759,22 +1839,30 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
     if (_PyAccu_Accumulate(acc, open_array))
         goto bail;
     if (s->indent != Py_None) {
-        /* TODO: DOES NOT RUN */
         indent_level += 1;
-        /*
-            newline_indent = '\n' + (' ' * (_indent * _current_indent_level))
-            separator = _item_separator + newline_indent
-            buf += newline_indent
-        */
+        newline_indent = encoder_newline_indent(s, indent_level);
+        if (newline_indent == NULL)
+            goto bail;
+        separator = PyUnicode_Concat(s->item_separator, newline_indent);
+        if (separator == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
+    }
+    else {
+        separator = s->item_separator;
+        Py_INCREF(separator);
     }
     for (i = 0; i < PySequence_Fast_GET_SIZE(s_fast); i++) {
         PyObject *obj = PySequence_Fast_GET_ITEM(s_fast, i);
         if (i) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (_PyAccu_Accumulate(acc, separator))
                 goto bail;
         }
         if (encoder_listencode_obj(s, acc, obj, indent_level))
             goto bail;
+        if (encoder_flush(s, acc))
+            goto bail;
     }
     if (ident != NULL) {
         if (PyDict_DelItem(s->markers, ident))
@@ -1782,12 +1870,17 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
         Py_CLEAR(ident);
     }
 
-    /* TODO: DOES NOT RUN
-    if (s->indent != Py_None) {
+    if (newline_indent != NULL) {
         indent_level -= 1;
-
-        yield '\n' + (' ' * (_indent * _current_indent_level))
-    }*/
+        Py_SETREF(newline_indent,
+                  encoder_newline_indent(s, indent_level));
+        if (newline_indent == NULL)
+            goto bail;
+        if (_PyAccu_Accumulate(acc, newline_indent))
+            goto bail;
+        Py_CLEAR(newline_indent);
+    }
+    Py_CLEAR(separator);
     if (_PyAccu_Accumulate(acc, close_array))
         goto bail;
     Py_DECREF(s_fast);
@@ -1795,6 +1888,8 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
 
 bail:
     Py_XDECREF(ident);
+    Py_XDECREF(newline_indent);
+    Py_XDECREF(separator);
     Py_DECREF(s_fast);
     return -1;
 }
@@ -441,6 +441,8 @@ state_init(SRE_STATE* state, PatternObject* pattern, PyObject* string,
     state->charsize = charsize;
     state->match_all = 0;
     state->must_advance = 0;
+    state->required = pattern->required;
+    state->requiredsize = pattern->requiredsize;
 
     state->beginning = ptr;
 
@@ -1323,23 +1325,33 @@ _sre.compile
     groups: Py_ssize_t
     groupindex: object(subclass_of='&PyDict_Type')
     indexgroup: object(subclass_of='&PyTuple_Type')
+    required: object = None
 
 [clinic start generated code]*/
 
 static PyObject *
 _sre_compile_impl(PyObject *module, PyObject *pattern, int flags,
                   PyObject *code, Py_ssize_t groups, PyObject *groupindex,
-                  PyObject *indexgroup)
-/*[clinic end generated code: output=ef9c2b3693776404 input=0a68476dbbe5db30]*/
+                  PyObject *indexgroup, PyObject *required)
+/*[clinic end generated code: output=fe42bc8e59cf149c input=4a18b908fcb10724]*/
 {
     /* "compile" pattern descriptor to pattern object */
 
     PatternObject* self;
-    Py_ssize_t i, n;
+    Py_ssize_t i, n, m;
+
+    if (required == Py_None)
+        m = 0;
+    else if (PyList_Check(required))
+        m = PyList_GET_SIZE(required);
+    else {
+        PyErr_SetString(PyExc_TypeError, "required must be a list or None");
+        return NULL;
+    }
 
     n = PyList_GET_SIZE(code);
     /* coverity[ampersand_in_size] */
-    self = PyObject_NEW_VAR(PatternObject, &Pattern_Type, n);
+    self = PyObject_NEW_VAR(PatternObject, &Pattern_Type, n + m);
     if (!self)
         return NULL;
     self->weakreflist = NULL;
@@ -1348,9 +1360,12 @@ _sre_compile_impl(PyObject *module, PyObject *pattern, int flags,
     self->indexgroup = NULL;
 
     self->codesize = n;
+    self->requiredsize = m;
+    self->required = m ? self->code + n : NULL;
 
-    for (i = 0; i < n; i++) {
-        PyObject *o = PyList_GET_ITEM(code, i);
+    for (i = 0; i < n + m; i++) {
+        PyObject *o = (i < n ? PyList_GET_ITEM(code, i) :
+                       PyList_GET_ITEM(required, i - n));
         unsigned long value = PyLong_AsUnsignedLong(o);
         self->code[i] = (SRE_CODE) value;
         if ((unsigned long) self->code[i] != value) {
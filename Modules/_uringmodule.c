@@ -0,0 +1,760 @@
+/*
+ * Minimal io_uring wrapper used by asyncio.uring_events.
+ *
+ * A Ring object owns a submission queue and a completion queue shared with
+ * the kernel.  Operations are queued with read(), write(), recv(), send(),
+ * accept(), poll() and cancel(); all queued operations are submitted at once
+ * by the next submit() or wait() call, which then returns the completions.
+ * Each operation is identified by a user_data integer chosen by the caller.
+ */
+
+#include "Python.h"
+
+#include <errno.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/socket.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+
+#include <linux/io_uring.h>
+
+#if defined(IORING_FEAT_EXT_ARG) && defined(__NR_io_uring_setup) \
+    && defined(__NR_io_uring_enter)
+#  define HAVE_IO_URING_EXT_ARG
+#endif
+
+#ifdef HAVE_IO_URING_EXT_ARG
+
+/* Features the module cannot work without: a single mmap for both rings,
+   completions never dropped when the completion queue is full, and
+   io_uring_enter() timeouts */
+#define REQUIRED_FEATURES \
+    (IORING_FEAT_SINGLE_MMAP | IORING_FEAT_NODROP | IORING_FEAT_EXT_ARG)
+
+/* Largest size of a single read or write, as on Linux read() and write() */
+#define MAX_RW_COUNT 0x7ffff000
+
+typedef struct {
+    PyObject_HEAD
+    int fd;
+    void *ring_ptr;
+    size_t ring_size;
+    struct io_uring_sqe *sqes;
+    size_t sqes_size;
+    unsigned *sq_head;
+    unsigned *sq_tail;
+    unsigned *sq_flags;
+    unsigned sq_mask;
+    unsigned sq_entries;
+    unsigned sqe_tail;          /* tail of the queued SQEs */
+    unsigned *cq_head;
+    unsigned *cq_tail;
+    unsigned cq_mask;
+    struct io_uring_cqe *cqes;
+    /* user_data => memoryview of the buffer of the operation (or None): keep
+       the buffers alive until the kernel is done with them */
+    PyObject *pending;
+} RingObject;
+
+static PyTypeObject RingType;
+
+static int
+io_uring_setup(unsigned entries, struct io_uring_params *p)
+{
+    return (int)syscall(__NR_io_uring_setup, entries, p);
+}
+
+static int
+io_uring_enter(int fd, unsigned to_submit, unsigned min_complete,
+               unsigned flags, void *arg, size_t argsz)
+{
+    return (int)syscall(__NR_io_uring_enter, fd, to_submit, min_complete,
+                        flags, arg, argsz);
+}
+
+static int
+ring_check_open(RingObject *self)
+{
+    if (self->fd < 0) {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed ring");
+        return -1;
+    }
+    return 0;
+}
+
+static unsigned
+ring_to_submit(RingObject *self)
+{
+    return self->sqe_tail - __atomic_load_n(self->sq_head, __ATOMIC_ACQUIRE);
+}
+
+/* Submit the queued SQEs and, if min_complete is non-zero, wait for
+   completions for at most ts (or forever if ts is NULL).  Return the result
+   of io_uring_enter(), errno is set on error. */
+static int
+ring_enter(RingObject *self, unsigned min_complete,
+           struct __kernel_timespec *ts)
+{
+    struct io_uring_getevents_arg arg;
+    unsigned to_submit = ring_to_submit(self);
+    unsigned flags = IORING_ENTER_EXT_ARG;
+    int ret;
+
+    memset(&arg, 0, sizeof(arg));
+    if (min_complete) {
+        flags |= IORING_ENTER_GETEVENTS;
+        arg.ts = (__u64)(uintptr_t)ts;
+    }
+    else if (__atomic_load_n(self->sq_flags, __ATOMIC_RELAXED)
+             & IORING_SQ_CQ_OVERFLOW) {
+        /* Flush the completions which did not fit in the completion
+           queue */
+        flags |= IORING_ENTER_GETEVENTS;
+    }
+    else if (to_submit == 0) {
+        return 0;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    ret = io_uring_enter(self->fd, to_submit, min_complete, flags,
+                         &arg, sizeof(arg));
+    Py_END_ALLOW_THREADS
+    return ret;
+}
+
+static struct io_uring_sqe *
+ring_get_sqe(RingObject *self, PyObject *key, PyObject *buffer)
+{
+    struct io_uring_sqe *sqe;
+    int r;
+
+    if (ring_check_open(self) < 0) {
+        return NULL;
+    }
+    r = PyDict_Contains(self->pending, key);
+    if (r < 0) {
+        return NULL;
+    }
+    if (r) {
+        PyErr_Format(PyExc_ValueError,
+                     "user_data %R is used by a pending operation", key);
+        return NULL;
+    }
+    if (ring_to_submit(self) >= self->sq_entries) {
+        /* The submission queue is full: submit it now */
+        if (ring_enter(self, 0, NULL) < 0 && errno != EINTR) {
+            PyErr_SetFromErrno(PyExc_OSError);
+            return NULL;
+        }
+        if (ring_to_submit(self) >= self->sq_entries) {
+            errno = EBUSY;
+            PyErr_SetFromErrno(PyExc_OSError);
+            return NULL;
+        }
+    }
+    if (PyDict_SetItem(self->pending, key, buffer) < 0) {
+        return NULL;
+    }
+    sqe = &self->sqes[self->sqe_tail & self->sq_mask];
+    memset(sqe, 0, sizeof(*sqe));
+    return sqe;
+}
+
+static void
+ring_queue_sqe(RingObject *self)
+{
+    self->sqe_tail++;
+    __atomic_store_n(self->sq_tail, self->sqe_tail, __ATOMIC_RELEASE);
+}
+
+/* Queue an operation on a buffer: the buffer is kept alive until the
+   operation completes */
+static PyObject *
+ring_queue_buffer_op(RingObject *self, int opcode, unsigned long long user_data,
+                     int fd, PyObject *obj, int writable, int flags)
+{
+    struct io_uring_sqe *sqe;
+    PyObject *key, *buffer;
+    Py_buffer *view;
+
+    buffer = PyMemoryView_FromObject(obj);
+    if (buffer == NULL) {
+        return NULL;
+    }
+    view = PyMemoryView_GET_BUFFER(buffer);
+    if (!PyBuffer_IsContiguous(view, 'C')) {
+        PyErr_SetString(PyExc_BufferError, "buffer is not contiguous");
+        goto error;
+    }
+    if (writable && view->readonly) {
+        PyErr_SetString(PyExc_TypeError, "buffer is read-only");
+        goto error;
+    }
+    key = PyLong_FromUnsignedLongLong(user_data);
+    if (key == NULL) {
+        goto error;
+    }
+    sqe = ring_get_sqe(self, key, buffer);
+    Py_DECREF(key);
+    if (sqe == NULL) {
+        goto error;
+    }
+    sqe->opcode = opcode;
+    sqe->fd = fd;
+    sqe->addr = (__u64)(uintptr_t)view->buf;
+    sqe->len = (__u32)Py_MIN(view->len, MAX_RW_COUNT);
+    if (opcode == IORING_OP_READ || opcode == IORING_OP_WRITE) {
+        /* Use the file position */
+        sqe->off = (__u64)-1;
+    }
+    else {
+        sqe->msg_flags = flags;
+    }
+    sqe->user_data = user_data;
+    ring_queue_sqe(self);
+    Py_DECREF(buffer);
+    Py_RETURN_NONE;
+
+error:
+    Py_DECREF(buffer);
+    return NULL;
+}
+
+static struct io_uring_sqe *
+ring_get_sqe_nobuffer(RingObject *self, unsigned long long user_data)
+{
+    struct io_uring_sqe *sqe;
+    PyObject *key;
+
+    key = PyLong_FromUnsignedLongLong(user_data);
+    if (key == NULL) {
+        return NULL;
+    }
+    sqe = ring_get_sqe(self, key, Py_None);
+    Py_DECREF(key);
+    if (sqe != NULL) {
+        sqe->user_data = user_data;
+    }
+    return sqe;
+}
+
+/* Pop the completions from the completion queue: return a list of
+   (user_data, result) tuples */
+static PyObject *
+ring_reap(RingObject *self)
+{
+    unsigned head = *self->cq_head;
+    unsigned tail = __atomic_load_n(self->cq_tail, __ATOMIC_ACQUIRE);
+    PyObject *result, *item, *key;
+    struct io_uring_cqe *cqe;
+    Py_ssize_t i;
+
+    result = PyList_New(tail - head);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (i = 0; head != tail; i++, head++) {
+        cqe = &self->cqes[head & self->cq_mask];
+        key = PyLong_FromUnsignedLongLong(cqe->user_data);
+        if (key == NULL) {
+            goto error;
+        }
+        item = Py_BuildValue("(Oi)", key, cqe->res);
+        if (item == NULL) {
+            Py_DECREF(key);
+            goto error;
+        }
+        PyList_SET_ITEM(result, i, item);
+        /* The kernel no longer uses the buffer of the operation */
+        if (PyDict_DelItem(self->pending, key) < 0) {
+            PyErr_Clear();
+        }
+        Py_DECREF(key);
+    }
+    __atomic_store_n(self->cq_head, head, __ATOMIC_RELEASE);
+    return result;
+
+error:
+    __atomic_store_n(self->cq_head, head, __ATOMIC_RELEASE);
+    Py_DECREF(result);
+    return NULL;
+}
+
+static PyObject *
+Ring_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"entries", NULL};
+    unsigned entries = 256;
+    struct io_uring_params p;
+    RingObject *self;
+    size_t sq_size, cq_size;
+    char *ring;
+    unsigned i, *sq_array;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|I:Ring", kwlist,
+                                     &entries)) {
+        return NULL;
+    }
+    self = (RingObject *)type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->fd = -1;
+    self->ring_ptr = MAP_FAILED;
+    self->sqes = MAP_FAILED;
+    self->pending = PyDict_New();
+    if (self->pending == NULL) {
+        goto error;
+    }
+
+    memset(&p, 0, sizeof(p));
+    self->fd = io_uring_setup(entries, &p);
+    if (self->fd < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        goto error;
+    }
+    if ((p.features & REQUIRED_FEATURES) != REQUIRED_FEATURES) {
+        PyErr_SetString(PyExc_OSError,
+                        "io_uring lacks features required by the module");
+        goto error;
+    }
+
+    sq_size = p.sq_off.array + p.sq_entries * sizeof(unsigned);
+    cq_size = p.cq_off.cqes + p.cq_entries * sizeof(struct io_uring_cqe);
+    self->ring_size = Py_MAX(sq_size, cq_size);
+    self->ring_ptr = mmap(NULL, self->ring_size, PROT_READ | PROT_WRITE,
+                          MAP_SHARED | MAP_POPULATE, self->fd,
+                          IORING_OFF_SQ_RING);
+    if (self->ring_ptr == MAP_FAILED) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        goto error;
+    }
+    self->sqes_size = p.sq_entries * sizeof(struct io_uring_sqe);
+    self->sqes = mmap(NULL, self->sqes_size, PROT_READ | PROT_WRITE,
+                      MAP_SHARED | MAP_POPULATE, self->fd, IORING_OFF_SQES);
+    if (self->sqes == MAP_FAILED) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        goto error;
+    }
+
+    ring = self->ring_ptr;
+    self->sq_head = (unsigned *)(ring + p.sq_off.head);
+    self->sq_tail = (unsigned *)(ring + p.sq_off.tail);
+    self->sq_flags = (unsigned *)(ring + p.sq_off.flags);
+    self->sq_mask = *(unsigned *)(ring + p.sq_off.ring_mask);
+    self->sq_entries = p.sq_entries;
+    self->sqe_tail = *self->sq_tail;
+    self->cq_head = (unsigned *)(ring + p.cq_off.head);
+    self->cq_tail = (unsigned *)(ring + p.cq_off.tail);
+    self->cq_mask = *(unsigned *)(ring + p.cq_off.ring_mask);
+    self->cqes = (struct io_uring_cqe *)(ring + p.cq_off.cqes);
+
+    /* SQE i is always stored in the slot i of the submission queue */
+    sq_array = (unsigned *)(ring + p.sq_off.array);
+    for (i = 0; i < p.sq_entries; i++) {
+        sq_array[i] = i;
+    }
+    return (PyObject *)self;
+
+error:
+    Py_DECREF(self);
+    return NULL;
+}
+
+static void
+ring_close(RingObject *self)
+{
+    if (self->sqes != MAP_FAILED) {
+        munmap(self->sqes, self->sqes_size);
+        self->sqes = MAP_FAILED;
+    }
+    if (self->ring_ptr != MAP_FAILED) {
+        munmap(self->ring_ptr, self->ring_size);
+        self->ring_ptr = MAP_FAILED;
+    }
+    if (self->fd >= 0) {
+        close(self->fd);
+        self->fd = -1;
+    }
+    if (self->pending != NULL && PyDict_GET_SIZE(self->pending)) {
+        /* The kernel cancels the pending operations asynchronously after
+           the ring is closed and may still write into their buffers:
+           never release them */
+        self->pending = NULL;
+    }
+}
+
+static void
+Ring_dealloc(RingObject *self)
+{
+    ring_close(self);
+    Py_XDECREF(self->pending);
+    Py_TYPE(self)->tp_free(self);
+}
+
+PyDoc_STRVAR(Ring_read_doc,
+"read(user_data, fd, buffer)\n\n\
+Queue a read from the file position of fd into the writable buffer.");
+
+static PyObject *
+Ring_read(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data;
+    int fd;
+    PyObject *buffer;
+
+    if (!PyArg_ParseTuple(args, "KiO:read", &user_data, &fd, &buffer)) {
+        return NULL;
+    }
+    return ring_queue_buffer_op(self, IORING_OP_READ, user_data, fd, buffer,
+                                1, 0);
+}
+
+PyDoc_STRVAR(Ring_write_doc,
+"write(user_data, fd, buffer)\n\n\
+Queue a write of the buffer at the file position of fd.");
+
+static PyObject *
+Ring_write(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data;
+    int fd;
+    PyObject *buffer;
+
+    if (!PyArg_ParseTuple(args, "KiO:write", &user_data, &fd, &buffer)) {
+        return NULL;
+    }
+    return ring_queue_buffer_op(self, IORING_OP_WRITE, user_data, fd, buffer,
+                                0, 0);
+}
+
+PyDoc_STRVAR(Ring_recv_doc,
+"recv(user_data, fd, buffer, flags=0)\n\n\
+Queue a recv() from the socket fd into the writable buffer.");
+
+static PyObject *
+Ring_recv(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data;
+    int fd, flags = 0;
+    PyObject *buffer;
+
+    if (!PyArg_ParseTuple(args, "KiO|i:recv", &user_data, &fd, &buffer,
+                          &flags)) {
+        return NULL;
+    }
+    return ring_queue_buffer_op(self, IORING_OP_RECV, user_data, fd, buffer,
+                                1, flags);
+}
+
+PyDoc_STRVAR(Ring_send_doc,
+"send(user_data, fd, buffer, flags=0)\n\n\
+Queue a send() of the buffer on the socket fd.");
+
+static PyObject *
+Ring_send(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data;
+    int fd, flags = 0;
+    PyObject *buffer;
+
+    if (!PyArg_ParseTuple(args, "KiO|i:send", &user_data, &fd, &buffer,
+                          &flags)) {
+        return NULL;
+    }
+    return ring_queue_buffer_op(self, IORING_OP_SEND, user_data, fd, buffer,
+                                0, flags);
+}
+
+PyDoc_STRVAR(Ring_accept_doc,
+"accept(user_data, fd, flags=0)\n\n\
+Queue an accept4() on the listening socket fd.  The result of the\n\
+operation is the file descriptor of the new connection.");
+
+static PyObject *
+Ring_accept(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data;
+    int fd, flags = 0;
+    struct io_uring_sqe *sqe;
+
+    if (!PyArg_ParseTuple(args, "Ki|i:accept", &user_data, &fd, &flags)) {
+        return NULL;
+    }
+    sqe = ring_get_sqe_nobuffer(self, user_data);
+    if (sqe == NULL) {
+        return NULL;
+    }
+    sqe->opcode = IORING_OP_ACCEPT;
+    sqe->fd = fd;
+    sqe->accept_flags = flags;
+    ring_queue_sqe(self);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(Ring_poll_doc,
+"poll(user_data, fd, events)\n\n\
+Queue a one-shot poll of fd.  The result of the operation is the mask\n\
+of the events which occurred.");
+
+static PyObject *
+Ring_poll(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data;
+    int fd;
+    unsigned int events;
+    struct io_uring_sqe *sqe;
+
+    if (!PyArg_ParseTuple(args, "KiI:poll", &user_data, &fd, &events)) {
+        return NULL;
+    }
+    sqe = ring_get_sqe_nobuffer(self, user_data);
+    if (sqe == NULL) {
+        return NULL;
+    }
+    sqe->opcode = IORING_OP_POLL_ADD;
+    sqe->fd = fd;
+#if PY_BIG_ENDIAN
+    events = (events << 16) | (events >> 16);
+#endif
+    sqe->poll32_events = events;
+    ring_queue_sqe(self);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(Ring_cancel_doc,
+"cancel(user_data, target)\n\n\
+Queue the cancellation of the pending operation identified by target.\n\
+The cancelled operation completes with -ECANCELED, unless it completed\n\
+before the cancellation.");
+
+static PyObject *
+Ring_cancel(RingObject *self, PyObject *args)
+{
+    unsigned long long user_data, target;
+    struct io_uring_sqe *sqe;
+
+    if (!PyArg_ParseTuple(args, "KK:cancel", &user_data, &target)) {
+        return NULL;
+    }
+    sqe = ring_get_sqe_nobuffer(self, user_data);
+    if (sqe == NULL) {
+        return NULL;
+    }
+    sqe->opcode = IORING_OP_ASYNC_CANCEL;
+    sqe->fd = -1;
+    sqe->addr = target;
+    ring_queue_sqe(self);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(Ring_submit_doc,
+"submit()\n\n\
+Submit the queued operations without waiting for their completion.");
+
+static PyObject *
+Ring_submit(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (ring_check_open(self) < 0) {
+        return NULL;
+    }
+    if (ring_enter(self, 0, NULL) < 0 && errno != EINTR && errno != EBUSY
+        && errno != EAGAIN) {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(Ring_wait_doc,
+"wait(timeout=None)\n\n\
+Submit the queued operations and wait until at least one operation\n\
+completes or the timeout (in seconds) expires.  Return a list of\n\
+(user_data, result) tuples, result is a negated errno value on error.");
+
+static PyObject *
+Ring_wait(RingObject *self, PyObject *args)
+{
+    PyObject *timeout_obj = Py_None;
+    _PyTime_t timeout = -1;
+    struct __kernel_timespec ts, *tsp = NULL;
+    struct timespec t;
+    unsigned min_complete;
+    int ret;
+
+    if (!PyArg_ParseTuple(args, "|O:wait", &timeout_obj)) {
+        return NULL;
+    }
+    if (timeout_obj != Py_None) {
+        if (_PyTime_FromSecondsObject(&timeout, timeout_obj,
+                                      _PyTime_ROUND_CEILING) < 0) {
+            return NULL;
+        }
+        if (timeout < 0) {
+            timeout = 0;
+        }
+        if (_PyTime_AsTimespec(timeout, &t) < 0) {
+            return NULL;
+        }
+        ts.tv_sec = t.tv_sec;
+        ts.tv_nsec = t.tv_nsec;
+        tsp = &ts;
+    }
+    if (ring_check_open(self) < 0) {
+        return NULL;
+    }
+
+    /* Don't wait if completions are already available */
+    min_complete = (timeout != 0
+                    && *self->cq_head == __atomic_load_n(self->cq_tail,
+                                                         __ATOMIC_ACQUIRE));
+    ret = ring_enter(self, min_complete, tsp);
+    if (ret < 0) {
+        if (errno == EINTR) {
+            if (PyErr_CheckSignals() < 0) {
+                return NULL;
+            }
+        }
+        else if (errno != ETIME && errno != EBUSY && errno != EAGAIN) {
+            return PyErr_SetFromErrno(PyExc_OSError);
+        }
+    }
+    return ring_reap(self);
+}
+
+PyDoc_STRVAR(Ring_close_doc,
+"close()\n\n\
+Close the ring.");
+
+static PyObject *
+Ring_close(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    ring_close(self);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(Ring_fileno_doc,
+"fileno()\n\n\
+Return the file descriptor of the ring.");
+
+static PyObject *
+Ring_fileno(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (ring_check_open(self) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLong(self->fd);
+}
+
+static PyObject *
+Ring_get_closed(RingObject *self, void *Py_UNUSED(closure))
+{
+    return PyBool_FromLong(self->fd < 0);
+}
+
+static PyMethodDef Ring_methods[] = {
+    {"read", (PyCFunction)Ring_read, METH_VARARGS, Ring_read_doc},
+    {"write", (PyCFunction)Ring_write, METH_VARARGS, Ring_write_doc},
+    {"recv", (PyCFunction)Ring_recv, METH_VARARGS, Ring_recv_doc},
+    {"send", (PyCFunction)Ring_send, METH_VARARGS, Ring_send_doc},
+    {"accept", (PyCFunction)Ring_accept, METH_VARARGS, Ring_accept_doc},
+    {"poll", (PyCFunction)Ring_poll, METH_VARARGS, Ring_poll_doc},
+    {"cancel", (PyCFunction)Ring_cancel, METH_VARARGS, Ring_cancel_doc},
+    {"submit", (PyCFunction)Ring_submit, METH_NOARGS, Ring_submit_doc},
+    {"wait", (PyCFunction)Ring_wait, METH_VARARGS, Ring_wait_doc},
+    {"close", (PyCFunction)Ring_close, METH_NOARGS, Ring_close_doc},
+    {"fileno", (PyCFunction)Ring_fileno, METH_NOARGS, Ring_fileno_doc},
+    {NULL, NULL}
+};
+
+static PyGetSetDef Ring_getset[] = {
+    {"closed", (getter)Ring_get_closed, NULL,
+     "True if the ring is closed."},
+    {NULL}
+};
+
+PyDoc_STRVAR(Ring_doc,
+"Ring(entries=256)\n\n\
+io_uring instance with a submission queue of the given size.\n\
+Raise OSError if the kernel does not support io_uring.");
+
+static PyTypeObject RingType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_uring.Ring",                      /* tp_name */
+    sizeof(RingObject),                 /* tp_basicsize */
+    0,                                  /* tp_itemsize */
+    (destructor)Ring_dealloc,           /* tp_dealloc */
+    0,                                  /* tp_vectorcall_offset */
+    0,                                  /* tp_getattr */
+    0,                                  /* tp_setattr */
+    0,                                  /* tp_as_async */
+    0,                                  /* tp_repr */
+    0,                                  /* tp_as_number */
+    0,                                  /* tp_as_sequence */
+    0,                                  /* tp_as_mapping */
+    0,                                  /* tp_hash */
+    0,                                  /* tp_call */
+    0,                                  /* tp_str */
+    0,                                  /* tp_getattro */
+    0,                                  /* tp_setattro */
+    0,                                  /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT,                 /* tp_flags */
+    Ring_doc,                           /* tp_doc */
+    0,                                  /* tp_traverse */
+    0,                                  /* tp_clear */
+    0,                                  /* tp_richcompare */
+    0,                                  /* tp_weaklistoffset */
+    0,                                  /* tp_iter */
+    0,                                  /* tp_iternext */
+    Ring_methods,                       /* tp_methods */
+    0,                                  /* tp_members */
+    Ring_getset,                        /* tp_getset */
+    0,                                  /* tp_base */
+    0,                                  /* tp_dict */
+    0,                                  /* tp_descr_get */
+    0,                                  /* tp_descr_set */
+    0,                                  /* tp_dictoffset */
+    0,                                  /* tp_init */
+    0,                                  /* tp_alloc */
+    Ring_new,                           /* tp_new */
+};
+
+#endif /* HAVE_IO_URING_EXT_ARG */
+
+PyDoc_STRVAR(module_doc,
+"Low-level interface to the Linux io_uring API, used by asyncio.");
+
+static struct PyModuleDef uringmodule = {
+    PyModuleDef_HEAD_INIT,
+    "_uring",
+    module_doc,
+    -1,
+    NULL,
+};
+
+PyMODINIT_FUNC
+PyInit__uring(void)
+{
+#ifdef HAVE_IO_URING_EXT_ARG
+    PyObject *m;
+
+    if (PyType_Ready(&RingType) < 0) {
+        return NULL;
+    }
+    m = PyModule_Create(&uringmodule);
+    if (m == NULL) {
+        return NULL;
+    }
+    Py_INCREF(&RingType);
+    if (PyModule_AddObject(m, "Ring", (PyObject *)&RingType) < 0) {
+        Py_DECREF(&RingType);
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+#else
+    PyErr_SetString(PyExc_ImportError,
+                    "_uring requires Linux 5.11 kernel headers or newer");
+    return NULL;
+#endif
+}
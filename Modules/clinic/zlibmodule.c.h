@@ -453,6 +453,121 @@ exit:
     return return_value;
 }
 
+#if defined(AT_LEAST_ZLIB_1_2_3_4)
+
+PyDoc_STRVAR(zlib_Decompress__decompress_block__doc__,
+"_decompress_block($self, data, /, max_length=0)\n"
+"--\n"
+"\n"
+"Decompress data up to the end of the current deflate block.\n"
+"\n"
+"Return a tuple of the decompressed data and the number of bits of the last\n"
+"input byte consumed that belong to the next block, or -1 if the input or\n"
+"max_length was exhausted before the end of the block.  Unconsumed input\n"
+"data is stored in the unconsumed_tail attribute.\n"
+"\n"
+"The state of a raw decompressor at the end of a block can be restored\n"
+"with the last 32 KiB of output as zdict and with _prime().");
+
+#define ZLIB_DECOMPRESS__DECOMPRESS_BLOCK_METHODDEF    \
+    {"_decompress_block", (PyCFunction)(void(*)(void))zlib_Decompress__decompress_block, METH_FASTCALL|METH_KEYWORDS, zlib_Decompress__decompress_block__doc__},
+
+static PyObject *
+zlib_Decompress__decompress_block_impl(compobject *self, Py_buffer *data,
+                                       Py_ssize_t max_length);
+
+static PyObject *
+zlib_Decompress__decompress_block(compobject *self, PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *return_value = NULL;
+    static const char * const _keywords[] = {"", "max_length", NULL};
+    static _PyArg_Parser _parser = {NULL, _keywords, "_decompress_block", 0};
+    PyObject *argsbuf[2];
+    Py_ssize_t noptargs = nargs + (kwnames ? PyTuple_GET_SIZE(kwnames) : 0) - 1;
+    Py_buffer data = {NULL, NULL};
+    Py_ssize_t max_length = 0;
+
+    args = _PyArg_UnpackKeywords(args, nargs, NULL, kwnames, &_parser, 1, 2, 0, argsbuf);
+    if (!args) {
+        goto exit;
+    }
+    if (PyObject_GetBuffer(args[0], &data, PyBUF_SIMPLE) != 0) {
+        goto exit;
+    }
+    if (!PyBuffer_IsContiguous(&data, 'C')) {
+        _PyArg_BadArgument("_decompress_block", 1, "contiguous buffer", args[0]);
+        goto exit;
+    }
+    if (!noptargs) {
+        goto skip_optional_pos;
+    }
+    if (!ssize_t_converter(args[1], &max_length)) {
+        goto exit;
+    }
+skip_optional_pos:
+    return_value = zlib_Decompress__decompress_block_impl(self, &data, max_length);
+
+exit:
+    /* Cleanup for data */
+    if (data.obj) {
+       PyBuffer_Release(&data);
+    }
+
+    return return_value;
+}
+
+#endif /* defined(AT_LEAST_ZLIB_1_2_3_4) */
+
+#if defined(AT_LEAST_ZLIB_1_2_3_4)
+
+PyDoc_STRVAR(zlib_Decompress__prime__doc__,
+"_prime($self, bits, value, /)\n"
+"--\n"
+"\n"
+"Insert bits of value in the input stream, before the next input byte.");
+
+#define ZLIB_DECOMPRESS__PRIME_METHODDEF    \
+    {"_prime", (PyCFunction)(void(*)(void))zlib_Decompress__prime, METH_FASTCALL, zlib_Decompress__prime__doc__},
+
+static PyObject *
+zlib_Decompress__prime_impl(compobject *self, int bits, int value);
+
+static PyObject *
+zlib_Decompress__prime(compobject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    int bits;
+    int value;
+
+    if (!_PyArg_CheckPositional("_prime", nargs, 2, 2)) {
+        goto exit;
+    }
+    if (PyFloat_Check(args[0])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    bits = _PyLong_AsInt(args[0]);
+    if (bits == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    value = _PyLong_AsInt(args[1]);
+    if (value == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    return_value = zlib_Decompress__prime_impl(self, bits, value);
+
+exit:
+    return return_value;
+}
+
+#endif /* defined(AT_LEAST_ZLIB_1_2_3_4) */
+
 PyDoc_STRVAR(zlib_Compress_flush__doc__,
 "flush($self, mode=zlib.Z_FINISH, /)\n"
 "--\n"
@@ -762,6 +877,14 @@ exit:
     return return_value;
 }
 
+#ifndef ZLIB_DECOMPRESS__DECOMPRESS_BLOCK_METHODDEF
+    #define ZLIB_DECOMPRESS__DECOMPRESS_BLOCK_METHODDEF
+#endif /* !defined(ZLIB_DECOMPRESS__DECOMPRESS_BLOCK_METHODDEF) */
+
+#ifndef ZLIB_DECOMPRESS__PRIME_METHODDEF
+    #define ZLIB_DECOMPRESS__PRIME_METHODDEF
+#endif /* !defined(ZLIB_DECOMPRESS__PRIME_METHODDEF) */
+
 #ifndef ZLIB_COMPRESS_COPY_METHODDEF
     #define ZLIB_COMPRESS_COPY_METHODDEF
 #endif /* !defined(ZLIB_COMPRESS_COPY_METHODDEF) */
@@ -785,4 +908,4 @@ exit:
 #ifndef ZLIB_DECOMPRESS___DEEPCOPY___METHODDEF
     #define ZLIB_DECOMPRESS___DEEPCOPY___METHODDEF
 #endif /* !defined(ZLIB_DECOMPRESS___DEEPCOPY___METHODDEF) */
-/*[clinic end generated code: output=feb079cebbbaacd6 input=a9049054013a1b77]*/
+/*[clinic end generated code: output=5199209179f16b87 input=a9049054013a1b77]*/
@@ -34,6 +34,9 @@ typedef struct {
     int flags; /* flags used when compiling pattern source */
     PyObject *weakreflist; /* List of weak references */
     int isbytes; /* pattern type (1 - bytes, 0 - string, -1 - None) */
+    /* literal string contained in every match (stored after the code) */
+    Py_ssize_t requiredsize;
+    SRE_CODE *required;
     /* pattern code */
     Py_ssize_t codesize;
     SRE_CODE code[1];
@@ -77,6 +80,10 @@ typedef struct {
     void** mark;
     int match_all;
     int must_advance;
+    /* literal string contained in every match, and where it was found */
+    const SRE_CODE* required;
+    Py_ssize_t requiredsize;
+    void* required_ptr;
     /* dynamically allocated stuff */
     char* data_stack;
     size_t data_stack_size;
@@ -1367,6 +1367,54 @@ exit:
 #define RESET_CAPTURE_GROUP() \
     do { state->lastmark = state->lastindex = -1; } while (0)
 
+/* Check that the literal string which every match of the pattern contains
+   occurs between state->start and state->end, so that searching is not
+   hopeless.  The occurrence found is remembered: the next searches from a
+   position before it need not look again. */
+LOCAL(int)
+SRE(find_required)(SRE_STATE* state)
+{
+    const SRE_CODE* required = state->required;
+    Py_ssize_t n = state->requiredsize;
+    SRE_CHAR* ptr = (SRE_CHAR *)state->start;
+    SRE_CHAR* end = (SRE_CHAR *)state->end;
+    SRE_CHAR c = (SRE_CHAR) required[0];
+    Py_ssize_t i;
+
+    if (state->required_ptr != NULL &&
+        (SRE_CHAR *)state->required_ptr >= ptr)
+        return 1;
+#if SIZEOF_SRE_CHAR < 4
+    for (i = 0; i < n; i++) {
+        if ((SRE_CODE) (SRE_CHAR) required[i] != required[i])
+            return 0; /* literal can't match: doesn't fit in char width */
+    }
+#endif
+    if (end - ptr < n)
+        return 0;
+    end -= n - 1;
+    while (ptr < end) {
+#if SIZEOF_SRE_CHAR == 1
+        ptr = memchr(ptr, c, end - ptr);
+        if (ptr == NULL)
+            return 0;
+#else
+        while (*ptr != c) {
+            if (++ptr >= end)
+                return 0;
+        }
+#endif
+        for (i = 1; i < n && (SRE_CODE) ptr[i] == required[i]; i++)
+            ;
+        if (i == n) {
+            state->required_ptr = ptr;
+            return 1;
+        }
+        ptr++;
+    }
+    return 0;
+}
+
 LOCAL(Py_ssize_t)
 SRE(search)(SRE_STATE* state, SRE_CODE* pattern)
 {
@@ -1383,6 +1431,11 @@ SRE(search)(SRE_STATE* state, SRE_CODE* pattern)
     if (ptr > end)
         return 0;
 
+    if (state->requiredsize && !SRE(find_required)(state)) {
+        TRACE(("reject (required literal not found)\n"));
+        return 0;
+    }
+
     if (pattern[0] == SRE_OP_INFO) {
         /* optimization info block */
         /* <INFO> <1=skip> <2=flags> <3=min> <4=max> <5=prefix info>  */
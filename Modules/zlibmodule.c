@@ -20,6 +20,9 @@
 #if defined(ZLIB_VERNUM) && ZLIB_VERNUM >= 0x1221
 #  define AT_LEAST_ZLIB_1_2_2_1
 #endif
+#if defined(ZLIB_VERNUM) && ZLIB_VERNUM >= 0x1234
+#  define AT_LEAST_ZLIB_1_2_3_4
+#endif
 
 /* The following parameters are copied from zutil.h, version 0.95 */
 #define DEFLATED   8
@@ -736,28 +739,13 @@ save_unconsumed_input(compobject *self, Py_buffer *data, int err)
     return 0;
 }
 
-/*[clinic input]
-zlib.Decompress.decompress
-
-    data: Py_buffer
-        The binary data to decompress.
-    /
-    max_length: ssize_t = 0
-        The maximum allowable length of the decompressed data.
-        Unconsumed input data will be stored in
-        the unconsumed_tail attribute.
-
-Return a bytes object containing the decompressed version of the data.
-
-After calling this function, some of the input data may still be stored in
-internal buffers for later processing.
-Call the flush() method to clear these buffers.
-[clinic start generated code]*/
-
+/* Helper for decompress() and _decompress_block().  If bits is not NULL,
+   stop at the end of the first deflate block reached, and set *bits to the
+   number of bits of the last input byte consumed which belong to the next
+   block, or to -1 if no block ended. */
 static PyObject *
-zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
-                                Py_ssize_t max_length)
-/*[clinic end generated code: output=6e5173c74e710352 input=b85a212a012b770a]*/
+decompress_data(compobject *self, Py_buffer *data, Py_ssize_t max_length,
+                int *bits)
 {
     int err = Z_OK;
     Py_ssize_t ibuflen, obuflen = DEF_BUF_SIZE, hard_limit;
@@ -797,7 +785,11 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
             }
 
             Py_BEGIN_ALLOW_THREADS
+#ifdef AT_LEAST_ZLIB_1_2_3_4
+            err = inflate(&self->zst, bits != NULL ? Z_BLOCK : Z_SYNC_FLUSH);
+#else
             err = inflate(&self->zst, Z_SYNC_FLUSH);
+#endif
             Py_END_ALLOW_THREADS
 
             switch (err) {
@@ -815,6 +807,15 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
                 goto save;
             }
 
+            /* inflate() returned right after the end-of-block code of a
+               block which is not the last one */
+            if (bits != NULL && err != Z_STREAM_END &&
+                (self->zst.data_type & 128) && !(self->zst.data_type & 64))
+            {
+                *bits = self->zst.data_type & 7;
+                goto save;
+            }
+
         } while (self->zst.avail_out == 0 || err == Z_NEED_DICT);
 
     } while (err != Z_STREAM_END && ibuflen != 0);
@@ -847,6 +848,92 @@ zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
     return RetVal;
 }
 
+/*[clinic input]
+zlib.Decompress.decompress
+
+    data: Py_buffer
+        The binary data to decompress.
+    /
+    max_length: ssize_t = 0
+        The maximum allowable length of the decompressed data.
+        Unconsumed input data will be stored in
+        the unconsumed_tail attribute.
+
+Return a bytes object containing the decompressed version of the data.
+
+After calling this function, some of the input data may still be stored in
+internal buffers for later processing.
+Call the flush() method to clear these buffers.
+[clinic start generated code]*/
+
+static PyObject *
+zlib_Decompress_decompress_impl(compobject *self, Py_buffer *data,
+                                Py_ssize_t max_length)
+/*[clinic end generated code: output=6e5173c74e710352 input=b85a212a012b770a]*/
+{
+    return decompress_data(self, data, max_length, NULL);
+}
+
+#ifdef AT_LEAST_ZLIB_1_2_3_4
+/*[clinic input]
+zlib.Decompress._decompress_block
+
+    data: Py_buffer
+    /
+    max_length: ssize_t = 0
+
+Decompress data up to the end of the current deflate block.
+
+Return a tuple of the decompressed data and the number of bits of the last
+input byte consumed that belong to the next block, or -1 if the input or
+max_length was exhausted before the end of the block.  Unconsumed input
+data is stored in the unconsumed_tail attribute.
+
+The state of a raw decompressor at the end of a block can be restored
+with the last 32 KiB of output as zdict and with _prime().
+[clinic start generated code]*/
+
+static PyObject *
+zlib_Decompress__decompress_block_impl(compobject *self, Py_buffer *data,
+                                       Py_ssize_t max_length)
+/*[clinic end generated code: output=ebe2224f38d7b9b4 input=90a451d16f9ada63]*/
+{
+    PyObject *data_out;
+    int bits = -1;
+
+    data_out = decompress_data(self, data, max_length, &bits);
+    if (data_out == NULL)
+        return NULL;
+    return Py_BuildValue("Ni", data_out, bits);
+}
+
+/*[clinic input]
+zlib.Decompress._prime
+
+    bits: int
+    value: int
+    /
+
+Insert bits of value in the input stream, before the next input byte.
+[clinic start generated code]*/
+
+static PyObject *
+zlib_Decompress__prime_impl(compobject *self, int bits, int value)
+/*[clinic end generated code: output=28ef4449f1c74533 input=937cecca33e1340e]*/
+{
+    int err;
+
+    ENTER_ZLIB(self);
+    err = inflatePrime(&self->zst, bits, value);
+    LEAVE_ZLIB(self);
+    if (err != Z_OK) {
+        zlib_error(self->zst, err, "while priming");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+#endif
+
 /*[clinic input]
 zlib.Compress.flush
 
@@ -1202,6 +1289,8 @@ static PyMethodDef comp_methods[] =
 static PyMethodDef Decomp_methods[] =
 {
     ZLIB_DECOMPRESS_DECOMPRESS_METHODDEF
+    ZLIB_DECOMPRESS__DECOMPRESS_BLOCK_METHODDEF
+    ZLIB_DECOMPRESS__PRIME_METHODDEF
     ZLIB_DECOMPRESS_FLUSH_METHODDEF
     ZLIB_DECOMPRESS_COPY_METHODDEF
     ZLIB_DECOMPRESS___COPY___METHODDEF
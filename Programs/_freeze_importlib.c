@@ -25,6 +25,7 @@ static const struct _frozen _PyImport_FrozenModules[] = {
    from frozen.obj. In the Makefile, frozen.o is not linked into this executable,
    so we define the variable here. */
 const struct _frozen *PyImport_FrozenModules;
+const struct _frozen *_PyImport_FrozenStdlib;
 #endif
 
 static const char header[] =
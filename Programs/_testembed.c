@@ -505,6 +505,11 @@ static int test_init_from_config(void)
     putenv("PYTHONPROFILEIMPORTTIME=0");
     config.import_time = 1;
 
+    putenv("PYTHONLAZYIMPORTS=0");
+    config.lazy_imports = 1;
+
+    config.use_frozen_modules = 0;
+
     config.show_ref_count = 1;
     config.show_alloc_count = 1;
     /* FIXME: test dump_refs: bpo-34223 */
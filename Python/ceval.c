@@ -12,6 +12,7 @@
 #include "Python.h"
 #include "pycore_ceval.h"
 #include "pycore_code.h"
+#include "pycore_import.h"   /* _PyImport_LazyImportModuleLevelObject */
 #include "pycore_object.h"
 #include "pycore_pyerrors.h"
 #include "pycore_pylifecycle.h"
@@ -5162,6 +5163,17 @@ import_name(PyThreadState *tstate, PyFrameObject *f,
         if (ilevel == -1 && _PyErr_Occurred(tstate)) {
             return NULL;
         }
+        /* Imports in try and with blocks are not deferred, so that their
+           handlers see the exceptions raised when executing the modules. */
+        if (tstate->interp->lazy_imports && f->f_iblock == 0) {
+            return _PyImport_LazyImportModuleLevelObject(
+                        tstate,
+                        name,
+                        f->f_globals,
+                        f->f_locals == NULL ? Py_None : f->f_locals,
+                        fromlist,
+                        ilevel);
+        }
         res = PyImport_ImportModuleLevelObject(
                         name,
                         f->f_globals,
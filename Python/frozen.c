@@ -5,6 +5,7 @@
 #include "importlib.h"
 #include "importlib_external.h"
 #include "importlib_zipimport.h"
+#include "frozen_stdlib.h"
 
 /* In order to test the support for frozen modules, by default we
    define a single frozen module, __hello__.  Loading it will print
@@ -48,3 +49,15 @@ static const struct _frozen _PyImport_FrozenModules[] = {
    collection of frozen modules: */
 
 const struct _frozen *PyImport_FrozenModules = _PyImport_FrozenModules;
+
+/* The standard library modules listed in FROZEN_STDLIB_MODULES by
+   "make regen-frozen-stdlib", see Tools/scripts/freeze_modules.py.  They
+   are looked up after PyImport_FrozenModules and are not used if the
+   interpreter is started with -X frozen_modules=off. */
+
+static const struct _frozen _PyImport_FrozenStdlibModules[] = {
+    _Py_FROZEN_STDLIB_MODULES
+    {0, 0, 0} /* sentinel */
+};
+
+const struct _frozen *_PyImport_FrozenStdlib = _PyImport_FrozenStdlibModules;
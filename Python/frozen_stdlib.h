@@ -0,0 +1,6 @@
+/* Auto-generated by Tools/scripts/freeze_modules.py */
+
+/* Standard library modules frozen in the interpreter, see Python/frozen.c.
+   Regenerate with "make regen-frozen-stdlib FROZEN_STDLIB_MODULES=...". */
+
+#define _Py_FROZEN_STDLIB_MODULES
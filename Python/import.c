@@ -4,6 +4,7 @@
 
 #include "Python-ast.h"
 #undef Yield   /* undefine macro conflicting with <winbase.h> */
+#include "pycore_import.h"
 #include "pycore_pyerrors.h"
 #include "pycore_pyhash.h"
 #include "pycore_pylifecycle.h"
@@ -1304,13 +1305,19 @@ find_frozen(PyObject *name)
     if (name == NULL)
         return NULL;
 
-    for (p = PyImport_FrozenModules; ; p++) {
-        if (p->name == NULL)
-            return NULL;
+    for (p = PyImport_FrozenModules; p->name != NULL; p++) {
         if (_PyUnicode_EqualToASCIIString(name, p->name))
-            break;
+            return p;
+    }
+
+    PyInterpreterState *interp = _PyInterpreterState_GET_UNSAFE();
+    if (_PyImport_FrozenStdlib == NULL || !interp->config.use_frozen_modules)
+        return NULL;
+    for (p = _PyImport_FrozenStdlib; p->name != NULL; p++) {
+        if (_PyUnicode_EqualToASCIIString(name, p->name))
+            return p;
     }
-    return p;
+    return NULL;
 }
 
 static PyObject *
@@ -1930,6 +1937,48 @@ PyImport_ImportModuleLevelObject(PyObject *name, PyObject *globals,
     return final_mod;
 }
 
+/* Import a module for an import statement when lazy imports are enabled
+   (-X lazy_imports): importlib._bootstrap._lazy_import() defers the execution
+   of the modules which are not imported yet. */
+PyObject *
+_PyImport_LazyImportModuleLevelObject(PyThreadState *tstate, PyObject *name,
+                                      PyObject *globals, PyObject *locals,
+                                      PyObject *fromlist, int level)
+{
+    _Py_IDENTIFIER(_lazy_import);
+    PyObject *mod, *level_obj, *final_mod;
+
+    /* Fast path for modules which are already imported */
+    if (level == 0 && (fromlist == NULL || fromlist == Py_None)
+        && PyUnicode_Check(name))
+    {
+        mod = import_get_module(tstate, name);
+        if (mod == NULL && _PyErr_Occurred(tstate)) {
+            return NULL;
+        }
+        /* Deferred modules are instances of a subclass of the module type */
+        int imported = (mod != NULL && PyModule_CheckExact(mod));
+        Py_XDECREF(mod);
+        if (imported) {
+            return PyImport_ImportModuleLevelObject(name, globals, locals,
+                                                    fromlist, level);
+        }
+    }
+
+    level_obj = PyLong_FromLong(level);
+    if (level_obj == NULL) {
+        return NULL;
+    }
+    final_mod = _PyObject_CallMethodIdObjArgs(
+                tstate->interp->importlib, &PyId__lazy_import,
+                name, globals, locals, fromlist, level_obj, NULL);
+    Py_DECREF(level_obj);
+    if (final_mod == NULL) {
+        remove_importlib_frames(tstate);
+    }
+    return final_mod;
+}
+
 PyObject *
 PyImport_ImportModuleLevel(const char *name, PyObject *globals, PyObject *locals,
                            PyObject *fromlist, int level)
@@ -1,7 +1,7 @@
 /* Auto-generated by Programs/_freeze_importlib.c */
 const unsigned char _Py_M__importlib_bootstrap[] = {
     99,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,4,0,0,0,64,0,0,0,115,194,1,0,0,100,0,
+    0,4,0,0,0,64,0,0,0,115,8,2,0,0,100,0,
     90,0,100,1,97,1,100,2,100,3,132,0,90,2,100,4,
     100,5,132,0,90,3,105,0,90,4,105,0,90,5,71,0,
     100,6,100,7,132,0,100,7,101,6,131,3,90,7,71,0,
@@ -13,7 +13,7 @@ const unsigned char _Py_M__importlib_bootstrap[] = {
     100,25,132,0,90,15,100,26,100,27,132,0,90,16,100,28,
     100,29,132,0,90,17,100,30,100,31,132,0,90,18,71,0,
     100,32,100,33,132,0,100,33,131,2,90,19,100,1,100,1,
-    100,34,156,2,100,35,100,36,132,2,90,20,100,94,100,37,
+    100,34,156,2,100,35,100,36,132,2,90,20,100,106,100,37,
     100,38,132,1,90,21,100,39,100,40,156,1,100,41,100,42,
     132,2,90,22,100,43,100,44,132,0,90,23,100,45,100,46,
     132,0,90,24,100,47,100,48,132,0,90,25,100,49,100,50,
@@ -21,1770 +21,1986 @@ const unsigned char _Py_M__importlib_bootstrap[] = {
     132,0,90,28,71,0,100,55,100,56,132,0,100,56,131,2,
     90,29,71,0,100,57,100,58,132,0,100,58,131,2,90,30,
     71,0,100,59,100,60,132,0,100,60,131,2,90,31,100,61,
-    100,62,132,0,90,32,100,63,100,64,132,0,90,33,100,95,
+    100,62,132,0,90,32,100,63,100,64,132,0,90,33,100,107,
     100,65,100,66,132,1,90,34,100,67,100,68,132,0,90,35,
-    100,69,90,36,101,36,100,70,23,0,90,37,100,71,100,72,
-    132,0,90,38,101,39,131,0,90,40,100,73,100,74,132,0,
-    90,41,100,96,100,76,100,77,132,1,90,42,100,39,100,78,
-    156,1,100,79,100,80,132,2,90,43,100,81,100,82,132,0,
-    90,44,100,97,100,84,100,85,132,1,90,45,100,86,100,87,
-    132,0,90,46,100,88,100,89,132,0,90,47,100,90,100,91,
-    132,0,90,48,100,92,100,93,132,0,90,49,100,1,83,0,
-    41,98,97,83,1,0,0,67,111,114,101,32,105,109,112,108,
-    101,109,101,110,116,97,116,105,111,110,32,111,102,32,105,109,
-    112,111,114,116,46,10,10,84,104,105,115,32,109,111,100,117,
-    108,101,32,105,115,32,78,79,84,32,109,101,97,110,116,32,
-    116,111,32,98,101,32,100,105,114,101,99,116,108,121,32,105,
-    109,112,111,114,116,101,100,33,32,73,116,32,104,97,115,32,
-    98,101,101,110,32,100,101,115,105,103,110,101,100,32,115,117,
-    99,104,10,116,104,97,116,32,105,116,32,99,97,110,32,98,
-    101,32,98,111,111,116,115,116,114,97,112,112,101,100,32,105,
-    110,116,111,32,80,121,116,104,111,110,32,97,115,32,116,104,
+    100,69,90,36,101,36,100,70,23,0,90,37,100,108,100,71,
+    100,72,132,1,90,38,101,39,131,0,90,40,100,109,100,73,
+    100,74,132,1,90,41,100,110,100,76,100,77,132,1,90,42,
+    100,39,100,78,156,1,100,79,100,80,132,2,90,43,100,81,
+    100,82,132,0,90,44,100,111,100,84,100,85,132,1,90,45,
+    100,1,90,46,101,47,131,0,90,48,100,1,97,49,100,86,
+    100,87,132,0,90,50,100,88,100,89,132,0,90,51,100,90,
+    100,91,132,0,90,52,100,92,100,93,132,0,90,53,100,112,
+    100,94,100,95,132,1,90,54,100,113,100,96,100,97,132,1,
+    90,55,100,98,100,99,132,0,90,56,100,100,100,101,132,0,
+    90,57,100,102,100,103,132,0,90,58,100,104,100,105,132,0,
+    90,59,100,1,83,0,41,114,97,83,1,0,0,67,111,114,
     101,32,105,109,112,108,101,109,101,110,116,97,116,105,111,110,
-    32,111,102,32,105,109,112,111,114,116,46,32,65,115,10,115,
-    117,99,104,32,105,116,32,114,101,113,117,105,114,101,115,32,
-    116,104,101,32,105,110,106,101,99,116,105,111,110,32,111,102,
-    32,115,112,101,99,105,102,105,99,32,109,111,100,117,108,101,
-    115,32,97,110,100,32,97,116,116,114,105,98,117,116,101,115,
-    32,105,110,32,111,114,100,101,114,32,116,111,10,119,111,114,
-    107,46,32,79,110,101,32,115,104,111,117,108,100,32,117,115,
-    101,32,105,109,112,111,114,116,108,105,98,32,97,115,32,116,
-    104,101,32,112,117,98,108,105,99,45,102,97,99,105,110,103,
-    32,118,101,114,115,105,111,110,32,111,102,32,116,104,105,115,
-    32,109,111,100,117,108,101,46,10,10,78,99,2,0,0,0,
-    0,0,0,0,0,0,0,0,3,0,0,0,7,0,0,0,
-    67,0,0,0,115,56,0,0,0,100,1,68,0,93,32,125,
-    2,116,0,124,1,124,2,131,2,114,4,116,1,124,0,124,
-    2,116,2,124,1,124,2,131,2,131,3,1,0,113,4,124,
-    0,106,3,160,4,124,1,106,3,161,1,1,0,100,2,83,
-    0,41,3,122,47,83,105,109,112,108,101,32,115,117,98,115,
-    116,105,116,117,116,101,32,102,111,114,32,102,117,110,99,116,
-    111,111,108,115,46,117,112,100,97,116,101,95,119,114,97,112,
-    112,101,114,46,41,4,218,10,95,95,109,111,100,117,108,101,
-    95,95,218,8,95,95,110,97,109,101,95,95,218,12,95,95,
-    113,117,97,108,110,97,109,101,95,95,218,7,95,95,100,111,
-    99,95,95,78,41,5,218,7,104,97,115,97,116,116,114,218,
-    7,115,101,116,97,116,116,114,218,7,103,101,116,97,116,116,
-    114,218,8,95,95,100,105,99,116,95,95,218,6,117,112,100,
-    97,116,101,41,3,90,3,110,101,119,90,3,111,108,100,218,
-    7,114,101,112,108,97,99,101,169,0,114,10,0,0,0,250,
-    29,60,102,114,111,122,101,110,32,105,109,112,111,114,116,108,
-    105,98,46,95,98,111,111,116,115,116,114,97,112,62,218,5,
-    95,119,114,97,112,27,0,0,0,115,8,0,0,0,0,2,
-    8,1,10,1,20,1,114,12,0,0,0,99,1,0,0,0,
-    0,0,0,0,0,0,0,0,1,0,0,0,2,0,0,0,
-    67,0,0,0,115,12,0,0,0,116,0,116,1,131,1,124,
-    0,131,1,83,0,169,1,78,41,2,218,4,116,121,112,101,
-    218,3,115,121,115,169,1,218,4,110,97,109,101,114,10,0,
-    0,0,114,10,0,0,0,114,11,0,0,0,218,11,95,110,
-    101,119,95,109,111,100,117,108,101,35,0,0,0,115,2,0,
-    0,0,0,1,114,18,0,0,0,99,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,1,0,0,0,64,0,
-    0,0,115,12,0,0,0,101,0,90,1,100,0,90,2,100,
-    1,83,0,41,2,218,14,95,68,101,97,100,108,111,99,107,
-    69,114,114,111,114,78,41,3,114,1,0,0,0,114,0,0,
-    0,0,114,2,0,0,0,114,10,0,0,0,114,10,0,0,
-    0,114,10,0,0,0,114,11,0,0,0,114,19,0,0,0,
-    48,0,0,0,115,2,0,0,0,8,1,114,19,0,0,0,
-    99,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,2,0,0,0,64,0,0,0,115,56,0,0,0,101,0,
-    90,1,100,0,90,2,100,1,90,3,100,2,100,3,132,0,
-    90,4,100,4,100,5,132,0,90,5,100,6,100,7,132,0,
-    90,6,100,8,100,9,132,0,90,7,100,10,100,11,132,0,
-    90,8,100,12,83,0,41,13,218,11,95,77,111,100,117,108,
-    101,76,111,99,107,122,169,65,32,114,101,99,117,114,115,105,
-    118,101,32,108,111,99,107,32,105,109,112,108,101,109,101,110,
-    116,97,116,105,111,110,32,119,104,105,99,104,32,105,115,32,
-    97,98,108,101,32,116,111,32,100,101,116,101,99,116,32,100,
-    101,97,100,108,111,99,107,115,10,32,32,32,32,40,101,46,
-    103,46,32,116,104,114,101,97,100,32,49,32,116,114,121,105,
-    110,103,32,116,111,32,116,97,107,101,32,108,111,99,107,115,
-    32,65,32,116,104,101,110,32,66,44,32,97,110,100,32,116,
-    104,114,101,97,100,32,50,32,116,114,121,105,110,103,32,116,
-    111,10,32,32,32,32,116,97,107,101,32,108,111,99,107,115,
-    32,66,32,116,104,101,110,32,65,41,46,10,32,32,32,32,
-    99,2,0,0,0,0,0,0,0,0,0,0,0,2,0,0,
-    0,2,0,0,0,67,0,0,0,115,48,0,0,0,116,0,
-    160,1,161,0,124,0,95,2,116,0,160,1,161,0,124,0,
-    95,3,124,1,124,0,95,4,100,0,124,0,95,5,100,1,
-    124,0,95,6,100,1,124,0,95,7,100,0,83,0,169,2,
-    78,233,0,0,0,0,41,8,218,7,95,116,104,114,101,97,
-    100,90,13,97,108,108,111,99,97,116,101,95,108,111,99,107,
-    218,4,108,111,99,107,218,6,119,97,107,101,117,112,114,17,
-    0,0,0,218,5,111,119,110,101,114,218,5,99,111,117,110,
-    116,218,7,119,97,105,116,101,114,115,169,2,218,4,115,101,
-    108,102,114,17,0,0,0,114,10,0,0,0,114,10,0,0,
-    0,114,11,0,0,0,218,8,95,95,105,110,105,116,95,95,
-    58,0,0,0,115,12,0,0,0,0,1,10,1,10,1,6,
-    1,6,1,6,1,122,20,95,77,111,100,117,108,101,76,111,
-    99,107,46,95,95,105,110,105,116,95,95,99,1,0,0,0,
-    0,0,0,0,0,0,0,0,4,0,0,0,3,0,0,0,
-    67,0,0,0,115,60,0,0,0,116,0,160,1,161,0,125,
-    1,124,0,106,2,125,2,116,3,160,4,124,2,161,1,125,
-    3,124,3,100,0,107,8,114,36,100,1,83,0,124,3,106,
-    2,125,2,124,2,124,1,107,2,114,14,100,2,83,0,113,
-    14,100,0,83,0,41,3,78,70,84,41,5,114,23,0,0,
-    0,218,9,103,101,116,95,105,100,101,110,116,114,26,0,0,
-    0,218,12,95,98,108,111,99,107,105,110,103,95,111,110,218,
-    3,103,101,116,41,4,114,30,0,0,0,90,2,109,101,218,
-    3,116,105,100,114,24,0,0,0,114,10,0,0,0,114,10,
-    0,0,0,114,11,0,0,0,218,12,104,97,115,95,100,101,
-    97,100,108,111,99,107,66,0,0,0,115,16,0,0,0,0,
-    2,8,1,6,2,10,1,8,1,4,1,6,1,8,1,122,
-    24,95,77,111,100,117,108,101,76,111,99,107,46,104,97,115,
-    95,100,101,97,100,108,111,99,107,99,1,0,0,0,0,0,
-    0,0,0,0,0,0,2,0,0,0,9,0,0,0,67,0,
-    0,0,115,178,0,0,0,116,0,160,1,161,0,125,1,124,
-    0,116,2,124,1,60,0,122,148,124,0,106,3,143,110,1,
-    0,124,0,106,4,100,1,107,2,115,46,124,0,106,5,124,
-    1,107,2,114,84,124,1,124,0,95,5,124,0,4,0,106,
-    4,100,2,55,0,2,0,95,4,87,0,53,0,81,0,82,
-    0,163,0,87,0,162,86,100,3,83,0,124,0,160,6,161,
-    0,114,104,116,7,100,4,124,0,22,0,131,1,130,1,124,
-    0,106,8,160,9,100,5,161,1,114,130,124,0,4,0,106,
-    10,100,2,55,0,2,0,95,10,87,0,53,0,81,0,82,
-    0,88,0,124,0,106,8,160,9,161,0,1,0,124,0,106,
-    8,160,11,161,0,1,0,113,18,87,0,53,0,116,2,124,
-    1,61,0,88,0,100,6,83,0,41,7,122,185,10,32,32,
-    32,32,32,32,32,32,65,99,113,117,105,114,101,32,116,104,
-    101,32,109,111,100,117,108,101,32,108,111,99,107,46,32,32,
-    73,102,32,97,32,112,111,116,101,110,116,105,97,108,32,100,
-    101,97,100,108,111,99,107,32,105,115,32,100,101,116,101,99,
-    116,101,100,44,10,32,32,32,32,32,32,32,32,97,32,95,
-    68,101,97,100,108,111,99,107,69,114,114,111,114,32,105,115,
-    32,114,97,105,115,101,100,46,10,32,32,32,32,32,32,32,
-    32,79,116,104,101,114,119,105,115,101,44,32,116,104,101,32,
-    108,111,99,107,32,105,115,32,97,108,119,97,121,115,32,97,
-    99,113,117,105,114,101,100,32,97,110,100,32,84,114,117,101,
-    32,105,115,32,114,101,116,117,114,110,101,100,46,10,32,32,
-    32,32,32,32,32,32,114,22,0,0,0,233,1,0,0,0,
-    84,122,23,100,101,97,100,108,111,99,107,32,100,101,116,101,
-    99,116,101,100,32,98,121,32,37,114,70,78,41,12,114,23,
-    0,0,0,114,32,0,0,0,114,33,0,0,0,114,24,0,
-    0,0,114,27,0,0,0,114,26,0,0,0,114,36,0,0,
-    0,114,19,0,0,0,114,25,0,0,0,218,7,97,99,113,
-    117,105,114,101,114,28,0,0,0,218,7,114,101,108,101,97,
-    115,101,169,2,114,30,0,0,0,114,35,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,38,0,
-    0,0,78,0,0,0,115,30,0,0,0,0,6,8,1,8,
-    1,2,2,8,1,20,1,6,1,14,1,18,1,8,1,12,
-    1,12,1,24,2,10,1,16,2,122,19,95,77,111,100,117,
-    108,101,76,111,99,107,46,97,99,113,117,105,114,101,99,1,
-    0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,9,
-    0,0,0,67,0,0,0,115,122,0,0,0,116,0,160,1,
-    161,0,125,1,124,0,106,2,143,98,1,0,124,0,106,3,
-    124,1,107,3,114,34,116,4,100,1,131,1,130,1,124,0,
-    106,5,100,2,107,4,115,48,74,0,130,1,124,0,4,0,
-    106,5,100,3,56,0,2,0,95,5,124,0,106,5,100,2,
-    107,2,114,108,100,0,124,0,95,3,124,0,106,6,114,108,
-    124,0,4,0,106,6,100,3,56,0,2,0,95,6,124,0,
-    106,7,160,8,161,0,1,0,87,0,53,0,81,0,82,0,
-    88,0,100,0,83,0,41,4,78,250,31,99,97,110,110,111,
-    116,32,114,101,108,101,97,115,101,32,117,110,45,97,99,113,
-    117,105,114,101,100,32,108,111,99,107,114,22,0,0,0,114,
-    37,0,0,0,41,9,114,23,0,0,0,114,32,0,0,0,
-    114,24,0,0,0,114,26,0,0,0,218,12,82,117,110,116,
-    105,109,101,69,114,114,111,114,114,27,0,0,0,114,28,0,
-    0,0,114,25,0,0,0,114,39,0,0,0,114,40,0,0,
-    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
-    114,39,0,0,0,103,0,0,0,115,22,0,0,0,0,1,
-    8,1,8,1,10,1,8,1,14,1,14,1,10,1,6,1,
-    6,1,14,1,122,19,95,77,111,100,117,108,101,76,111,99,
-    107,46,114,101,108,101,97,115,101,99,1,0,0,0,0,0,
-    0,0,0,0,0,0,1,0,0,0,5,0,0,0,67,0,
-    0,0,115,18,0,0,0,100,1,160,0,124,0,106,1,116,
-    2,124,0,131,1,161,2,83,0,41,2,78,122,23,95,77,
-    111,100,117,108,101,76,111,99,107,40,123,33,114,125,41,32,
-    97,116,32,123,125,169,3,218,6,102,111,114,109,97,116,114,
-    17,0,0,0,218,2,105,100,169,1,114,30,0,0,0,114,
-    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,8,
-    95,95,114,101,112,114,95,95,116,0,0,0,115,2,0,0,
-    0,0,1,122,20,95,77,111,100,117,108,101,76,111,99,107,
-    46,95,95,114,101,112,114,95,95,78,41,9,114,1,0,0,
-    0,114,0,0,0,0,114,2,0,0,0,114,3,0,0,0,
-    114,31,0,0,0,114,36,0,0,0,114,38,0,0,0,114,
-    39,0,0,0,114,47,0,0,0,114,10,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,20,0,
-    0,0,52,0,0,0,115,12,0,0,0,8,1,4,5,8,
-    8,8,12,8,25,8,13,114,20,0,0,0,99,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,0,0,0,2,0,0,
-    0,64,0,0,0,115,48,0,0,0,101,0,90,1,100,0,
-    90,2,100,1,90,3,100,2,100,3,132,0,90,4,100,4,
-    100,5,132,0,90,5,100,6,100,7,132,0,90,6,100,8,
-    100,9,132,0,90,7,100,10,83,0,41,11,218,16,95,68,
-    117,109,109,121,77,111,100,117,108,101,76,111,99,107,122,86,
-    65,32,115,105,109,112,108,101,32,95,77,111,100,117,108,101,
-    76,111,99,107,32,101,113,117,105,118,97,108,101,110,116,32,
-    102,111,114,32,80,121,116,104,111,110,32,98,117,105,108,100,
-    115,32,119,105,116,104,111,117,116,10,32,32,32,32,109,117,
-    108,116,105,45,116,104,114,101,97,100,105,110,103,32,115,117,
-    112,112,111,114,116,46,99,2,0,0,0,0,0,0,0,0,
+    32,111,102,32,105,109,112,111,114,116,46,10,10,84,104,105,
+    115,32,109,111,100,117,108,101,32,105,115,32,78,79,84,32,
+    109,101,97,110,116,32,116,111,32,98,101,32,100,105,114,101,
+    99,116,108,121,32,105,109,112,111,114,116,101,100,33,32,73,
+    116,32,104,97,115,32,98,101,101,110,32,100,101,115,105,103,
+    110,101,100,32,115,117,99,104,10,116,104,97,116,32,105,116,
+    32,99,97,110,32,98,101,32,98,111,111,116,115,116,114,97,
+    112,112,101,100,32,105,110,116,111,32,80,121,116,104,111,110,
+    32,97,115,32,116,104,101,32,105,109,112,108,101,109,101,110,
+    116,97,116,105,111,110,32,111,102,32,105,109,112,111,114,116,
+    46,32,65,115,10,115,117,99,104,32,105,116,32,114,101,113,
+    117,105,114,101,115,32,116,104,101,32,105,110,106,101,99,116,
+    105,111,110,32,111,102,32,115,112,101,99,105,102,105,99,32,
+    109,111,100,117,108,101,115,32,97,110,100,32,97,116,116,114,
+    105,98,117,116,101,115,32,105,110,32,111,114,100,101,114,32,
+    116,111,10,119,111,114,107,46,32,79,110,101,32,115,104,111,
+    117,108,100,32,117,115,101,32,105,109,112,111,114,116,108,105,
+    98,32,97,115,32,116,104,101,32,112,117,98,108,105,99,45,
+    102,97,99,105,110,103,32,118,101,114,115,105,111,110,32,111,
+    102,32,116,104,105,115,32,109,111,100,117,108,101,46,10,10,
+    78,99,2,0,0,0,0,0,0,0,0,0,0,0,3,0,
+    0,0,7,0,0,0,67,0,0,0,115,56,0,0,0,100,
+    1,68,0,93,32,125,2,116,0,124,1,124,2,131,2,114,
+    4,116,1,124,0,124,2,116,2,124,1,124,2,131,2,131,
+    3,1,0,113,4,124,0,106,3,160,4,124,1,106,3,161,
+    1,1,0,100,2,83,0,41,3,122,47,83,105,109,112,108,
+    101,32,115,117,98,115,116,105,116,117,116,101,32,102,111,114,
+    32,102,117,110,99,116,111,111,108,115,46,117,112,100,97,116,
+    101,95,119,114,97,112,112,101,114,46,41,4,218,10,95,95,
+    109,111,100,117,108,101,95,95,218,8,95,95,110,97,109,101,
+    95,95,218,12,95,95,113,117,97,108,110,97,109,101,95,95,
+    218,7,95,95,100,111,99,95,95,78,41,5,218,7,104,97,
+    115,97,116,116,114,218,7,115,101,116,97,116,116,114,218,7,
+    103,101,116,97,116,116,114,218,8,95,95,100,105,99,116,95,
+    95,218,6,117,112,100,97,116,101,41,3,90,3,110,101,119,
+    90,3,111,108,100,218,7,114,101,112,108,97,99,101,169,0,
+    114,10,0,0,0,250,29,60,102,114,111,122,101,110,32,105,
+    109,112,111,114,116,108,105,98,46,95,98,111,111,116,115,116,
+    114,97,112,62,218,5,95,119,114,97,112,27,0,0,0,115,
+    8,0,0,0,0,2,8,1,10,1,20,1,114,12,0,0,
+    0,99,1,0,0,0,0,0,0,0,0,0,0,0,1,0,
+    0,0,2,0,0,0,67,0,0,0,115,12,0,0,0,116,
+    0,116,1,131,1,124,0,131,1,83,0,169,1,78,41,2,
+    218,4,116,121,112,101,218,3,115,121,115,169,1,218,4,110,
+    97,109,101,114,10,0,0,0,114,10,0,0,0,114,11,0,
+    0,0,218,11,95,110,101,119,95,109,111,100,117,108,101,35,
+    0,0,0,115,2,0,0,0,0,1,114,18,0,0,0,99,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    1,0,0,0,64,0,0,0,115,12,0,0,0,101,0,90,
+    1,100,0,90,2,100,1,83,0,41,2,218,14,95,68,101,
+    97,100,108,111,99,107,69,114,114,111,114,78,41,3,114,1,
+    0,0,0,114,0,0,0,0,114,2,0,0,0,114,10,0,
+    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
+    0,114,19,0,0,0,48,0,0,0,115,2,0,0,0,8,
+    1,114,19,0,0,0,99,0,0,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,2,0,0,0,64,0,0,0,115,
+    56,0,0,0,101,0,90,1,100,0,90,2,100,1,90,3,
+    100,2,100,3,132,0,90,4,100,4,100,5,132,0,90,5,
+    100,6,100,7,132,0,90,6,100,8,100,9,132,0,90,7,
+    100,10,100,11,132,0,90,8,100,12,83,0,41,13,218,11,
+    95,77,111,100,117,108,101,76,111,99,107,122,169,65,32,114,
+    101,99,117,114,115,105,118,101,32,108,111,99,107,32,105,109,
+    112,108,101,109,101,110,116,97,116,105,111,110,32,119,104,105,
+    99,104,32,105,115,32,97,98,108,101,32,116,111,32,100,101,
+    116,101,99,116,32,100,101,97,100,108,111,99,107,115,10,32,
+    32,32,32,40,101,46,103,46,32,116,104,114,101,97,100,32,
+    49,32,116,114,121,105,110,103,32,116,111,32,116,97,107,101,
+    32,108,111,99,107,115,32,65,32,116,104,101,110,32,66,44,
+    32,97,110,100,32,116,104,114,101,97,100,32,50,32,116,114,
+    121,105,110,103,32,116,111,10,32,32,32,32,116,97,107,101,
+    32,108,111,99,107,115,32,66,32,116,104,101,110,32,65,41,
+    46,10,32,32,32,32,99,2,0,0,0,0,0,0,0,0,
     0,0,0,2,0,0,0,2,0,0,0,67,0,0,0,115,
-    16,0,0,0,124,1,124,0,95,0,100,1,124,0,95,1,
-    100,0,83,0,114,21,0,0,0,41,2,114,17,0,0,0,
-    114,27,0,0,0,114,29,0,0,0,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,114,31,0,0,0,124,0,
-    0,0,115,4,0,0,0,0,1,6,1,122,25,95,68,117,
-    109,109,121,77,111,100,117,108,101,76,111,99,107,46,95,95,
-    105,110,105,116,95,95,99,1,0,0,0,0,0,0,0,0,
-    0,0,0,1,0,0,0,3,0,0,0,67,0,0,0,115,
-    18,0,0,0,124,0,4,0,106,0,100,1,55,0,2,0,
-    95,0,100,2,83,0,41,3,78,114,37,0,0,0,84,41,
-    1,114,27,0,0,0,114,46,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,114,38,0,0,0,128,
-    0,0,0,115,4,0,0,0,0,1,14,1,122,24,95,68,
-    117,109,109,121,77,111,100,117,108,101,76,111,99,107,46,97,
-    99,113,117,105,114,101,99,1,0,0,0,0,0,0,0,0,
-    0,0,0,1,0,0,0,3,0,0,0,67,0,0,0,115,
-    36,0,0,0,124,0,106,0,100,1,107,2,114,18,116,1,
-    100,2,131,1,130,1,124,0,4,0,106,0,100,3,56,0,
-    2,0,95,0,100,0,83,0,41,4,78,114,22,0,0,0,
-    114,41,0,0,0,114,37,0,0,0,41,2,114,27,0,0,
-    0,114,42,0,0,0,114,46,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,114,39,0,0,0,132,
-    0,0,0,115,6,0,0,0,0,1,10,1,8,1,122,24,
-    95,68,117,109,109,121,77,111,100,117,108,101,76,111,99,107,
-    46,114,101,108,101,97,115,101,99,1,0,0,0,0,0,0,
-    0,0,0,0,0,1,0,0,0,5,0,0,0,67,0,0,
-    0,115,18,0,0,0,100,1,160,0,124,0,106,1,116,2,
-    124,0,131,1,161,2,83,0,41,2,78,122,28,95,68,117,
-    109,109,121,77,111,100,117,108,101,76,111,99,107,40,123,33,
-    114,125,41,32,97,116,32,123,125,114,43,0,0,0,114,46,
+    48,0,0,0,116,0,160,1,161,0,124,0,95,2,116,0,
+    160,1,161,0,124,0,95,3,124,1,124,0,95,4,100,0,
+    124,0,95,5,100,1,124,0,95,6,100,1,124,0,95,7,
+    100,0,83,0,169,2,78,233,0,0,0,0,41,8,218,7,
+    95,116,104,114,101,97,100,90,13,97,108,108,111,99,97,116,
+    101,95,108,111,99,107,218,4,108,111,99,107,218,6,119,97,
+    107,101,117,112,114,17,0,0,0,218,5,111,119,110,101,114,
+    218,5,99,111,117,110,116,218,7,119,97,105,116,101,114,115,
+    169,2,218,4,115,101,108,102,114,17,0,0,0,114,10,0,
+    0,0,114,10,0,0,0,114,11,0,0,0,218,8,95,95,
+    105,110,105,116,95,95,58,0,0,0,115,12,0,0,0,0,
+    1,10,1,10,1,6,1,6,1,6,1,122,20,95,77,111,
+    100,117,108,101,76,111,99,107,46,95,95,105,110,105,116,95,
+    95,99,1,0,0,0,0,0,0,0,0,0,0,0,4,0,
+    0,0,3,0,0,0,67,0,0,0,115,60,0,0,0,116,
+    0,160,1,161,0,125,1,124,0,106,2,125,2,116,3,160,
+    4,124,2,161,1,125,3,124,3,100,0,107,8,114,36,100,
+    1,83,0,124,3,106,2,125,2,124,2,124,1,107,2,114,
+    14,100,2,83,0,113,14,100,0,83,0,41,3,78,70,84,
+    41,5,114,23,0,0,0,218,9,103,101,116,95,105,100,101,
+    110,116,114,26,0,0,0,218,12,95,98,108,111,99,107,105,
+    110,103,95,111,110,218,3,103,101,116,41,4,114,30,0,0,
+    0,90,2,109,101,218,3,116,105,100,114,24,0,0,0,114,
+    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,12,
+    104,97,115,95,100,101,97,100,108,111,99,107,66,0,0,0,
+    115,16,0,0,0,0,2,8,1,6,2,10,1,8,1,4,
+    1,6,1,8,1,122,24,95,77,111,100,117,108,101,76,111,
+    99,107,46,104,97,115,95,100,101,97,100,108,111,99,107,99,
+    1,0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,
+    9,0,0,0,67,0,0,0,115,178,0,0,0,116,0,160,
+    1,161,0,125,1,124,0,116,2,124,1,60,0,122,148,124,
+    0,106,3,143,110,1,0,124,0,106,4,100,1,107,2,115,
+    46,124,0,106,5,124,1,107,2,114,84,124,1,124,0,95,
+    5,124,0,4,0,106,4,100,2,55,0,2,0,95,4,87,
+    0,53,0,81,0,82,0,163,0,87,0,162,86,100,3,83,
+    0,124,0,160,6,161,0,114,104,116,7,100,4,124,0,22,
+    0,131,1,130,1,124,0,106,8,160,9,100,5,161,1,114,
+    130,124,0,4,0,106,10,100,2,55,0,2,0,95,10,87,
+    0,53,0,81,0,82,0,88,0,124,0,106,8,160,9,161,
+    0,1,0,124,0,106,8,160,11,161,0,1,0,113,18,87,
+    0,53,0,116,2,124,1,61,0,88,0,100,6,83,0,41,
+    7,122,185,10,32,32,32,32,32,32,32,32,65,99,113,117,
+    105,114,101,32,116,104,101,32,109,111,100,117,108,101,32,108,
+    111,99,107,46,32,32,73,102,32,97,32,112,111,116,101,110,
+    116,105,97,108,32,100,101,97,100,108,111,99,107,32,105,115,
+    32,100,101,116,101,99,116,101,100,44,10,32,32,32,32,32,
+    32,32,32,97,32,95,68,101,97,100,108,111,99,107,69,114,
+    114,111,114,32,105,115,32,114,97,105,115,101,100,46,10,32,
+    32,32,32,32,32,32,32,79,116,104,101,114,119,105,115,101,
+    44,32,116,104,101,32,108,111,99,107,32,105,115,32,97,108,
+    119,97,121,115,32,97,99,113,117,105,114,101,100,32,97,110,
+    100,32,84,114,117,101,32,105,115,32,114,101,116,117,114,110,
+    101,100,46,10,32,32,32,32,32,32,32,32,114,22,0,0,
+    0,233,1,0,0,0,84,122,23,100,101,97,100,108,111,99,
+    107,32,100,101,116,101,99,116,101,100,32,98,121,32,37,114,
+    70,78,41,12,114,23,0,0,0,114,32,0,0,0,114,33,
+    0,0,0,114,24,0,0,0,114,27,0,0,0,114,26,0,
+    0,0,114,36,0,0,0,114,19,0,0,0,114,25,0,0,
+    0,218,7,97,99,113,117,105,114,101,114,28,0,0,0,218,
+    7,114,101,108,101,97,115,101,169,2,114,30,0,0,0,114,
+    35,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,38,0,0,0,78,0,0,0,115,30,0,0,
+    0,0,6,8,1,8,1,2,2,8,1,20,1,6,1,14,
+    1,18,1,8,1,12,1,12,1,24,2,10,1,16,2,122,
+    19,95,77,111,100,117,108,101,76,111,99,107,46,97,99,113,
+    117,105,114,101,99,1,0,0,0,0,0,0,0,0,0,0,
+    0,2,0,0,0,9,0,0,0,67,0,0,0,115,122,0,
+    0,0,116,0,160,1,161,0,125,1,124,0,106,2,143,98,
+    1,0,124,0,106,3,124,1,107,3,114,34,116,4,100,1,
+    131,1,130,1,124,0,106,5,100,2,107,4,115,48,74,0,
+    130,1,124,0,4,0,106,5,100,3,56,0,2,0,95,5,
+    124,0,106,5,100,2,107,2,114,108,100,0,124,0,95,3,
+    124,0,106,6,114,108,124,0,4,0,106,6,100,3,56,0,
+    2,0,95,6,124,0,106,7,160,8,161,0,1,0,87,0,
+    53,0,81,0,82,0,88,0,100,0,83,0,41,4,78,250,
+    31,99,97,110,110,111,116,32,114,101,108,101,97,115,101,32,
+    117,110,45,97,99,113,117,105,114,101,100,32,108,111,99,107,
+    114,22,0,0,0,114,37,0,0,0,41,9,114,23,0,0,
+    0,114,32,0,0,0,114,24,0,0,0,114,26,0,0,0,
+    218,12,82,117,110,116,105,109,101,69,114,114,111,114,114,27,
+    0,0,0,114,28,0,0,0,114,25,0,0,0,114,39,0,
+    0,0,114,40,0,0,0,114,10,0,0,0,114,10,0,0,
+    0,114,11,0,0,0,114,39,0,0,0,103,0,0,0,115,
+    22,0,0,0,0,1,8,1,8,1,10,1,8,1,14,1,
+    14,1,10,1,6,1,6,1,14,1,122,19,95,77,111,100,
+    117,108,101,76,111,99,107,46,114,101,108,101,97,115,101,99,
+    1,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,
+    5,0,0,0,67,0,0,0,115,18,0,0,0,100,1,160,
+    0,124,0,106,1,116,2,124,0,131,1,161,2,83,0,41,
+    2,78,122,23,95,77,111,100,117,108,101,76,111,99,107,40,
+    123,33,114,125,41,32,97,116,32,123,125,169,3,218,6,102,
+    111,114,109,97,116,114,17,0,0,0,218,2,105,100,169,1,
+    114,30,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
+    11,0,0,0,218,8,95,95,114,101,112,114,95,95,116,0,
+    0,0,115,2,0,0,0,0,1,122,20,95,77,111,100,117,
+    108,101,76,111,99,107,46,95,95,114,101,112,114,95,95,78,
+    41,9,114,1,0,0,0,114,0,0,0,0,114,2,0,0,
+    0,114,3,0,0,0,114,31,0,0,0,114,36,0,0,0,
+    114,38,0,0,0,114,39,0,0,0,114,47,0,0,0,114,
+    10,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,20,0,0,0,52,0,0,0,115,12,0,0,
+    0,8,1,4,5,8,8,8,12,8,25,8,13,114,20,0,
+    0,0,99,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    0,0,0,2,0,0,0,64,0,0,0,115,48,0,0,0,
+    101,0,90,1,100,0,90,2,100,1,90,3,100,2,100,3,
+    132,0,90,4,100,4,100,5,132,0,90,5,100,6,100,7,
+    132,0,90,6,100,8,100,9,132,0,90,7,100,10,83,0,
+    41,11,218,16,95,68,117,109,109,121,77,111,100,117,108,101,
+    76,111,99,107,122,86,65,32,115,105,109,112,108,101,32,95,
+    77,111,100,117,108,101,76,111,99,107,32,101,113,117,105,118,
+    97,108,101,110,116,32,102,111,114,32,80,121,116,104,111,110,
+    32,98,117,105,108,100,115,32,119,105,116,104,111,117,116,10,
+    32,32,32,32,109,117,108,116,105,45,116,104,114,101,97,100,
+    105,110,103,32,115,117,112,112,111,114,116,46,99,2,0,0,
+    0,0,0,0,0,0,0,0,0,2,0,0,0,2,0,0,
+    0,67,0,0,0,115,16,0,0,0,124,1,124,0,95,0,
+    100,1,124,0,95,1,100,0,83,0,114,21,0,0,0,41,
+    2,114,17,0,0,0,114,27,0,0,0,114,29,0,0,0,
+    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
+    31,0,0,0,124,0,0,0,115,4,0,0,0,0,1,6,
+    1,122,25,95,68,117,109,109,121,77,111,100,117,108,101,76,
+    111,99,107,46,95,95,105,110,105,116,95,95,99,1,0,0,
+    0,0,0,0,0,0,0,0,0,1,0,0,0,3,0,0,
+    0,67,0,0,0,115,18,0,0,0,124,0,4,0,106,0,
+    100,1,55,0,2,0,95,0,100,2,83,0,41,3,78,114,
+    37,0,0,0,84,41,1,114,27,0,0,0,114,46,0,0,
+    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,38,0,0,0,128,0,0,0,115,4,0,0,0,0,1,
+    14,1,122,24,95,68,117,109,109,121,77,111,100,117,108,101,
+    76,111,99,107,46,97,99,113,117,105,114,101,99,1,0,0,
+    0,0,0,0,0,0,0,0,0,1,0,0,0,3,0,0,
+    0,67,0,0,0,115,36,0,0,0,124,0,106,0,100,1,
+    107,2,114,18,116,1,100,2,131,1,130,1,124,0,4,0,
+    106,0,100,3,56,0,2,0,95,0,100,0,83,0,41,4,
+    78,114,22,0,0,0,114,41,0,0,0,114,37,0,0,0,
+    41,2,114,27,0,0,0,114,42,0,0,0,114,46,0,0,
+    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,39,0,0,0,132,0,0,0,115,6,0,0,0,0,1,
+    10,1,8,1,122,24,95,68,117,109,109,121,77,111,100,117,
+    108,101,76,111,99,107,46,114,101,108,101,97,115,101,99,1,
+    0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,5,
+    0,0,0,67,0,0,0,115,18,0,0,0,100,1,160,0,
+    124,0,106,1,116,2,124,0,131,1,161,2,83,0,41,2,
+    78,122,28,95,68,117,109,109,121,77,111,100,117,108,101,76,
+    111,99,107,40,123,33,114,125,41,32,97,116,32,123,125,114,
+    43,0,0,0,114,46,0,0,0,114,10,0,0,0,114,10,
+    0,0,0,114,11,0,0,0,114,47,0,0,0,137,0,0,
+    0,115,2,0,0,0,0,1,122,25,95,68,117,109,109,121,
+    77,111,100,117,108,101,76,111,99,107,46,95,95,114,101,112,
+    114,95,95,78,41,8,114,1,0,0,0,114,0,0,0,0,
+    114,2,0,0,0,114,3,0,0,0,114,31,0,0,0,114,
+    38,0,0,0,114,39,0,0,0,114,47,0,0,0,114,10,
     0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,
-    0,0,114,47,0,0,0,137,0,0,0,115,2,0,0,0,
-    0,1,122,25,95,68,117,109,109,121,77,111,100,117,108,101,
-    76,111,99,107,46,95,95,114,101,112,114,95,95,78,41,8,
-    114,1,0,0,0,114,0,0,0,0,114,2,0,0,0,114,
-    3,0,0,0,114,31,0,0,0,114,38,0,0,0,114,39,
-    0,0,0,114,47,0,0,0,114,10,0,0,0,114,10,0,
-    0,0,114,10,0,0,0,114,11,0,0,0,114,48,0,0,
-    0,120,0,0,0,115,10,0,0,0,8,1,4,3,8,4,
-    8,4,8,5,114,48,0,0,0,99,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,0,0,0,2,0,0,0,64,0,
-    0,0,115,36,0,0,0,101,0,90,1,100,0,90,2,100,
-    1,100,2,132,0,90,3,100,3,100,4,132,0,90,4,100,
-    5,100,6,132,0,90,5,100,7,83,0,41,8,218,18,95,
+    0,0,114,48,0,0,0,120,0,0,0,115,10,0,0,0,
+    8,1,4,3,8,4,8,4,8,5,114,48,0,0,0,99,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,
+    2,0,0,0,64,0,0,0,115,36,0,0,0,101,0,90,
+    1,100,0,90,2,100,1,100,2,132,0,90,3,100,3,100,
+    4,132,0,90,4,100,5,100,6,132,0,90,5,100,7,83,
+    0,41,8,218,18,95,77,111,100,117,108,101,76,111,99,107,
+    77,97,110,97,103,101,114,99,2,0,0,0,0,0,0,0,
+    0,0,0,0,2,0,0,0,2,0,0,0,67,0,0,0,
+    115,16,0,0,0,124,1,124,0,95,0,100,0,124,0,95,
+    1,100,0,83,0,114,13,0,0,0,41,2,218,5,95,110,
+    97,109,101,218,5,95,108,111,99,107,114,29,0,0,0,114,
+    10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,31,
+    0,0,0,143,0,0,0,115,4,0,0,0,0,1,6,1,
+    122,27,95,77,111,100,117,108,101,76,111,99,107,77,97,110,
+    97,103,101,114,46,95,95,105,110,105,116,95,95,99,1,0,
+    0,0,0,0,0,0,0,0,0,0,1,0,0,0,2,0,
+    0,0,67,0,0,0,115,26,0,0,0,116,0,124,0,106,
+    1,131,1,124,0,95,2,124,0,106,2,160,3,161,0,1,
+    0,100,0,83,0,114,13,0,0,0,41,4,218,16,95,103,
+    101,116,95,109,111,100,117,108,101,95,108,111,99,107,114,50,
+    0,0,0,114,51,0,0,0,114,38,0,0,0,114,46,0,
+    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
+    0,218,9,95,95,101,110,116,101,114,95,95,147,0,0,0,
+    115,4,0,0,0,0,1,12,1,122,28,95,77,111,100,117,
+    108,101,76,111,99,107,77,97,110,97,103,101,114,46,95,95,
+    101,110,116,101,114,95,95,99,1,0,0,0,0,0,0,0,
+    0,0,0,0,3,0,0,0,2,0,0,0,79,0,0,0,
+    115,14,0,0,0,124,0,106,0,160,1,161,0,1,0,100,
+    0,83,0,114,13,0,0,0,41,2,114,51,0,0,0,114,
+    39,0,0,0,41,3,114,30,0,0,0,218,4,97,114,103,
+    115,90,6,107,119,97,114,103,115,114,10,0,0,0,114,10,
+    0,0,0,114,11,0,0,0,218,8,95,95,101,120,105,116,
+    95,95,151,0,0,0,115,2,0,0,0,0,1,122,27,95,
     77,111,100,117,108,101,76,111,99,107,77,97,110,97,103,101,
-    114,99,2,0,0,0,0,0,0,0,0,0,0,0,2,0,
-    0,0,2,0,0,0,67,0,0,0,115,16,0,0,0,124,
-    1,124,0,95,0,100,0,124,0,95,1,100,0,83,0,114,
-    13,0,0,0,41,2,218,5,95,110,97,109,101,218,5,95,
-    108,111,99,107,114,29,0,0,0,114,10,0,0,0,114,10,
-    0,0,0,114,11,0,0,0,114,31,0,0,0,143,0,0,
-    0,115,4,0,0,0,0,1,6,1,122,27,95,77,111,100,
-    117,108,101,76,111,99,107,77,97,110,97,103,101,114,46,95,
-    95,105,110,105,116,95,95,99,1,0,0,0,0,0,0,0,
-    0,0,0,0,1,0,0,0,2,0,0,0,67,0,0,0,
-    115,26,0,0,0,116,0,124,0,106,1,131,1,124,0,95,
-    2,124,0,106,2,160,3,161,0,1,0,100,0,83,0,114,
-    13,0,0,0,41,4,218,16,95,103,101,116,95,109,111,100,
-    117,108,101,95,108,111,99,107,114,50,0,0,0,114,51,0,
-    0,0,114,38,0,0,0,114,46,0,0,0,114,10,0,0,
-    0,114,10,0,0,0,114,11,0,0,0,218,9,95,95,101,
-    110,116,101,114,95,95,147,0,0,0,115,4,0,0,0,0,
-    1,12,1,122,28,95,77,111,100,117,108,101,76,111,99,107,
-    77,97,110,97,103,101,114,46,95,95,101,110,116,101,114,95,
-    95,99,1,0,0,0,0,0,0,0,0,0,0,0,3,0,
-    0,0,2,0,0,0,79,0,0,0,115,14,0,0,0,124,
-    0,106,0,160,1,161,0,1,0,100,0,83,0,114,13,0,
-    0,0,41,2,114,51,0,0,0,114,39,0,0,0,41,3,
-    114,30,0,0,0,218,4,97,114,103,115,90,6,107,119,97,
-    114,103,115,114,10,0,0,0,114,10,0,0,0,114,11,0,
-    0,0,218,8,95,95,101,120,105,116,95,95,151,0,0,0,
-    115,2,0,0,0,0,1,122,27,95,77,111,100,117,108,101,
-    76,111,99,107,77,97,110,97,103,101,114,46,95,95,101,120,
-    105,116,95,95,78,41,6,114,1,0,0,0,114,0,0,0,
-    0,114,2,0,0,0,114,31,0,0,0,114,53,0,0,0,
-    114,55,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,114,49,0,0,0,141,0,
-    0,0,115,6,0,0,0,8,2,8,4,8,4,114,49,0,
-    0,0,99,1,0,0,0,0,0,0,0,0,0,0,0,3,
-    0,0,0,8,0,0,0,67,0,0,0,115,130,0,0,0,
-    116,0,160,1,161,0,1,0,122,106,122,14,116,3,124,0,
-    25,0,131,0,125,1,87,0,110,24,4,0,116,4,107,10,
-    114,48,1,0,1,0,1,0,100,1,125,1,89,0,110,2,
-    88,0,124,1,100,1,107,8,114,112,116,5,100,1,107,8,
-    114,76,116,6,124,0,131,1,125,1,110,8,116,7,124,0,
-    131,1,125,1,124,0,102,1,100,2,100,3,132,1,125,2,
-    116,8,160,9,124,1,124,2,161,2,116,3,124,0,60,0,
-    87,0,53,0,116,0,160,2,161,0,1,0,88,0,124,1,
-    83,0,41,4,122,139,71,101,116,32,111,114,32,99,114,101,
-    97,116,101,32,116,104,101,32,109,111,100,117,108,101,32,108,
-    111,99,107,32,102,111,114,32,97,32,103,105,118,101,110,32,
-    109,111,100,117,108,101,32,110,97,109,101,46,10,10,32,32,
-    32,32,65,99,113,117,105,114,101,47,114,101,108,101,97,115,
-    101,32,105,110,116,101,114,110,97,108,108,121,32,116,104,101,
-    32,103,108,111,98,97,108,32,105,109,112,111,114,116,32,108,
-    111,99,107,32,116,111,32,112,114,111,116,101,99,116,10,32,
-    32,32,32,95,109,111,100,117,108,101,95,108,111,99,107,115,
-    46,78,99,2,0,0,0,0,0,0,0,0,0,0,0,2,
-    0,0,0,8,0,0,0,83,0,0,0,115,48,0,0,0,
-    116,0,160,1,161,0,1,0,122,24,116,3,160,4,124,1,
-    161,1,124,0,107,8,114,30,116,3,124,1,61,0,87,0,
-    53,0,116,0,160,2,161,0,1,0,88,0,100,0,83,0,
-    114,13,0,0,0,41,5,218,4,95,105,109,112,218,12,97,
-    99,113,117,105,114,101,95,108,111,99,107,218,12,114,101,108,
-    101,97,115,101,95,108,111,99,107,218,13,95,109,111,100,117,
-    108,101,95,108,111,99,107,115,114,34,0,0,0,41,2,218,
-    3,114,101,102,114,17,0,0,0,114,10,0,0,0,114,10,
-    0,0,0,114,11,0,0,0,218,2,99,98,176,0,0,0,
-    115,10,0,0,0,0,1,8,1,2,4,14,1,10,2,122,
-    28,95,103,101,116,95,109,111,100,117,108,101,95,108,111,99,
-    107,46,60,108,111,99,97,108,115,62,46,99,98,41,10,114,
-    56,0,0,0,114,57,0,0,0,114,58,0,0,0,114,59,
-    0,0,0,218,8,75,101,121,69,114,114,111,114,114,23,0,
-    0,0,114,48,0,0,0,114,20,0,0,0,218,8,95,119,
-    101,97,107,114,101,102,114,60,0,0,0,41,3,114,17,0,
-    0,0,114,24,0,0,0,114,61,0,0,0,114,10,0,0,
-    0,114,10,0,0,0,114,11,0,0,0,114,52,0,0,0,
-    157,0,0,0,115,28,0,0,0,0,6,8,1,2,1,2,
-    1,14,1,14,1,10,2,8,1,8,1,10,2,8,2,12,
-    11,20,2,10,2,114,52,0,0,0,99,1,0,0,0,0,
-    0,0,0,0,0,0,0,2,0,0,0,8,0,0,0,67,
-    0,0,0,115,54,0,0,0,116,0,124,0,131,1,125,1,
-    122,12,124,1,160,1,161,0,1,0,87,0,110,20,4,0,
-    116,2,107,10,114,40,1,0,1,0,1,0,89,0,110,10,
-    88,0,124,1,160,3,161,0,1,0,100,1,83,0,41,2,
-    122,189,65,99,113,117,105,114,101,115,32,116,104,101,110,32,
-    114,101,108,101,97,115,101,115,32,116,104,101,32,109,111,100,
-    117,108,101,32,108,111,99,107,32,102,111,114,32,97,32,103,
-    105,118,101,110,32,109,111,100,117,108,101,32,110,97,109,101,
-    46,10,10,32,32,32,32,84,104,105,115,32,105,115,32,117,
-    115,101,100,32,116,111,32,101,110,115,117,114,101,32,97,32,
-    109,111,100,117,108,101,32,105,115,32,99,111,109,112,108,101,
-    116,101,108,121,32,105,110,105,116,105,97,108,105,122,101,100,
-    44,32,105,110,32,116,104,101,10,32,32,32,32,101,118,101,
-    110,116,32,105,116,32,105,115,32,98,101,105,110,103,32,105,
-    109,112,111,114,116,101,100,32,98,121,32,97,110,111,116,104,
-    101,114,32,116,104,114,101,97,100,46,10,32,32,32,32,78,
-    41,4,114,52,0,0,0,114,38,0,0,0,114,19,0,0,
-    0,114,39,0,0,0,41,2,114,17,0,0,0,114,24,0,
+    114,46,95,95,101,120,105,116,95,95,78,41,6,114,1,0,
+    0,0,114,0,0,0,0,114,2,0,0,0,114,31,0,0,
+    0,114,53,0,0,0,114,55,0,0,0,114,10,0,0,0,
+    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
+    49,0,0,0,141,0,0,0,115,6,0,0,0,8,2,8,
+    4,8,4,114,49,0,0,0,99,1,0,0,0,0,0,0,
+    0,0,0,0,0,3,0,0,0,8,0,0,0,67,0,0,
+    0,115,130,0,0,0,116,0,160,1,161,0,1,0,122,106,
+    122,14,116,3,124,0,25,0,131,0,125,1,87,0,110,24,
+    4,0,116,4,107,10,114,48,1,0,1,0,1,0,100,1,
+    125,1,89,0,110,2,88,0,124,1,100,1,107,8,114,112,
+    116,5,100,1,107,8,114,76,116,6,124,0,131,1,125,1,
+    110,8,116,7,124,0,131,1,125,1,124,0,102,1,100,2,
+    100,3,132,1,125,2,116,8,160,9,124,1,124,2,161,2,
+    116,3,124,0,60,0,87,0,53,0,116,0,160,2,161,0,
+    1,0,88,0,124,1,83,0,41,4,122,139,71,101,116,32,
+    111,114,32,99,114,101,97,116,101,32,116,104,101,32,109,111,
+    100,117,108,101,32,108,111,99,107,32,102,111,114,32,97,32,
+    103,105,118,101,110,32,109,111,100,117,108,101,32,110,97,109,
+    101,46,10,10,32,32,32,32,65,99,113,117,105,114,101,47,
+    114,101,108,101,97,115,101,32,105,110,116,101,114,110,97,108,
+    108,121,32,116,104,101,32,103,108,111,98,97,108,32,105,109,
+    112,111,114,116,32,108,111,99,107,32,116,111,32,112,114,111,
+    116,101,99,116,10,32,32,32,32,95,109,111,100,117,108,101,
+    95,108,111,99,107,115,46,78,99,2,0,0,0,0,0,0,
+    0,0,0,0,0,2,0,0,0,8,0,0,0,83,0,0,
+    0,115,48,0,0,0,116,0,160,1,161,0,1,0,122,24,
+    116,3,160,4,124,1,161,1,124,0,107,8,114,30,116,3,
+    124,1,61,0,87,0,53,0,116,0,160,2,161,0,1,0,
+    88,0,100,0,83,0,114,13,0,0,0,41,5,218,4,95,
+    105,109,112,218,12,97,99,113,117,105,114,101,95,108,111,99,
+    107,218,12,114,101,108,101,97,115,101,95,108,111,99,107,218,
+    13,95,109,111,100,117,108,101,95,108,111,99,107,115,114,34,
+    0,0,0,41,2,218,3,114,101,102,114,17,0,0,0,114,
+    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,2,
+    99,98,176,0,0,0,115,10,0,0,0,0,1,8,1,2,
+    4,14,1,10,2,122,28,95,103,101,116,95,109,111,100,117,
+    108,101,95,108,111,99,107,46,60,108,111,99,97,108,115,62,
+    46,99,98,41,10,114,56,0,0,0,114,57,0,0,0,114,
+    58,0,0,0,114,59,0,0,0,218,8,75,101,121,69,114,
+    114,111,114,114,23,0,0,0,114,48,0,0,0,114,20,0,
+    0,0,218,8,95,119,101,97,107,114,101,102,114,60,0,0,
+    0,41,3,114,17,0,0,0,114,24,0,0,0,114,61,0,
     0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,218,19,95,108,111,99,107,95,117,110,108,111,99,107,95,
-    109,111,100,117,108,101,194,0,0,0,115,12,0,0,0,0,
-    6,8,1,2,1,12,1,14,3,6,2,114,64,0,0,0,
-    99,1,0,0,0,0,0,0,0,0,0,0,0,3,0,0,
-    0,3,0,0,0,79,0,0,0,115,10,0,0,0,124,0,
-    124,1,124,2,142,1,83,0,41,1,97,46,1,0,0,114,
-    101,109,111,118,101,95,105,109,112,111,114,116,108,105,98,95,
-    102,114,97,109,101,115,32,105,110,32,105,109,112,111,114,116,
-    46,99,32,119,105,108,108,32,97,108,119,97,121,115,32,114,
-    101,109,111,118,101,32,115,101,113,117,101,110,99,101,115,10,
-    32,32,32,32,111,102,32,105,109,112,111,114,116,108,105,98,
-    32,102,114,97,109,101,115,32,116,104,97,116,32,101,110,100,
-    32,119,105,116,104,32,97,32,99,97,108,108,32,116,111,32,
-    116,104,105,115,32,102,117,110,99,116,105,111,110,10,10,32,
-    32,32,32,85,115,101,32,105,116,32,105,110,115,116,101,97,
-    100,32,111,102,32,97,32,110,111,114,109,97,108,32,99,97,
-    108,108,32,105,110,32,112,108,97,99,101,115,32,119,104,101,
-    114,101,32,105,110,99,108,117,100,105,110,103,32,116,104,101,
-    32,105,109,112,111,114,116,108,105,98,10,32,32,32,32,102,
-    114,97,109,101,115,32,105,110,116,114,111,100,117,99,101,115,
-    32,117,110,119,97,110,116,101,100,32,110,111,105,115,101,32,
-    105,110,116,111,32,116,104,101,32,116,114,97,99,101,98,97,
-    99,107,32,40,101,46,103,46,32,119,104,101,110,32,101,120,
-    101,99,117,116,105,110,103,10,32,32,32,32,109,111,100,117,
-    108,101,32,99,111,100,101,41,10,32,32,32,32,114,10,0,
-    0,0,41,3,218,1,102,114,54,0,0,0,90,4,107,119,
-    100,115,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,218,25,95,99,97,108,108,95,119,105,116,104,95,102,114,
-    97,109,101,115,95,114,101,109,111,118,101,100,211,0,0,0,
-    115,2,0,0,0,0,8,114,66,0,0,0,114,37,0,0,
-    0,41,1,218,9,118,101,114,98,111,115,105,116,121,99,1,
-    0,0,0,0,0,0,0,1,0,0,0,3,0,0,0,4,
-    0,0,0,71,0,0,0,115,54,0,0,0,116,0,106,1,
-    106,2,124,1,107,5,114,50,124,0,160,3,100,1,161,1,
-    115,30,100,2,124,0,23,0,125,0,116,4,124,0,106,5,
-    124,2,142,0,116,0,106,6,100,3,141,2,1,0,100,4,
-    83,0,41,5,122,61,80,114,105,110,116,32,116,104,101,32,
-    109,101,115,115,97,103,101,32,116,111,32,115,116,100,101,114,
-    114,32,105,102,32,45,118,47,80,89,84,72,79,78,86,69,
-    82,66,79,83,69,32,105,115,32,116,117,114,110,101,100,32,
-    111,110,46,41,2,250,1,35,122,7,105,109,112,111,114,116,
-    32,122,2,35,32,41,1,90,4,102,105,108,101,78,41,7,
-    114,15,0,0,0,218,5,102,108,97,103,115,218,7,118,101,
-    114,98,111,115,101,218,10,115,116,97,114,116,115,119,105,116,
-    104,218,5,112,114,105,110,116,114,44,0,0,0,218,6,115,
-    116,100,101,114,114,41,3,218,7,109,101,115,115,97,103,101,
-    114,67,0,0,0,114,54,0,0,0,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,218,16,95,118,101,114,98,
-    111,115,101,95,109,101,115,115,97,103,101,222,0,0,0,115,
-    8,0,0,0,0,2,12,1,10,1,8,1,114,75,0,0,
-    0,99,1,0,0,0,0,0,0,0,0,0,0,0,2,0,
-    0,0,3,0,0,0,3,0,0,0,115,26,0,0,0,135,
-    0,102,1,100,1,100,2,132,8,125,1,116,0,124,1,136,
-    0,131,2,1,0,124,1,83,0,41,3,122,49,68,101,99,
-    111,114,97,116,111,114,32,116,111,32,118,101,114,105,102,121,
-    32,116,104,101,32,110,97,109,101,100,32,109,111,100,117,108,
-    101,32,105,115,32,98,117,105,108,116,45,105,110,46,99,2,
-    0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,4,
-    0,0,0,19,0,0,0,115,38,0,0,0,124,1,116,0,
-    106,1,107,7,114,28,116,2,100,1,160,3,124,1,161,1,
-    124,1,100,2,141,2,130,1,136,0,124,0,124,1,131,2,
-    83,0,41,3,78,250,29,123,33,114,125,32,105,115,32,110,
-    111,116,32,97,32,98,117,105,108,116,45,105,110,32,109,111,
-    100,117,108,101,114,16,0,0,0,41,4,114,15,0,0,0,
-    218,20,98,117,105,108,116,105,110,95,109,111,100,117,108,101,
-    95,110,97,109,101,115,218,11,73,109,112,111,114,116,69,114,
-    114,111,114,114,44,0,0,0,169,2,114,30,0,0,0,218,
-    8,102,117,108,108,110,97,109,101,169,1,218,3,102,120,110,
-    114,10,0,0,0,114,11,0,0,0,218,25,95,114,101,113,
-    117,105,114,101,115,95,98,117,105,108,116,105,110,95,119,114,
-    97,112,112,101,114,232,0,0,0,115,10,0,0,0,0,1,
-    10,1,10,1,2,255,6,2,122,52,95,114,101,113,117,105,
-    114,101,115,95,98,117,105,108,116,105,110,46,60,108,111,99,
-    97,108,115,62,46,95,114,101,113,117,105,114,101,115,95,98,
-    117,105,108,116,105,110,95,119,114,97,112,112,101,114,169,1,
-    114,12,0,0,0,41,2,114,82,0,0,0,114,83,0,0,
-    0,114,10,0,0,0,114,81,0,0,0,114,11,0,0,0,
-    218,17,95,114,101,113,117,105,114,101,115,95,98,117,105,108,
-    116,105,110,230,0,0,0,115,6,0,0,0,0,2,12,5,
-    10,1,114,85,0,0,0,99,1,0,0,0,0,0,0,0,
+    0,114,52,0,0,0,157,0,0,0,115,28,0,0,0,0,
+    6,8,1,2,1,2,1,14,1,14,1,10,2,8,1,8,
+    1,10,2,8,2,12,11,20,2,10,2,114,52,0,0,0,
+    99,1,0,0,0,0,0,0,0,0,0,0,0,2,0,0,
+    0,8,0,0,0,67,0,0,0,115,54,0,0,0,116,0,
+    124,0,131,1,125,1,122,12,124,1,160,1,161,0,1,0,
+    87,0,110,20,4,0,116,2,107,10,114,40,1,0,1,0,
+    1,0,89,0,110,10,88,0,124,1,160,3,161,0,1,0,
+    100,1,83,0,41,2,122,189,65,99,113,117,105,114,101,115,
+    32,116,104,101,110,32,114,101,108,101,97,115,101,115,32,116,
+    104,101,32,109,111,100,117,108,101,32,108,111,99,107,32,102,
+    111,114,32,97,32,103,105,118,101,110,32,109,111,100,117,108,
+    101,32,110,97,109,101,46,10,10,32,32,32,32,84,104,105,
+    115,32,105,115,32,117,115,101,100,32,116,111,32,101,110,115,
+    117,114,101,32,97,32,109,111,100,117,108,101,32,105,115,32,
+    99,111,109,112,108,101,116,101,108,121,32,105,110,105,116,105,
+    97,108,105,122,101,100,44,32,105,110,32,116,104,101,10,32,
+    32,32,32,101,118,101,110,116,32,105,116,32,105,115,32,98,
+    101,105,110,103,32,105,109,112,111,114,116,101,100,32,98,121,
+    32,97,110,111,116,104,101,114,32,116,104,114,101,97,100,46,
+    10,32,32,32,32,78,41,4,114,52,0,0,0,114,38,0,
+    0,0,114,19,0,0,0,114,39,0,0,0,41,2,114,17,
+    0,0,0,114,24,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,218,19,95,108,111,99,107,95,117,
+    110,108,111,99,107,95,109,111,100,117,108,101,194,0,0,0,
+    115,12,0,0,0,0,6,8,1,2,1,12,1,14,3,6,
+    2,114,64,0,0,0,99,1,0,0,0,0,0,0,0,0,
+    0,0,0,3,0,0,0,3,0,0,0,79,0,0,0,115,
+    10,0,0,0,124,0,124,1,124,2,142,1,83,0,41,1,
+    97,46,1,0,0,114,101,109,111,118,101,95,105,109,112,111,
+    114,116,108,105,98,95,102,114,97,109,101,115,32,105,110,32,
+    105,109,112,111,114,116,46,99,32,119,105,108,108,32,97,108,
+    119,97,121,115,32,114,101,109,111,118,101,32,115,101,113,117,
+    101,110,99,101,115,10,32,32,32,32,111,102,32,105,109,112,
+    111,114,116,108,105,98,32,102,114,97,109,101,115,32,116,104,
+    97,116,32,101,110,100,32,119,105,116,104,32,97,32,99,97,
+    108,108,32,116,111,32,116,104,105,115,32,102,117,110,99,116,
+    105,111,110,10,10,32,32,32,32,85,115,101,32,105,116,32,
+    105,110,115,116,101,97,100,32,111,102,32,97,32,110,111,114,
+    109,97,108,32,99,97,108,108,32,105,110,32,112,108,97,99,
+    101,115,32,119,104,101,114,101,32,105,110,99,108,117,100,105,
+    110,103,32,116,104,101,32,105,109,112,111,114,116,108,105,98,
+    10,32,32,32,32,102,114,97,109,101,115,32,105,110,116,114,
+    111,100,117,99,101,115,32,117,110,119,97,110,116,101,100,32,
+    110,111,105,115,101,32,105,110,116,111,32,116,104,101,32,116,
+    114,97,99,101,98,97,99,107,32,40,101,46,103,46,32,119,
+    104,101,110,32,101,120,101,99,117,116,105,110,103,10,32,32,
+    32,32,109,111,100,117,108,101,32,99,111,100,101,41,10,32,
+    32,32,32,114,10,0,0,0,41,3,218,1,102,114,54,0,
+    0,0,90,4,107,119,100,115,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,218,25,95,99,97,108,108,95,119,
+    105,116,104,95,102,114,97,109,101,115,95,114,101,109,111,118,
+    101,100,211,0,0,0,115,2,0,0,0,0,8,114,66,0,
+    0,0,114,37,0,0,0,41,1,218,9,118,101,114,98,111,
+    115,105,116,121,99,1,0,0,0,0,0,0,0,1,0,0,
+    0,3,0,0,0,4,0,0,0,71,0,0,0,115,54,0,
+    0,0,116,0,106,1,106,2,124,1,107,5,114,50,124,0,
+    160,3,100,1,161,1,115,30,100,2,124,0,23,0,125,0,
+    116,4,124,0,106,5,124,2,142,0,116,0,106,6,100,3,
+    141,2,1,0,100,4,83,0,41,5,122,61,80,114,105,110,
+    116,32,116,104,101,32,109,101,115,115,97,103,101,32,116,111,
+    32,115,116,100,101,114,114,32,105,102,32,45,118,47,80,89,
+    84,72,79,78,86,69,82,66,79,83,69,32,105,115,32,116,
+    117,114,110,101,100,32,111,110,46,41,2,250,1,35,122,7,
+    105,109,112,111,114,116,32,122,2,35,32,41,1,90,4,102,
+    105,108,101,78,41,7,114,15,0,0,0,218,5,102,108,97,
+    103,115,218,7,118,101,114,98,111,115,101,218,10,115,116,97,
+    114,116,115,119,105,116,104,218,5,112,114,105,110,116,114,44,
+    0,0,0,218,6,115,116,100,101,114,114,41,3,218,7,109,
+    101,115,115,97,103,101,114,67,0,0,0,114,54,0,0,0,
+    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,
+    16,95,118,101,114,98,111,115,101,95,109,101,115,115,97,103,
+    101,222,0,0,0,115,8,0,0,0,0,2,12,1,10,1,
+    8,1,114,75,0,0,0,99,1,0,0,0,0,0,0,0,
     0,0,0,0,2,0,0,0,3,0,0,0,3,0,0,0,
     115,26,0,0,0,135,0,102,1,100,1,100,2,132,8,125,
     1,116,0,124,1,136,0,131,2,1,0,124,1,83,0,41,
-    3,122,47,68,101,99,111,114,97,116,111,114,32,116,111,32,
+    3,122,49,68,101,99,111,114,97,116,111,114,32,116,111,32,
     118,101,114,105,102,121,32,116,104,101,32,110,97,109,101,100,
-    32,109,111,100,117,108,101,32,105,115,32,102,114,111,122,101,
-    110,46,99,2,0,0,0,0,0,0,0,0,0,0,0,2,
-    0,0,0,4,0,0,0,19,0,0,0,115,38,0,0,0,
-    116,0,160,1,124,1,161,1,115,28,116,2,100,1,160,3,
-    124,1,161,1,124,1,100,2,141,2,130,1,136,0,124,0,
-    124,1,131,2,83,0,169,3,78,122,27,123,33,114,125,32,
-    105,115,32,110,111,116,32,97,32,102,114,111,122,101,110,32,
-    109,111,100,117,108,101,114,16,0,0,0,41,4,114,56,0,
-    0,0,218,9,105,115,95,102,114,111,122,101,110,114,78,0,
-    0,0,114,44,0,0,0,114,79,0,0,0,114,81,0,0,
-    0,114,10,0,0,0,114,11,0,0,0,218,24,95,114,101,
-    113,117,105,114,101,115,95,102,114,111,122,101,110,95,119,114,
-    97,112,112,101,114,243,0,0,0,115,10,0,0,0,0,1,
-    10,1,10,1,2,255,6,2,122,50,95,114,101,113,117,105,
-    114,101,115,95,102,114,111,122,101,110,46,60,108,111,99,97,
-    108,115,62,46,95,114,101,113,117,105,114,101,115,95,102,114,
-    111,122,101,110,95,119,114,97,112,112,101,114,114,84,0,0,
-    0,41,2,114,82,0,0,0,114,88,0,0,0,114,10,0,
-    0,0,114,81,0,0,0,114,11,0,0,0,218,16,95,114,
-    101,113,117,105,114,101,115,95,102,114,111,122,101,110,241,0,
-    0,0,115,6,0,0,0,0,2,12,5,10,1,114,89,0,
-    0,0,99,2,0,0,0,0,0,0,0,0,0,0,0,4,
-    0,0,0,3,0,0,0,67,0,0,0,115,62,0,0,0,
-    116,0,124,1,124,0,131,2,125,2,124,1,116,1,106,2,
-    107,6,114,50,116,1,106,2,124,1,25,0,125,3,116,3,
-    124,2,124,3,131,2,1,0,116,1,106,2,124,1,25,0,
-    83,0,116,4,124,2,131,1,83,0,100,1,83,0,41,2,
-    122,128,76,111,97,100,32,116,104,101,32,115,112,101,99,105,
-    102,105,101,100,32,109,111,100,117,108,101,32,105,110,116,111,
-    32,115,121,115,46,109,111,100,117,108,101,115,32,97,110,100,
-    32,114,101,116,117,114,110,32,105,116,46,10,10,32,32,32,
-    32,84,104,105,115,32,109,101,116,104,111,100,32,105,115,32,
-    100,101,112,114,101,99,97,116,101,100,46,32,32,85,115,101,
-    32,108,111,97,100,101,114,46,101,120,101,99,95,109,111,100,
-    117,108,101,32,105,110,115,116,101,97,100,46,10,10,32,32,
-    32,32,78,41,5,218,16,115,112,101,99,95,102,114,111,109,
-    95,108,111,97,100,101,114,114,15,0,0,0,218,7,109,111,
-    100,117,108,101,115,218,5,95,101,120,101,99,218,5,95,108,
-    111,97,100,41,4,114,30,0,0,0,114,80,0,0,0,218,
-    4,115,112,101,99,218,6,109,111,100,117,108,101,114,10,0,
-    0,0,114,10,0,0,0,114,11,0,0,0,218,17,95,108,
-    111,97,100,95,109,111,100,117,108,101,95,115,104,105,109,253,
-    0,0,0,115,12,0,0,0,0,6,10,1,10,1,10,1,
-    10,1,10,2,114,96,0,0,0,99,1,0,0,0,0,0,
-    0,0,0,0,0,0,5,0,0,0,8,0,0,0,67,0,
-    0,0,115,226,0,0,0,116,0,124,0,100,1,100,0,131,
-    3,125,1,116,1,124,1,100,2,131,2,114,56,122,12,124,
-    1,160,2,124,0,161,1,87,0,83,0,4,0,116,3,107,
-    10,114,54,1,0,1,0,1,0,89,0,110,2,88,0,122,
-    10,124,0,106,4,125,2,87,0,110,20,4,0,116,5,107,
-    10,114,86,1,0,1,0,1,0,89,0,110,18,88,0,124,
-    2,100,0,107,9,114,104,116,6,124,2,131,1,83,0,122,
-    10,124,0,106,7,125,3,87,0,110,24,4,0,116,5,107,
-    10,114,138,1,0,1,0,1,0,100,3,125,3,89,0,110,
-    2,88,0,122,10,124,0,106,8,125,4,87,0,110,58,4,
-    0,116,5,107,10,114,208,1,0,1,0,1,0,124,1,100,
-    0,107,8,114,188,100,4,160,9,124,3,161,1,6,0,89,
-    0,83,0,100,5,160,9,124,3,124,1,161,2,6,0,89,
-    0,83,0,89,0,110,14,88,0,100,6,160,9,124,3,124,
-    4,161,2,83,0,100,0,83,0,41,7,78,218,10,95,95,
-    108,111,97,100,101,114,95,95,218,11,109,111,100,117,108,101,
-    95,114,101,112,114,250,1,63,250,13,60,109,111,100,117,108,
-    101,32,123,33,114,125,62,250,20,60,109,111,100,117,108,101,
-    32,123,33,114,125,32,40,123,33,114,125,41,62,250,23,60,
-    109,111,100,117,108,101,32,123,33,114,125,32,102,114,111,109,
-    32,123,33,114,125,62,41,10,114,6,0,0,0,114,4,0,
-    0,0,114,98,0,0,0,218,9,69,120,99,101,112,116,105,
-    111,110,218,8,95,95,115,112,101,99,95,95,218,14,65,116,
-    116,114,105,98,117,116,101,69,114,114,111,114,218,22,95,109,
-    111,100,117,108,101,95,114,101,112,114,95,102,114,111,109,95,
-    115,112,101,99,114,1,0,0,0,218,8,95,95,102,105,108,
-    101,95,95,114,44,0,0,0,41,5,114,95,0,0,0,218,
-    6,108,111,97,100,101,114,114,94,0,0,0,114,17,0,0,
-    0,218,8,102,105,108,101,110,97,109,101,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,218,12,95,109,111,100,
-    117,108,101,95,114,101,112,114,13,1,0,0,115,46,0,0,
-    0,0,2,12,1,10,4,2,1,12,1,14,1,6,1,2,
-    1,10,1,14,1,6,2,8,1,8,4,2,1,10,1,14,
-    1,10,1,2,1,10,1,14,1,8,1,14,2,22,2,114,
-    110,0,0,0,99,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,4,0,0,0,64,0,0,0,115,114,0,
-    0,0,101,0,90,1,100,0,90,2,100,1,90,3,100,2,
-    100,2,100,2,100,3,156,3,100,4,100,5,132,2,90,4,
-    100,6,100,7,132,0,90,5,100,8,100,9,132,0,90,6,
-    101,7,100,10,100,11,132,0,131,1,90,8,101,8,106,9,
-    100,12,100,11,132,0,131,1,90,8,101,7,100,13,100,14,
-    132,0,131,1,90,10,101,7,100,15,100,16,132,0,131,1,
-    90,11,101,11,106,9,100,17,100,16,132,0,131,1,90,11,
-    100,2,83,0,41,18,218,10,77,111,100,117,108,101,83,112,
-    101,99,97,208,5,0,0,84,104,101,32,115,112,101,99,105,
-    102,105,99,97,116,105,111,110,32,102,111,114,32,97,32,109,
-    111,100,117,108,101,44,32,117,115,101,100,32,102,111,114,32,
-    108,111,97,100,105,110,103,46,10,10,32,32,32,32,65,32,
-    109,111,100,117,108,101,39,115,32,115,112,101,99,32,105,115,
-    32,116,104,101,32,115,111,117,114,99,101,32,102,111,114,32,
-    105,110,102,111,114,109,97,116,105,111,110,32,97,98,111,117,
-    116,32,116,104,101,32,109,111,100,117,108,101,46,32,32,70,
-    111,114,10,32,32,32,32,100,97,116,97,32,97,115,115,111,
-    99,105,97,116,101,100,32,119,105,116,104,32,116,104,101,32,
-    109,111,100,117,108,101,44,32,105,110,99,108,117,100,105,110,
-    103,32,115,111,117,114,99,101,44,32,117,115,101,32,116,104,
-    101,32,115,112,101,99,39,115,10,32,32,32,32,108,111,97,
-    100,101,114,46,10,10,32,32,32,32,96,110,97,109,101,96,
-    32,105,115,32,116,104,101,32,97,98,115,111,108,117,116,101,
-    32,110,97,109,101,32,111,102,32,116,104,101,32,109,111,100,
-    117,108,101,46,32,32,96,108,111,97,100,101,114,96,32,105,
-    115,32,116,104,101,32,108,111,97,100,101,114,10,32,32,32,
-    32,116,111,32,117,115,101,32,119,104,101,110,32,108,111,97,
-    100,105,110,103,32,116,104,101,32,109,111,100,117,108,101,46,
-    32,32,96,112,97,114,101,110,116,96,32,105,115,32,116,104,
-    101,32,110,97,109,101,32,111,102,32,116,104,101,10,32,32,
-    32,32,112,97,99,107,97,103,101,32,116,104,101,32,109,111,
-    100,117,108,101,32,105,115,32,105,110,46,32,32,84,104,101,
-    32,112,97,114,101,110,116,32,105,115,32,100,101,114,105,118,
-    101,100,32,102,114,111,109,32,116,104,101,32,110,97,109,101,
-    46,10,10,32,32,32,32,96,105,115,95,112,97,99,107,97,
-    103,101,96,32,100,101,116,101,114,109,105,110,101,115,32,105,
-    102,32,116,104,101,32,109,111,100,117,108,101,32,105,115,32,
-    99,111,110,115,105,100,101,114,101,100,32,97,32,112,97,99,
-    107,97,103,101,32,111,114,10,32,32,32,32,110,111,116,46,
-    32,32,79,110,32,109,111,100,117,108,101,115,32,116,104,105,
-    115,32,105,115,32,114,101,102,108,101,99,116,101,100,32,98,
-    121,32,116,104,101,32,96,95,95,112,97,116,104,95,95,96,
-    32,97,116,116,114,105,98,117,116,101,46,10,10,32,32,32,
-    32,96,111,114,105,103,105,110,96,32,105,115,32,116,104,101,
-    32,115,112,101,99,105,102,105,99,32,108,111,99,97,116,105,
-    111,110,32,117,115,101,100,32,98,121,32,116,104,101,32,108,
-    111,97,100,101,114,32,102,114,111,109,32,119,104,105,99,104,
-    32,116,111,10,32,32,32,32,108,111,97,100,32,116,104,101,
-    32,109,111,100,117,108,101,44,32,105,102,32,116,104,97,116,
-    32,105,110,102,111,114,109,97,116,105,111,110,32,105,115,32,
-    97,118,97,105,108,97,98,108,101,46,32,32,87,104,101,110,
-    32,102,105,108,101,110,97,109,101,32,105,115,10,32,32,32,
-    32,115,101,116,44,32,111,114,105,103,105,110,32,119,105,108,
-    108,32,109,97,116,99,104,46,10,10,32,32,32,32,96,104,
-    97,115,95,108,111,99,97,116,105,111,110,96,32,105,110,100,
-    105,99,97,116,101,115,32,116,104,97,116,32,97,32,115,112,
-    101,99,39,115,32,34,111,114,105,103,105,110,34,32,114,101,
-    102,108,101,99,116,115,32,97,32,108,111,99,97,116,105,111,
-    110,46,10,32,32,32,32,87,104,101,110,32,116,104,105,115,
-    32,105,115,32,84,114,117,101,44,32,96,95,95,102,105,108,
-    101,95,95,96,32,97,116,116,114,105,98,117,116,101,32,111,
-    102,32,116,104,101,32,109,111,100,117,108,101,32,105,115,32,
-    115,101,116,46,10,10,32,32,32,32,96,99,97,99,104,101,
-    100,96,32,105,115,32,116,104,101,32,108,111,99,97,116,105,
-    111,110,32,111,102,32,116,104,101,32,99,97,99,104,101,100,
-    32,98,121,116,101,99,111,100,101,32,102,105,108,101,44,32,
-    105,102,32,97,110,121,46,32,32,73,116,10,32,32,32,32,
-    99,111,114,114,101,115,112,111,110,100,115,32,116,111,32,116,
-    104,101,32,96,95,95,99,97,99,104,101,100,95,95,96,32,
-    97,116,116,114,105,98,117,116,101,46,10,10,32,32,32,32,
-    96,115,117,98,109,111,100,117,108,101,95,115,101,97,114,99,
-    104,95,108,111,99,97,116,105,111,110,115,96,32,105,115,32,
-    116,104,101,32,115,101,113,117,101,110,99,101,32,111,102,32,
-    112,97,116,104,32,101,110,116,114,105,101,115,32,116,111,10,
-    32,32,32,32,115,101,97,114,99,104,32,119,104,101,110,32,
-    105,109,112,111,114,116,105,110,103,32,115,117,98,109,111,100,
-    117,108,101,115,46,32,32,73,102,32,115,101,116,44,32,105,
-    115,95,112,97,99,107,97,103,101,32,115,104,111,117,108,100,
-    32,98,101,10,32,32,32,32,84,114,117,101,45,45,97,110,
-    100,32,70,97,108,115,101,32,111,116,104,101,114,119,105,115,
-    101,46,10,10,32,32,32,32,80,97,99,107,97,103,101,115,
-    32,97,114,101,32,115,105,109,112,108,121,32,109,111,100,117,
-    108,101,115,32,116,104,97,116,32,40,109,97,121,41,32,104,
-    97,118,101,32,115,117,98,109,111,100,117,108,101,115,46,32,
-    32,73,102,32,97,32,115,112,101,99,10,32,32,32,32,104,
-    97,115,32,97,32,110,111,110,45,78,111,110,101,32,118,97,
-    108,117,101,32,105,110,32,96,115,117,98,109,111,100,117,108,
-    101,95,115,101,97,114,99,104,95,108,111,99,97,116,105,111,
-    110,115,96,44,32,116,104,101,32,105,109,112,111,114,116,10,
-    32,32,32,32,115,121,115,116,101,109,32,119,105,108,108,32,
-    99,111,110,115,105,100,101,114,32,109,111,100,117,108,101,115,
-    32,108,111,97,100,101,100,32,102,114,111,109,32,116,104,101,
-    32,115,112,101,99,32,97,115,32,112,97,99,107,97,103,101,
-    115,46,10,10,32,32,32,32,79,110,108,121,32,102,105,110,
-    100,101,114,115,32,40,115,101,101,32,105,109,112,111,114,116,
-    108,105,98,46,97,98,99,46,77,101,116,97,80,97,116,104,
-    70,105,110,100,101,114,32,97,110,100,10,32,32,32,32,105,
-    109,112,111,114,116,108,105,98,46,97,98,99,46,80,97,116,
-    104,69,110,116,114,121,70,105,110,100,101,114,41,32,115,104,
-    111,117,108,100,32,109,111,100,105,102,121,32,77,111,100,117,
-    108,101,83,112,101,99,32,105,110,115,116,97,110,99,101,115,
-    46,10,10,32,32,32,32,78,41,3,218,6,111,114,105,103,
-    105,110,218,12,108,111,97,100,101,114,95,115,116,97,116,101,
-    218,10,105,115,95,112,97,99,107,97,103,101,99,3,0,0,
-    0,0,0,0,0,3,0,0,0,6,0,0,0,2,0,0,
-    0,67,0,0,0,115,54,0,0,0,124,1,124,0,95,0,
-    124,2,124,0,95,1,124,3,124,0,95,2,124,4,124,0,
-    95,3,124,5,114,32,103,0,110,2,100,0,124,0,95,4,
-    100,1,124,0,95,5,100,0,124,0,95,6,100,0,83,0,
-    41,2,78,70,41,7,114,17,0,0,0,114,108,0,0,0,
-    114,112,0,0,0,114,113,0,0,0,218,26,115,117,98,109,
-    111,100,117,108,101,95,115,101,97,114,99,104,95,108,111,99,
-    97,116,105,111,110,115,218,13,95,115,101,116,95,102,105,108,
-    101,97,116,116,114,218,7,95,99,97,99,104,101,100,41,6,
-    114,30,0,0,0,114,17,0,0,0,114,108,0,0,0,114,
-    112,0,0,0,114,113,0,0,0,114,114,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,31,0,
-    0,0,86,1,0,0,115,14,0,0,0,0,2,6,1,6,
-    1,6,1,6,1,14,3,6,1,122,19,77,111,100,117,108,
-    101,83,112,101,99,46,95,95,105,110,105,116,95,95,99,1,
-    0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,6,
-    0,0,0,67,0,0,0,115,102,0,0,0,100,1,160,0,
-    124,0,106,1,161,1,100,2,160,0,124,0,106,2,161,1,
-    103,2,125,1,124,0,106,3,100,0,107,9,114,52,124,1,
-    160,4,100,3,160,0,124,0,106,3,161,1,161,1,1,0,
-    124,0,106,5,100,0,107,9,114,80,124,1,160,4,100,4,
-    160,0,124,0,106,5,161,1,161,1,1,0,100,5,160,0,
-    124,0,106,6,106,7,100,6,160,8,124,1,161,1,161,2,
-    83,0,41,7,78,122,9,110,97,109,101,61,123,33,114,125,
-    122,11,108,111,97,100,101,114,61,123,33,114,125,122,11,111,
-    114,105,103,105,110,61,123,33,114,125,122,29,115,117,98,109,
-    111,100,117,108,101,95,115,101,97,114,99,104,95,108,111,99,
-    97,116,105,111,110,115,61,123,125,122,6,123,125,40,123,125,
-    41,122,2,44,32,41,9,114,44,0,0,0,114,17,0,0,
-    0,114,108,0,0,0,114,112,0,0,0,218,6,97,112,112,
-    101,110,100,114,115,0,0,0,218,9,95,95,99,108,97,115,
-    115,95,95,114,1,0,0,0,218,4,106,111,105,110,41,2,
-    114,30,0,0,0,114,54,0,0,0,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,114,47,0,0,0,98,1,
-    0,0,115,20,0,0,0,0,1,10,1,10,255,4,2,10,
-    1,18,1,10,1,8,1,4,255,6,2,122,19,77,111,100,
-    117,108,101,83,112,101,99,46,95,95,114,101,112,114,95,95,
-    99,2,0,0,0,0,0,0,0,0,0,0,0,3,0,0,
-    0,8,0,0,0,67,0,0,0,115,108,0,0,0,124,0,
-    106,0,125,2,122,72,124,0,106,1,124,1,106,1,107,2,
-    111,76,124,0,106,2,124,1,106,2,107,2,111,76,124,0,
-    106,3,124,1,106,3,107,2,111,76,124,2,124,1,106,0,
-    107,2,111,76,124,0,106,4,124,1,106,4,107,2,111,76,
-    124,0,106,5,124,1,106,5,107,2,87,0,83,0,4,0,
-    116,6,107,10,114,102,1,0,1,0,1,0,116,7,6,0,
-    89,0,83,0,88,0,100,0,83,0,114,13,0,0,0,41,
-    8,114,115,0,0,0,114,17,0,0,0,114,108,0,0,0,
-    114,112,0,0,0,218,6,99,97,99,104,101,100,218,12,104,
-    97,115,95,108,111,99,97,116,105,111,110,114,105,0,0,0,
-    218,14,78,111,116,73,109,112,108,101,109,101,110,116,101,100,
-    41,3,114,30,0,0,0,90,5,111,116,104,101,114,90,4,
-    115,109,115,108,114,10,0,0,0,114,10,0,0,0,114,11,
-    0,0,0,218,6,95,95,101,113,95,95,108,1,0,0,115,
-    30,0,0,0,0,1,6,1,2,1,12,1,10,255,2,2,
-    10,254,2,3,8,253,2,4,10,252,2,5,10,251,4,6,
-    14,1,122,17,77,111,100,117,108,101,83,112,101,99,46,95,
-    95,101,113,95,95,99,1,0,0,0,0,0,0,0,0,0,
-    0,0,1,0,0,0,3,0,0,0,67,0,0,0,115,58,
-    0,0,0,124,0,106,0,100,0,107,8,114,52,124,0,106,
-    1,100,0,107,9,114,52,124,0,106,2,114,52,116,3,100,
-    0,107,8,114,38,116,4,130,1,116,3,160,5,124,0,106,
-    1,161,1,124,0,95,0,124,0,106,0,83,0,114,13,0,
-    0,0,41,6,114,117,0,0,0,114,112,0,0,0,114,116,
-    0,0,0,218,19,95,98,111,111,116,115,116,114,97,112,95,
-    101,120,116,101,114,110,97,108,218,19,78,111,116,73,109,112,
-    108,101,109,101,110,116,101,100,69,114,114,111,114,90,11,95,
-    103,101,116,95,99,97,99,104,101,100,114,46,0,0,0,114,
-    10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,121,
-    0,0,0,120,1,0,0,115,12,0,0,0,0,2,10,1,
-    16,1,8,1,4,1,14,1,122,17,77,111,100,117,108,101,
-    83,112,101,99,46,99,97,99,104,101,100,99,2,0,0,0,
-    0,0,0,0,0,0,0,0,2,0,0,0,2,0,0,0,
-    67,0,0,0,115,10,0,0,0,124,1,124,0,95,0,100,
-    0,83,0,114,13,0,0,0,41,1,114,117,0,0,0,41,
-    2,114,30,0,0,0,114,121,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,114,121,0,0,0,129,
-    1,0,0,115,2,0,0,0,0,2,99,1,0,0,0,0,
-    0,0,0,0,0,0,0,1,0,0,0,3,0,0,0,67,
-    0,0,0,115,36,0,0,0,124,0,106,0,100,1,107,8,
-    114,26,124,0,106,1,160,2,100,2,161,1,100,3,25,0,
-    83,0,124,0,106,1,83,0,100,1,83,0,41,4,122,32,
-    84,104,101,32,110,97,109,101,32,111,102,32,116,104,101,32,
-    109,111,100,117,108,101,39,115,32,112,97,114,101,110,116,46,
-    78,218,1,46,114,22,0,0,0,41,3,114,115,0,0,0,
-    114,17,0,0,0,218,10,114,112,97,114,116,105,116,105,111,
-    110,114,46,0,0,0,114,10,0,0,0,114,10,0,0,0,
-    114,11,0,0,0,218,6,112,97,114,101,110,116,133,1,0,
-    0,115,6,0,0,0,0,3,10,1,16,2,122,17,77,111,
-    100,117,108,101,83,112,101,99,46,112,97,114,101,110,116,99,
-    1,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,
-    1,0,0,0,67,0,0,0,115,6,0,0,0,124,0,106,
-    0,83,0,114,13,0,0,0,41,1,114,116,0,0,0,114,
-    46,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
-    0,0,0,114,122,0,0,0,141,1,0,0,115,2,0,0,
-    0,0,2,122,23,77,111,100,117,108,101,83,112,101,99,46,
-    104,97,115,95,108,111,99,97,116,105,111,110,99,2,0,0,
-    0,0,0,0,0,0,0,0,0,2,0,0,0,2,0,0,
-    0,67,0,0,0,115,14,0,0,0,116,0,124,1,131,1,
-    124,0,95,1,100,0,83,0,114,13,0,0,0,41,2,218,
-    4,98,111,111,108,114,116,0,0,0,41,2,114,30,0,0,
-    0,218,5,118,97,108,117,101,114,10,0,0,0,114,10,0,
-    0,0,114,11,0,0,0,114,122,0,0,0,145,1,0,0,
-    115,2,0,0,0,0,2,41,12,114,1,0,0,0,114,0,
-    0,0,0,114,2,0,0,0,114,3,0,0,0,114,31,0,
-    0,0,114,47,0,0,0,114,124,0,0,0,218,8,112,114,
-    111,112,101,114,116,121,114,121,0,0,0,218,6,115,101,116,
-    116,101,114,114,129,0,0,0,114,122,0,0,0,114,10,0,
-    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,114,111,0,0,0,49,1,0,0,115,32,0,0,0,8,
-    1,4,36,4,1,2,255,12,12,8,10,8,12,2,1,10,
-    8,4,1,10,3,2,1,10,7,2,1,10,3,4,1,114,
-    111,0,0,0,169,2,114,112,0,0,0,114,114,0,0,0,
-    99,2,0,0,0,0,0,0,0,2,0,0,0,6,0,0,
-    0,8,0,0,0,67,0,0,0,115,154,0,0,0,116,0,
-    124,1,100,1,131,2,114,74,116,1,100,2,107,8,114,22,
-    116,2,130,1,116,1,106,3,125,4,124,3,100,2,107,8,
-    114,48,124,4,124,0,124,1,100,3,141,2,83,0,124,3,
-    114,56,103,0,110,2,100,2,125,5,124,4,124,0,124,1,
-    124,5,100,4,141,3,83,0,124,3,100,2,107,8,114,138,
-    116,0,124,1,100,5,131,2,114,134,122,14,124,1,160,4,
-    124,0,161,1,125,3,87,0,113,138,4,0,116,5,107,10,
-    114,130,1,0,1,0,1,0,100,2,125,3,89,0,113,138,
-    88,0,110,4,100,6,125,3,116,6,124,0,124,1,124,2,
-    124,3,100,7,141,4,83,0,41,8,122,53,82,101,116,117,
-    114,110,32,97,32,109,111,100,117,108,101,32,115,112,101,99,
-    32,98,97,115,101,100,32,111,110,32,118,97,114,105,111,117,
-    115,32,108,111,97,100,101,114,32,109,101,116,104,111,100,115,
-    46,90,12,103,101,116,95,102,105,108,101,110,97,109,101,78,
-    41,1,114,108,0,0,0,41,2,114,108,0,0,0,114,115,
-    0,0,0,114,114,0,0,0,70,114,134,0,0,0,41,7,
-    114,4,0,0,0,114,125,0,0,0,114,126,0,0,0,218,
-    23,115,112,101,99,95,102,114,111,109,95,102,105,108,101,95,
-    108,111,99,97,116,105,111,110,114,114,0,0,0,114,78,0,
-    0,0,114,111,0,0,0,41,6,114,17,0,0,0,114,108,
-    0,0,0,114,112,0,0,0,114,114,0,0,0,114,135,0,
-    0,0,90,6,115,101,97,114,99,104,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,114,90,0,0,0,150,1,
-    0,0,115,36,0,0,0,0,2,10,1,8,1,4,1,6,
-    2,8,1,12,1,12,1,6,1,2,255,6,3,8,1,10,
-    1,2,1,14,1,14,1,12,3,4,2,114,90,0,0,0,
-    99,3,0,0,0,0,0,0,0,0,0,0,0,8,0,0,
-    0,8,0,0,0,67,0,0,0,115,56,1,0,0,122,10,
-    124,0,106,0,125,3,87,0,110,20,4,0,116,1,107,10,
-    114,30,1,0,1,0,1,0,89,0,110,14,88,0,124,3,
-    100,0,107,9,114,44,124,3,83,0,124,0,106,2,125,4,
-    124,1,100,0,107,8,114,90,122,10,124,0,106,3,125,1,
-    87,0,110,20,4,0,116,1,107,10,114,88,1,0,1,0,
-    1,0,89,0,110,2,88,0,122,10,124,0,106,4,125,5,
-    87,0,110,24,4,0,116,1,107,10,114,124,1,0,1,0,
-    1,0,100,0,125,5,89,0,110,2,88,0,124,2,100,0,
-    107,8,114,184,124,5,100,0,107,8,114,180,122,10,124,1,
-    106,5,125,2,87,0,113,184,4,0,116,1,107,10,114,176,
-    1,0,1,0,1,0,100,0,125,2,89,0,113,184,88,0,
-    110,4,124,5,125,2,122,10,124,0,106,6,125,6,87,0,
-    110,24,4,0,116,1,107,10,114,218,1,0,1,0,1,0,
-    100,0,125,6,89,0,110,2,88,0,122,14,116,7,124,0,
-    106,8,131,1,125,7,87,0,110,26,4,0,116,1,107,10,
-    144,1,114,4,1,0,1,0,1,0,100,0,125,7,89,0,
-    110,2,88,0,116,9,124,4,124,1,124,2,100,1,141,3,
-    125,3,124,5,100,0,107,8,144,1,114,34,100,2,110,2,
-    100,3,124,3,95,10,124,6,124,3,95,11,124,7,124,3,
-    95,12,124,3,83,0,41,4,78,169,1,114,112,0,0,0,
-    70,84,41,13,114,104,0,0,0,114,105,0,0,0,114,1,
-    0,0,0,114,97,0,0,0,114,107,0,0,0,218,7,95,
-    79,82,73,71,73,78,218,10,95,95,99,97,99,104,101,100,
-    95,95,218,4,108,105,115,116,218,8,95,95,112,97,116,104,
-    95,95,114,111,0,0,0,114,116,0,0,0,114,121,0,0,
-    0,114,115,0,0,0,41,8,114,95,0,0,0,114,108,0,
-    0,0,114,112,0,0,0,114,94,0,0,0,114,17,0,0,
-    0,90,8,108,111,99,97,116,105,111,110,114,121,0,0,0,
-    114,115,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
-    11,0,0,0,218,17,95,115,112,101,99,95,102,114,111,109,
-    95,109,111,100,117,108,101,176,1,0,0,115,72,0,0,0,
-    0,2,2,1,10,1,14,1,6,2,8,1,4,2,6,1,
-    8,1,2,1,10,1,14,2,6,1,2,1,10,1,14,1,
-    10,1,8,1,8,1,2,1,10,1,14,1,12,2,4,1,
-    2,1,10,1,14,1,10,1,2,1,14,1,16,1,10,2,
-    14,1,20,1,6,1,6,1,114,141,0,0,0,70,169,1,
-    218,8,111,118,101,114,114,105,100,101,99,2,0,0,0,0,
-    0,0,0,1,0,0,0,5,0,0,0,8,0,0,0,67,
-    0,0,0,115,226,1,0,0,124,2,115,20,116,0,124,1,
-    100,1,100,0,131,3,100,0,107,8,114,54,122,12,124,0,
-    106,1,124,1,95,2,87,0,110,20,4,0,116,3,107,10,
-    114,52,1,0,1,0,1,0,89,0,110,2,88,0,124,2,
-    115,74,116,0,124,1,100,2,100,0,131,3,100,0,107,8,
-    114,178,124,0,106,4,125,3,124,3,100,0,107,8,114,146,
-    124,0,106,5,100,0,107,9,114,146,116,6,100,0,107,8,
-    114,110,116,7,130,1,116,6,106,8,125,4,124,4,160,9,
-    124,4,161,1,125,3,124,0,106,5,124,3,95,10,124,3,
-    124,0,95,4,100,0,124,1,95,11,122,10,124,3,124,1,
-    95,12,87,0,110,20,4,0,116,3,107,10,114,176,1,0,
-    1,0,1,0,89,0,110,2,88,0,124,2,115,198,116,0,
-    124,1,100,3,100,0,131,3,100,0,107,8,114,232,122,12,
-    124,0,106,13,124,1,95,14,87,0,110,20,4,0,116,3,
-    107,10,114,230,1,0,1,0,1,0,89,0,110,2,88,0,
-    122,10,124,0,124,1,95,15,87,0,110,22,4,0,116,3,
-    107,10,144,1,114,8,1,0,1,0,1,0,89,0,110,2,
-    88,0,124,2,144,1,115,34,116,0,124,1,100,4,100,0,
-    131,3,100,0,107,8,144,1,114,82,124,0,106,5,100,0,
-    107,9,144,1,114,82,122,12,124,0,106,5,124,1,95,16,
-    87,0,110,22,4,0,116,3,107,10,144,1,114,80,1,0,
-    1,0,1,0,89,0,110,2,88,0,124,0,106,17,144,1,
-    114,222,124,2,144,1,115,114,116,0,124,1,100,5,100,0,
-    131,3,100,0,107,8,144,1,114,150,122,12,124,0,106,18,
-    124,1,95,11,87,0,110,22,4,0,116,3,107,10,144,1,
-    114,148,1,0,1,0,1,0,89,0,110,2,88,0,124,2,
-    144,1,115,174,116,0,124,1,100,6,100,0,131,3,100,0,
-    107,8,144,1,114,222,124,0,106,19,100,0,107,9,144,1,
-    114,222,122,12,124,0,106,19,124,1,95,20,87,0,110,22,
-    4,0,116,3,107,10,144,1,114,220,1,0,1,0,1,0,
-    89,0,110,2,88,0,124,1,83,0,41,7,78,114,1,0,
-    0,0,114,97,0,0,0,218,11,95,95,112,97,99,107,97,
-    103,101,95,95,114,140,0,0,0,114,107,0,0,0,114,138,
-    0,0,0,41,21,114,6,0,0,0,114,17,0,0,0,114,
-    1,0,0,0,114,105,0,0,0,114,108,0,0,0,114,115,
-    0,0,0,114,125,0,0,0,114,126,0,0,0,218,16,95,
-    78,97,109,101,115,112,97,99,101,76,111,97,100,101,114,218,
-    7,95,95,110,101,119,95,95,90,5,95,112,97,116,104,114,
-    107,0,0,0,114,97,0,0,0,114,129,0,0,0,114,144,
-    0,0,0,114,104,0,0,0,114,140,0,0,0,114,122,0,
-    0,0,114,112,0,0,0,114,121,0,0,0,114,138,0,0,
-    0,41,5,114,94,0,0,0,114,95,0,0,0,114,143,0,
-    0,0,114,108,0,0,0,114,145,0,0,0,114,10,0,0,
-    0,114,10,0,0,0,114,11,0,0,0,218,18,95,105,110,
-    105,116,95,109,111,100,117,108,101,95,97,116,116,114,115,221,
-    1,0,0,115,96,0,0,0,0,4,20,1,2,1,12,1,
-    14,1,6,2,20,1,6,1,8,2,10,1,8,1,4,1,
-    6,2,10,1,8,1,6,11,6,1,2,1,10,1,14,1,
-    6,2,20,1,2,1,12,1,14,1,6,2,2,1,10,1,
-    16,1,6,2,24,1,12,1,2,1,12,1,16,1,6,2,
-    8,1,24,1,2,1,12,1,16,1,6,2,24,1,12,1,
-    2,1,12,1,16,1,6,1,114,147,0,0,0,99,1,0,
+    32,109,111,100,117,108,101,32,105,115,32,98,117,105,108,116,
+    45,105,110,46,99,2,0,0,0,0,0,0,0,0,0,0,
+    0,2,0,0,0,4,0,0,0,19,0,0,0,115,38,0,
+    0,0,124,1,116,0,106,1,107,7,114,28,116,2,100,1,
+    160,3,124,1,161,1,124,1,100,2,141,2,130,1,136,0,
+    124,0,124,1,131,2,83,0,41,3,78,250,29,123,33,114,
+    125,32,105,115,32,110,111,116,32,97,32,98,117,105,108,116,
+    45,105,110,32,109,111,100,117,108,101,114,16,0,0,0,41,
+    4,114,15,0,0,0,218,20,98,117,105,108,116,105,110,95,
+    109,111,100,117,108,101,95,110,97,109,101,115,218,11,73,109,
+    112,111,114,116,69,114,114,111,114,114,44,0,0,0,169,2,
+    114,30,0,0,0,218,8,102,117,108,108,110,97,109,101,169,
+    1,218,3,102,120,110,114,10,0,0,0,114,11,0,0,0,
+    218,25,95,114,101,113,117,105,114,101,115,95,98,117,105,108,
+    116,105,110,95,119,114,97,112,112,101,114,232,0,0,0,115,
+    10,0,0,0,0,1,10,1,10,1,2,255,6,2,122,52,
+    95,114,101,113,117,105,114,101,115,95,98,117,105,108,116,105,
+    110,46,60,108,111,99,97,108,115,62,46,95,114,101,113,117,
+    105,114,101,115,95,98,117,105,108,116,105,110,95,119,114,97,
+    112,112,101,114,169,1,114,12,0,0,0,41,2,114,82,0,
+    0,0,114,83,0,0,0,114,10,0,0,0,114,81,0,0,
+    0,114,11,0,0,0,218,17,95,114,101,113,117,105,114,101,
+    115,95,98,117,105,108,116,105,110,230,0,0,0,115,6,0,
+    0,0,0,2,12,5,10,1,114,85,0,0,0,99,1,0,
     0,0,0,0,0,0,0,0,0,0,2,0,0,0,3,0,
-    0,0,67,0,0,0,115,82,0,0,0,100,1,125,1,116,
-    0,124,0,106,1,100,2,131,2,114,30,124,0,106,1,160,
-    2,124,0,161,1,125,1,110,20,116,0,124,0,106,1,100,
-    3,131,2,114,50,116,3,100,4,131,1,130,1,124,1,100,
-    1,107,8,114,68,116,4,124,0,106,5,131,1,125,1,116,
-    6,124,0,124,1,131,2,1,0,124,1,83,0,41,5,122,
-    43,67,114,101,97,116,101,32,97,32,109,111,100,117,108,101,
-    32,98,97,115,101,100,32,111,110,32,116,104,101,32,112,114,
-    111,118,105,100,101,100,32,115,112,101,99,46,78,218,13,99,
-    114,101,97,116,101,95,109,111,100,117,108,101,218,11,101,120,
-    101,99,95,109,111,100,117,108,101,122,66,108,111,97,100,101,
-    114,115,32,116,104,97,116,32,100,101,102,105,110,101,32,101,
-    120,101,99,95,109,111,100,117,108,101,40,41,32,109,117,115,
-    116,32,97,108,115,111,32,100,101,102,105,110,101,32,99,114,
-    101,97,116,101,95,109,111,100,117,108,101,40,41,41,7,114,
-    4,0,0,0,114,108,0,0,0,114,148,0,0,0,114,78,
-    0,0,0,114,18,0,0,0,114,17,0,0,0,114,147,0,
-    0,0,169,2,114,94,0,0,0,114,95,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,218,16,109,
-    111,100,117,108,101,95,102,114,111,109,95,115,112,101,99,37,
-    2,0,0,115,18,0,0,0,0,3,4,1,12,3,14,1,
-    12,1,8,2,8,1,10,1,10,1,114,151,0,0,0,99,
-    1,0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,
-    4,0,0,0,67,0,0,0,115,106,0,0,0,124,0,106,
-    0,100,1,107,8,114,14,100,2,110,4,124,0,106,0,125,
-    1,124,0,106,1,100,1,107,8,114,66,124,0,106,2,100,
-    1,107,8,114,50,100,3,160,3,124,1,161,1,83,0,100,
-    4,160,3,124,1,124,0,106,2,161,2,83,0,110,36,124,
-    0,106,4,114,86,100,5,160,3,124,1,124,0,106,1,161,
-    2,83,0,100,6,160,3,124,0,106,0,124,0,106,1,161,
-    2,83,0,100,1,83,0,41,7,122,38,82,101,116,117,114,
-    110,32,116,104,101,32,114,101,112,114,32,116,111,32,117,115,
-    101,32,102,111,114,32,116,104,101,32,109,111,100,117,108,101,
-    46,78,114,99,0,0,0,114,100,0,0,0,114,101,0,0,
-    0,114,102,0,0,0,250,18,60,109,111,100,117,108,101,32,
-    123,33,114,125,32,40,123,125,41,62,41,5,114,17,0,0,
-    0,114,112,0,0,0,114,108,0,0,0,114,44,0,0,0,
-    114,122,0,0,0,41,2,114,94,0,0,0,114,17,0,0,
-    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
-    114,106,0,0,0,54,2,0,0,115,16,0,0,0,0,3,
-    20,1,10,1,10,1,10,2,16,2,6,1,14,2,114,106,
-    0,0,0,99,2,0,0,0,0,0,0,0,0,0,0,0,
-    4,0,0,0,10,0,0,0,67,0,0,0,115,204,0,0,
-    0,124,0,106,0,125,2,116,1,124,2,131,1,143,180,1,
-    0,116,2,106,3,160,4,124,2,161,1,124,1,107,9,114,
-    54,100,1,160,5,124,2,161,1,125,3,116,6,124,3,124,
-    2,100,2,141,2,130,1,122,106,124,0,106,8,100,3,107,
-    8,114,106,124,0,106,9,100,3,107,8,114,90,116,6,100,
-    4,124,0,106,0,100,2,141,2,130,1,116,10,124,0,124,
-    1,100,5,100,6,141,3,1,0,110,52,116,10,124,0,124,
-    1,100,5,100,6,141,3,1,0,116,11,124,0,106,8,100,
-    7,131,2,115,146,124,0,106,8,160,12,124,2,161,1,1,
-    0,110,12,124,0,106,8,160,13,124,1,161,1,1,0,87,
-    0,53,0,116,2,106,3,160,7,124,0,106,0,161,1,125,
-    1,124,1,116,2,106,3,124,0,106,0,60,0,88,0,87,
-    0,53,0,81,0,82,0,88,0,124,1,83,0,41,8,122,
-    70,69,120,101,99,117,116,101,32,116,104,101,32,115,112,101,
-    99,39,115,32,115,112,101,99,105,102,105,101,100,32,109,111,
-    100,117,108,101,32,105,110,32,97,110,32,101,120,105,115,116,
-    105,110,103,32,109,111,100,117,108,101,39,115,32,110,97,109,
-    101,115,112,97,99,101,46,122,30,109,111,100,117,108,101,32,
-    123,33,114,125,32,110,111,116,32,105,110,32,115,121,115,46,
-    109,111,100,117,108,101,115,114,16,0,0,0,78,250,14,109,
-    105,115,115,105,110,103,32,108,111,97,100,101,114,84,114,142,
-    0,0,0,114,149,0,0,0,41,14,114,17,0,0,0,114,
-    49,0,0,0,114,15,0,0,0,114,91,0,0,0,114,34,
-    0,0,0,114,44,0,0,0,114,78,0,0,0,218,3,112,
-    111,112,114,108,0,0,0,114,115,0,0,0,114,147,0,0,
-    0,114,4,0,0,0,218,11,108,111,97,100,95,109,111,100,
-    117,108,101,114,149,0,0,0,41,4,114,94,0,0,0,114,
-    95,0,0,0,114,17,0,0,0,218,3,109,115,103,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,92,0,
-    0,0,71,2,0,0,115,34,0,0,0,0,2,6,1,10,
-    1,16,1,10,1,12,1,2,1,10,1,10,1,14,2,16,
-    2,14,1,12,4,14,2,16,4,14,1,24,1,114,92,0,
-    0,0,99,1,0,0,0,0,0,0,0,0,0,0,0,2,
-    0,0,0,8,0,0,0,67,0,0,0,115,26,1,0,0,
-    122,18,124,0,106,0,160,1,124,0,106,2,161,1,1,0,
-    87,0,110,52,1,0,1,0,1,0,124,0,106,2,116,3,
-    106,4,107,6,114,64,116,3,106,4,160,5,124,0,106,2,
-    161,1,125,1,124,1,116,3,106,4,124,0,106,2,60,0,
-    130,0,89,0,110,2,88,0,116,3,106,4,160,5,124,0,
-    106,2,161,1,125,1,124,1,116,3,106,4,124,0,106,2,
-    60,0,116,6,124,1,100,1,100,0,131,3,100,0,107,8,
-    114,148,122,12,124,0,106,0,124,1,95,7,87,0,110,20,
-    4,0,116,8,107,10,114,146,1,0,1,0,1,0,89,0,
-    110,2,88,0,116,6,124,1,100,2,100,0,131,3,100,0,
-    107,8,114,226,122,40,124,1,106,9,124,1,95,10,116,11,
-    124,1,100,3,131,2,115,202,124,0,106,2,160,12,100,4,
-    161,1,100,5,25,0,124,1,95,10,87,0,110,20,4,0,
-    116,8,107,10,114,224,1,0,1,0,1,0,89,0,110,2,
-    88,0,116,6,124,1,100,6,100,0,131,3,100,0,107,8,
-    144,1,114,22,122,10,124,0,124,1,95,13,87,0,110,22,
-    4,0,116,8,107,10,144,1,114,20,1,0,1,0,1,0,
-    89,0,110,2,88,0,124,1,83,0,41,7,78,114,97,0,
-    0,0,114,144,0,0,0,114,140,0,0,0,114,127,0,0,
-    0,114,22,0,0,0,114,104,0,0,0,41,14,114,108,0,
-    0,0,114,155,0,0,0,114,17,0,0,0,114,15,0,0,
-    0,114,91,0,0,0,114,154,0,0,0,114,6,0,0,0,
-    114,97,0,0,0,114,105,0,0,0,114,1,0,0,0,114,
-    144,0,0,0,114,4,0,0,0,114,128,0,0,0,114,104,
-    0,0,0,114,150,0,0,0,114,10,0,0,0,114,10,0,
-    0,0,114,11,0,0,0,218,25,95,108,111,97,100,95,98,
-    97,99,107,119,97,114,100,95,99,111,109,112,97,116,105,98,
-    108,101,101,2,0,0,115,54,0,0,0,0,4,2,1,18,
-    1,6,1,12,1,14,1,12,1,8,3,14,1,12,1,16,
-    1,2,1,12,1,14,1,6,1,16,1,2,4,8,1,10,
-    1,22,1,14,1,6,1,18,1,2,1,10,1,16,1,6,
-    1,114,157,0,0,0,99,1,0,0,0,0,0,0,0,0,
-    0,0,0,2,0,0,0,11,0,0,0,67,0,0,0,115,
-    220,0,0,0,124,0,106,0,100,0,107,9,114,30,116,1,
-    124,0,106,0,100,1,131,2,115,30,116,2,124,0,131,1,
-    83,0,116,3,124,0,131,1,125,1,100,2,124,0,95,4,
-    122,162,124,1,116,5,106,6,124,0,106,7,60,0,122,52,
-    124,0,106,0,100,0,107,8,114,96,124,0,106,8,100,0,
-    107,8,114,108,116,9,100,4,124,0,106,7,100,5,141,2,
-    130,1,110,12,124,0,106,0,160,10,124,1,161,1,1,0,
-    87,0,110,50,1,0,1,0,1,0,122,14,116,5,106,6,
-    124,0,106,7,61,0,87,0,110,20,4,0,116,11,107,10,
-    114,152,1,0,1,0,1,0,89,0,110,2,88,0,130,0,
-    89,0,110,2,88,0,116,5,106,6,160,12,124,0,106,7,
-    161,1,125,1,124,1,116,5,106,6,124,0,106,7,60,0,
-    116,13,100,6,124,0,106,7,124,0,106,0,131,3,1,0,
-    87,0,53,0,100,3,124,0,95,4,88,0,124,1,83,0,
-    41,7,78,114,149,0,0,0,84,70,114,153,0,0,0,114,
-    16,0,0,0,122,18,105,109,112,111,114,116,32,123,33,114,
-    125,32,35,32,123,33,114,125,41,14,114,108,0,0,0,114,
-    4,0,0,0,114,157,0,0,0,114,151,0,0,0,90,13,
-    95,105,110,105,116,105,97,108,105,122,105,110,103,114,15,0,
-    0,0,114,91,0,0,0,114,17,0,0,0,114,115,0,0,
-    0,114,78,0,0,0,114,149,0,0,0,114,62,0,0,0,
-    114,154,0,0,0,114,75,0,0,0,114,150,0,0,0,114,
-    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,14,
-    95,108,111,97,100,95,117,110,108,111,99,107,101,100,138,2,
-    0,0,115,46,0,0,0,0,2,10,2,12,1,8,2,8,
-    5,6,1,2,1,12,1,2,1,10,1,10,1,16,3,16,
-    1,6,1,2,1,14,1,14,1,6,1,8,5,14,1,12,
-    1,20,2,8,2,114,158,0,0,0,99,1,0,0,0,0,
-    0,0,0,0,0,0,0,1,0,0,0,10,0,0,0,67,
-    0,0,0,115,42,0,0,0,116,0,124,0,106,1,131,1,
-    143,22,1,0,116,2,124,0,131,1,87,0,2,0,53,0,
-    81,0,82,0,163,0,83,0,81,0,82,0,88,0,100,1,
-    83,0,41,2,122,191,82,101,116,117,114,110,32,97,32,110,
-    101,119,32,109,111,100,117,108,101,32,111,98,106,101,99,116,
-    44,32,108,111,97,100,101,100,32,98,121,32,116,104,101,32,
-    115,112,101,99,39,115,32,108,111,97,100,101,114,46,10,10,
-    32,32,32,32,84,104,101,32,109,111,100,117,108,101,32,105,
-    115,32,110,111,116,32,97,100,100,101,100,32,116,111,32,105,
-    116,115,32,112,97,114,101,110,116,46,10,10,32,32,32,32,
-    73,102,32,97,32,109,111,100,117,108,101,32,105,115,32,97,
-    108,114,101,97,100,121,32,105,110,32,115,121,115,46,109,111,
-    100,117,108,101,115,44,32,116,104,97,116,32,101,120,105,115,
-    116,105,110,103,32,109,111,100,117,108,101,32,103,101,116,115,
-    10,32,32,32,32,99,108,111,98,98,101,114,101,100,46,10,
-    10,32,32,32,32,78,41,3,114,49,0,0,0,114,17,0,
-    0,0,114,158,0,0,0,41,1,114,94,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,93,0,
-    0,0,180,2,0,0,115,4,0,0,0,0,9,12,1,114,
-    93,0,0,0,99,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,4,0,0,0,64,0,0,0,115,136,0,
-    0,0,101,0,90,1,100,0,90,2,100,1,90,3,101,4,
-    100,2,100,3,132,0,131,1,90,5,101,6,100,19,100,5,
-    100,6,132,1,131,1,90,7,101,6,100,20,100,7,100,8,
-    132,1,131,1,90,8,101,6,100,9,100,10,132,0,131,1,
-    90,9,101,6,100,11,100,12,132,0,131,1,90,10,101,6,
-    101,11,100,13,100,14,132,0,131,1,131,1,90,12,101,6,
-    101,11,100,15,100,16,132,0,131,1,131,1,90,13,101,6,
-    101,11,100,17,100,18,132,0,131,1,131,1,90,14,101,6,
-    101,15,131,1,90,16,100,4,83,0,41,21,218,15,66,117,
-    105,108,116,105,110,73,109,112,111,114,116,101,114,122,144,77,
-    101,116,97,32,112,97,116,104,32,105,109,112,111,114,116,32,
-    102,111,114,32,98,117,105,108,116,45,105,110,32,109,111,100,
-    117,108,101,115,46,10,10,32,32,32,32,65,108,108,32,109,
-    101,116,104,111,100,115,32,97,114,101,32,101,105,116,104,101,
-    114,32,99,108,97,115,115,32,111,114,32,115,116,97,116,105,
-    99,32,109,101,116,104,111,100,115,32,116,111,32,97,118,111,
-    105,100,32,116,104,101,32,110,101,101,100,32,116,111,10,32,
-    32,32,32,105,110,115,116,97,110,116,105,97,116,101,32,116,
-    104,101,32,99,108,97,115,115,46,10,10,32,32,32,32,99,
-    1,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,
-    3,0,0,0,67,0,0,0,115,12,0,0,0,100,1,160,
-    0,124,0,106,1,161,1,83,0,41,2,250,115,82,101,116,
-    117,114,110,32,114,101,112,114,32,102,111,114,32,116,104,101,
-    32,109,111,100,117,108,101,46,10,10,32,32,32,32,32,32,
-    32,32,84,104,101,32,109,101,116,104,111,100,32,105,115,32,
-    100,101,112,114,101,99,97,116,101,100,46,32,32,84,104,101,
-    32,105,109,112,111,114,116,32,109,97,99,104,105,110,101,114,
-    121,32,100,111,101,115,32,116,104,101,32,106,111,98,32,105,
-    116,115,101,108,102,46,10,10,32,32,32,32,32,32,32,32,
-    122,24,60,109,111,100,117,108,101,32,123,33,114,125,32,40,
-    98,117,105,108,116,45,105,110,41,62,41,2,114,44,0,0,
-    0,114,1,0,0,0,41,1,114,95,0,0,0,114,10,0,
-    0,0,114,10,0,0,0,114,11,0,0,0,114,98,0,0,
-    0,204,2,0,0,115,2,0,0,0,0,7,122,27,66,117,
-    105,108,116,105,110,73,109,112,111,114,116,101,114,46,109,111,
-    100,117,108,101,95,114,101,112,114,78,99,4,0,0,0,0,
-    0,0,0,0,0,0,0,4,0,0,0,5,0,0,0,67,
-    0,0,0,115,44,0,0,0,124,2,100,0,107,9,114,12,
-    100,0,83,0,116,0,160,1,124,1,161,1,114,36,116,2,
-    124,1,124,0,100,1,100,2,141,3,83,0,100,0,83,0,
-    100,0,83,0,41,3,78,122,8,98,117,105,108,116,45,105,
-    110,114,136,0,0,0,41,3,114,56,0,0,0,90,10,105,
-    115,95,98,117,105,108,116,105,110,114,90,0,0,0,169,4,
-    218,3,99,108,115,114,80,0,0,0,218,4,112,97,116,104,
-    218,6,116,97,114,103,101,116,114,10,0,0,0,114,10,0,
-    0,0,114,11,0,0,0,218,9,102,105,110,100,95,115,112,
-    101,99,213,2,0,0,115,10,0,0,0,0,2,8,1,4,
-    1,10,1,14,2,122,25,66,117,105,108,116,105,110,73,109,
-    112,111,114,116,101,114,46,102,105,110,100,95,115,112,101,99,
-    99,3,0,0,0,0,0,0,0,0,0,0,0,4,0,0,
-    0,4,0,0,0,67,0,0,0,115,30,0,0,0,124,0,
-    160,0,124,1,124,2,161,2,125,3,124,3,100,1,107,9,
-    114,26,124,3,106,1,83,0,100,1,83,0,41,2,122,175,
-    70,105,110,100,32,116,104,101,32,98,117,105,108,116,45,105,
-    110,32,109,111,100,117,108,101,46,10,10,32,32,32,32,32,
-    32,32,32,73,102,32,39,112,97,116,104,39,32,105,115,32,
-    101,118,101,114,32,115,112,101,99,105,102,105,101,100,32,116,
-    104,101,110,32,116,104,101,32,115,101,97,114,99,104,32,105,
-    115,32,99,111,110,115,105,100,101,114,101,100,32,97,32,102,
-    97,105,108,117,114,101,46,10,10,32,32,32,32,32,32,32,
-    32,84,104,105,115,32,109,101,116,104,111,100,32,105,115,32,
-    100,101,112,114,101,99,97,116,101,100,46,32,32,85,115,101,
-    32,102,105,110,100,95,115,112,101,99,40,41,32,105,110,115,
-    116,101,97,100,46,10,10,32,32,32,32,32,32,32,32,78,
-    41,2,114,165,0,0,0,114,108,0,0,0,41,4,114,162,
-    0,0,0,114,80,0,0,0,114,163,0,0,0,114,94,0,
-    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,218,11,102,105,110,100,95,109,111,100,117,108,101,222,2,
-    0,0,115,4,0,0,0,0,9,12,1,122,27,66,117,105,
-    108,116,105,110,73,109,112,111,114,116,101,114,46,102,105,110,
-    100,95,109,111,100,117,108,101,99,2,0,0,0,0,0,0,
-    0,0,0,0,0,2,0,0,0,4,0,0,0,67,0,0,
-    0,115,46,0,0,0,124,1,106,0,116,1,106,2,107,7,
-    114,34,116,3,100,1,160,4,124,1,106,0,161,1,124,1,
-    106,0,100,2,141,2,130,1,116,5,116,6,106,7,124,1,
-    131,2,83,0,41,3,122,24,67,114,101,97,116,101,32,97,
-    32,98,117,105,108,116,45,105,110,32,109,111,100,117,108,101,
-    114,76,0,0,0,114,16,0,0,0,41,8,114,17,0,0,
-    0,114,15,0,0,0,114,77,0,0,0,114,78,0,0,0,
-    114,44,0,0,0,114,66,0,0,0,114,56,0,0,0,90,
-    14,99,114,101,97,116,101,95,98,117,105,108,116,105,110,41,
-    2,114,30,0,0,0,114,94,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,114,148,0,0,0,234,
-    2,0,0,115,10,0,0,0,0,3,12,1,12,1,4,255,
-    6,2,122,29,66,117,105,108,116,105,110,73,109,112,111,114,
-    116,101,114,46,99,114,101,97,116,101,95,109,111,100,117,108,
-    101,99,2,0,0,0,0,0,0,0,0,0,0,0,2,0,
-    0,0,3,0,0,0,67,0,0,0,115,16,0,0,0,116,
-    0,116,1,106,2,124,1,131,2,1,0,100,1,83,0,41,
-    2,122,22,69,120,101,99,32,97,32,98,117,105,108,116,45,
-    105,110,32,109,111,100,117,108,101,78,41,3,114,66,0,0,
-    0,114,56,0,0,0,90,12,101,120,101,99,95,98,117,105,
-    108,116,105,110,41,2,114,30,0,0,0,114,95,0,0,0,
+    0,0,3,0,0,0,115,26,0,0,0,135,0,102,1,100,
+    1,100,2,132,8,125,1,116,0,124,1,136,0,131,2,1,
+    0,124,1,83,0,41,3,122,47,68,101,99,111,114,97,116,
+    111,114,32,116,111,32,118,101,114,105,102,121,32,116,104,101,
+    32,110,97,109,101,100,32,109,111,100,117,108,101,32,105,115,
+    32,102,114,111,122,101,110,46,99,2,0,0,0,0,0,0,
+    0,0,0,0,0,2,0,0,0,4,0,0,0,19,0,0,
+    0,115,38,0,0,0,116,0,160,1,124,1,161,1,115,28,
+    116,2,100,1,160,3,124,1,161,1,124,1,100,2,141,2,
+    130,1,136,0,124,0,124,1,131,2,83,0,169,3,78,122,
+    27,123,33,114,125,32,105,115,32,110,111,116,32,97,32,102,
+    114,111,122,101,110,32,109,111,100,117,108,101,114,16,0,0,
+    0,41,4,114,56,0,0,0,218,9,105,115,95,102,114,111,
+    122,101,110,114,78,0,0,0,114,44,0,0,0,114,79,0,
+    0,0,114,81,0,0,0,114,10,0,0,0,114,11,0,0,
+    0,218,24,95,114,101,113,117,105,114,101,115,95,102,114,111,
+    122,101,110,95,119,114,97,112,112,101,114,243,0,0,0,115,
+    10,0,0,0,0,1,10,1,10,1,2,255,6,2,122,50,
+    95,114,101,113,117,105,114,101,115,95,102,114,111,122,101,110,
+    46,60,108,111,99,97,108,115,62,46,95,114,101,113,117,105,
+    114,101,115,95,102,114,111,122,101,110,95,119,114,97,112,112,
+    101,114,114,84,0,0,0,41,2,114,82,0,0,0,114,88,
+    0,0,0,114,10,0,0,0,114,81,0,0,0,114,11,0,
+    0,0,218,16,95,114,101,113,117,105,114,101,115,95,102,114,
+    111,122,101,110,241,0,0,0,115,6,0,0,0,0,2,12,
+    5,10,1,114,89,0,0,0,99,2,0,0,0,0,0,0,
+    0,0,0,0,0,4,0,0,0,3,0,0,0,67,0,0,
+    0,115,62,0,0,0,116,0,124,1,124,0,131,2,125,2,
+    124,1,116,1,106,2,107,6,114,50,116,1,106,2,124,1,
+    25,0,125,3,116,3,124,2,124,3,131,2,1,0,116,1,
+    106,2,124,1,25,0,83,0,116,4,124,2,131,1,83,0,
+    100,1,83,0,41,2,122,128,76,111,97,100,32,116,104,101,
+    32,115,112,101,99,105,102,105,101,100,32,109,111,100,117,108,
+    101,32,105,110,116,111,32,115,121,115,46,109,111,100,117,108,
+    101,115,32,97,110,100,32,114,101,116,117,114,110,32,105,116,
+    46,10,10,32,32,32,32,84,104,105,115,32,109,101,116,104,
+    111,100,32,105,115,32,100,101,112,114,101,99,97,116,101,100,
+    46,32,32,85,115,101,32,108,111,97,100,101,114,46,101,120,
+    101,99,95,109,111,100,117,108,101,32,105,110,115,116,101,97,
+    100,46,10,10,32,32,32,32,78,41,5,218,16,115,112,101,
+    99,95,102,114,111,109,95,108,111,97,100,101,114,114,15,0,
+    0,0,218,7,109,111,100,117,108,101,115,218,5,95,101,120,
+    101,99,218,5,95,108,111,97,100,41,4,114,30,0,0,0,
+    114,80,0,0,0,218,4,115,112,101,99,218,6,109,111,100,
+    117,108,101,114,10,0,0,0,114,10,0,0,0,114,11,0,
+    0,0,218,17,95,108,111,97,100,95,109,111,100,117,108,101,
+    95,115,104,105,109,253,0,0,0,115,12,0,0,0,0,6,
+    10,1,10,1,10,1,10,1,10,2,114,96,0,0,0,99,
+    1,0,0,0,0,0,0,0,0,0,0,0,5,0,0,0,
+    8,0,0,0,67,0,0,0,115,226,0,0,0,116,0,124,
+    0,100,1,100,0,131,3,125,1,116,1,124,1,100,2,131,
+    2,114,56,122,12,124,1,160,2,124,0,161,1,87,0,83,
+    0,4,0,116,3,107,10,114,54,1,0,1,0,1,0,89,
+    0,110,2,88,0,122,10,124,0,106,4,125,2,87,0,110,
+    20,4,0,116,5,107,10,114,86,1,0,1,0,1,0,89,
+    0,110,18,88,0,124,2,100,0,107,9,114,104,116,6,124,
+    2,131,1,83,0,122,10,124,0,106,7,125,3,87,0,110,
+    24,4,0,116,5,107,10,114,138,1,0,1,0,1,0,100,
+    3,125,3,89,0,110,2,88,0,122,10,124,0,106,8,125,
+    4,87,0,110,58,4,0,116,5,107,10,114,208,1,0,1,
+    0,1,0,124,1,100,0,107,8,114,188,100,4,160,9,124,
+    3,161,1,6,0,89,0,83,0,100,5,160,9,124,3,124,
+    1,161,2,6,0,89,0,83,0,89,0,110,14,88,0,100,
+    6,160,9,124,3,124,4,161,2,83,0,100,0,83,0,41,
+    7,78,218,10,95,95,108,111,97,100,101,114,95,95,218,11,
+    109,111,100,117,108,101,95,114,101,112,114,250,1,63,250,13,
+    60,109,111,100,117,108,101,32,123,33,114,125,62,250,20,60,
+    109,111,100,117,108,101,32,123,33,114,125,32,40,123,33,114,
+    125,41,62,250,23,60,109,111,100,117,108,101,32,123,33,114,
+    125,32,102,114,111,109,32,123,33,114,125,62,41,10,114,6,
+    0,0,0,114,4,0,0,0,114,98,0,0,0,218,9,69,
+    120,99,101,112,116,105,111,110,218,8,95,95,115,112,101,99,
+    95,95,218,14,65,116,116,114,105,98,117,116,101,69,114,114,
+    111,114,218,22,95,109,111,100,117,108,101,95,114,101,112,114,
+    95,102,114,111,109,95,115,112,101,99,114,1,0,0,0,218,
+    8,95,95,102,105,108,101,95,95,114,44,0,0,0,41,5,
+    114,95,0,0,0,218,6,108,111,97,100,101,114,114,94,0,
+    0,0,114,17,0,0,0,218,8,102,105,108,101,110,97,109,
+    101,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    218,12,95,109,111,100,117,108,101,95,114,101,112,114,13,1,
+    0,0,115,46,0,0,0,0,2,12,1,10,4,2,1,12,
+    1,14,1,6,1,2,1,10,1,14,1,6,2,8,1,8,
+    4,2,1,10,1,14,1,10,1,2,1,10,1,14,1,8,
+    1,14,2,22,2,114,110,0,0,0,99,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,4,0,0,0,64,
+    0,0,0,115,114,0,0,0,101,0,90,1,100,0,90,2,
+    100,1,90,3,100,2,100,2,100,2,100,3,156,3,100,4,
+    100,5,132,2,90,4,100,6,100,7,132,0,90,5,100,8,
+    100,9,132,0,90,6,101,7,100,10,100,11,132,0,131,1,
+    90,8,101,8,106,9,100,12,100,11,132,0,131,1,90,8,
+    101,7,100,13,100,14,132,0,131,1,90,10,101,7,100,15,
+    100,16,132,0,131,1,90,11,101,11,106,9,100,17,100,16,
+    132,0,131,1,90,11,100,2,83,0,41,18,218,10,77,111,
+    100,117,108,101,83,112,101,99,97,208,5,0,0,84,104,101,
+    32,115,112,101,99,105,102,105,99,97,116,105,111,110,32,102,
+    111,114,32,97,32,109,111,100,117,108,101,44,32,117,115,101,
+    100,32,102,111,114,32,108,111,97,100,105,110,103,46,10,10,
+    32,32,32,32,65,32,109,111,100,117,108,101,39,115,32,115,
+    112,101,99,32,105,115,32,116,104,101,32,115,111,117,114,99,
+    101,32,102,111,114,32,105,110,102,111,114,109,97,116,105,111,
+    110,32,97,98,111,117,116,32,116,104,101,32,109,111,100,117,
+    108,101,46,32,32,70,111,114,10,32,32,32,32,100,97,116,
+    97,32,97,115,115,111,99,105,97,116,101,100,32,119,105,116,
+    104,32,116,104,101,32,109,111,100,117,108,101,44,32,105,110,
+    99,108,117,100,105,110,103,32,115,111,117,114,99,101,44,32,
+    117,115,101,32,116,104,101,32,115,112,101,99,39,115,10,32,
+    32,32,32,108,111,97,100,101,114,46,10,10,32,32,32,32,
+    96,110,97,109,101,96,32,105,115,32,116,104,101,32,97,98,
+    115,111,108,117,116,101,32,110,97,109,101,32,111,102,32,116,
+    104,101,32,109,111,100,117,108,101,46,32,32,96,108,111,97,
+    100,101,114,96,32,105,115,32,116,104,101,32,108,111,97,100,
+    101,114,10,32,32,32,32,116,111,32,117,115,101,32,119,104,
+    101,110,32,108,111,97,100,105,110,103,32,116,104,101,32,109,
+    111,100,117,108,101,46,32,32,96,112,97,114,101,110,116,96,
+    32,105,115,32,116,104,101,32,110,97,109,101,32,111,102,32,
+    116,104,101,10,32,32,32,32,112,97,99,107,97,103,101,32,
+    116,104,101,32,109,111,100,117,108,101,32,105,115,32,105,110,
+    46,32,32,84,104,101,32,112,97,114,101,110,116,32,105,115,
+    32,100,101,114,105,118,101,100,32,102,114,111,109,32,116,104,
+    101,32,110,97,109,101,46,10,10,32,32,32,32,96,105,115,
+    95,112,97,99,107,97,103,101,96,32,100,101,116,101,114,109,
+    105,110,101,115,32,105,102,32,116,104,101,32,109,111,100,117,
+    108,101,32,105,115,32,99,111,110,115,105,100,101,114,101,100,
+    32,97,32,112,97,99,107,97,103,101,32,111,114,10,32,32,
+    32,32,110,111,116,46,32,32,79,110,32,109,111,100,117,108,
+    101,115,32,116,104,105,115,32,105,115,32,114,101,102,108,101,
+    99,116,101,100,32,98,121,32,116,104,101,32,96,95,95,112,
+    97,116,104,95,95,96,32,97,116,116,114,105,98,117,116,101,
+    46,10,10,32,32,32,32,96,111,114,105,103,105,110,96,32,
+    105,115,32,116,104,101,32,115,112,101,99,105,102,105,99,32,
+    108,111,99,97,116,105,111,110,32,117,115,101,100,32,98,121,
+    32,116,104,101,32,108,111,97,100,101,114,32,102,114,111,109,
+    32,119,104,105,99,104,32,116,111,10,32,32,32,32,108,111,
+    97,100,32,116,104,101,32,109,111,100,117,108,101,44,32,105,
+    102,32,116,104,97,116,32,105,110,102,111,114,109,97,116,105,
+    111,110,32,105,115,32,97,118,97,105,108,97,98,108,101,46,
+    32,32,87,104,101,110,32,102,105,108,101,110,97,109,101,32,
+    105,115,10,32,32,32,32,115,101,116,44,32,111,114,105,103,
+    105,110,32,119,105,108,108,32,109,97,116,99,104,46,10,10,
+    32,32,32,32,96,104,97,115,95,108,111,99,97,116,105,111,
+    110,96,32,105,110,100,105,99,97,116,101,115,32,116,104,97,
+    116,32,97,32,115,112,101,99,39,115,32,34,111,114,105,103,
+    105,110,34,32,114,101,102,108,101,99,116,115,32,97,32,108,
+    111,99,97,116,105,111,110,46,10,32,32,32,32,87,104,101,
+    110,32,116,104,105,115,32,105,115,32,84,114,117,101,44,32,
+    96,95,95,102,105,108,101,95,95,96,32,97,116,116,114,105,
+    98,117,116,101,32,111,102,32,116,104,101,32,109,111,100,117,
+    108,101,32,105,115,32,115,101,116,46,10,10,32,32,32,32,
+    96,99,97,99,104,101,100,96,32,105,115,32,116,104,101,32,
+    108,111,99,97,116,105,111,110,32,111,102,32,116,104,101,32,
+    99,97,99,104,101,100,32,98,121,116,101,99,111,100,101,32,
+    102,105,108,101,44,32,105,102,32,97,110,121,46,32,32,73,
+    116,10,32,32,32,32,99,111,114,114,101,115,112,111,110,100,
+    115,32,116,111,32,116,104,101,32,96,95,95,99,97,99,104,
+    101,100,95,95,96,32,97,116,116,114,105,98,117,116,101,46,
+    10,10,32,32,32,32,96,115,117,98,109,111,100,117,108,101,
+    95,115,101,97,114,99,104,95,108,111,99,97,116,105,111,110,
+    115,96,32,105,115,32,116,104,101,32,115,101,113,117,101,110,
+    99,101,32,111,102,32,112,97,116,104,32,101,110,116,114,105,
+    101,115,32,116,111,10,32,32,32,32,115,101,97,114,99,104,
+    32,119,104,101,110,32,105,109,112,111,114,116,105,110,103,32,
+    115,117,98,109,111,100,117,108,101,115,46,32,32,73,102,32,
+    115,101,116,44,32,105,115,95,112,97,99,107,97,103,101,32,
+    115,104,111,117,108,100,32,98,101,10,32,32,32,32,84,114,
+    117,101,45,45,97,110,100,32,70,97,108,115,101,32,111,116,
+    104,101,114,119,105,115,101,46,10,10,32,32,32,32,80,97,
+    99,107,97,103,101,115,32,97,114,101,32,115,105,109,112,108,
+    121,32,109,111,100,117,108,101,115,32,116,104,97,116,32,40,
+    109,97,121,41,32,104,97,118,101,32,115,117,98,109,111,100,
+    117,108,101,115,46,32,32,73,102,32,97,32,115,112,101,99,
+    10,32,32,32,32,104,97,115,32,97,32,110,111,110,45,78,
+    111,110,101,32,118,97,108,117,101,32,105,110,32,96,115,117,
+    98,109,111,100,117,108,101,95,115,101,97,114,99,104,95,108,
+    111,99,97,116,105,111,110,115,96,44,32,116,104,101,32,105,
+    109,112,111,114,116,10,32,32,32,32,115,121,115,116,101,109,
+    32,119,105,108,108,32,99,111,110,115,105,100,101,114,32,109,
+    111,100,117,108,101,115,32,108,111,97,100,101,100,32,102,114,
+    111,109,32,116,104,101,32,115,112,101,99,32,97,115,32,112,
+    97,99,107,97,103,101,115,46,10,10,32,32,32,32,79,110,
+    108,121,32,102,105,110,100,101,114,115,32,40,115,101,101,32,
+    105,109,112,111,114,116,108,105,98,46,97,98,99,46,77,101,
+    116,97,80,97,116,104,70,105,110,100,101,114,32,97,110,100,
+    10,32,32,32,32,105,109,112,111,114,116,108,105,98,46,97,
+    98,99,46,80,97,116,104,69,110,116,114,121,70,105,110,100,
+    101,114,41,32,115,104,111,117,108,100,32,109,111,100,105,102,
+    121,32,77,111,100,117,108,101,83,112,101,99,32,105,110,115,
+    116,97,110,99,101,115,46,10,10,32,32,32,32,78,41,3,
+    218,6,111,114,105,103,105,110,218,12,108,111,97,100,101,114,
+    95,115,116,97,116,101,218,10,105,115,95,112,97,99,107,97,
+    103,101,99,3,0,0,0,0,0,0,0,3,0,0,0,6,
+    0,0,0,2,0,0,0,67,0,0,0,115,54,0,0,0,
+    124,1,124,0,95,0,124,2,124,0,95,1,124,3,124,0,
+    95,2,124,4,124,0,95,3,124,5,114,32,103,0,110,2,
+    100,0,124,0,95,4,100,1,124,0,95,5,100,0,124,0,
+    95,6,100,0,83,0,41,2,78,70,41,7,114,17,0,0,
+    0,114,108,0,0,0,114,112,0,0,0,114,113,0,0,0,
+    218,26,115,117,98,109,111,100,117,108,101,95,115,101,97,114,
+    99,104,95,108,111,99,97,116,105,111,110,115,218,13,95,115,
+    101,116,95,102,105,108,101,97,116,116,114,218,7,95,99,97,
+    99,104,101,100,41,6,114,30,0,0,0,114,17,0,0,0,
+    114,108,0,0,0,114,112,0,0,0,114,113,0,0,0,114,
+    114,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,31,0,0,0,86,1,0,0,115,14,0,0,
+    0,0,2,6,1,6,1,6,1,6,1,14,3,6,1,122,
+    19,77,111,100,117,108,101,83,112,101,99,46,95,95,105,110,
+    105,116,95,95,99,1,0,0,0,0,0,0,0,0,0,0,
+    0,2,0,0,0,6,0,0,0,67,0,0,0,115,102,0,
+    0,0,100,1,160,0,124,0,106,1,161,1,100,2,160,0,
+    124,0,106,2,161,1,103,2,125,1,124,0,106,3,100,0,
+    107,9,114,52,124,1,160,4,100,3,160,0,124,0,106,3,
+    161,1,161,1,1,0,124,0,106,5,100,0,107,9,114,80,
+    124,1,160,4,100,4,160,0,124,0,106,5,161,1,161,1,
+    1,0,100,5,160,0,124,0,106,6,106,7,100,6,160,8,
+    124,1,161,1,161,2,83,0,41,7,78,122,9,110,97,109,
+    101,61,123,33,114,125,122,11,108,111,97,100,101,114,61,123,
+    33,114,125,122,11,111,114,105,103,105,110,61,123,33,114,125,
+    122,29,115,117,98,109,111,100,117,108,101,95,115,101,97,114,
+    99,104,95,108,111,99,97,116,105,111,110,115,61,123,125,122,
+    6,123,125,40,123,125,41,122,2,44,32,41,9,114,44,0,
+    0,0,114,17,0,0,0,114,108,0,0,0,114,112,0,0,
+    0,218,6,97,112,112,101,110,100,114,115,0,0,0,218,9,
+    95,95,99,108,97,115,115,95,95,114,1,0,0,0,218,4,
+    106,111,105,110,41,2,114,30,0,0,0,114,54,0,0,0,
     114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
-    149,0,0,0,242,2,0,0,115,2,0,0,0,0,3,122,
-    27,66,117,105,108,116,105,110,73,109,112,111,114,116,101,114,
-    46,101,120,101,99,95,109,111,100,117,108,101,99,2,0,0,
-    0,0,0,0,0,0,0,0,0,2,0,0,0,1,0,0,
-    0,67,0,0,0,115,4,0,0,0,100,1,83,0,41,2,
-    122,57,82,101,116,117,114,110,32,78,111,110,101,32,97,115,
-    32,98,117,105,108,116,45,105,110,32,109,111,100,117,108,101,
-    115,32,100,111,32,110,111,116,32,104,97,118,101,32,99,111,
-    100,101,32,111,98,106,101,99,116,115,46,78,114,10,0,0,
-    0,169,2,114,162,0,0,0,114,80,0,0,0,114,10,0,
-    0,0,114,10,0,0,0,114,11,0,0,0,218,8,103,101,
-    116,95,99,111,100,101,247,2,0,0,115,2,0,0,0,0,
-    4,122,24,66,117,105,108,116,105,110,73,109,112,111,114,116,
-    101,114,46,103,101,116,95,99,111,100,101,99,2,0,0,0,
-    0,0,0,0,0,0,0,0,2,0,0,0,1,0,0,0,
-    67,0,0,0,115,4,0,0,0,100,1,83,0,41,2,122,
-    56,82,101,116,117,114,110,32,78,111,110,101,32,97,115,32,
-    98,117,105,108,116,45,105,110,32,109,111,100,117,108,101,115,
-    32,100,111,32,110,111,116,32,104,97,118,101,32,115,111,117,
-    114,99,101,32,99,111,100,101,46,78,114,10,0,0,0,114,
-    167,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
-    0,0,0,218,10,103,101,116,95,115,111,117,114,99,101,253,
-    2,0,0,115,2,0,0,0,0,4,122,26,66,117,105,108,
-    116,105,110,73,109,112,111,114,116,101,114,46,103,101,116,95,
-    115,111,117,114,99,101,99,2,0,0,0,0,0,0,0,0,
-    0,0,0,2,0,0,0,1,0,0,0,67,0,0,0,115,
-    4,0,0,0,100,1,83,0,41,2,122,52,82,101,116,117,
-    114,110,32,70,97,108,115,101,32,97,115,32,98,117,105,108,
-    116,45,105,110,32,109,111,100,117,108,101,115,32,97,114,101,
-    32,110,101,118,101,114,32,112,97,99,107,97,103,101,115,46,
-    70,114,10,0,0,0,114,167,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,114,114,0,0,0,3,
-    3,0,0,115,2,0,0,0,0,4,122,26,66,117,105,108,
-    116,105,110,73,109,112,111,114,116,101,114,46,105,115,95,112,
-    97,99,107,97,103,101,41,2,78,78,41,1,78,41,17,114,
+    47,0,0,0,98,1,0,0,115,20,0,0,0,0,1,10,
+    1,10,255,4,2,10,1,18,1,10,1,8,1,4,255,6,
+    2,122,19,77,111,100,117,108,101,83,112,101,99,46,95,95,
+    114,101,112,114,95,95,99,2,0,0,0,0,0,0,0,0,
+    0,0,0,3,0,0,0,8,0,0,0,67,0,0,0,115,
+    108,0,0,0,124,0,106,0,125,2,122,72,124,0,106,1,
+    124,1,106,1,107,2,111,76,124,0,106,2,124,1,106,2,
+    107,2,111,76,124,0,106,3,124,1,106,3,107,2,111,76,
+    124,2,124,1,106,0,107,2,111,76,124,0,106,4,124,1,
+    106,4,107,2,111,76,124,0,106,5,124,1,106,5,107,2,
+    87,0,83,0,4,0,116,6,107,10,114,102,1,0,1,0,
+    1,0,116,7,6,0,89,0,83,0,88,0,100,0,83,0,
+    114,13,0,0,0,41,8,114,115,0,0,0,114,17,0,0,
+    0,114,108,0,0,0,114,112,0,0,0,218,6,99,97,99,
+    104,101,100,218,12,104,97,115,95,108,111,99,97,116,105,111,
+    110,114,105,0,0,0,218,14,78,111,116,73,109,112,108,101,
+    109,101,110,116,101,100,41,3,114,30,0,0,0,90,5,111,
+    116,104,101,114,90,4,115,109,115,108,114,10,0,0,0,114,
+    10,0,0,0,114,11,0,0,0,218,6,95,95,101,113,95,
+    95,108,1,0,0,115,30,0,0,0,0,1,6,1,2,1,
+    12,1,10,255,2,2,10,254,2,3,8,253,2,4,10,252,
+    2,5,10,251,4,6,14,1,122,17,77,111,100,117,108,101,
+    83,112,101,99,46,95,95,101,113,95,95,99,1,0,0,0,
+    0,0,0,0,0,0,0,0,1,0,0,0,3,0,0,0,
+    67,0,0,0,115,58,0,0,0,124,0,106,0,100,0,107,
+    8,114,52,124,0,106,1,100,0,107,9,114,52,124,0,106,
+    2,114,52,116,3,100,0,107,8,114,38,116,4,130,1,116,
+    3,160,5,124,0,106,1,161,1,124,0,95,0,124,0,106,
+    0,83,0,114,13,0,0,0,41,6,114,117,0,0,0,114,
+    112,0,0,0,114,116,0,0,0,218,19,95,98,111,111,116,
+    115,116,114,97,112,95,101,120,116,101,114,110,97,108,218,19,
+    78,111,116,73,109,112,108,101,109,101,110,116,101,100,69,114,
+    114,111,114,90,11,95,103,101,116,95,99,97,99,104,101,100,
+    114,46,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
+    11,0,0,0,114,121,0,0,0,120,1,0,0,115,12,0,
+    0,0,0,2,10,1,16,1,8,1,4,1,14,1,122,17,
+    77,111,100,117,108,101,83,112,101,99,46,99,97,99,104,101,
+    100,99,2,0,0,0,0,0,0,0,0,0,0,0,2,0,
+    0,0,2,0,0,0,67,0,0,0,115,10,0,0,0,124,
+    1,124,0,95,0,100,0,83,0,114,13,0,0,0,41,1,
+    114,117,0,0,0,41,2,114,30,0,0,0,114,121,0,0,
+    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,121,0,0,0,129,1,0,0,115,2,0,0,0,0,2,
+    99,1,0,0,0,0,0,0,0,0,0,0,0,1,0,0,
+    0,3,0,0,0,67,0,0,0,115,36,0,0,0,124,0,
+    106,0,100,1,107,8,114,26,124,0,106,1,160,2,100,2,
+    161,1,100,3,25,0,83,0,124,0,106,1,83,0,100,1,
+    83,0,41,4,122,32,84,104,101,32,110,97,109,101,32,111,
+    102,32,116,104,101,32,109,111,100,117,108,101,39,115,32,112,
+    97,114,101,110,116,46,78,218,1,46,114,22,0,0,0,41,
+    3,114,115,0,0,0,114,17,0,0,0,218,10,114,112,97,
+    114,116,105,116,105,111,110,114,46,0,0,0,114,10,0,0,
+    0,114,10,0,0,0,114,11,0,0,0,218,6,112,97,114,
+    101,110,116,133,1,0,0,115,6,0,0,0,0,3,10,1,
+    16,2,122,17,77,111,100,117,108,101,83,112,101,99,46,112,
+    97,114,101,110,116,99,1,0,0,0,0,0,0,0,0,0,
+    0,0,1,0,0,0,1,0,0,0,67,0,0,0,115,6,
+    0,0,0,124,0,106,0,83,0,114,13,0,0,0,41,1,
+    114,116,0,0,0,114,46,0,0,0,114,10,0,0,0,114,
+    10,0,0,0,114,11,0,0,0,114,122,0,0,0,141,1,
+    0,0,115,2,0,0,0,0,2,122,23,77,111,100,117,108,
+    101,83,112,101,99,46,104,97,115,95,108,111,99,97,116,105,
+    111,110,99,2,0,0,0,0,0,0,0,0,0,0,0,2,
+    0,0,0,2,0,0,0,67,0,0,0,115,14,0,0,0,
+    116,0,124,1,131,1,124,0,95,1,100,0,83,0,114,13,
+    0,0,0,41,2,218,4,98,111,111,108,114,116,0,0,0,
+    41,2,114,30,0,0,0,218,5,118,97,108,117,101,114,10,
+    0,0,0,114,10,0,0,0,114,11,0,0,0,114,122,0,
+    0,0,145,1,0,0,115,2,0,0,0,0,2,41,12,114,
     1,0,0,0,114,0,0,0,0,114,2,0,0,0,114,3,
-    0,0,0,218,12,115,116,97,116,105,99,109,101,116,104,111,
-    100,114,98,0,0,0,218,11,99,108,97,115,115,109,101,116,
-    104,111,100,114,165,0,0,0,114,166,0,0,0,114,148,0,
-    0,0,114,149,0,0,0,114,85,0,0,0,114,168,0,0,
-    0,114,169,0,0,0,114,114,0,0,0,114,96,0,0,0,
-    114,155,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,114,159,0,0,0,195,2,
-    0,0,115,42,0,0,0,8,2,4,7,2,1,10,8,2,
-    1,12,8,2,1,12,11,2,1,10,7,2,1,10,4,2,
-    1,2,1,12,4,2,1,2,1,12,4,2,1,2,1,12,
-    4,114,159,0,0,0,99,0,0,0,0,0,0,0,0,0,
-    0,0,0,0,0,0,0,4,0,0,0,64,0,0,0,115,
-    144,0,0,0,101,0,90,1,100,0,90,2,100,1,90,3,
-    100,2,90,4,101,5,100,3,100,4,132,0,131,1,90,6,
-    101,7,100,22,100,6,100,7,132,1,131,1,90,8,101,7,
-    100,23,100,8,100,9,132,1,131,1,90,9,101,7,100,10,
-    100,11,132,0,131,1,90,10,101,5,100,12,100,13,132,0,
-    131,1,90,11,101,7,100,14,100,15,132,0,131,1,90,12,
-    101,7,101,13,100,16,100,17,132,0,131,1,131,1,90,14,
-    101,7,101,13,100,18,100,19,132,0,131,1,131,1,90,15,
-    101,7,101,13,100,20,100,21,132,0,131,1,131,1,90,16,
-    100,5,83,0,41,24,218,14,70,114,111,122,101,110,73,109,
-    112,111,114,116,101,114,122,142,77,101,116,97,32,112,97,116,
-    104,32,105,109,112,111,114,116,32,102,111,114,32,102,114,111,
-    122,101,110,32,109,111,100,117,108,101,115,46,10,10,32,32,
-    32,32,65,108,108,32,109,101,116,104,111,100,115,32,97,114,
-    101,32,101,105,116,104,101,114,32,99,108,97,115,115,32,111,
-    114,32,115,116,97,116,105,99,32,109,101,116,104,111,100,115,
-    32,116,111,32,97,118,111,105,100,32,116,104,101,32,110,101,
-    101,100,32,116,111,10,32,32,32,32,105,110,115,116,97,110,
-    116,105,97,116,101,32,116,104,101,32,99,108,97,115,115,46,
-    10,10,32,32,32,32,90,6,102,114,111,122,101,110,99,1,
-    0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,4,
-    0,0,0,67,0,0,0,115,16,0,0,0,100,1,160,0,
-    124,0,106,1,116,2,106,3,161,2,83,0,41,2,114,160,
-    0,0,0,114,152,0,0,0,41,4,114,44,0,0,0,114,
-    1,0,0,0,114,172,0,0,0,114,137,0,0,0,41,1,
-    218,1,109,114,10,0,0,0,114,10,0,0,0,114,11,0,
-    0,0,114,98,0,0,0,23,3,0,0,115,2,0,0,0,
-    0,7,122,26,70,114,111,122,101,110,73,109,112,111,114,116,
-    101,114,46,109,111,100,117,108,101,95,114,101,112,114,78,99,
-    4,0,0,0,0,0,0,0,0,0,0,0,4,0,0,0,
-    5,0,0,0,67,0,0,0,115,34,0,0,0,116,0,160,
-    1,124,1,161,1,114,26,116,2,124,1,124,0,124,0,106,
-    3,100,1,141,3,83,0,100,0,83,0,100,0,83,0,41,
-    2,78,114,136,0,0,0,41,4,114,56,0,0,0,114,87,
-    0,0,0,114,90,0,0,0,114,137,0,0,0,114,161,0,
+    0,0,0,114,31,0,0,0,114,47,0,0,0,114,124,0,
+    0,0,218,8,112,114,111,112,101,114,116,121,114,121,0,0,
+    0,218,6,115,101,116,116,101,114,114,129,0,0,0,114,122,
+    0,0,0,114,10,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,114,111,0,0,0,49,1,0,0,
+    115,32,0,0,0,8,1,4,36,4,1,2,255,12,12,8,
+    10,8,12,2,1,10,8,4,1,10,3,2,1,10,7,2,
+    1,10,3,4,1,114,111,0,0,0,169,2,114,112,0,0,
+    0,114,114,0,0,0,99,2,0,0,0,0,0,0,0,2,
+    0,0,0,6,0,0,0,8,0,0,0,67,0,0,0,115,
+    154,0,0,0,116,0,124,1,100,1,131,2,114,74,116,1,
+    100,2,107,8,114,22,116,2,130,1,116,1,106,3,125,4,
+    124,3,100,2,107,8,114,48,124,4,124,0,124,1,100,3,
+    141,2,83,0,124,3,114,56,103,0,110,2,100,2,125,5,
+    124,4,124,0,124,1,124,5,100,4,141,3,83,0,124,3,
+    100,2,107,8,114,138,116,0,124,1,100,5,131,2,114,134,
+    122,14,124,1,160,4,124,0,161,1,125,3,87,0,113,138,
+    4,0,116,5,107,10,114,130,1,0,1,0,1,0,100,2,
+    125,3,89,0,113,138,88,0,110,4,100,6,125,3,116,6,
+    124,0,124,1,124,2,124,3,100,7,141,4,83,0,41,8,
+    122,53,82,101,116,117,114,110,32,97,32,109,111,100,117,108,
+    101,32,115,112,101,99,32,98,97,115,101,100,32,111,110,32,
+    118,97,114,105,111,117,115,32,108,111,97,100,101,114,32,109,
+    101,116,104,111,100,115,46,90,12,103,101,116,95,102,105,108,
+    101,110,97,109,101,78,41,1,114,108,0,0,0,41,2,114,
+    108,0,0,0,114,115,0,0,0,114,114,0,0,0,70,114,
+    134,0,0,0,41,7,114,4,0,0,0,114,125,0,0,0,
+    114,126,0,0,0,218,23,115,112,101,99,95,102,114,111,109,
+    95,102,105,108,101,95,108,111,99,97,116,105,111,110,114,114,
+    0,0,0,114,78,0,0,0,114,111,0,0,0,41,6,114,
+    17,0,0,0,114,108,0,0,0,114,112,0,0,0,114,114,
+    0,0,0,114,135,0,0,0,90,6,115,101,97,114,99,104,
+    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
+    90,0,0,0,150,1,0,0,115,36,0,0,0,0,2,10,
+    1,8,1,4,1,6,2,8,1,12,1,12,1,6,1,2,
+    255,6,3,8,1,10,1,2,1,14,1,14,1,12,3,4,
+    2,114,90,0,0,0,99,3,0,0,0,0,0,0,0,0,
+    0,0,0,8,0,0,0,8,0,0,0,67,0,0,0,115,
+    56,1,0,0,122,10,124,0,106,0,125,3,87,0,110,20,
+    4,0,116,1,107,10,114,30,1,0,1,0,1,0,89,0,
+    110,14,88,0,124,3,100,0,107,9,114,44,124,3,83,0,
+    124,0,106,2,125,4,124,1,100,0,107,8,114,90,122,10,
+    124,0,106,3,125,1,87,0,110,20,4,0,116,1,107,10,
+    114,88,1,0,1,0,1,0,89,0,110,2,88,0,122,10,
+    124,0,106,4,125,5,87,0,110,24,4,0,116,1,107,10,
+    114,124,1,0,1,0,1,0,100,0,125,5,89,0,110,2,
+    88,0,124,2,100,0,107,8,114,184,124,5,100,0,107,8,
+    114,180,122,10,124,1,106,5,125,2,87,0,113,184,4,0,
+    116,1,107,10,114,176,1,0,1,0,1,0,100,0,125,2,
+    89,0,113,184,88,0,110,4,124,5,125,2,122,10,124,0,
+    106,6,125,6,87,0,110,24,4,0,116,1,107,10,114,218,
+    1,0,1,0,1,0,100,0,125,6,89,0,110,2,88,0,
+    122,14,116,7,124,0,106,8,131,1,125,7,87,0,110,26,
+    4,0,116,1,107,10,144,1,114,4,1,0,1,0,1,0,
+    100,0,125,7,89,0,110,2,88,0,116,9,124,4,124,1,
+    124,2,100,1,141,3,125,3,124,5,100,0,107,8,144,1,
+    114,34,100,2,110,2,100,3,124,3,95,10,124,6,124,3,
+    95,11,124,7,124,3,95,12,124,3,83,0,41,4,78,169,
+    1,114,112,0,0,0,70,84,41,13,114,104,0,0,0,114,
+    105,0,0,0,114,1,0,0,0,114,97,0,0,0,114,107,
+    0,0,0,218,7,95,79,82,73,71,73,78,218,10,95,95,
+    99,97,99,104,101,100,95,95,218,4,108,105,115,116,218,8,
+    95,95,112,97,116,104,95,95,114,111,0,0,0,114,116,0,
+    0,0,114,121,0,0,0,114,115,0,0,0,41,8,114,95,
+    0,0,0,114,108,0,0,0,114,112,0,0,0,114,94,0,
+    0,0,114,17,0,0,0,90,8,108,111,99,97,116,105,111,
+    110,114,121,0,0,0,114,115,0,0,0,114,10,0,0,0,
+    114,10,0,0,0,114,11,0,0,0,218,17,95,115,112,101,
+    99,95,102,114,111,109,95,109,111,100,117,108,101,176,1,0,
+    0,115,72,0,0,0,0,2,2,1,10,1,14,1,6,2,
+    8,1,4,2,6,1,8,1,2,1,10,1,14,2,6,1,
+    2,1,10,1,14,1,10,1,8,1,8,1,2,1,10,1,
+    14,1,12,2,4,1,2,1,10,1,14,1,10,1,2,1,
+    14,1,16,1,10,2,14,1,20,1,6,1,6,1,114,141,
+    0,0,0,70,169,1,218,8,111,118,101,114,114,105,100,101,
+    99,2,0,0,0,0,0,0,0,1,0,0,0,5,0,0,
+    0,8,0,0,0,67,0,0,0,115,226,1,0,0,124,2,
+    115,20,116,0,124,1,100,1,100,0,131,3,100,0,107,8,
+    114,54,122,12,124,0,106,1,124,1,95,2,87,0,110,20,
+    4,0,116,3,107,10,114,52,1,0,1,0,1,0,89,0,
+    110,2,88,0,124,2,115,74,116,0,124,1,100,2,100,0,
+    131,3,100,0,107,8,114,178,124,0,106,4,125,3,124,3,
+    100,0,107,8,114,146,124,0,106,5,100,0,107,9,114,146,
+    116,6,100,0,107,8,114,110,116,7,130,1,116,6,106,8,
+    125,4,124,4,160,9,124,4,161,1,125,3,124,0,106,5,
+    124,3,95,10,124,3,124,0,95,4,100,0,124,1,95,11,
+    122,10,124,3,124,1,95,12,87,0,110,20,4,0,116,3,
+    107,10,114,176,1,0,1,0,1,0,89,0,110,2,88,0,
+    124,2,115,198,116,0,124,1,100,3,100,0,131,3,100,0,
+    107,8,114,232,122,12,124,0,106,13,124,1,95,14,87,0,
+    110,20,4,0,116,3,107,10,114,230,1,0,1,0,1,0,
+    89,0,110,2,88,0,122,10,124,0,124,1,95,15,87,0,
+    110,22,4,0,116,3,107,10,144,1,114,8,1,0,1,0,
+    1,0,89,0,110,2,88,0,124,2,144,1,115,34,116,0,
+    124,1,100,4,100,0,131,3,100,0,107,8,144,1,114,82,
+    124,0,106,5,100,0,107,9,144,1,114,82,122,12,124,0,
+    106,5,124,1,95,16,87,0,110,22,4,0,116,3,107,10,
+    144,1,114,80,1,0,1,0,1,0,89,0,110,2,88,0,
+    124,0,106,17,144,1,114,222,124,2,144,1,115,114,116,0,
+    124,1,100,5,100,0,131,3,100,0,107,8,144,1,114,150,
+    122,12,124,0,106,18,124,1,95,11,87,0,110,22,4,0,
+    116,3,107,10,144,1,114,148,1,0,1,0,1,0,89,0,
+    110,2,88,0,124,2,144,1,115,174,116,0,124,1,100,6,
+    100,0,131,3,100,0,107,8,144,1,114,222,124,0,106,19,
+    100,0,107,9,144,1,114,222,122,12,124,0,106,19,124,1,
+    95,20,87,0,110,22,4,0,116,3,107,10,144,1,114,220,
+    1,0,1,0,1,0,89,0,110,2,88,0,124,1,83,0,
+    41,7,78,114,1,0,0,0,114,97,0,0,0,218,11,95,
+    95,112,97,99,107,97,103,101,95,95,114,140,0,0,0,114,
+    107,0,0,0,114,138,0,0,0,41,21,114,6,0,0,0,
+    114,17,0,0,0,114,1,0,0,0,114,105,0,0,0,114,
+    108,0,0,0,114,115,0,0,0,114,125,0,0,0,114,126,
+    0,0,0,218,16,95,78,97,109,101,115,112,97,99,101,76,
+    111,97,100,101,114,218,7,95,95,110,101,119,95,95,90,5,
+    95,112,97,116,104,114,107,0,0,0,114,97,0,0,0,114,
+    129,0,0,0,114,144,0,0,0,114,104,0,0,0,114,140,
+    0,0,0,114,122,0,0,0,114,112,0,0,0,114,121,0,
+    0,0,114,138,0,0,0,41,5,114,94,0,0,0,114,95,
+    0,0,0,114,143,0,0,0,114,108,0,0,0,114,145,0,
     0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,114,165,0,0,0,32,3,0,0,115,6,0,0,0,0,
-    2,10,1,16,2,122,24,70,114,111,122,101,110,73,109,112,
-    111,114,116,101,114,46,102,105,110,100,95,115,112,101,99,99,
-    3,0,0,0,0,0,0,0,0,0,0,0,3,0,0,0,
-    3,0,0,0,67,0,0,0,115,18,0,0,0,116,0,160,
-    1,124,1,161,1,114,14,124,0,83,0,100,1,83,0,41,
-    2,122,93,70,105,110,100,32,97,32,102,114,111,122,101,110,
-    32,109,111,100,117,108,101,46,10,10,32,32,32,32,32,32,
-    32,32,84,104,105,115,32,109,101,116,104,111,100,32,105,115,
-    32,100,101,112,114,101,99,97,116,101,100,46,32,32,85,115,
-    101,32,102,105,110,100,95,115,112,101,99,40,41,32,105,110,
-    115,116,101,97,100,46,10,10,32,32,32,32,32,32,32,32,
-    78,41,2,114,56,0,0,0,114,87,0,0,0,41,3,114,
-    162,0,0,0,114,80,0,0,0,114,163,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,166,0,
-    0,0,39,3,0,0,115,2,0,0,0,0,7,122,26,70,
-    114,111,122,101,110,73,109,112,111,114,116,101,114,46,102,105,
-    110,100,95,109,111,100,117,108,101,99,2,0,0,0,0,0,
-    0,0,0,0,0,0,2,0,0,0,1,0,0,0,67,0,
-    0,0,115,4,0,0,0,100,1,83,0,41,2,122,42,85,
-    115,101,32,100,101,102,97,117,108,116,32,115,101,109,97,110,
-    116,105,99,115,32,102,111,114,32,109,111,100,117,108,101,32,
-    99,114,101,97,116,105,111,110,46,78,114,10,0,0,0,41,
-    2,114,162,0,0,0,114,94,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,114,148,0,0,0,48,
-    3,0,0,115,2,0,0,0,0,2,122,28,70,114,111,122,
-    101,110,73,109,112,111,114,116,101,114,46,99,114,101,97,116,
-    101,95,109,111,100,117,108,101,99,1,0,0,0,0,0,0,
-    0,0,0,0,0,3,0,0,0,4,0,0,0,67,0,0,
-    0,115,64,0,0,0,124,0,106,0,106,1,125,1,116,2,
-    160,3,124,1,161,1,115,36,116,4,100,1,160,5,124,1,
-    161,1,124,1,100,2,141,2,130,1,116,6,116,2,106,7,
-    124,1,131,2,125,2,116,8,124,2,124,0,106,9,131,2,
-    1,0,100,0,83,0,114,86,0,0,0,41,10,114,104,0,
-    0,0,114,17,0,0,0,114,56,0,0,0,114,87,0,0,
+    0,218,18,95,105,110,105,116,95,109,111,100,117,108,101,95,
+    97,116,116,114,115,221,1,0,0,115,96,0,0,0,0,4,
+    20,1,2,1,12,1,14,1,6,2,20,1,6,1,8,2,
+    10,1,8,1,4,1,6,2,10,1,8,1,6,11,6,1,
+    2,1,10,1,14,1,6,2,20,1,2,1,12,1,14,1,
+    6,2,2,1,10,1,16,1,6,2,24,1,12,1,2,1,
+    12,1,16,1,6,2,8,1,24,1,2,1,12,1,16,1,
+    6,2,24,1,12,1,2,1,12,1,16,1,6,1,114,147,
+    0,0,0,99,1,0,0,0,0,0,0,0,0,0,0,0,
+    2,0,0,0,3,0,0,0,67,0,0,0,115,82,0,0,
+    0,100,1,125,1,116,0,124,0,106,1,100,2,131,2,114,
+    30,124,0,106,1,160,2,124,0,161,1,125,1,110,20,116,
+    0,124,0,106,1,100,3,131,2,114,50,116,3,100,4,131,
+    1,130,1,124,1,100,1,107,8,114,68,116,4,124,0,106,
+    5,131,1,125,1,116,6,124,0,124,1,131,2,1,0,124,
+    1,83,0,41,5,122,43,67,114,101,97,116,101,32,97,32,
+    109,111,100,117,108,101,32,98,97,115,101,100,32,111,110,32,
+    116,104,101,32,112,114,111,118,105,100,101,100,32,115,112,101,
+    99,46,78,218,13,99,114,101,97,116,101,95,109,111,100,117,
+    108,101,218,11,101,120,101,99,95,109,111,100,117,108,101,122,
+    66,108,111,97,100,101,114,115,32,116,104,97,116,32,100,101,
+    102,105,110,101,32,101,120,101,99,95,109,111,100,117,108,101,
+    40,41,32,109,117,115,116,32,97,108,115,111,32,100,101,102,
+    105,110,101,32,99,114,101,97,116,101,95,109,111,100,117,108,
+    101,40,41,41,7,114,4,0,0,0,114,108,0,0,0,114,
+    148,0,0,0,114,78,0,0,0,114,18,0,0,0,114,17,
+    0,0,0,114,147,0,0,0,169,2,114,94,0,0,0,114,
+    95,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,218,16,109,111,100,117,108,101,95,102,114,111,109,
+    95,115,112,101,99,37,2,0,0,115,18,0,0,0,0,3,
+    4,1,12,3,14,1,12,1,8,2,8,1,10,1,10,1,
+    114,151,0,0,0,99,1,0,0,0,0,0,0,0,0,0,
+    0,0,2,0,0,0,4,0,0,0,67,0,0,0,115,106,
+    0,0,0,124,0,106,0,100,1,107,8,114,14,100,2,110,
+    4,124,0,106,0,125,1,124,0,106,1,100,1,107,8,114,
+    66,124,0,106,2,100,1,107,8,114,50,100,3,160,3,124,
+    1,161,1,83,0,100,4,160,3,124,1,124,0,106,2,161,
+    2,83,0,110,36,124,0,106,4,114,86,100,5,160,3,124,
+    1,124,0,106,1,161,2,83,0,100,6,160,3,124,0,106,
+    0,124,0,106,1,161,2,83,0,100,1,83,0,41,7,122,
+    38,82,101,116,117,114,110,32,116,104,101,32,114,101,112,114,
+    32,116,111,32,117,115,101,32,102,111,114,32,116,104,101,32,
+    109,111,100,117,108,101,46,78,114,99,0,0,0,114,100,0,
+    0,0,114,101,0,0,0,114,102,0,0,0,250,18,60,109,
+    111,100,117,108,101,32,123,33,114,125,32,40,123,125,41,62,
+    41,5,114,17,0,0,0,114,112,0,0,0,114,108,0,0,
+    0,114,44,0,0,0,114,122,0,0,0,41,2,114,94,0,
+    0,0,114,17,0,0,0,114,10,0,0,0,114,10,0,0,
+    0,114,11,0,0,0,114,106,0,0,0,54,2,0,0,115,
+    16,0,0,0,0,3,20,1,10,1,10,1,10,2,16,2,
+    6,1,14,2,114,106,0,0,0,99,2,0,0,0,0,0,
+    0,0,0,0,0,0,4,0,0,0,10,0,0,0,67,0,
+    0,0,115,204,0,0,0,124,0,106,0,125,2,116,1,124,
+    2,131,1,143,180,1,0,116,2,106,3,160,4,124,2,161,
+    1,124,1,107,9,114,54,100,1,160,5,124,2,161,1,125,
+    3,116,6,124,3,124,2,100,2,141,2,130,1,122,106,124,
+    0,106,8,100,3,107,8,114,106,124,0,106,9,100,3,107,
+    8,114,90,116,6,100,4,124,0,106,0,100,2,141,2,130,
+    1,116,10,124,0,124,1,100,5,100,6,141,3,1,0,110,
+    52,116,10,124,0,124,1,100,5,100,6,141,3,1,0,116,
+    11,124,0,106,8,100,7,131,2,115,146,124,0,106,8,160,
+    12,124,2,161,1,1,0,110,12,124,0,106,8,160,13,124,
+    1,161,1,1,0,87,0,53,0,116,2,106,3,160,7,124,
+    0,106,0,161,1,125,1,124,1,116,2,106,3,124,0,106,
+    0,60,0,88,0,87,0,53,0,81,0,82,0,88,0,124,
+    1,83,0,41,8,122,70,69,120,101,99,117,116,101,32,116,
+    104,101,32,115,112,101,99,39,115,32,115,112,101,99,105,102,
+    105,101,100,32,109,111,100,117,108,101,32,105,110,32,97,110,
+    32,101,120,105,115,116,105,110,103,32,109,111,100,117,108,101,
+    39,115,32,110,97,109,101,115,112,97,99,101,46,122,30,109,
+    111,100,117,108,101,32,123,33,114,125,32,110,111,116,32,105,
+    110,32,115,121,115,46,109,111,100,117,108,101,115,114,16,0,
+    0,0,78,250,14,109,105,115,115,105,110,103,32,108,111,97,
+    100,101,114,84,114,142,0,0,0,114,149,0,0,0,41,14,
+    114,17,0,0,0,114,49,0,0,0,114,15,0,0,0,114,
+    91,0,0,0,114,34,0,0,0,114,44,0,0,0,114,78,
+    0,0,0,218,3,112,111,112,114,108,0,0,0,114,115,0,
+    0,0,114,147,0,0,0,114,4,0,0,0,218,11,108,111,
+    97,100,95,109,111,100,117,108,101,114,149,0,0,0,41,4,
+    114,94,0,0,0,114,95,0,0,0,114,17,0,0,0,218,
+    3,109,115,103,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,92,0,0,0,71,2,0,0,115,34,0,0,
+    0,0,2,6,1,10,1,16,1,10,1,12,1,2,1,10,
+    1,10,1,14,2,16,2,14,1,12,4,14,2,16,4,14,
+    1,24,1,114,92,0,0,0,99,1,0,0,0,0,0,0,
+    0,0,0,0,0,2,0,0,0,8,0,0,0,67,0,0,
+    0,115,26,1,0,0,122,18,124,0,106,0,160,1,124,0,
+    106,2,161,1,1,0,87,0,110,52,1,0,1,0,1,0,
+    124,0,106,2,116,3,106,4,107,6,114,64,116,3,106,4,
+    160,5,124,0,106,2,161,1,125,1,124,1,116,3,106,4,
+    124,0,106,2,60,0,130,0,89,0,110,2,88,0,116,3,
+    106,4,160,5,124,0,106,2,161,1,125,1,124,1,116,3,
+    106,4,124,0,106,2,60,0,116,6,124,1,100,1,100,0,
+    131,3,100,0,107,8,114,148,122,12,124,0,106,0,124,1,
+    95,7,87,0,110,20,4,0,116,8,107,10,114,146,1,0,
+    1,0,1,0,89,0,110,2,88,0,116,6,124,1,100,2,
+    100,0,131,3,100,0,107,8,114,226,122,40,124,1,106,9,
+    124,1,95,10,116,11,124,1,100,3,131,2,115,202,124,0,
+    106,2,160,12,100,4,161,1,100,5,25,0,124,1,95,10,
+    87,0,110,20,4,0,116,8,107,10,114,224,1,0,1,0,
+    1,0,89,0,110,2,88,0,116,6,124,1,100,6,100,0,
+    131,3,100,0,107,8,144,1,114,22,122,10,124,0,124,1,
+    95,13,87,0,110,22,4,0,116,8,107,10,144,1,114,20,
+    1,0,1,0,1,0,89,0,110,2,88,0,124,1,83,0,
+    41,7,78,114,97,0,0,0,114,144,0,0,0,114,140,0,
+    0,0,114,127,0,0,0,114,22,0,0,0,114,104,0,0,
+    0,41,14,114,108,0,0,0,114,155,0,0,0,114,17,0,
+    0,0,114,15,0,0,0,114,91,0,0,0,114,154,0,0,
+    0,114,6,0,0,0,114,97,0,0,0,114,105,0,0,0,
+    114,1,0,0,0,114,144,0,0,0,114,4,0,0,0,114,
+    128,0,0,0,114,104,0,0,0,114,150,0,0,0,114,10,
+    0,0,0,114,10,0,0,0,114,11,0,0,0,218,25,95,
+    108,111,97,100,95,98,97,99,107,119,97,114,100,95,99,111,
+    109,112,97,116,105,98,108,101,101,2,0,0,115,54,0,0,
+    0,0,4,2,1,18,1,6,1,12,1,14,1,12,1,8,
+    3,14,1,12,1,16,1,2,1,12,1,14,1,6,1,16,
+    1,2,4,8,1,10,1,22,1,14,1,6,1,18,1,2,
+    1,10,1,16,1,6,1,114,157,0,0,0,99,1,0,0,
+    0,0,0,0,0,0,0,0,0,2,0,0,0,11,0,0,
+    0,67,0,0,0,115,220,0,0,0,124,0,106,0,100,0,
+    107,9,114,30,116,1,124,0,106,0,100,1,131,2,115,30,
+    116,2,124,0,131,1,83,0,116,3,124,0,131,1,125,1,
+    100,2,124,0,95,4,122,162,124,1,116,5,106,6,124,0,
+    106,7,60,0,122,52,124,0,106,0,100,0,107,8,114,96,
+    124,0,106,8,100,0,107,8,114,108,116,9,100,4,124,0,
+    106,7,100,5,141,2,130,1,110,12,124,0,106,0,160,10,
+    124,1,161,1,1,0,87,0,110,50,1,0,1,0,1,0,
+    122,14,116,5,106,6,124,0,106,7,61,0,87,0,110,20,
+    4,0,116,11,107,10,114,152,1,0,1,0,1,0,89,0,
+    110,2,88,0,130,0,89,0,110,2,88,0,116,5,106,6,
+    160,12,124,0,106,7,161,1,125,1,124,1,116,5,106,6,
+    124,0,106,7,60,0,116,13,100,6,124,0,106,7,124,0,
+    106,0,131,3,1,0,87,0,53,0,100,3,124,0,95,4,
+    88,0,124,1,83,0,41,7,78,114,149,0,0,0,84,70,
+    114,153,0,0,0,114,16,0,0,0,250,18,105,109,112,111,
+    114,116,32,123,33,114,125,32,35,32,123,33,114,125,41,14,
+    114,108,0,0,0,114,4,0,0,0,114,157,0,0,0,114,
+    151,0,0,0,218,13,95,105,110,105,116,105,97,108,105,122,
+    105,110,103,114,15,0,0,0,114,91,0,0,0,114,17,0,
+    0,0,114,115,0,0,0,114,78,0,0,0,114,149,0,0,
+    0,114,62,0,0,0,114,154,0,0,0,114,75,0,0,0,
+    114,150,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
+    11,0,0,0,218,14,95,108,111,97,100,95,117,110,108,111,
+    99,107,101,100,138,2,0,0,115,46,0,0,0,0,2,10,
+    2,12,1,8,2,8,5,6,1,2,1,12,1,2,1,10,
+    1,10,1,16,3,16,1,6,1,2,1,14,1,14,1,6,
+    1,8,5,14,1,12,1,20,2,8,2,114,160,0,0,0,
+    99,1,0,0,0,0,0,0,0,0,0,0,0,1,0,0,
+    0,10,0,0,0,67,0,0,0,115,42,0,0,0,116,0,
+    124,0,106,1,131,1,143,22,1,0,116,2,124,0,131,1,
+    87,0,2,0,53,0,81,0,82,0,163,0,83,0,81,0,
+    82,0,88,0,100,1,83,0,41,2,122,191,82,101,116,117,
+    114,110,32,97,32,110,101,119,32,109,111,100,117,108,101,32,
+    111,98,106,101,99,116,44,32,108,111,97,100,101,100,32,98,
+    121,32,116,104,101,32,115,112,101,99,39,115,32,108,111,97,
+    100,101,114,46,10,10,32,32,32,32,84,104,101,32,109,111,
+    100,117,108,101,32,105,115,32,110,111,116,32,97,100,100,101,
+    100,32,116,111,32,105,116,115,32,112,97,114,101,110,116,46,
+    10,10,32,32,32,32,73,102,32,97,32,109,111,100,117,108,
+    101,32,105,115,32,97,108,114,101,97,100,121,32,105,110,32,
+    115,121,115,46,109,111,100,117,108,101,115,44,32,116,104,97,
+    116,32,101,120,105,115,116,105,110,103,32,109,111,100,117,108,
+    101,32,103,101,116,115,10,32,32,32,32,99,108,111,98,98,
+    101,114,101,100,46,10,10,32,32,32,32,78,41,3,114,49,
+    0,0,0,114,17,0,0,0,114,160,0,0,0,169,1,114,
+    94,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,93,0,0,0,180,2,0,0,115,4,0,0,
+    0,0,9,12,1,114,93,0,0,0,99,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,4,0,0,0,64,
+    0,0,0,115,136,0,0,0,101,0,90,1,100,0,90,2,
+    100,1,90,3,101,4,100,2,100,3,132,0,131,1,90,5,
+    101,6,100,19,100,5,100,6,132,1,131,1,90,7,101,6,
+    100,20,100,7,100,8,132,1,131,1,90,8,101,6,100,9,
+    100,10,132,0,131,1,90,9,101,6,100,11,100,12,132,0,
+    131,1,90,10,101,6,101,11,100,13,100,14,132,0,131,1,
+    131,1,90,12,101,6,101,11,100,15,100,16,132,0,131,1,
+    131,1,90,13,101,6,101,11,100,17,100,18,132,0,131,1,
+    131,1,90,14,101,6,101,15,131,1,90,16,100,4,83,0,
+    41,21,218,15,66,117,105,108,116,105,110,73,109,112,111,114,
+    116,101,114,122,144,77,101,116,97,32,112,97,116,104,32,105,
+    109,112,111,114,116,32,102,111,114,32,98,117,105,108,116,45,
+    105,110,32,109,111,100,117,108,101,115,46,10,10,32,32,32,
+    32,65,108,108,32,109,101,116,104,111,100,115,32,97,114,101,
+    32,101,105,116,104,101,114,32,99,108,97,115,115,32,111,114,
+    32,115,116,97,116,105,99,32,109,101,116,104,111,100,115,32,
+    116,111,32,97,118,111,105,100,32,116,104,101,32,110,101,101,
+    100,32,116,111,10,32,32,32,32,105,110,115,116,97,110,116,
+    105,97,116,101,32,116,104,101,32,99,108,97,115,115,46,10,
+    10,32,32,32,32,99,1,0,0,0,0,0,0,0,0,0,
+    0,0,1,0,0,0,3,0,0,0,67,0,0,0,115,12,
+    0,0,0,100,1,160,0,124,0,106,1,161,1,83,0,41,
+    2,250,115,82,101,116,117,114,110,32,114,101,112,114,32,102,
+    111,114,32,116,104,101,32,109,111,100,117,108,101,46,10,10,
+    32,32,32,32,32,32,32,32,84,104,101,32,109,101,116,104,
+    111,100,32,105,115,32,100,101,112,114,101,99,97,116,101,100,
+    46,32,32,84,104,101,32,105,109,112,111,114,116,32,109,97,
+    99,104,105,110,101,114,121,32,100,111,101,115,32,116,104,101,
+    32,106,111,98,32,105,116,115,101,108,102,46,10,10,32,32,
+    32,32,32,32,32,32,122,24,60,109,111,100,117,108,101,32,
+    123,33,114,125,32,40,98,117,105,108,116,45,105,110,41,62,
+    41,2,114,44,0,0,0,114,1,0,0,0,41,1,114,95,
+    0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,
+    0,0,114,98,0,0,0,204,2,0,0,115,2,0,0,0,
+    0,7,122,27,66,117,105,108,116,105,110,73,109,112,111,114,
+    116,101,114,46,109,111,100,117,108,101,95,114,101,112,114,78,
+    99,4,0,0,0,0,0,0,0,0,0,0,0,4,0,0,
+    0,5,0,0,0,67,0,0,0,115,44,0,0,0,124,2,
+    100,0,107,9,114,12,100,0,83,0,116,0,160,1,124,1,
+    161,1,114,36,116,2,124,1,124,0,100,1,100,2,141,3,
+    83,0,100,0,83,0,100,0,83,0,41,3,78,122,8,98,
+    117,105,108,116,45,105,110,114,136,0,0,0,41,3,114,56,
+    0,0,0,90,10,105,115,95,98,117,105,108,116,105,110,114,
+    90,0,0,0,169,4,218,3,99,108,115,114,80,0,0,0,
+    218,4,112,97,116,104,218,6,116,97,114,103,101,116,114,10,
+    0,0,0,114,10,0,0,0,114,11,0,0,0,218,9,102,
+    105,110,100,95,115,112,101,99,213,2,0,0,115,10,0,0,
+    0,0,2,8,1,4,1,10,1,14,2,122,25,66,117,105,
+    108,116,105,110,73,109,112,111,114,116,101,114,46,102,105,110,
+    100,95,115,112,101,99,99,3,0,0,0,0,0,0,0,0,
+    0,0,0,4,0,0,0,4,0,0,0,67,0,0,0,115,
+    30,0,0,0,124,0,160,0,124,1,124,2,161,2,125,3,
+    124,3,100,1,107,9,114,26,124,3,106,1,83,0,100,1,
+    83,0,41,2,122,175,70,105,110,100,32,116,104,101,32,98,
+    117,105,108,116,45,105,110,32,109,111,100,117,108,101,46,10,
+    10,32,32,32,32,32,32,32,32,73,102,32,39,112,97,116,
+    104,39,32,105,115,32,101,118,101,114,32,115,112,101,99,105,
+    102,105,101,100,32,116,104,101,110,32,116,104,101,32,115,101,
+    97,114,99,104,32,105,115,32,99,111,110,115,105,100,101,114,
+    101,100,32,97,32,102,97,105,108,117,114,101,46,10,10,32,
+    32,32,32,32,32,32,32,84,104,105,115,32,109,101,116,104,
+    111,100,32,105,115,32,100,101,112,114,101,99,97,116,101,100,
+    46,32,32,85,115,101,32,102,105,110,100,95,115,112,101,99,
+    40,41,32,105,110,115,116,101,97,100,46,10,10,32,32,32,
+    32,32,32,32,32,78,41,2,114,168,0,0,0,114,108,0,
+    0,0,41,4,114,165,0,0,0,114,80,0,0,0,114,166,
+    0,0,0,114,94,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,218,11,102,105,110,100,95,109,111,
+    100,117,108,101,222,2,0,0,115,4,0,0,0,0,9,12,
+    1,122,27,66,117,105,108,116,105,110,73,109,112,111,114,116,
+    101,114,46,102,105,110,100,95,109,111,100,117,108,101,99,2,
+    0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,4,
+    0,0,0,67,0,0,0,115,46,0,0,0,124,1,106,0,
+    116,1,106,2,107,7,114,34,116,3,100,1,160,4,124,1,
+    106,0,161,1,124,1,106,0,100,2,141,2,130,1,116,5,
+    116,6,106,7,124,1,131,2,83,0,41,3,122,24,67,114,
+    101,97,116,101,32,97,32,98,117,105,108,116,45,105,110,32,
+    109,111,100,117,108,101,114,76,0,0,0,114,16,0,0,0,
+    41,8,114,17,0,0,0,114,15,0,0,0,114,77,0,0,
     0,114,78,0,0,0,114,44,0,0,0,114,66,0,0,0,
-    218,17,103,101,116,95,102,114,111,122,101,110,95,111,98,106,
-    101,99,116,218,4,101,120,101,99,114,7,0,0,0,41,3,
-    114,95,0,0,0,114,17,0,0,0,218,4,99,111,100,101,
-    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
-    149,0,0,0,52,3,0,0,115,14,0,0,0,0,2,8,
-    1,10,1,10,1,2,255,6,2,12,1,122,26,70,114,111,
-    122,101,110,73,109,112,111,114,116,101,114,46,101,120,101,99,
+    114,56,0,0,0,90,14,99,114,101,97,116,101,95,98,117,
+    105,108,116,105,110,41,2,114,30,0,0,0,114,94,0,0,
+    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,148,0,0,0,234,2,0,0,115,10,0,0,0,0,3,
+    12,1,12,1,4,255,6,2,122,29,66,117,105,108,116,105,
+    110,73,109,112,111,114,116,101,114,46,99,114,101,97,116,101,
     95,109,111,100,117,108,101,99,2,0,0,0,0,0,0,0,
     0,0,0,0,2,0,0,0,3,0,0,0,67,0,0,0,
-    115,10,0,0,0,116,0,124,0,124,1,131,2,83,0,41,
-    1,122,95,76,111,97,100,32,97,32,102,114,111,122,101,110,
-    32,109,111,100,117,108,101,46,10,10,32,32,32,32,32,32,
-    32,32,84,104,105,115,32,109,101,116,104,111,100,32,105,115,
-    32,100,101,112,114,101,99,97,116,101,100,46,32,32,85,115,
-    101,32,101,120,101,99,95,109,111,100,117,108,101,40,41,32,
-    105,110,115,116,101,97,100,46,10,10,32,32,32,32,32,32,
-    32,32,41,1,114,96,0,0,0,114,167,0,0,0,114,10,
-    0,0,0,114,10,0,0,0,114,11,0,0,0,114,155,0,
-    0,0,61,3,0,0,115,2,0,0,0,0,7,122,26,70,
-    114,111,122,101,110,73,109,112,111,114,116,101,114,46,108,111,
-    97,100,95,109,111,100,117,108,101,99,2,0,0,0,0,0,
-    0,0,0,0,0,0,2,0,0,0,3,0,0,0,67,0,
-    0,0,115,10,0,0,0,116,0,160,1,124,1,161,1,83,
-    0,41,1,122,45,82,101,116,117,114,110,32,116,104,101,32,
-    99,111,100,101,32,111,98,106,101,99,116,32,102,111,114,32,
-    116,104,101,32,102,114,111,122,101,110,32,109,111,100,117,108,
-    101,46,41,2,114,56,0,0,0,114,174,0,0,0,114,167,
+    115,16,0,0,0,116,0,116,1,106,2,124,1,131,2,1,
+    0,100,1,83,0,41,2,122,22,69,120,101,99,32,97,32,
+    98,117,105,108,116,45,105,110,32,109,111,100,117,108,101,78,
+    41,3,114,66,0,0,0,114,56,0,0,0,90,12,101,120,
+    101,99,95,98,117,105,108,116,105,110,41,2,114,30,0,0,
+    0,114,95,0,0,0,114,10,0,0,0,114,10,0,0,0,
+    114,11,0,0,0,114,149,0,0,0,242,2,0,0,115,2,
+    0,0,0,0,3,122,27,66,117,105,108,116,105,110,73,109,
+    112,111,114,116,101,114,46,101,120,101,99,95,109,111,100,117,
+    108,101,99,2,0,0,0,0,0,0,0,0,0,0,0,2,
+    0,0,0,1,0,0,0,67,0,0,0,115,4,0,0,0,
+    100,1,83,0,41,2,122,57,82,101,116,117,114,110,32,78,
+    111,110,101,32,97,115,32,98,117,105,108,116,45,105,110,32,
+    109,111,100,117,108,101,115,32,100,111,32,110,111,116,32,104,
+    97,118,101,32,99,111,100,101,32,111,98,106,101,99,116,115,
+    46,78,114,10,0,0,0,169,2,114,165,0,0,0,114,80,
     0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,
-    0,0,114,168,0,0,0,70,3,0,0,115,2,0,0,0,
-    0,4,122,23,70,114,111,122,101,110,73,109,112,111,114,116,
-    101,114,46,103,101,116,95,99,111,100,101,99,2,0,0,0,
-    0,0,0,0,0,0,0,0,2,0,0,0,1,0,0,0,
-    67,0,0,0,115,4,0,0,0,100,1,83,0,41,2,122,
-    54,82,101,116,117,114,110,32,78,111,110,101,32,97,115,32,
-    102,114,111,122,101,110,32,109,111,100,117,108,101,115,32,100,
-    111,32,110,111,116,32,104,97,118,101,32,115,111,117,114,99,
-    101,32,99,111,100,101,46,78,114,10,0,0,0,114,167,0,
-    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,114,169,0,0,0,76,3,0,0,115,2,0,0,0,0,
-    4,122,25,70,114,111,122,101,110,73,109,112,111,114,116,101,
+    0,0,218,8,103,101,116,95,99,111,100,101,247,2,0,0,
+    115,2,0,0,0,0,4,122,24,66,117,105,108,116,105,110,
+    73,109,112,111,114,116,101,114,46,103,101,116,95,99,111,100,
+    101,99,2,0,0,0,0,0,0,0,0,0,0,0,2,0,
+    0,0,1,0,0,0,67,0,0,0,115,4,0,0,0,100,
+    1,83,0,41,2,122,56,82,101,116,117,114,110,32,78,111,
+    110,101,32,97,115,32,98,117,105,108,116,45,105,110,32,109,
+    111,100,117,108,101,115,32,100,111,32,110,111,116,32,104,97,
+    118,101,32,115,111,117,114,99,101,32,99,111,100,101,46,78,
+    114,10,0,0,0,114,170,0,0,0,114,10,0,0,0,114,
+    10,0,0,0,114,11,0,0,0,218,10,103,101,116,95,115,
+    111,117,114,99,101,253,2,0,0,115,2,0,0,0,0,4,
+    122,26,66,117,105,108,116,105,110,73,109,112,111,114,116,101,
     114,46,103,101,116,95,115,111,117,114,99,101,99,2,0,0,
-    0,0,0,0,0,0,0,0,0,2,0,0,0,3,0,0,
-    0,67,0,0,0,115,10,0,0,0,116,0,160,1,124,1,
-    161,1,83,0,41,1,122,46,82,101,116,117,114,110,32,84,
-    114,117,101,32,105,102,32,116,104,101,32,102,114,111,122,101,
-    110,32,109,111,100,117,108,101,32,105,115,32,97,32,112,97,
-    99,107,97,103,101,46,41,2,114,56,0,0,0,90,17,105,
-    115,95,102,114,111,122,101,110,95,112,97,99,107,97,103,101,
-    114,167,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
-    11,0,0,0,114,114,0,0,0,82,3,0,0,115,2,0,
-    0,0,0,4,122,25,70,114,111,122,101,110,73,109,112,111,
-    114,116,101,114,46,105,115,95,112,97,99,107,97,103,101,41,
-    2,78,78,41,1,78,41,17,114,1,0,0,0,114,0,0,
-    0,0,114,2,0,0,0,114,3,0,0,0,114,137,0,0,
-    0,114,170,0,0,0,114,98,0,0,0,114,171,0,0,0,
-    114,165,0,0,0,114,166,0,0,0,114,148,0,0,0,114,
-    149,0,0,0,114,155,0,0,0,114,89,0,0,0,114,168,
-    0,0,0,114,169,0,0,0,114,114,0,0,0,114,10,0,
-    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,114,172,0,0,0,12,3,0,0,115,46,0,0,0,8,
-    2,4,7,4,2,2,1,10,8,2,1,12,6,2,1,12,
-    8,2,1,10,3,2,1,10,8,2,1,10,8,2,1,2,
-    1,12,4,2,1,2,1,12,4,2,1,2,1,114,172,0,
-    0,0,99,0,0,0,0,0,0,0,0,0,0,0,0,0,
-    0,0,0,2,0,0,0,64,0,0,0,115,32,0,0,0,
-    101,0,90,1,100,0,90,2,100,1,90,3,100,2,100,3,
-    132,0,90,4,100,4,100,5,132,0,90,5,100,6,83,0,
-    41,7,218,18,95,73,109,112,111,114,116,76,111,99,107,67,
-    111,110,116,101,120,116,122,36,67,111,110,116,101,120,116,32,
-    109,97,110,97,103,101,114,32,102,111,114,32,116,104,101,32,
-    105,109,112,111,114,116,32,108,111,99,107,46,99,1,0,0,
-    0,0,0,0,0,0,0,0,0,1,0,0,0,2,0,0,
-    0,67,0,0,0,115,12,0,0,0,116,0,160,1,161,0,
-    1,0,100,1,83,0,41,2,122,24,65,99,113,117,105,114,
-    101,32,116,104,101,32,105,109,112,111,114,116,32,108,111,99,
-    107,46,78,41,2,114,56,0,0,0,114,57,0,0,0,114,
-    46,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
-    0,0,0,114,53,0,0,0,95,3,0,0,115,2,0,0,
-    0,0,2,122,28,95,73,109,112,111,114,116,76,111,99,107,
-    67,111,110,116,101,120,116,46,95,95,101,110,116,101,114,95,
-    95,99,4,0,0,0,0,0,0,0,0,0,0,0,4,0,
-    0,0,2,0,0,0,67,0,0,0,115,12,0,0,0,116,
-    0,160,1,161,0,1,0,100,1,83,0,41,2,122,60,82,
-    101,108,101,97,115,101,32,116,104,101,32,105,109,112,111,114,
-    116,32,108,111,99,107,32,114,101,103,97,114,100,108,101,115,
-    115,32,111,102,32,97,110,121,32,114,97,105,115,101,100,32,
-    101,120,99,101,112,116,105,111,110,115,46,78,41,2,114,56,
-    0,0,0,114,58,0,0,0,41,4,114,30,0,0,0,218,
-    8,101,120,99,95,116,121,112,101,218,9,101,120,99,95,118,
-    97,108,117,101,218,13,101,120,99,95,116,114,97,99,101,98,
-    97,99,107,114,10,0,0,0,114,10,0,0,0,114,11,0,
-    0,0,114,55,0,0,0,99,3,0,0,115,2,0,0,0,
-    0,2,122,27,95,73,109,112,111,114,116,76,111,99,107,67,
-    111,110,116,101,120,116,46,95,95,101,120,105,116,95,95,78,
-    41,6,114,1,0,0,0,114,0,0,0,0,114,2,0,0,
-    0,114,3,0,0,0,114,53,0,0,0,114,55,0,0,0,
-    114,10,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
-    11,0,0,0,114,177,0,0,0,91,3,0,0,115,6,0,
-    0,0,8,2,4,2,8,4,114,177,0,0,0,99,3,0,
-    0,0,0,0,0,0,0,0,0,0,5,0,0,0,5,0,
-    0,0,67,0,0,0,115,64,0,0,0,124,1,160,0,100,
-    1,124,2,100,2,24,0,161,2,125,3,116,1,124,3,131,
-    1,124,2,107,0,114,36,116,2,100,3,131,1,130,1,124,
-    3,100,4,25,0,125,4,124,0,114,60,100,5,160,3,124,
-    4,124,0,161,2,83,0,124,4,83,0,41,6,122,50,82,
-    101,115,111,108,118,101,32,97,32,114,101,108,97,116,105,118,
-    101,32,109,111,100,117,108,101,32,110,97,109,101,32,116,111,
-    32,97,110,32,97,98,115,111,108,117,116,101,32,111,110,101,
-    46,114,127,0,0,0,114,37,0,0,0,122,50,97,116,116,
+    0,0,0,0,0,0,0,0,0,2,0,0,0,1,0,0,
+    0,67,0,0,0,115,4,0,0,0,100,1,83,0,41,2,
+    122,52,82,101,116,117,114,110,32,70,97,108,115,101,32,97,
+    115,32,98,117,105,108,116,45,105,110,32,109,111,100,117,108,
+    101,115,32,97,114,101,32,110,101,118,101,114,32,112,97,99,
+    107,97,103,101,115,46,70,114,10,0,0,0,114,170,0,0,
+    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,114,0,0,0,3,3,0,0,115,2,0,0,0,0,4,
+    122,26,66,117,105,108,116,105,110,73,109,112,111,114,116,101,
+    114,46,105,115,95,112,97,99,107,97,103,101,41,2,78,78,
+    41,1,78,41,17,114,1,0,0,0,114,0,0,0,0,114,
+    2,0,0,0,114,3,0,0,0,218,12,115,116,97,116,105,
+    99,109,101,116,104,111,100,114,98,0,0,0,218,11,99,108,
+    97,115,115,109,101,116,104,111,100,114,168,0,0,0,114,169,
+    0,0,0,114,148,0,0,0,114,149,0,0,0,114,85,0,
+    0,0,114,171,0,0,0,114,172,0,0,0,114,114,0,0,
+    0,114,96,0,0,0,114,155,0,0,0,114,10,0,0,0,
+    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
+    162,0,0,0,195,2,0,0,115,42,0,0,0,8,2,4,
+    7,2,1,10,8,2,1,12,8,2,1,12,11,2,1,10,
+    7,2,1,10,4,2,1,2,1,12,4,2,1,2,1,12,
+    4,2,1,2,1,12,4,114,162,0,0,0,99,0,0,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,4,0,0,
+    0,64,0,0,0,115,144,0,0,0,101,0,90,1,100,0,
+    90,2,100,1,90,3,100,2,90,4,101,5,100,3,100,4,
+    132,0,131,1,90,6,101,7,100,22,100,6,100,7,132,1,
+    131,1,90,8,101,7,100,23,100,8,100,9,132,1,131,1,
+    90,9,101,7,100,10,100,11,132,0,131,1,90,10,101,5,
+    100,12,100,13,132,0,131,1,90,11,101,7,100,14,100,15,
+    132,0,131,1,90,12,101,7,101,13,100,16,100,17,132,0,
+    131,1,131,1,90,14,101,7,101,13,100,18,100,19,132,0,
+    131,1,131,1,90,15,101,7,101,13,100,20,100,21,132,0,
+    131,1,131,1,90,16,100,5,83,0,41,24,218,14,70,114,
+    111,122,101,110,73,109,112,111,114,116,101,114,122,142,77,101,
+    116,97,32,112,97,116,104,32,105,109,112,111,114,116,32,102,
+    111,114,32,102,114,111,122,101,110,32,109,111,100,117,108,101,
+    115,46,10,10,32,32,32,32,65,108,108,32,109,101,116,104,
+    111,100,115,32,97,114,101,32,101,105,116,104,101,114,32,99,
+    108,97,115,115,32,111,114,32,115,116,97,116,105,99,32,109,
+    101,116,104,111,100,115,32,116,111,32,97,118,111,105,100,32,
+    116,104,101,32,110,101,101,100,32,116,111,10,32,32,32,32,
+    105,110,115,116,97,110,116,105,97,116,101,32,116,104,101,32,
+    99,108,97,115,115,46,10,10,32,32,32,32,90,6,102,114,
+    111,122,101,110,99,1,0,0,0,0,0,0,0,0,0,0,
+    0,1,0,0,0,4,0,0,0,67,0,0,0,115,16,0,
+    0,0,100,1,160,0,124,0,106,1,116,2,106,3,161,2,
+    83,0,41,2,114,163,0,0,0,114,152,0,0,0,41,4,
+    114,44,0,0,0,114,1,0,0,0,114,175,0,0,0,114,
+    137,0,0,0,41,1,218,1,109,114,10,0,0,0,114,10,
+    0,0,0,114,11,0,0,0,114,98,0,0,0,23,3,0,
+    0,115,2,0,0,0,0,7,122,26,70,114,111,122,101,110,
+    73,109,112,111,114,116,101,114,46,109,111,100,117,108,101,95,
+    114,101,112,114,78,99,4,0,0,0,0,0,0,0,0,0,
+    0,0,4,0,0,0,5,0,0,0,67,0,0,0,115,34,
+    0,0,0,116,0,160,1,124,1,161,1,114,26,116,2,124,
+    1,124,0,124,0,106,3,100,1,141,3,83,0,100,0,83,
+    0,100,0,83,0,41,2,78,114,136,0,0,0,41,4,114,
+    56,0,0,0,114,87,0,0,0,114,90,0,0,0,114,137,
+    0,0,0,114,164,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,114,168,0,0,0,32,3,0,0,
+    115,6,0,0,0,0,2,10,1,16,2,122,24,70,114,111,
+    122,101,110,73,109,112,111,114,116,101,114,46,102,105,110,100,
+    95,115,112,101,99,99,3,0,0,0,0,0,0,0,0,0,
+    0,0,3,0,0,0,3,0,0,0,67,0,0,0,115,18,
+    0,0,0,116,0,160,1,124,1,161,1,114,14,124,0,83,
+    0,100,1,83,0,41,2,122,93,70,105,110,100,32,97,32,
+    102,114,111,122,101,110,32,109,111,100,117,108,101,46,10,10,
+    32,32,32,32,32,32,32,32,84,104,105,115,32,109,101,116,
+    104,111,100,32,105,115,32,100,101,112,114,101,99,97,116,101,
+    100,46,32,32,85,115,101,32,102,105,110,100,95,115,112,101,
+    99,40,41,32,105,110,115,116,101,97,100,46,10,10,32,32,
+    32,32,32,32,32,32,78,41,2,114,56,0,0,0,114,87,
+    0,0,0,41,3,114,165,0,0,0,114,80,0,0,0,114,
+    166,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,169,0,0,0,39,3,0,0,115,2,0,0,
+    0,0,7,122,26,70,114,111,122,101,110,73,109,112,111,114,
+    116,101,114,46,102,105,110,100,95,109,111,100,117,108,101,99,
+    2,0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,
+    1,0,0,0,67,0,0,0,115,4,0,0,0,100,1,83,
+    0,41,2,122,42,85,115,101,32,100,101,102,97,117,108,116,
+    32,115,101,109,97,110,116,105,99,115,32,102,111,114,32,109,
+    111,100,117,108,101,32,99,114,101,97,116,105,111,110,46,78,
+    114,10,0,0,0,41,2,114,165,0,0,0,114,94,0,0,
+    0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,148,0,0,0,48,3,0,0,115,2,0,0,0,0,2,
+    122,28,70,114,111,122,101,110,73,109,112,111,114,116,101,114,
+    46,99,114,101,97,116,101,95,109,111,100,117,108,101,99,1,
+    0,0,0,0,0,0,0,0,0,0,0,3,0,0,0,4,
+    0,0,0,67,0,0,0,115,64,0,0,0,124,0,106,0,
+    106,1,125,1,116,2,160,3,124,1,161,1,115,36,116,4,
+    100,1,160,5,124,1,161,1,124,1,100,2,141,2,130,1,
+    116,6,116,2,106,7,124,1,131,2,125,2,116,8,124,2,
+    124,0,106,9,131,2,1,0,100,0,83,0,114,86,0,0,
+    0,41,10,114,104,0,0,0,114,17,0,0,0,114,56,0,
+    0,0,114,87,0,0,0,114,78,0,0,0,114,44,0,0,
+    0,114,66,0,0,0,218,17,103,101,116,95,102,114,111,122,
+    101,110,95,111,98,106,101,99,116,218,4,101,120,101,99,114,
+    7,0,0,0,41,3,114,95,0,0,0,114,17,0,0,0,
+    218,4,99,111,100,101,114,10,0,0,0,114,10,0,0,0,
+    114,11,0,0,0,114,149,0,0,0,52,3,0,0,115,14,
+    0,0,0,0,2,8,1,10,1,10,1,2,255,6,2,12,
+    1,122,26,70,114,111,122,101,110,73,109,112,111,114,116,101,
+    114,46,101,120,101,99,95,109,111,100,117,108,101,99,2,0,
+    0,0,0,0,0,0,0,0,0,0,2,0,0,0,3,0,
+    0,0,67,0,0,0,115,10,0,0,0,116,0,124,0,124,
+    1,131,2,83,0,41,1,122,95,76,111,97,100,32,97,32,
+    102,114,111,122,101,110,32,109,111,100,117,108,101,46,10,10,
+    32,32,32,32,32,32,32,32,84,104,105,115,32,109,101,116,
+    104,111,100,32,105,115,32,100,101,112,114,101,99,97,116,101,
+    100,46,32,32,85,115,101,32,101,120,101,99,95,109,111,100,
+    117,108,101,40,41,32,105,110,115,116,101,97,100,46,10,10,
+    32,32,32,32,32,32,32,32,41,1,114,96,0,0,0,114,
+    170,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,114,155,0,0,0,61,3,0,0,115,2,0,0,
+    0,0,7,122,26,70,114,111,122,101,110,73,109,112,111,114,
+    116,101,114,46,108,111,97,100,95,109,111,100,117,108,101,99,
+    2,0,0,0,0,0,0,0,0,0,0,0,2,0,0,0,
+    3,0,0,0,67,0,0,0,115,10,0,0,0,116,0,160,
+    1,124,1,161,1,83,0,41,1,122,45,82,101,116,117,114,
+    110,32,116,104,101,32,99,111,100,101,32,111,98,106,101,99,
+    116,32,102,111,114,32,116,104,101,32,102,114,111,122,101,110,
+    32,109,111,100,117,108,101,46,41,2,114,56,0,0,0,114,
+    177,0,0,0,114,170,0,0,0,114,10,0,0,0,114,10,
+    0,0,0,114,11,0,0,0,114,171,0,0,0,70,3,0,
+    0,115,2,0,0,0,0,4,122,23,70,114,111,122,101,110,
+    73,109,112,111,114,116,101,114,46,103,101,116,95,99,111,100,
+    101,99,2,0,0,0,0,0,0,0,0,0,0,0,2,0,
+    0,0,1,0,0,0,67,0,0,0,115,4,0,0,0,100,
+    1,83,0,41,2,122,54,82,101,116,117,114,110,32,78,111,
+    110,101,32,97,115,32,102,114,111,122,101,110,32,109,111,100,
+    117,108,101,115,32,100,111,32,110,111,116,32,104,97,118,101,
+    32,115,111,117,114,99,101,32,99,111,100,101,46,78,114,10,
+    0,0,0,114,170,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,114,172,0,0,0,76,3,0,0,
+    115,2,0,0,0,0,4,122,25,70,114,111,122,101,110,73,
+    109,112,111,114,116,101,114,46,103,101,116,95,115,111,117,114,
+    99,101,99,2,0,0,0,0,0,0,0,0,0,0,0,2,
+    0,0,0,3,0,0,0,67,0,0,0,115,10,0,0,0,
+    116,0,160,1,124,1,161,1,83,0,41,1,122,46,82,101,
+    116,117,114,110,32,84,114,117,101,32,105,102,32,116,104,101,
+    32,102,114,111,122,101,110,32,109,111,100,117,108,101,32,105,
+    115,32,97,32,112,97,99,107,97,103,101,46,41,2,114,56,
+    0,0,0,90,17,105,115,95,102,114,111,122,101,110,95,112,
+    97,99,107,97,103,101,114,170,0,0,0,114,10,0,0,0,
+    114,10,0,0,0,114,11,0,0,0,114,114,0,0,0,82,
+    3,0,0,115,2,0,0,0,0,4,122,25,70,114,111,122,
+    101,110,73,109,112,111,114,116,101,114,46,105,115,95,112,97,
+    99,107,97,103,101,41,2,78,78,41,1,78,41,17,114,1,
+    0,0,0,114,0,0,0,0,114,2,0,0,0,114,3,0,
+    0,0,114,137,0,0,0,114,173,0,0,0,114,98,0,0,
+    0,114,174,0,0,0,114,168,0,0,0,114,169,0,0,0,
+    114,148,0,0,0,114,149,0,0,0,114,155,0,0,0,114,
+    89,0,0,0,114,171,0,0,0,114,172,0,0,0,114,114,
+    0,0,0,114,10,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,114,175,0,0,0,12,3,0,0,
+    115,46,0,0,0,8,2,4,7,4,2,2,1,10,8,2,
+    1,12,6,2,1,12,8,2,1,10,3,2,1,10,8,2,
+    1,10,8,2,1,2,1,12,4,2,1,2,1,12,4,2,
+    1,2,1,114,175,0,0,0,99,0,0,0,0,0,0,0,
+    0,0,0,0,0,0,0,0,0,2,0,0,0,64,0,0,
+    0,115,32,0,0,0,101,0,90,1,100,0,90,2,100,1,
+    90,3,100,2,100,3,132,0,90,4,100,4,100,5,132,0,
+    90,5,100,6,83,0,41,7,218,18,95,73,109,112,111,114,
+    116,76,111,99,107,67,111,110,116,101,120,116,122,36,67,111,
+    110,116,101,120,116,32,109,97,110,97,103,101,114,32,102,111,
+    114,32,116,104,101,32,105,109,112,111,114,116,32,108,111,99,
+    107,46,99,1,0,0,0,0,0,0,0,0,0,0,0,1,
+    0,0,0,2,0,0,0,67,0,0,0,115,12,0,0,0,
+    116,0,160,1,161,0,1,0,100,1,83,0,41,2,122,24,
+    65,99,113,117,105,114,101,32,116,104,101,32,105,109,112,111,
+    114,116,32,108,111,99,107,46,78,41,2,114,56,0,0,0,
+    114,57,0,0,0,114,46,0,0,0,114,10,0,0,0,114,
+    10,0,0,0,114,11,0,0,0,114,53,0,0,0,95,3,
+    0,0,115,2,0,0,0,0,2,122,28,95,73,109,112,111,
+    114,116,76,111,99,107,67,111,110,116,101,120,116,46,95,95,
+    101,110,116,101,114,95,95,99,4,0,0,0,0,0,0,0,
+    0,0,0,0,4,0,0,0,2,0,0,0,67,0,0,0,
+    115,12,0,0,0,116,0,160,1,161,0,1,0,100,1,83,
+    0,41,2,122,60,82,101,108,101,97,115,101,32,116,104,101,
+    32,105,109,112,111,114,116,32,108,111,99,107,32,114,101,103,
+    97,114,100,108,101,115,115,32,111,102,32,97,110,121,32,114,
+    97,105,115,101,100,32,101,120,99,101,112,116,105,111,110,115,
+    46,78,41,2,114,56,0,0,0,114,58,0,0,0,41,4,
+    114,30,0,0,0,218,8,101,120,99,95,116,121,112,101,218,
+    9,101,120,99,95,118,97,108,117,101,218,13,101,120,99,95,
+    116,114,97,99,101,98,97,99,107,114,10,0,0,0,114,10,
+    0,0,0,114,11,0,0,0,114,55,0,0,0,99,3,0,
+    0,115,2,0,0,0,0,2,122,27,95,73,109,112,111,114,
+    116,76,111,99,107,67,111,110,116,101,120,116,46,95,95,101,
+    120,105,116,95,95,78,41,6,114,1,0,0,0,114,0,0,
+    0,0,114,2,0,0,0,114,3,0,0,0,114,53,0,0,
+    0,114,55,0,0,0,114,10,0,0,0,114,10,0,0,0,
+    114,10,0,0,0,114,11,0,0,0,114,180,0,0,0,91,
+    3,0,0,115,6,0,0,0,8,2,4,2,8,4,114,180,
+    0,0,0,99,3,0,0,0,0,0,0,0,0,0,0,0,
+    5,0,0,0,5,0,0,0,67,0,0,0,115,64,0,0,
+    0,124,1,160,0,100,1,124,2,100,2,24,0,161,2,125,
+    3,116,1,124,3,131,1,124,2,107,0,114,36,116,2,100,
+    3,131,1,130,1,124,3,100,4,25,0,125,4,124,0,114,
+    60,100,5,160,3,124,4,124,0,161,2,83,0,124,4,83,
+    0,41,6,122,50,82,101,115,111,108,118,101,32,97,32,114,
+    101,108,97,116,105,118,101,32,109,111,100,117,108,101,32,110,
+    97,109,101,32,116,111,32,97,110,32,97,98,115,111,108,117,
+    116,101,32,111,110,101,46,114,127,0,0,0,114,37,0,0,
+    0,122,50,97,116,116,101,109,112,116,101,100,32,114,101,108,
+    97,116,105,118,101,32,105,109,112,111,114,116,32,98,101,121,
+    111,110,100,32,116,111,112,45,108,101,118,101,108,32,112,97,
+    99,107,97,103,101,114,22,0,0,0,250,5,123,125,46,123,
+    125,41,4,218,6,114,115,112,108,105,116,218,3,108,101,110,
+    114,78,0,0,0,114,44,0,0,0,41,5,114,17,0,0,
+    0,218,7,112,97,99,107,97,103,101,218,5,108,101,118,101,
+    108,90,4,98,105,116,115,90,4,98,97,115,101,114,10,0,
+    0,0,114,10,0,0,0,114,11,0,0,0,218,13,95,114,
+    101,115,111,108,118,101,95,110,97,109,101,104,3,0,0,115,
+    10,0,0,0,0,2,16,1,12,1,8,1,8,1,114,189,
+    0,0,0,99,3,0,0,0,0,0,0,0,0,0,0,0,
+    4,0,0,0,4,0,0,0,67,0,0,0,115,34,0,0,
+    0,124,0,160,0,124,1,124,2,161,2,125,3,124,3,100,
+    0,107,8,114,24,100,0,83,0,116,1,124,1,124,3,131,
+    2,83,0,114,13,0,0,0,41,2,114,169,0,0,0,114,
+    90,0,0,0,41,4,218,6,102,105,110,100,101,114,114,17,
+    0,0,0,114,166,0,0,0,114,108,0,0,0,114,10,0,
+    0,0,114,10,0,0,0,114,11,0,0,0,218,17,95,102,
+    105,110,100,95,115,112,101,99,95,108,101,103,97,99,121,113,
+    3,0,0,115,8,0,0,0,0,3,12,1,8,1,4,1,
+    114,191,0,0,0,99,3,0,0,0,0,0,0,0,0,0,
+    0,0,10,0,0,0,10,0,0,0,67,0,0,0,115,12,
+    1,0,0,116,0,106,1,125,3,124,3,100,1,107,8,114,
+    22,116,2,100,2,131,1,130,1,124,3,115,38,116,3,160,
+    4,100,3,116,5,161,2,1,0,124,0,116,0,106,6,107,
+    6,125,4,124,3,68,0,93,210,125,5,116,7,131,0,143,
+    84,1,0,122,10,124,5,106,8,125,6,87,0,110,54,4,
+    0,116,9,107,10,114,128,1,0,1,0,1,0,116,10,124,
+    5,124,0,124,1,131,3,125,7,124,7,100,1,107,8,114,
+    124,89,0,87,0,53,0,81,0,82,0,163,0,113,52,89,
+    0,110,14,88,0,124,6,124,0,124,1,124,2,131,3,125,
+    7,87,0,53,0,81,0,82,0,88,0,124,7,100,1,107,
+    9,114,52,124,4,144,0,115,254,124,0,116,0,106,6,107,
+    6,144,0,114,254,116,0,106,6,124,0,25,0,125,8,122,
+    10,124,8,106,11,125,9,87,0,110,28,4,0,116,9,107,
+    10,114,226,1,0,1,0,1,0,124,7,6,0,89,0,2,
+    0,1,0,83,0,88,0,124,9,100,1,107,8,114,244,124,
+    7,2,0,1,0,83,0,124,9,2,0,1,0,83,0,113,
+    52,124,7,2,0,1,0,83,0,113,52,100,1,83,0,41,
+    4,122,21,70,105,110,100,32,97,32,109,111,100,117,108,101,
+    39,115,32,115,112,101,99,46,78,122,53,115,121,115,46,109,
+    101,116,97,95,112,97,116,104,32,105,115,32,78,111,110,101,
+    44,32,80,121,116,104,111,110,32,105,115,32,108,105,107,101,
+    108,121,32,115,104,117,116,116,105,110,103,32,100,111,119,110,
+    122,22,115,121,115,46,109,101,116,97,95,112,97,116,104,32,
+    105,115,32,101,109,112,116,121,41,12,114,15,0,0,0,218,
+    9,109,101,116,97,95,112,97,116,104,114,78,0,0,0,218,
+    9,95,119,97,114,110,105,110,103,115,218,4,119,97,114,110,
+    218,13,73,109,112,111,114,116,87,97,114,110,105,110,103,114,
+    91,0,0,0,114,180,0,0,0,114,168,0,0,0,114,105,
+    0,0,0,114,191,0,0,0,114,104,0,0,0,41,10,114,
+    17,0,0,0,114,166,0,0,0,114,167,0,0,0,114,192,
+    0,0,0,90,9,105,115,95,114,101,108,111,97,100,114,190,
+    0,0,0,114,168,0,0,0,114,94,0,0,0,114,95,0,
+    0,0,114,104,0,0,0,114,10,0,0,0,114,10,0,0,
+    0,114,11,0,0,0,218,10,95,102,105,110,100,95,115,112,
+    101,99,122,3,0,0,115,54,0,0,0,0,2,6,1,8,
+    2,8,3,4,1,12,5,10,1,8,1,8,1,2,1,10,
+    1,14,1,12,1,8,1,20,2,22,1,8,2,18,1,10,
+    1,2,1,10,1,14,4,14,2,8,1,8,2,10,2,10,
+    2,114,196,0,0,0,99,3,0,0,0,0,0,0,0,0,
+    0,0,0,3,0,0,0,5,0,0,0,67,0,0,0,115,
+    108,0,0,0,116,0,124,0,116,1,131,2,115,28,116,2,
+    100,1,160,3,116,4,124,0,131,1,161,1,131,1,130,1,
+    124,2,100,2,107,0,114,44,116,5,100,3,131,1,130,1,
+    124,2,100,2,107,4,114,84,116,0,124,1,116,1,131,2,
+    115,72,116,2,100,4,131,1,130,1,110,12,124,1,115,84,
+    116,6,100,5,131,1,130,1,124,0,115,104,124,2,100,2,
+    107,2,114,104,116,5,100,6,131,1,130,1,100,7,83,0,
+    41,8,122,28,86,101,114,105,102,121,32,97,114,103,117,109,
+    101,110,116,115,32,97,114,101,32,34,115,97,110,101,34,46,
+    122,31,109,111,100,117,108,101,32,110,97,109,101,32,109,117,
+    115,116,32,98,101,32,115,116,114,44,32,110,111,116,32,123,
+    125,114,22,0,0,0,122,18,108,101,118,101,108,32,109,117,
+    115,116,32,98,101,32,62,61,32,48,122,31,95,95,112,97,
+    99,107,97,103,101,95,95,32,110,111,116,32,115,101,116,32,
+    116,111,32,97,32,115,116,114,105,110,103,122,54,97,116,116,
     101,109,112,116,101,100,32,114,101,108,97,116,105,118,101,32,
-    105,109,112,111,114,116,32,98,101,121,111,110,100,32,116,111,
-    112,45,108,101,118,101,108,32,112,97,99,107,97,103,101,114,
-    22,0,0,0,250,5,123,125,46,123,125,41,4,218,6,114,
-    115,112,108,105,116,218,3,108,101,110,114,78,0,0,0,114,
-    44,0,0,0,41,5,114,17,0,0,0,218,7,112,97,99,
-    107,97,103,101,218,5,108,101,118,101,108,90,4,98,105,116,
-    115,90,4,98,97,115,101,114,10,0,0,0,114,10,0,0,
-    0,114,11,0,0,0,218,13,95,114,101,115,111,108,118,101,
-    95,110,97,109,101,104,3,0,0,115,10,0,0,0,0,2,
-    16,1,12,1,8,1,8,1,114,186,0,0,0,99,3,0,
-    0,0,0,0,0,0,0,0,0,0,4,0,0,0,4,0,
-    0,0,67,0,0,0,115,34,0,0,0,124,0,160,0,124,
-    1,124,2,161,2,125,3,124,3,100,0,107,8,114,24,100,
-    0,83,0,116,1,124,1,124,3,131,2,83,0,114,13,0,
-    0,0,41,2,114,166,0,0,0,114,90,0,0,0,41,4,
-    218,6,102,105,110,100,101,114,114,17,0,0,0,114,163,0,
-    0,0,114,108,0,0,0,114,10,0,0,0,114,10,0,0,
-    0,114,11,0,0,0,218,17,95,102,105,110,100,95,115,112,
-    101,99,95,108,101,103,97,99,121,113,3,0,0,115,8,0,
-    0,0,0,3,12,1,8,1,4,1,114,188,0,0,0,99,
-    3,0,0,0,0,0,0,0,0,0,0,0,10,0,0,0,
-    10,0,0,0,67,0,0,0,115,12,1,0,0,116,0,106,
-    1,125,3,124,3,100,1,107,8,114,22,116,2,100,2,131,
-    1,130,1,124,3,115,38,116,3,160,4,100,3,116,5,161,
-    2,1,0,124,0,116,0,106,6,107,6,125,4,124,3,68,
-    0,93,210,125,5,116,7,131,0,143,84,1,0,122,10,124,
-    5,106,8,125,6,87,0,110,54,4,0,116,9,107,10,114,
-    128,1,0,1,0,1,0,116,10,124,5,124,0,124,1,131,
-    3,125,7,124,7,100,1,107,8,114,124,89,0,87,0,53,
-    0,81,0,82,0,163,0,113,52,89,0,110,14,88,0,124,
-    6,124,0,124,1,124,2,131,3,125,7,87,0,53,0,81,
-    0,82,0,88,0,124,7,100,1,107,9,114,52,124,4,144,
-    0,115,254,124,0,116,0,106,6,107,6,144,0,114,254,116,
-    0,106,6,124,0,25,0,125,8,122,10,124,8,106,11,125,
-    9,87,0,110,28,4,0,116,9,107,10,114,226,1,0,1,
-    0,1,0,124,7,6,0,89,0,2,0,1,0,83,0,88,
-    0,124,9,100,1,107,8,114,244,124,7,2,0,1,0,83,
-    0,124,9,2,0,1,0,83,0,113,52,124,7,2,0,1,
-    0,83,0,113,52,100,1,83,0,41,4,122,21,70,105,110,
-    100,32,97,32,109,111,100,117,108,101,39,115,32,115,112,101,
-    99,46,78,122,53,115,121,115,46,109,101,116,97,95,112,97,
-    116,104,32,105,115,32,78,111,110,101,44,32,80,121,116,104,
-    111,110,32,105,115,32,108,105,107,101,108,121,32,115,104,117,
-    116,116,105,110,103,32,100,111,119,110,122,22,115,121,115,46,
-    109,101,116,97,95,112,97,116,104,32,105,115,32,101,109,112,
-    116,121,41,12,114,15,0,0,0,218,9,109,101,116,97,95,
-    112,97,116,104,114,78,0,0,0,218,9,95,119,97,114,110,
-    105,110,103,115,218,4,119,97,114,110,218,13,73,109,112,111,
-    114,116,87,97,114,110,105,110,103,114,91,0,0,0,114,177,
-    0,0,0,114,165,0,0,0,114,105,0,0,0,114,188,0,
-    0,0,114,104,0,0,0,41,10,114,17,0,0,0,114,163,
-    0,0,0,114,164,0,0,0,114,189,0,0,0,90,9,105,
-    115,95,114,101,108,111,97,100,114,187,0,0,0,114,165,0,
-    0,0,114,94,0,0,0,114,95,0,0,0,114,104,0,0,
+    105,109,112,111,114,116,32,119,105,116,104,32,110,111,32,107,
+    110,111,119,110,32,112,97,114,101,110,116,32,112,97,99,107,
+    97,103,101,122,17,69,109,112,116,121,32,109,111,100,117,108,
+    101,32,110,97,109,101,78,41,7,218,10,105,115,105,110,115,
+    116,97,110,99,101,218,3,115,116,114,218,9,84,121,112,101,
+    69,114,114,111,114,114,44,0,0,0,114,14,0,0,0,218,
+    10,86,97,108,117,101,69,114,114,111,114,114,78,0,0,0,
+    169,3,114,17,0,0,0,114,187,0,0,0,114,188,0,0,
     0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
-    218,10,95,102,105,110,100,95,115,112,101,99,122,3,0,0,
-    115,54,0,0,0,0,2,6,1,8,2,8,3,4,1,12,
-    5,10,1,8,1,8,1,2,1,10,1,14,1,12,1,8,
-    1,20,2,22,1,8,2,18,1,10,1,2,1,10,1,14,
-    4,14,2,8,1,8,2,10,2,10,2,114,193,0,0,0,
-    99,3,0,0,0,0,0,0,0,0,0,0,0,3,0,0,
-    0,5,0,0,0,67,0,0,0,115,108,0,0,0,116,0,
-    124,0,116,1,131,2,115,28,116,2,100,1,160,3,116,4,
-    124,0,131,1,161,1,131,1,130,1,124,2,100,2,107,0,
-    114,44,116,5,100,3,131,1,130,1,124,2,100,2,107,4,
-    114,84,116,0,124,1,116,1,131,2,115,72,116,2,100,4,
-    131,1,130,1,110,12,124,1,115,84,116,6,100,5,131,1,
-    130,1,124,0,115,104,124,2,100,2,107,2,114,104,116,5,
-    100,6,131,1,130,1,100,7,83,0,41,8,122,28,86,101,
-    114,105,102,121,32,97,114,103,117,109,101,110,116,115,32,97,
-    114,101,32,34,115,97,110,101,34,46,122,31,109,111,100,117,
-    108,101,32,110,97,109,101,32,109,117,115,116,32,98,101,32,
-    115,116,114,44,32,110,111,116,32,123,125,114,22,0,0,0,
-    122,18,108,101,118,101,108,32,109,117,115,116,32,98,101,32,
-    62,61,32,48,122,31,95,95,112,97,99,107,97,103,101,95,
-    95,32,110,111,116,32,115,101,116,32,116,111,32,97,32,115,
-    116,114,105,110,103,122,54,97,116,116,101,109,112,116,101,100,
-    32,114,101,108,97,116,105,118,101,32,105,109,112,111,114,116,
-    32,119,105,116,104,32,110,111,32,107,110,111,119,110,32,112,
-    97,114,101,110,116,32,112,97,99,107,97,103,101,122,17,69,
-    109,112,116,121,32,109,111,100,117,108,101,32,110,97,109,101,
-    78,41,7,218,10,105,115,105,110,115,116,97,110,99,101,218,
-    3,115,116,114,218,9,84,121,112,101,69,114,114,111,114,114,
-    44,0,0,0,114,14,0,0,0,218,10,86,97,108,117,101,
-    69,114,114,111,114,114,78,0,0,0,169,3,114,17,0,0,
-    0,114,184,0,0,0,114,185,0,0,0,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,218,13,95,115,97,110,
-    105,116,121,95,99,104,101,99,107,169,3,0,0,115,22,0,
-    0,0,0,2,10,1,18,1,8,1,8,1,8,1,10,1,
-    10,1,4,1,8,2,12,1,114,199,0,0,0,122,16,78,
-    111,32,109,111,100,117,108,101,32,110,97,109,101,100,32,122,
-    4,123,33,114,125,99,2,0,0,0,0,0,0,0,0,0,
-    0,0,8,0,0,0,8,0,0,0,67,0,0,0,115,220,
-    0,0,0,100,0,125,2,124,0,160,0,100,1,161,1,100,
-    2,25,0,125,3,124,3,114,134,124,3,116,1,106,2,107,
-    7,114,42,116,3,124,1,124,3,131,2,1,0,124,0,116,
-    1,106,2,107,6,114,62,116,1,106,2,124,0,25,0,83,
-    0,116,1,106,2,124,3,25,0,125,4,122,10,124,4,106,
-    4,125,2,87,0,110,50,4,0,116,5,107,10,114,132,1,
-    0,1,0,1,0,116,6,100,3,23,0,160,7,124,0,124,
-    3,161,2,125,5,116,8,124,5,124,0,100,4,141,2,100,
-    0,130,2,89,0,110,2,88,0,116,9,124,0,124,2,131,
-    2,125,6,124,6,100,0,107,8,114,172,116,8,116,6,160,
-    7,124,0,161,1,124,0,100,4,141,2,130,1,110,8,116,
-    10,124,6,131,1,125,7,124,3,114,216,116,1,106,2,124,
-    3,25,0,125,4,116,11,124,4,124,0,160,0,100,1,161,
-    1,100,5,25,0,124,7,131,3,1,0,124,7,83,0,41,
-    6,78,114,127,0,0,0,114,22,0,0,0,122,23,59,32,
-    123,33,114,125,32,105,115,32,110,111,116,32,97,32,112,97,
-    99,107,97,103,101,114,16,0,0,0,233,2,0,0,0,41,
-    12,114,128,0,0,0,114,15,0,0,0,114,91,0,0,0,
-    114,66,0,0,0,114,140,0,0,0,114,105,0,0,0,218,
-    8,95,69,82,82,95,77,83,71,114,44,0,0,0,218,19,
-    77,111,100,117,108,101,78,111,116,70,111,117,110,100,69,114,
-    114,111,114,114,193,0,0,0,114,158,0,0,0,114,5,0,
-    0,0,41,8,114,17,0,0,0,218,7,105,109,112,111,114,
-    116,95,114,163,0,0,0,114,129,0,0,0,90,13,112,97,
-    114,101,110,116,95,109,111,100,117,108,101,114,156,0,0,0,
-    114,94,0,0,0,114,95,0,0,0,114,10,0,0,0,114,
-    10,0,0,0,114,11,0,0,0,218,23,95,102,105,110,100,
-    95,97,110,100,95,108,111,97,100,95,117,110,108,111,99,107,
-    101,100,188,3,0,0,115,42,0,0,0,0,1,4,1,14,
-    1,4,1,10,1,10,2,10,1,10,1,10,1,2,1,10,
-    1,14,1,16,1,20,1,10,1,8,1,20,2,8,1,4,
-    2,10,1,22,1,114,204,0,0,0,99,2,0,0,0,0,
-    0,0,0,0,0,0,0,4,0,0,0,10,0,0,0,67,
-    0,0,0,115,106,0,0,0,116,0,124,0,131,1,143,50,
-    1,0,116,1,106,2,160,3,124,0,116,4,161,2,125,2,
-    124,2,116,4,107,8,114,54,116,5,124,0,124,1,131,2,
-    87,0,2,0,53,0,81,0,82,0,163,0,83,0,87,0,
-    53,0,81,0,82,0,88,0,124,2,100,1,107,8,114,94,
-    100,2,160,6,124,0,161,1,125,3,116,7,124,3,124,0,
-    100,3,141,2,130,1,116,8,124,0,131,1,1,0,124,2,
-    83,0,41,4,122,25,70,105,110,100,32,97,110,100,32,108,
-    111,97,100,32,116,104,101,32,109,111,100,117,108,101,46,78,
+    218,13,95,115,97,110,105,116,121,95,99,104,101,99,107,169,
+    3,0,0,115,22,0,0,0,0,2,10,1,18,1,8,1,
+    8,1,8,1,10,1,10,1,4,1,8,2,12,1,114,202,
+    0,0,0,122,16,78,111,32,109,111,100,117,108,101,32,110,
+    97,109,101,100,32,122,4,123,33,114,125,99,3,0,0,0,
+    0,0,0,0,0,0,0,0,9,0,0,0,8,0,0,0,
+    67,0,0,0,115,8,1,0,0,100,0,125,3,124,0,160,
+    0,100,1,161,1,100,2,25,0,125,4,124,4,114,154,124,
+    4,116,1,106,2,107,7,114,42,116,3,124,1,124,4,131,
+    2,1,0,124,0,116,1,106,2,107,6,114,62,116,1,106,
+    2,124,0,25,0,83,0,116,1,106,2,124,4,25,0,125,
+    5,122,10,124,5,106,4,125,3,87,0,110,50,4,0,116,
+    5,107,10,114,132,1,0,1,0,1,0,116,6,100,3,23,
+    0,160,7,124,0,124,4,161,2,125,6,116,8,124,6,124,
+    0,100,4,141,2,100,0,130,2,89,0,110,2,88,0,124,
+    0,116,1,106,2,107,6,114,154,116,1,106,2,124,0,25,
+    0,83,0,116,9,124,0,124,3,131,2,125,7,124,7,100,
+    0,107,8,114,192,116,8,116,6,160,7,124,0,161,1,124,
+    0,100,4,141,2,130,1,110,30,124,2,114,214,116,10,124,
+    7,131,1,114,214,116,11,124,7,131,1,125,8,110,8,116,
+    12,124,7,131,1,125,8,124,4,144,1,114,4,116,1,106,
+    2,124,4,25,0,125,5,116,13,124,5,124,0,160,0,100,
+    1,161,1,100,5,25,0,124,8,131,3,1,0,124,8,83,
+    0,41,6,78,114,127,0,0,0,114,22,0,0,0,122,23,
+    59,32,123,33,114,125,32,105,115,32,110,111,116,32,97,32,
+    112,97,99,107,97,103,101,114,16,0,0,0,233,2,0,0,
+    0,41,14,114,128,0,0,0,114,15,0,0,0,114,91,0,
+    0,0,114,66,0,0,0,114,140,0,0,0,114,105,0,0,
+    0,218,8,95,69,82,82,95,77,83,71,114,44,0,0,0,
+    218,19,77,111,100,117,108,101,78,111,116,70,111,117,110,100,
+    69,114,114,111,114,114,196,0,0,0,218,10,95,99,97,110,
+    95,100,101,102,101,114,218,15,95,100,101,102,101,114,95,117,
+    110,108,111,99,107,101,100,114,160,0,0,0,114,5,0,0,
+    0,41,9,114,17,0,0,0,218,7,105,109,112,111,114,116,
+    95,218,4,108,97,122,121,114,166,0,0,0,114,129,0,0,
+    0,90,13,112,97,114,101,110,116,95,109,111,100,117,108,101,
+    114,156,0,0,0,114,94,0,0,0,114,95,0,0,0,114,
+    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,23,
+    95,102,105,110,100,95,97,110,100,95,108,111,97,100,95,117,
+    110,108,111,99,107,101,100,188,3,0,0,115,50,0,0,0,
+    0,1,4,1,14,1,4,1,10,1,10,2,10,1,10,1,
+    10,1,2,1,10,1,14,1,16,1,20,2,10,1,10,1,
+    10,1,8,1,20,1,12,1,10,2,8,1,6,2,10,1,
+    22,1,114,210,0,0,0,99,3,0,0,0,0,0,0,0,
+    0,0,0,0,5,0,0,0,10,0,0,0,67,0,0,0,
+    115,108,0,0,0,116,0,124,0,131,1,143,52,1,0,116,
+    1,106,2,160,3,124,0,116,4,161,2,125,3,124,3,116,
+    4,107,8,114,56,116,5,124,0,124,1,124,2,131,3,87,
+    0,2,0,53,0,81,0,82,0,163,0,83,0,87,0,53,
+    0,81,0,82,0,88,0,124,3,100,1,107,8,114,96,100,
+    2,160,6,124,0,161,1,125,4,116,7,124,4,124,0,100,
+    3,141,2,130,1,116,8,124,0,131,1,1,0,124,3,83,
+    0,41,4,122,122,70,105,110,100,32,97,110,100,32,108,111,
+    97,100,32,116,104,101,32,109,111,100,117,108,101,46,10,10,
+    32,32,32,32,73,102,32,108,97,122,121,32,105,115,32,116,
+    114,117,101,32,97,110,100,32,116,104,101,32,109,111,100,117,
+    108,101,32,105,115,32,110,111,116,32,105,109,112,111,114,116,
+    101,100,32,121,101,116,44,32,105,116,115,32,101,120,101,99,
+    117,116,105,111,110,32,109,97,121,32,98,101,10,32,32,32,
+    32,100,101,102,101,114,114,101,100,46,10,32,32,32,32,78,
     122,40,105,109,112,111,114,116,32,111,102,32,123,125,32,104,
     97,108,116,101,100,59,32,78,111,110,101,32,105,110,32,115,
     121,115,46,109,111,100,117,108,101,115,114,16,0,0,0,41,
     9,114,49,0,0,0,114,15,0,0,0,114,91,0,0,0,
     114,34,0,0,0,218,14,95,78,69,69,68,83,95,76,79,
-    65,68,73,78,71,114,204,0,0,0,114,44,0,0,0,114,
-    202,0,0,0,114,64,0,0,0,41,4,114,17,0,0,0,
-    114,203,0,0,0,114,95,0,0,0,114,74,0,0,0,114,
-    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,14,
-    95,102,105,110,100,95,97,110,100,95,108,111,97,100,218,3,
-    0,0,115,22,0,0,0,0,2,10,1,14,1,8,1,32,
-    2,8,1,4,1,2,255,4,2,12,2,8,1,114,206,0,
-    0,0,114,22,0,0,0,99,3,0,0,0,0,0,0,0,
-    0,0,0,0,3,0,0,0,4,0,0,0,67,0,0,0,
-    115,42,0,0,0,116,0,124,0,124,1,124,2,131,3,1,
-    0,124,2,100,1,107,4,114,32,116,1,124,0,124,1,124,
-    2,131,3,125,0,116,2,124,0,116,3,131,2,83,0,41,
-    2,97,50,1,0,0,73,109,112,111,114,116,32,97,110,100,
-    32,114,101,116,117,114,110,32,116,104,101,32,109,111,100,117,
-    108,101,32,98,97,115,101,100,32,111,110,32,105,116,115,32,
-    110,97,109,101,44,32,116,104,101,32,112,97,99,107,97,103,
-    101,32,116,104,101,32,99,97,108,108,32,105,115,10,32,32,
-    32,32,98,101,105,110,103,32,109,97,100,101,32,102,114,111,
-    109,44,32,97,110,100,32,116,104,101,32,108,101,118,101,108,
-    32,97,100,106,117,115,116,109,101,110,116,46,10,10,32,32,
-    32,32,84,104,105,115,32,102,117,110,99,116,105,111,110,32,
-    114,101,112,114,101,115,101,110,116,115,32,116,104,101,32,103,
-    114,101,97,116,101,115,116,32,99,111,109,109,111,110,32,100,
-    101,110,111,109,105,110,97,116,111,114,32,111,102,32,102,117,
-    110,99,116,105,111,110,97,108,105,116,121,10,32,32,32,32,
-    98,101,116,119,101,101,110,32,105,109,112,111,114,116,95,109,
-    111,100,117,108,101,32,97,110,100,32,95,95,105,109,112,111,
-    114,116,95,95,46,32,84,104,105,115,32,105,110,99,108,117,
-    100,101,115,32,115,101,116,116,105,110,103,32,95,95,112,97,
-    99,107,97,103,101,95,95,32,105,102,10,32,32,32,32,116,
-    104,101,32,108,111,97,100,101,114,32,100,105,100,32,110,111,
-    116,46,10,10,32,32,32,32,114,22,0,0,0,41,4,114,
-    199,0,0,0,114,186,0,0,0,114,206,0,0,0,218,11,
-    95,103,99,100,95,105,109,112,111,114,116,114,198,0,0,0,
-    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,114,
-    207,0,0,0,234,3,0,0,115,8,0,0,0,0,9,12,
-    1,8,1,12,1,114,207,0,0,0,169,1,218,9,114,101,
-    99,117,114,115,105,118,101,99,3,0,0,0,0,0,0,0,
-    1,0,0,0,8,0,0,0,11,0,0,0,67,0,0,0,
-    115,226,0,0,0,124,1,68,0,93,216,125,4,116,0,124,
-    4,116,1,131,2,115,66,124,3,114,34,124,0,106,2,100,
-    1,23,0,125,5,110,4,100,2,125,5,116,3,100,3,124,
-    5,155,0,100,4,116,4,124,4,131,1,106,2,155,0,157,
-    4,131,1,130,1,113,4,124,4,100,5,107,2,114,108,124,
-    3,115,220,116,5,124,0,100,6,131,2,114,220,116,6,124,
-    0,124,0,106,7,124,2,100,7,100,8,141,4,1,0,113,
-    4,116,5,124,0,124,4,131,2,115,4,100,9,160,8,124,
-    0,106,2,124,4,161,2,125,6,122,14,116,9,124,2,124,
-    6,131,2,1,0,87,0,113,4,4,0,116,10,107,10,114,
-    218,1,0,125,7,1,0,122,42,124,7,106,11,124,6,107,
-    2,114,200,116,12,106,13,160,14,124,6,116,15,161,2,100,
-    10,107,9,114,200,87,0,89,0,162,8,113,4,130,0,87,
-    0,53,0,100,10,125,7,126,7,88,0,89,0,113,4,88,
-    0,113,4,124,0,83,0,41,11,122,238,70,105,103,117,114,
-    101,32,111,117,116,32,119,104,97,116,32,95,95,105,109,112,
-    111,114,116,95,95,32,115,104,111,117,108,100,32,114,101,116,
-    117,114,110,46,10,10,32,32,32,32,84,104,101,32,105,109,
-    112,111,114,116,95,32,112,97,114,97,109,101,116,101,114,32,
-    105,115,32,97,32,99,97,108,108,97,98,108,101,32,119,104,
-    105,99,104,32,116,97,107,101,115,32,116,104,101,32,110,97,
-    109,101,32,111,102,32,109,111,100,117,108,101,32,116,111,10,
-    32,32,32,32,105,109,112,111,114,116,46,32,73,116,32,105,
-    115,32,114,101,113,117,105,114,101,100,32,116,111,32,100,101,
-    99,111,117,112,108,101,32,116,104,101,32,102,117,110,99,116,
-    105,111,110,32,102,114,111,109,32,97,115,115,117,109,105,110,
-    103,32,105,109,112,111,114,116,108,105,98,39,115,10,32,32,
-    32,32,105,109,112,111,114,116,32,105,109,112,108,101,109,101,
-    110,116,97,116,105,111,110,32,105,115,32,100,101,115,105,114,
-    101,100,46,10,10,32,32,32,32,122,8,46,95,95,97,108,
-    108,95,95,122,13,96,96,102,114,111,109,32,108,105,115,116,
-    39,39,122,8,73,116,101,109,32,105,110,32,122,18,32,109,
-    117,115,116,32,98,101,32,115,116,114,44,32,110,111,116,32,
-    250,1,42,218,7,95,95,97,108,108,95,95,84,114,208,0,
-    0,0,114,181,0,0,0,78,41,16,114,194,0,0,0,114,
-    195,0,0,0,114,1,0,0,0,114,196,0,0,0,114,14,
-    0,0,0,114,4,0,0,0,218,16,95,104,97,110,100,108,
-    101,95,102,114,111,109,108,105,115,116,114,211,0,0,0,114,
-    44,0,0,0,114,66,0,0,0,114,202,0,0,0,114,17,
-    0,0,0,114,15,0,0,0,114,91,0,0,0,114,34,0,
-    0,0,114,205,0,0,0,41,8,114,95,0,0,0,218,8,
-    102,114,111,109,108,105,115,116,114,203,0,0,0,114,209,0,
-    0,0,218,1,120,90,5,119,104,101,114,101,90,9,102,114,
-    111,109,95,110,97,109,101,90,3,101,120,99,114,10,0,0,
-    0,114,10,0,0,0,114,11,0,0,0,114,212,0,0,0,
-    249,3,0,0,115,44,0,0,0,0,10,8,1,10,1,4,
-    1,12,2,4,1,28,2,8,1,14,1,10,1,2,255,8,
-    2,10,1,14,1,2,1,14,1,16,4,10,1,16,255,2,
-    2,8,1,22,1,114,212,0,0,0,99,1,0,0,0,0,
-    0,0,0,0,0,0,0,3,0,0,0,6,0,0,0,67,
-    0,0,0,115,146,0,0,0,124,0,160,0,100,1,161,1,
-    125,1,124,0,160,0,100,2,161,1,125,2,124,1,100,3,
-    107,9,114,82,124,2,100,3,107,9,114,78,124,1,124,2,
-    106,1,107,3,114,78,116,2,106,3,100,4,124,1,155,2,
-    100,5,124,2,106,1,155,2,100,6,157,5,116,4,100,7,
-    100,8,141,3,1,0,124,1,83,0,124,2,100,3,107,9,
-    114,96,124,2,106,1,83,0,116,2,106,3,100,9,116,4,
-    100,7,100,8,141,3,1,0,124,0,100,10,25,0,125,1,
-    100,11,124,0,107,7,114,142,124,1,160,5,100,12,161,1,
-    100,13,25,0,125,1,124,1,83,0,41,14,122,167,67,97,
-    108,99,117,108,97,116,101,32,119,104,97,116,32,95,95,112,
-    97,99,107,97,103,101,95,95,32,115,104,111,117,108,100,32,
-    98,101,46,10,10,32,32,32,32,95,95,112,97,99,107,97,
-    103,101,95,95,32,105,115,32,110,111,116,32,103,117,97,114,
-    97,110,116,101,101,100,32,116,111,32,98,101,32,100,101,102,
-    105,110,101,100,32,111,114,32,99,111,117,108,100,32,98,101,
-    32,115,101,116,32,116,111,32,78,111,110,101,10,32,32,32,
-    32,116,111,32,114,101,112,114,101,115,101,110,116,32,116,104,
-    97,116,32,105,116,115,32,112,114,111,112,101,114,32,118,97,
-    108,117,101,32,105,115,32,117,110,107,110,111,119,110,46,10,
-    10,32,32,32,32,114,144,0,0,0,114,104,0,0,0,78,
-    122,32,95,95,112,97,99,107,97,103,101,95,95,32,33,61,
-    32,95,95,115,112,101,99,95,95,46,112,97,114,101,110,116,
-    32,40,122,4,32,33,61,32,250,1,41,233,3,0,0,0,
-    41,1,90,10,115,116,97,99,107,108,101,118,101,108,122,89,
-    99,97,110,39,116,32,114,101,115,111,108,118,101,32,112,97,
-    99,107,97,103,101,32,102,114,111,109,32,95,95,115,112,101,
-    99,95,95,32,111,114,32,95,95,112,97,99,107,97,103,101,
-    95,95,44,32,102,97,108,108,105,110,103,32,98,97,99,107,
-    32,111,110,32,95,95,110,97,109,101,95,95,32,97,110,100,
-    32,95,95,112,97,116,104,95,95,114,1,0,0,0,114,140,
-    0,0,0,114,127,0,0,0,114,22,0,0,0,41,6,114,
-    34,0,0,0,114,129,0,0,0,114,190,0,0,0,114,191,
-    0,0,0,114,192,0,0,0,114,128,0,0,0,41,3,218,
-    7,103,108,111,98,97,108,115,114,184,0,0,0,114,94,0,
-    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,218,17,95,99,97,108,99,95,95,95,112,97,99,107,97,
-    103,101,95,95,30,4,0,0,115,38,0,0,0,0,7,10,
-    1,10,1,8,1,18,1,22,2,2,0,2,254,6,3,4,
-    1,8,1,6,2,6,2,2,0,2,254,6,3,8,1,8,
-    1,14,1,114,218,0,0,0,114,10,0,0,0,99,5,0,
-    0,0,0,0,0,0,0,0,0,0,9,0,0,0,5,0,
-    0,0,67,0,0,0,115,180,0,0,0,124,4,100,1,107,
-    2,114,18,116,0,124,0,131,1,125,5,110,36,124,1,100,
-    2,107,9,114,30,124,1,110,2,105,0,125,6,116,1,124,
-    6,131,1,125,7,116,0,124,0,124,7,124,4,131,3,125,
-    5,124,3,115,150,124,4,100,1,107,2,114,84,116,0,124,
-    0,160,2,100,3,161,1,100,1,25,0,131,1,83,0,124,
-    0,115,92,124,5,83,0,116,3,124,0,131,1,116,3,124,
-    0,160,2,100,3,161,1,100,1,25,0,131,1,24,0,125,
-    8,116,4,106,5,124,5,106,6,100,2,116,3,124,5,106,
-    6,131,1,124,8,24,0,133,2,25,0,25,0,83,0,110,
-    26,116,7,124,5,100,4,131,2,114,172,116,8,124,5,124,
-    3,116,0,131,3,83,0,124,5,83,0,100,2,83,0,41,
-    5,97,215,1,0,0,73,109,112,111,114,116,32,97,32,109,
-    111,100,117,108,101,46,10,10,32,32,32,32,84,104,101,32,
-    39,103,108,111,98,97,108,115,39,32,97,114,103,117,109,101,
-    110,116,32,105,115,32,117,115,101,100,32,116,111,32,105,110,
-    102,101,114,32,119,104,101,114,101,32,116,104,101,32,105,109,
-    112,111,114,116,32,105,115,32,111,99,99,117,114,114,105,110,
-    103,32,102,114,111,109,10,32,32,32,32,116,111,32,104,97,
-    110,100,108,101,32,114,101,108,97,116,105,118,101,32,105,109,
-    112,111,114,116,115,46,32,84,104,101,32,39,108,111,99,97,
-    108,115,39,32,97,114,103,117,109,101,110,116,32,105,115,32,
-    105,103,110,111,114,101,100,46,32,84,104,101,10,32,32,32,
-    32,39,102,114,111,109,108,105,115,116,39,32,97,114,103,117,
-    109,101,110,116,32,115,112,101,99,105,102,105,101,115,32,119,
-    104,97,116,32,115,104,111,117,108,100,32,101,120,105,115,116,
-    32,97,115,32,97,116,116,114,105,98,117,116,101,115,32,111,
-    110,32,116,104,101,32,109,111,100,117,108,101,10,32,32,32,
-    32,98,101,105,110,103,32,105,109,112,111,114,116,101,100,32,
-    40,101,46,103,46,32,96,96,102,114,111,109,32,109,111,100,
-    117,108,101,32,105,109,112,111,114,116,32,60,102,114,111,109,
-    108,105,115,116,62,96,96,41,46,32,32,84,104,101,32,39,
-    108,101,118,101,108,39,10,32,32,32,32,97,114,103,117,109,
-    101,110,116,32,114,101,112,114,101,115,101,110,116,115,32,116,
-    104,101,32,112,97,99,107,97,103,101,32,108,111,99,97,116,
-    105,111,110,32,116,111,32,105,109,112,111,114,116,32,102,114,
-    111,109,32,105,110,32,97,32,114,101,108,97,116,105,118,101,
-    10,32,32,32,32,105,109,112,111,114,116,32,40,101,46,103,
-    46,32,96,96,102,114,111,109,32,46,46,112,107,103,32,105,
-    109,112,111,114,116,32,109,111,100,96,96,32,119,111,117,108,
-    100,32,104,97,118,101,32,97,32,39,108,101,118,101,108,39,
-    32,111,102,32,50,41,46,10,10,32,32,32,32,114,22,0,
-    0,0,78,114,127,0,0,0,114,140,0,0,0,41,9,114,
-    207,0,0,0,114,218,0,0,0,218,9,112,97,114,116,105,
-    116,105,111,110,114,183,0,0,0,114,15,0,0,0,114,91,
-    0,0,0,114,1,0,0,0,114,4,0,0,0,114,212,0,
-    0,0,41,9,114,17,0,0,0,114,217,0,0,0,218,6,
-    108,111,99,97,108,115,114,213,0,0,0,114,185,0,0,0,
-    114,95,0,0,0,90,8,103,108,111,98,97,108,115,95,114,
-    184,0,0,0,90,7,99,117,116,95,111,102,102,114,10,0,
-    0,0,114,10,0,0,0,114,11,0,0,0,218,10,95,95,
-    105,109,112,111,114,116,95,95,57,4,0,0,115,30,0,0,
-    0,0,11,8,1,10,2,16,1,8,1,12,1,4,3,8,
-    1,18,1,4,1,4,4,26,3,32,1,10,1,12,2,114,
-    221,0,0,0,99,1,0,0,0,0,0,0,0,0,0,0,
-    0,2,0,0,0,3,0,0,0,67,0,0,0,115,38,0,
-    0,0,116,0,160,1,124,0,161,1,125,1,124,1,100,0,
-    107,8,114,30,116,2,100,1,124,0,23,0,131,1,130,1,
-    116,3,124,1,131,1,83,0,41,2,78,122,25,110,111,32,
-    98,117,105,108,116,45,105,110,32,109,111,100,117,108,101,32,
-    110,97,109,101,100,32,41,4,114,159,0,0,0,114,165,0,
-    0,0,114,78,0,0,0,114,158,0,0,0,41,2,114,17,
-    0,0,0,114,94,0,0,0,114,10,0,0,0,114,10,0,
-    0,0,114,11,0,0,0,218,18,95,98,117,105,108,116,105,
-    110,95,102,114,111,109,95,110,97,109,101,94,4,0,0,115,
-    8,0,0,0,0,1,10,1,8,1,12,1,114,222,0,0,
-    0,99,2,0,0,0,0,0,0,0,0,0,0,0,10,0,
-    0,0,5,0,0,0,67,0,0,0,115,166,0,0,0,124,
-    1,97,0,124,0,97,1,116,2,116,1,131,1,125,2,116,
-    1,106,3,160,4,161,0,68,0,93,72,92,2,125,3,125,
-    4,116,5,124,4,124,2,131,2,114,26,124,3,116,1,106,
-    6,107,6,114,60,116,7,125,5,110,18,116,0,160,8,124,
-    3,161,1,114,26,116,9,125,5,110,2,113,26,116,10,124,
-    4,124,5,131,2,125,6,116,11,124,6,124,4,131,2,1,
-    0,113,26,116,1,106,3,116,12,25,0,125,7,100,1,68,
-    0,93,46,125,8,124,8,116,1,106,3,107,7,114,138,116,
-    13,124,8,131,1,125,9,110,10,116,1,106,3,124,8,25,
-    0,125,9,116,14,124,7,124,8,124,9,131,3,1,0,113,
-    114,100,2,83,0,41,3,122,250,83,101,116,117,112,32,105,
-    109,112,111,114,116,108,105,98,32,98,121,32,105,109,112,111,
-    114,116,105,110,103,32,110,101,101,100,101,100,32,98,117,105,
-    108,116,45,105,110,32,109,111,100,117,108,101,115,32,97,110,
-    100,32,105,110,106,101,99,116,105,110,103,32,116,104,101,109,
-    10,32,32,32,32,105,110,116,111,32,116,104,101,32,103,108,
-    111,98,97,108,32,110,97,109,101,115,112,97,99,101,46,10,
-    10,32,32,32,32,65,115,32,115,121,115,32,105,115,32,110,
-    101,101,100,101,100,32,102,111,114,32,115,121,115,46,109,111,
-    100,117,108,101,115,32,97,99,99,101,115,115,32,97,110,100,
-    32,95,105,109,112,32,105,115,32,110,101,101,100,101,100,32,
-    116,111,32,108,111,97,100,32,98,117,105,108,116,45,105,110,
-    10,32,32,32,32,109,111,100,117,108,101,115,44,32,116,104,
-    111,115,101,32,116,119,111,32,109,111,100,117,108,101,115,32,
-    109,117,115,116,32,98,101,32,101,120,112,108,105,99,105,116,
-    108,121,32,112,97,115,115,101,100,32,105,110,46,10,10,32,
-    32,32,32,41,3,114,23,0,0,0,114,190,0,0,0,114,
-    63,0,0,0,78,41,15,114,56,0,0,0,114,15,0,0,
-    0,114,14,0,0,0,114,91,0,0,0,218,5,105,116,101,
-    109,115,114,194,0,0,0,114,77,0,0,0,114,159,0,0,
-    0,114,87,0,0,0,114,172,0,0,0,114,141,0,0,0,
-    114,147,0,0,0,114,1,0,0,0,114,222,0,0,0,114,
-    5,0,0,0,41,10,218,10,115,121,115,95,109,111,100,117,
-    108,101,218,11,95,105,109,112,95,109,111,100,117,108,101,90,
-    11,109,111,100,117,108,101,95,116,121,112,101,114,17,0,0,
-    0,114,95,0,0,0,114,108,0,0,0,114,94,0,0,0,
-    90,11,115,101,108,102,95,109,111,100,117,108,101,90,12,98,
-    117,105,108,116,105,110,95,110,97,109,101,90,14,98,117,105,
-    108,116,105,110,95,109,111,100,117,108,101,114,10,0,0,0,
-    114,10,0,0,0,114,11,0,0,0,218,6,95,115,101,116,
-    117,112,101,4,0,0,115,36,0,0,0,0,9,4,1,4,
-    3,8,1,18,1,10,1,10,1,6,1,10,1,6,2,2,
-    1,10,1,12,3,10,1,8,1,10,1,10,2,10,1,114,
-    226,0,0,0,99,2,0,0,0,0,0,0,0,0,0,0,
-    0,2,0,0,0,3,0,0,0,67,0,0,0,115,38,0,
-    0,0,116,0,124,0,124,1,131,2,1,0,116,1,106,2,
-    160,3,116,4,161,1,1,0,116,1,106,2,160,3,116,5,
-    161,1,1,0,100,1,83,0,41,2,122,48,73,110,115,116,
-    97,108,108,32,105,109,112,111,114,116,101,114,115,32,102,111,
-    114,32,98,117,105,108,116,105,110,32,97,110,100,32,102,114,
-    111,122,101,110,32,109,111,100,117,108,101,115,78,41,6,114,
-    226,0,0,0,114,15,0,0,0,114,189,0,0,0,114,118,
-    0,0,0,114,159,0,0,0,114,172,0,0,0,41,2,114,
-    224,0,0,0,114,225,0,0,0,114,10,0,0,0,114,10,
-    0,0,0,114,11,0,0,0,218,8,95,105,110,115,116,97,
-    108,108,136,4,0,0,115,6,0,0,0,0,2,10,2,12,
-    1,114,227,0,0,0,99,0,0,0,0,0,0,0,0,0,
-    0,0,0,1,0,0,0,4,0,0,0,67,0,0,0,115,
-    32,0,0,0,100,1,100,2,108,0,125,0,124,0,97,1,
-    124,0,160,2,116,3,106,4,116,5,25,0,161,1,1,0,
-    100,2,83,0,41,3,122,57,73,110,115,116,97,108,108,32,
-    105,109,112,111,114,116,101,114,115,32,116,104,97,116,32,114,
-    101,113,117,105,114,101,32,101,120,116,101,114,110,97,108,32,
-    102,105,108,101,115,121,115,116,101,109,32,97,99,99,101,115,
-    115,114,22,0,0,0,78,41,6,218,26,95,102,114,111,122,
-    101,110,95,105,109,112,111,114,116,108,105,98,95,101,120,116,
-    101,114,110,97,108,114,125,0,0,0,114,227,0,0,0,114,
-    15,0,0,0,114,91,0,0,0,114,1,0,0,0,41,1,
-    114,228,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
-    11,0,0,0,218,27,95,105,110,115,116,97,108,108,95,101,
-    120,116,101,114,110,97,108,95,105,109,112,111,114,116,101,114,
-    115,144,4,0,0,115,6,0,0,0,0,3,8,1,4,1,
-    114,229,0,0,0,41,2,78,78,41,1,78,41,2,78,114,
-    22,0,0,0,41,4,78,78,114,10,0,0,0,114,22,0,
-    0,0,41,50,114,3,0,0,0,114,125,0,0,0,114,12,
-    0,0,0,114,18,0,0,0,114,59,0,0,0,114,33,0,
-    0,0,114,42,0,0,0,114,19,0,0,0,114,20,0,0,
-    0,114,48,0,0,0,114,49,0,0,0,114,52,0,0,0,
-    114,64,0,0,0,114,66,0,0,0,114,75,0,0,0,114,
-    85,0,0,0,114,89,0,0,0,114,96,0,0,0,114,110,
-    0,0,0,114,111,0,0,0,114,90,0,0,0,114,141,0,
-    0,0,114,147,0,0,0,114,151,0,0,0,114,106,0,0,
-    0,114,92,0,0,0,114,157,0,0,0,114,158,0,0,0,
-    114,93,0,0,0,114,159,0,0,0,114,172,0,0,0,114,
-    177,0,0,0,114,186,0,0,0,114,188,0,0,0,114,193,
-    0,0,0,114,199,0,0,0,90,15,95,69,82,82,95,77,
-    83,71,95,80,82,69,70,73,88,114,201,0,0,0,114,204,
-    0,0,0,218,6,111,98,106,101,99,116,114,205,0,0,0,
-    114,206,0,0,0,114,207,0,0,0,114,212,0,0,0,114,
-    218,0,0,0,114,221,0,0,0,114,222,0,0,0,114,226,
-    0,0,0,114,227,0,0,0,114,229,0,0,0,114,10,0,
-    0,0,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
-    0,218,8,60,109,111,100,117,108,101,62,1,0,0,0,115,
-    94,0,0,0,4,24,4,2,8,8,8,8,4,2,4,3,
-    16,4,14,68,14,21,14,16,8,37,8,17,8,11,14,8,
-    8,11,8,12,8,16,8,36,14,101,16,26,10,45,14,72,
-    8,17,8,17,8,30,8,37,8,42,8,15,14,73,14,79,
-    14,13,8,9,8,9,10,47,8,16,4,1,8,2,8,27,
-    6,3,8,16,10,15,14,37,8,27,10,37,8,7,8,35,
-    8,8,
+    65,68,73,78,71,114,210,0,0,0,114,44,0,0,0,114,
+    205,0,0,0,114,64,0,0,0,41,5,114,17,0,0,0,
+    114,208,0,0,0,114,209,0,0,0,114,95,0,0,0,114,
+    74,0,0,0,114,10,0,0,0,114,10,0,0,0,114,11,
+    0,0,0,218,14,95,102,105,110,100,95,97,110,100,95,108,
+    111,97,100,223,3,0,0,115,22,0,0,0,0,6,10,1,
+    14,1,8,1,34,2,8,1,4,1,2,255,4,2,12,2,
+    8,1,114,212,0,0,0,114,22,0,0,0,99,3,0,0,
+    0,0,0,0,0,0,0,0,0,3,0,0,0,4,0,0,
+    0,67,0,0,0,115,42,0,0,0,116,0,124,0,124,1,
+    124,2,131,3,1,0,124,2,100,1,107,4,114,32,116,1,
+    124,0,124,1,124,2,131,3,125,0,116,2,124,0,116,3,
+    131,2,83,0,41,2,97,50,1,0,0,73,109,112,111,114,
+    116,32,97,110,100,32,114,101,116,117,114,110,32,116,104,101,
+    32,109,111,100,117,108,101,32,98,97,115,101,100,32,111,110,
+    32,105,116,115,32,110,97,109,101,44,32,116,104,101,32,112,
+    97,99,107,97,103,101,32,116,104,101,32,99,97,108,108,32,
+    105,115,10,32,32,32,32,98,101,105,110,103,32,109,97,100,
+    101,32,102,114,111,109,44,32,97,110,100,32,116,104,101,32,
+    108,101,118,101,108,32,97,100,106,117,115,116,109,101,110,116,
+    46,10,10,32,32,32,32,84,104,105,115,32,102,117,110,99,
+    116,105,111,110,32,114,101,112,114,101,115,101,110,116,115,32,
+    116,104,101,32,103,114,101,97,116,101,115,116,32,99,111,109,
+    109,111,110,32,100,101,110,111,109,105,110,97,116,111,114,32,
+    111,102,32,102,117,110,99,116,105,111,110,97,108,105,116,121,
+    10,32,32,32,32,98,101,116,119,101,101,110,32,105,109,112,
+    111,114,116,95,109,111,100,117,108,101,32,97,110,100,32,95,
+    95,105,109,112,111,114,116,95,95,46,32,84,104,105,115,32,
+    105,110,99,108,117,100,101,115,32,115,101,116,116,105,110,103,
+    32,95,95,112,97,99,107,97,103,101,95,95,32,105,102,10,
+    32,32,32,32,116,104,101,32,108,111,97,100,101,114,32,100,
+    105,100,32,110,111,116,46,10,10,32,32,32,32,114,22,0,
+    0,0,41,4,114,202,0,0,0,114,189,0,0,0,114,212,
+    0,0,0,218,11,95,103,99,100,95,105,109,112,111,114,116,
+    114,201,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
+    11,0,0,0,114,213,0,0,0,243,3,0,0,115,8,0,
+    0,0,0,9,12,1,8,1,12,1,114,213,0,0,0,169,
+    1,218,9,114,101,99,117,114,115,105,118,101,99,3,0,0,
+    0,0,0,0,0,1,0,0,0,8,0,0,0,11,0,0,
+    0,67,0,0,0,115,226,0,0,0,124,1,68,0,93,216,
+    125,4,116,0,124,4,116,1,131,2,115,66,124,3,114,34,
+    124,0,106,2,100,1,23,0,125,5,110,4,100,2,125,5,
+    116,3,100,3,124,5,155,0,100,4,116,4,124,4,131,1,
+    106,2,155,0,157,4,131,1,130,1,113,4,124,4,100,5,
+    107,2,114,108,124,3,115,220,116,5,124,0,100,6,131,2,
+    114,220,116,6,124,0,124,0,106,7,124,2,100,7,100,8,
+    141,4,1,0,113,4,116,5,124,0,124,4,131,2,115,4,
+    100,9,160,8,124,0,106,2,124,4,161,2,125,6,122,14,
+    116,9,124,2,124,6,131,2,1,0,87,0,113,4,4,0,
+    116,10,107,10,114,218,1,0,125,7,1,0,122,42,124,7,
+    106,11,124,6,107,2,114,200,116,12,106,13,160,14,124,6,
+    116,15,161,2,100,10,107,9,114,200,87,0,89,0,162,8,
+    113,4,130,0,87,0,53,0,100,10,125,7,126,7,88,0,
+    89,0,113,4,88,0,113,4,124,0,83,0,41,11,122,238,
+    70,105,103,117,114,101,32,111,117,116,32,119,104,97,116,32,
+    95,95,105,109,112,111,114,116,95,95,32,115,104,111,117,108,
+    100,32,114,101,116,117,114,110,46,10,10,32,32,32,32,84,
+    104,101,32,105,109,112,111,114,116,95,32,112,97,114,97,109,
+    101,116,101,114,32,105,115,32,97,32,99,97,108,108,97,98,
+    108,101,32,119,104,105,99,104,32,116,97,107,101,115,32,116,
+    104,101,32,110,97,109,101,32,111,102,32,109,111,100,117,108,
+    101,32,116,111,10,32,32,32,32,105,109,112,111,114,116,46,
+    32,73,116,32,105,115,32,114,101,113,117,105,114,101,100,32,
+    116,111,32,100,101,99,111,117,112,108,101,32,116,104,101,32,
+    102,117,110,99,116,105,111,110,32,102,114,111,109,32,97,115,
+    115,117,109,105,110,103,32,105,109,112,111,114,116,108,105,98,
+    39,115,10,32,32,32,32,105,109,112,111,114,116,32,105,109,
+    112,108,101,109,101,110,116,97,116,105,111,110,32,105,115,32,
+    100,101,115,105,114,101,100,46,10,10,32,32,32,32,122,8,
+    46,95,95,97,108,108,95,95,122,13,96,96,102,114,111,109,
+    32,108,105,115,116,39,39,122,8,73,116,101,109,32,105,110,
+    32,122,18,32,109,117,115,116,32,98,101,32,115,116,114,44,
+    32,110,111,116,32,250,1,42,218,7,95,95,97,108,108,95,
+    95,84,114,214,0,0,0,114,184,0,0,0,78,41,16,114,
+    197,0,0,0,114,198,0,0,0,114,1,0,0,0,114,199,
+    0,0,0,114,14,0,0,0,114,4,0,0,0,218,16,95,
+    104,97,110,100,108,101,95,102,114,111,109,108,105,115,116,114,
+    217,0,0,0,114,44,0,0,0,114,66,0,0,0,114,205,
+    0,0,0,114,17,0,0,0,114,15,0,0,0,114,91,0,
+    0,0,114,34,0,0,0,114,211,0,0,0,41,8,114,95,
+    0,0,0,218,8,102,114,111,109,108,105,115,116,114,208,0,
+    0,0,114,215,0,0,0,218,1,120,90,5,119,104,101,114,
+    101,90,9,102,114,111,109,95,110,97,109,101,90,3,101,120,
+    99,114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,218,0,0,0,2,4,0,0,115,44,0,0,0,0,10,
+    8,1,10,1,4,1,12,2,4,1,28,2,8,1,14,1,
+    10,1,2,255,8,2,10,1,14,1,2,1,14,1,16,4,
+    10,1,16,255,2,2,8,1,22,1,114,218,0,0,0,99,
+    1,0,0,0,0,0,0,0,0,0,0,0,3,0,0,0,
+    6,0,0,0,67,0,0,0,115,146,0,0,0,124,0,160,
+    0,100,1,161,1,125,1,124,0,160,0,100,2,161,1,125,
+    2,124,1,100,3,107,9,114,82,124,2,100,3,107,9,114,
+    78,124,1,124,2,106,1,107,3,114,78,116,2,106,3,100,
+    4,124,1,155,2,100,5,124,2,106,1,155,2,100,6,157,
+    5,116,4,100,7,100,8,141,3,1,0,124,1,83,0,124,
+    2,100,3,107,9,114,96,124,2,106,1,83,0,116,2,106,
+    3,100,9,116,4,100,7,100,8,141,3,1,0,124,0,100,
+    10,25,0,125,1,100,11,124,0,107,7,114,142,124,1,160,
+    5,100,12,161,1,100,13,25,0,125,1,124,1,83,0,41,
+    14,122,167,67,97,108,99,117,108,97,116,101,32,119,104,97,
+    116,32,95,95,112,97,99,107,97,103,101,95,95,32,115,104,
+    111,117,108,100,32,98,101,46,10,10,32,32,32,32,95,95,
+    112,97,99,107,97,103,101,95,95,32,105,115,32,110,111,116,
+    32,103,117,97,114,97,110,116,101,101,100,32,116,111,32,98,
+    101,32,100,101,102,105,110,101,100,32,111,114,32,99,111,117,
+    108,100,32,98,101,32,115,101,116,32,116,111,32,78,111,110,
+    101,10,32,32,32,32,116,111,32,114,101,112,114,101,115,101,
+    110,116,32,116,104,97,116,32,105,116,115,32,112,114,111,112,
+    101,114,32,118,97,108,117,101,32,105,115,32,117,110,107,110,
+    111,119,110,46,10,10,32,32,32,32,114,144,0,0,0,114,
+    104,0,0,0,78,122,32,95,95,112,97,99,107,97,103,101,
+    95,95,32,33,61,32,95,95,115,112,101,99,95,95,46,112,
+    97,114,101,110,116,32,40,122,4,32,33,61,32,250,1,41,
+    233,3,0,0,0,41,1,90,10,115,116,97,99,107,108,101,
+    118,101,108,122,89,99,97,110,39,116,32,114,101,115,111,108,
+    118,101,32,112,97,99,107,97,103,101,32,102,114,111,109,32,
+    95,95,115,112,101,99,95,95,32,111,114,32,95,95,112,97,
+    99,107,97,103,101,95,95,44,32,102,97,108,108,105,110,103,
+    32,98,97,99,107,32,111,110,32,95,95,110,97,109,101,95,
+    95,32,97,110,100,32,95,95,112,97,116,104,95,95,114,1,
+    0,0,0,114,140,0,0,0,114,127,0,0,0,114,22,0,
+    0,0,41,6,114,34,0,0,0,114,129,0,0,0,114,193,
+    0,0,0,114,194,0,0,0,114,195,0,0,0,114,128,0,
+    0,0,41,3,218,7,103,108,111,98,97,108,115,114,187,0,
+    0,0,114,94,0,0,0,114,10,0,0,0,114,10,0,0,
+    0,114,11,0,0,0,218,17,95,99,97,108,99,95,95,95,
+    112,97,99,107,97,103,101,95,95,39,4,0,0,115,38,0,
+    0,0,0,7,10,1,10,1,8,1,18,1,22,2,2,0,
+    2,254,6,3,4,1,8,1,6,2,6,2,2,0,2,254,
+    6,3,8,1,8,1,14,1,114,224,0,0,0,114,10,0,
+    0,0,99,5,0,0,0,0,0,0,0,0,0,0,0,9,
+    0,0,0,5,0,0,0,67,0,0,0,115,180,0,0,0,
+    124,4,100,1,107,2,114,18,116,0,124,0,131,1,125,5,
+    110,36,124,1,100,2,107,9,114,30,124,1,110,2,105,0,
+    125,6,116,1,124,6,131,1,125,7,116,0,124,0,124,7,
+    124,4,131,3,125,5,124,3,115,150,124,4,100,1,107,2,
+    114,84,116,0,124,0,160,2,100,3,161,1,100,1,25,0,
+    131,1,83,0,124,0,115,92,124,5,83,0,116,3,124,0,
+    131,1,116,3,124,0,160,2,100,3,161,1,100,1,25,0,
+    131,1,24,0,125,8,116,4,106,5,124,5,106,6,100,2,
+    116,3,124,5,106,6,131,1,124,8,24,0,133,2,25,0,
+    25,0,83,0,110,26,116,7,124,5,100,4,131,2,114,172,
+    116,8,124,5,124,3,116,0,131,3,83,0,124,5,83,0,
+    100,2,83,0,41,5,97,215,1,0,0,73,109,112,111,114,
+    116,32,97,32,109,111,100,117,108,101,46,10,10,32,32,32,
+    32,84,104,101,32,39,103,108,111,98,97,108,115,39,32,97,
+    114,103,117,109,101,110,116,32,105,115,32,117,115,101,100,32,
+    116,111,32,105,110,102,101,114,32,119,104,101,114,101,32,116,
+    104,101,32,105,109,112,111,114,116,32,105,115,32,111,99,99,
+    117,114,114,105,110,103,32,102,114,111,109,10,32,32,32,32,
+    116,111,32,104,97,110,100,108,101,32,114,101,108,97,116,105,
+    118,101,32,105,109,112,111,114,116,115,46,32,84,104,101,32,
+    39,108,111,99,97,108,115,39,32,97,114,103,117,109,101,110,
+    116,32,105,115,32,105,103,110,111,114,101,100,46,32,84,104,
+    101,10,32,32,32,32,39,102,114,111,109,108,105,115,116,39,
+    32,97,114,103,117,109,101,110,116,32,115,112,101,99,105,102,
+    105,101,115,32,119,104,97,116,32,115,104,111,117,108,100,32,
+    101,120,105,115,116,32,97,115,32,97,116,116,114,105,98,117,
+    116,101,115,32,111,110,32,116,104,101,32,109,111,100,117,108,
+    101,10,32,32,32,32,98,101,105,110,103,32,105,109,112,111,
+    114,116,101,100,32,40,101,46,103,46,32,96,96,102,114,111,
+    109,32,109,111,100,117,108,101,32,105,109,112,111,114,116,32,
+    60,102,114,111,109,108,105,115,116,62,96,96,41,46,32,32,
+    84,104,101,32,39,108,101,118,101,108,39,10,32,32,32,32,
+    97,114,103,117,109,101,110,116,32,114,101,112,114,101,115,101,
+    110,116,115,32,116,104,101,32,112,97,99,107,97,103,101,32,
+    108,111,99,97,116,105,111,110,32,116,111,32,105,109,112,111,
+    114,116,32,102,114,111,109,32,105,110,32,97,32,114,101,108,
+    97,116,105,118,101,10,32,32,32,32,105,109,112,111,114,116,
+    32,40,101,46,103,46,32,96,96,102,114,111,109,32,46,46,
+    112,107,103,32,105,109,112,111,114,116,32,109,111,100,96,96,
+    32,119,111,117,108,100,32,104,97,118,101,32,97,32,39,108,
+    101,118,101,108,39,32,111,102,32,50,41,46,10,10,32,32,
+    32,32,114,22,0,0,0,78,114,127,0,0,0,114,140,0,
+    0,0,41,9,114,213,0,0,0,114,224,0,0,0,218,9,
+    112,97,114,116,105,116,105,111,110,114,186,0,0,0,114,15,
+    0,0,0,114,91,0,0,0,114,1,0,0,0,114,4,0,
+    0,0,114,218,0,0,0,41,9,114,17,0,0,0,114,223,
+    0,0,0,218,6,108,111,99,97,108,115,114,219,0,0,0,
+    114,188,0,0,0,114,95,0,0,0,90,8,103,108,111,98,
+    97,108,115,95,114,187,0,0,0,90,7,99,117,116,95,111,
+    102,102,114,10,0,0,0,114,10,0,0,0,114,11,0,0,
+    0,218,10,95,95,105,109,112,111,114,116,95,95,66,4,0,
+    0,115,30,0,0,0,0,11,8,1,10,2,16,1,8,1,
+    12,1,4,3,8,1,18,1,4,1,4,4,26,3,32,1,
+    10,1,12,2,114,227,0,0,0,99,1,0,0,0,0,0,
+    0,0,0,0,0,0,2,0,0,0,3,0,0,0,67,0,
+    0,0,115,60,0,0,0,116,0,100,1,107,8,125,1,124,
+    0,114,56,124,0,116,1,107,6,114,24,100,2,83,0,124,
+    1,115,40,124,0,116,0,107,6,114,40,100,3,125,1,124,
+    0,160,2,100,4,161,1,100,5,25,0,125,0,113,8,124,
+    1,83,0,41,6,122,55,82,101,116,117,114,110,32,119,104,
+    101,116,104,101,114,32,97,32,108,97,122,121,32,105,109,112,
+    111,114,116,32,109,97,121,32,100,101,102,101,114,32,116,104,
+    101,32,109,111,100,117,108,101,32,110,97,109,101,46,78,70,
+    84,114,127,0,0,0,114,22,0,0,0,41,3,218,19,95,
+    108,97,122,121,95,105,109,112,111,114,116,115,95,97,108,108,
+    111,119,218,18,95,108,97,122,121,95,105,109,112,111,114,116,
+    115,95,100,101,110,121,114,128,0,0,0,41,2,114,17,0,
+    0,0,90,7,97,108,108,111,119,101,100,114,10,0,0,0,
+    114,10,0,0,0,114,11,0,0,0,218,10,95,109,97,121,
+    95,100,101,102,101,114,116,4,0,0,115,16,0,0,0,0,
+    2,8,1,4,1,8,1,4,1,12,1,4,1,16,1,114,
+    230,0,0,0,99,1,0,0,0,0,0,0,0,0,0,0,
+    0,1,0,0,0,5,0,0,0,67,0,0,0,115,24,0,
+    0,0,116,0,124,0,106,1,116,2,106,3,116,2,106,4,
+    116,2,106,5,102,3,131,2,83,0,41,1,122,184,82,101,
+    116,117,114,110,32,119,104,101,116,104,101,114,32,116,104,101,
+    32,101,120,101,99,117,116,105,111,110,32,111,102,32,116,104,
+    101,32,109,111,100,117,108,101,32,111,102,32,115,112,101,99,
+    32,99,97,110,32,98,101,32,100,101,102,101,114,114,101,100,
+    46,10,10,32,32,32,32,84,104,105,115,32,105,115,32,111,
+    110,108,121,32,116,104,101,32,99,97,115,101,32,102,111,114,
+    32,109,111,100,117,108,101,115,32,101,120,101,99,117,116,105,
+    110,103,32,99,111,100,101,44,32,119,104,111,115,101,32,108,
+    111,97,100,101,114,32,99,114,101,97,116,101,115,10,32,32,
+    32,32,110,111,116,104,105,110,103,32,98,101,102,111,114,101,
+    32,116,104,101,105,114,32,101,120,101,99,117,116,105,111,110,
+    46,10,32,32,32,32,41,6,114,197,0,0,0,114,108,0,
+    0,0,114,125,0,0,0,90,12,83,111,117,114,99,101,76,
+    111,97,100,101,114,90,20,83,111,117,114,99,101,108,101,115,
+    115,70,105,108,101,76,111,97,100,101,114,90,20,66,121,116,
+    101,99,111,100,101,66,117,110,100,108,101,70,105,110,100,101,
+    114,114,161,0,0,0,114,10,0,0,0,114,10,0,0,0,
+    114,11,0,0,0,114,206,0,0,0,128,4,0,0,115,8,
+    0,0,0,0,6,10,1,4,1,4,254,114,206,0,0,0,
+    99,1,0,0,0,0,0,0,0,0,0,0,0,2,0,0,
+    0,3,0,0,0,67,0,0,0,115,42,0,0,0,116,0,
+    124,0,131,1,125,1,116,1,124,1,95,2,124,1,116,3,
+    106,4,124,0,106,5,60,0,116,6,100,1,124,0,106,5,
+    131,2,1,0,124,1,83,0,41,2,122,111,67,114,101,97,
+    116,101,32,116,104,101,32,109,111,100,117,108,101,32,111,102,
+    32,115,112,101,99,32,97,110,100,32,97,100,100,32,105,116,
+    32,116,111,32,115,121,115,46,109,111,100,117,108,101,115,44,
+    32,100,101,102,101,114,114,105,110,103,32,105,116,115,10,32,
+    32,32,32,101,120,101,99,117,116,105,111,110,32,116,111,32,
+    116,104,101,32,102,105,114,115,116,32,97,116,116,114,105,98,
+    117,116,101,32,97,99,99,101,115,115,46,122,22,105,109,112,
+    111,114,116,32,123,33,114,125,32,35,32,100,101,102,101,114,
+    114,101,100,41,7,114,151,0,0,0,218,11,95,76,97,122,
+    121,77,111,100,117,108,101,114,119,0,0,0,114,15,0,0,
+    0,114,91,0,0,0,114,17,0,0,0,114,75,0,0,0,
+    114,150,0,0,0,114,10,0,0,0,114,10,0,0,0,114,
+    11,0,0,0,114,207,0,0,0,139,4,0,0,115,10,0,
+    0,0,0,3,8,1,6,1,12,1,12,1,114,207,0,0,
+    0,99,1,0,0,0,0,0,0,0,0,0,0,0,3,0,
+    0,0,9,0,0,0,67,0,0,0,115,194,0,0,0,116,
+    0,116,1,131,1,125,1,124,1,160,2,124,0,100,1,161,
+    2,125,2,116,3,124,2,106,4,131,1,143,154,1,0,116,
+    0,124,0,131,1,116,5,107,9,115,56,116,6,124,2,100,
+    2,100,3,131,3,114,70,87,0,53,0,81,0,82,0,163,
+    0,100,4,83,0,100,5,124,2,95,7,122,64,122,16,124,
+    2,106,8,160,9,124,0,161,1,1,0,87,0,110,42,1,
+    0,1,0,1,0,116,1,106,10,160,11,124,2,106,4,161,
+    1,124,0,107,8,114,130,116,1,106,10,124,2,106,4,61,
+    0,130,0,89,0,110,2,88,0,87,0,53,0,100,3,124,
+    2,95,7,88,0,124,1,160,12,124,0,100,6,124,1,161,
+    3,1,0,116,13,100,7,124,2,106,4,124,2,106,8,131,
+    3,1,0,87,0,53,0,81,0,82,0,88,0,100,4,83,
+    0,41,8,122,89,69,120,101,99,117,116,101,32,97,32,100,
+    101,102,101,114,114,101,100,32,109,111,100,117,108,101,44,32,
+    117,110,108,101,115,115,32,105,116,32,105,115,32,97,108,114,
+    101,97,100,121,32,101,120,101,99,117,116,101,100,32,111,114,
+    32,101,120,101,99,117,116,105,110,103,10,32,32,32,32,105,
+    110,32,116,104,105,115,32,116,104,114,101,97,100,46,114,104,
+    0,0,0,114,159,0,0,0,70,78,84,114,119,0,0,0,
+    114,158,0,0,0,41,14,114,14,0,0,0,114,15,0,0,
+    0,218,16,95,95,103,101,116,97,116,116,114,105,98,117,116,
+    101,95,95,114,49,0,0,0,114,17,0,0,0,114,231,0,
+    0,0,114,6,0,0,0,114,159,0,0,0,114,108,0,0,
+    0,114,149,0,0,0,114,91,0,0,0,114,34,0,0,0,
+    218,11,95,95,115,101,116,97,116,116,114,95,95,114,75,0,
+    0,0,41,3,114,95,0,0,0,218,11,109,111,100,117,108,
+    101,95,116,121,112,101,114,94,0,0,0,114,10,0,0,0,
+    114,10,0,0,0,114,11,0,0,0,218,14,95,108,111,97,
+    100,95,100,101,102,101,114,114,101,100,149,4,0,0,115,34,
+    0,0,0,0,3,8,1,12,1,12,1,12,1,10,255,2,
+    2,14,1,6,1,4,1,16,1,6,3,18,1,10,1,12,
+    2,8,1,14,1,114,235,0,0,0,99,3,0,0,0,0,
+    0,0,0,0,0,0,0,3,0,0,0,5,0,0,0,67,
+    0,0,0,115,48,0,0,0,116,0,124,0,124,1,124,2,
+    131,3,1,0,124,2,100,1,107,4,114,32,116,1,124,0,
+    124,1,124,2,131,3,125,0,116,2,124,0,116,3,116,4,
+    124,0,131,1,131,3,83,0,41,2,122,92,73,109,112,111,
+    114,116,32,116,104,101,32,109,111,100,117,108,101,32,108,105,
+    107,101,32,95,103,99,100,95,105,109,112,111,114,116,40,41,
+    44,32,98,117,116,32,100,101,102,101,114,32,105,116,115,32,
+    101,120,101,99,117,116,105,111,110,32,105,102,32,105,116,32,
+    105,115,10,32,32,32,32,110,111,116,32,105,109,112,111,114,
+    116,101,100,32,121,101,116,46,114,22,0,0,0,41,5,114,
+    202,0,0,0,114,189,0,0,0,114,212,0,0,0,114,213,
+    0,0,0,114,230,0,0,0,114,201,0,0,0,114,10,0,
+    0,0,114,10,0,0,0,114,11,0,0,0,218,16,95,108,
+    97,122,121,95,103,99,100,95,105,109,112,111,114,116,173,4,
+    0,0,115,8,0,0,0,0,3,12,1,8,1,12,1,114,
+    236,0,0,0,99,5,0,0,0,0,0,0,0,0,0,0,
+    0,7,0,0,0,6,0,0,0,67,0,0,0,115,130,0,
+    0,0,124,3,114,80,124,4,100,1,107,4,114,46,116,0,
+    124,1,100,2,107,9,114,26,124,1,110,2,105,0,131,1,
+    125,5,116,1,124,0,124,5,124,4,131,3,125,6,110,8,
+    116,1,124,0,131,1,125,6,116,2,124,6,100,3,131,2,
+    114,76,116,3,124,6,124,3,116,4,131,3,83,0,124,6,
+    83,0,124,4,100,1,107,2,114,114,116,4,124,0,131,1,
+    1,0,116,1,124,0,160,5,100,4,161,1,100,1,25,0,
+    131,1,83,0,116,6,124,0,124,1,124,2,124,3,124,4,
+    131,5,83,0,41,5,97,67,1,0,0,73,109,112,111,114,
+    116,32,97,32,109,111,100,117,108,101,32,102,111,114,32,97,
+    110,32,105,109,112,111,114,116,32,115,116,97,116,101,109,101,
+    110,116,32,119,104,101,110,32,108,97,122,121,32,105,109,112,
+    111,114,116,115,32,97,114,101,32,101,110,97,98,108,101,100,
+    46,10,10,32,32,32,32,84,104,101,32,109,111,100,117,108,
+    101,44,32,111,114,32,116,104,101,32,115,117,98,109,111,100,
+    117,108,101,115,32,105,110,32,102,114,111,109,108,105,115,116,
+    44,32,97,114,101,32,100,101,102,101,114,114,101,100,32,105,
+    102,32,116,104,101,121,32,97,114,101,32,110,111,116,10,32,
+    32,32,32,105,109,112,111,114,116,101,100,32,121,101,116,58,
+    32,116,104,101,121,32,97,114,101,32,101,120,101,99,117,116,
+    101,100,32,111,110,32,102,105,114,115,116,32,97,116,116,114,
+    105,98,117,116,101,32,97,99,99,101,115,115,46,32,32,84,
+    104,101,32,112,97,114,101,110,116,10,32,32,32,32,112,97,
+    99,107,97,103,101,115,44,32,97,110,100,32,116,104,101,32,
+    109,111,100,117,108,101,32,105,116,115,101,108,102,32,105,102,
+    32,111,116,104,101,114,32,110,97,109,101,115,32,97,114,101,
+    32,105,110,32,102,114,111,109,108,105,115,116,44,32,97,114,
+    101,10,32,32,32,32,105,109,112,111,114,116,101,100,32,97,
+    115,32,117,115,117,97,108,46,10,10,32,32,32,32,114,22,
+    0,0,0,78,114,140,0,0,0,114,127,0,0,0,41,7,
+    114,224,0,0,0,114,213,0,0,0,114,4,0,0,0,114,
+    218,0,0,0,114,236,0,0,0,114,225,0,0,0,114,227,
+    0,0,0,41,7,114,17,0,0,0,114,223,0,0,0,114,
+    226,0,0,0,114,219,0,0,0,114,188,0,0,0,114,187,
+    0,0,0,114,95,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,11,0,0,0,218,12,95,108,97,122,121,95,105,
+    109,112,111,114,116,182,4,0,0,115,24,0,0,0,0,9,
+    4,1,8,1,20,1,14,2,8,1,10,1,12,1,4,1,
+    8,1,8,1,18,1,114,237,0,0,0,99,1,0,0,0,
+    0,0,0,0,0,0,0,0,2,0,0,0,3,0,0,0,
+    67,0,0,0,115,38,0,0,0,116,0,160,1,124,0,161,
+    1,125,1,124,1,100,0,107,8,114,30,116,2,100,1,124,
+    0,23,0,131,1,130,1,116,3,124,1,131,1,83,0,41,
+    2,78,122,25,110,111,32,98,117,105,108,116,45,105,110,32,
+    109,111,100,117,108,101,32,110,97,109,101,100,32,41,4,114,
+    162,0,0,0,114,168,0,0,0,114,78,0,0,0,114,160,
+    0,0,0,41,2,114,17,0,0,0,114,94,0,0,0,114,
+    10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,18,
+    95,98,117,105,108,116,105,110,95,102,114,111,109,95,110,97,
+    109,101,206,4,0,0,115,8,0,0,0,0,1,10,1,8,
+    1,12,1,114,238,0,0,0,99,2,0,0,0,0,0,0,
+    0,0,0,0,0,9,0,0,0,5,0,0,0,3,0,0,
+    0,115,186,0,0,0,124,1,97,0,124,0,97,1,116,2,
+    116,1,131,1,137,0,116,1,106,3,160,4,161,0,68,0,
+    93,72,92,2,125,2,125,3,116,5,124,3,136,0,131,2,
+    114,26,124,2,116,1,106,6,107,6,114,60,116,7,125,4,
+    110,18,116,0,160,8,124,2,161,1,114,26,116,9,125,4,
+    110,2,113,26,116,10,124,3,124,4,131,2,125,5,116,11,
+    124,5,124,3,131,2,1,0,113,26,71,0,135,0,102,1,
+    100,1,100,2,132,8,100,2,136,0,131,3,97,12,116,1,
+    106,3,116,13,25,0,125,6,100,3,68,0,93,46,125,7,
+    124,7,116,1,106,3,107,7,114,158,116,14,124,7,131,1,
+    125,8,110,10,116,1,106,3,124,7,25,0,125,8,116,15,
+    124,6,124,7,124,8,131,3,1,0,113,134,100,4,83,0,
+    41,5,122,250,83,101,116,117,112,32,105,109,112,111,114,116,
+    108,105,98,32,98,121,32,105,109,112,111,114,116,105,110,103,
+    32,110,101,101,100,101,100,32,98,117,105,108,116,45,105,110,
+    32,109,111,100,117,108,101,115,32,97,110,100,32,105,110,106,
+    101,99,116,105,110,103,32,116,104,101,109,10,32,32,32,32,
+    105,110,116,111,32,116,104,101,32,103,108,111,98,97,108,32,
+    110,97,109,101,115,112,97,99,101,46,10,10,32,32,32,32,
+    65,115,32,115,121,115,32,105,115,32,110,101,101,100,101,100,
+    32,102,111,114,32,115,121,115,46,109,111,100,117,108,101,115,
+    32,97,99,99,101,115,115,32,97,110,100,32,95,105,109,112,
+    32,105,115,32,110,101,101,100,101,100,32,116,111,32,108,111,
+    97,100,32,98,117,105,108,116,45,105,110,10,32,32,32,32,
+    109,111,100,117,108,101,115,44,32,116,104,111,115,101,32,116,
+    119,111,32,109,111,100,117,108,101,115,32,109,117,115,116,32,
+    98,101,32,101,120,112,108,105,99,105,116,108,121,32,112,97,
+    115,115,101,100,32,105,110,46,10,10,32,32,32,32,99,0,
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,3,
+    0,0,0,0,0,0,0,115,52,0,0,0,101,0,90,1,
+    100,0,90,2,100,1,90,3,135,0,102,1,100,2,100,3,
+    132,8,90,4,135,0,102,1,100,4,100,5,132,8,90,5,
+    135,0,102,1,100,6,100,7,132,8,90,6,100,8,83,0,
+    41,9,114,231,0,0,0,122,79,65,32,109,111,100,117,108,
+    101,32,100,101,102,101,114,114,101,100,32,98,121,32,97,32,
+    108,97,122,121,32,105,109,112,111,114,116,44,32,101,120,101,
+    99,117,116,101,100,32,111,110,32,102,105,114,115,116,32,97,
+    116,116,114,105,98,117,116,101,10,32,32,32,32,32,32,32,
+    32,97,99,99,101,115,115,46,99,2,0,0,0,0,0,0,
+    0,0,0,0,0,2,0,0,0,4,0,0,0,19,0,0,
+    0,115,20,0,0,0,116,0,124,0,131,1,1,0,136,0,
+    160,1,124,0,124,1,161,2,83,0,114,13,0,0,0,41,
+    2,114,235,0,0,0,114,232,0,0,0,169,2,114,30,0,
+    0,0,218,4,97,116,116,114,169,1,114,234,0,0,0,114,
+    10,0,0,0,114,11,0,0,0,114,232,0,0,0,243,4,
+    0,0,115,4,0,0,0,0,1,8,1,122,28,95,76,97,
+    122,121,77,111,100,117,108,101,46,95,95,103,101,116,97,116,
+    116,114,105,98,117,116,101,95,95,99,3,0,0,0,0,0,
+    0,0,0,0,0,0,3,0,0,0,5,0,0,0,19,0,
+    0,0,115,26,0,0,0,116,0,124,0,131,1,1,0,136,
+    0,160,1,124,0,124,1,124,2,161,3,1,0,100,0,83,
+    0,114,13,0,0,0,41,2,114,235,0,0,0,114,233,0,
+    0,0,41,3,114,30,0,0,0,114,240,0,0,0,114,131,
+    0,0,0,114,241,0,0,0,114,10,0,0,0,114,11,0,
+    0,0,114,233,0,0,0,247,4,0,0,115,4,0,0,0,
+    0,1,8,1,122,23,95,76,97,122,121,77,111,100,117,108,
+    101,46,95,95,115,101,116,97,116,116,114,95,95,99,2,0,
+    0,0,0,0,0,0,0,0,0,0,2,0,0,0,4,0,
+    0,0,19,0,0,0,115,24,0,0,0,116,0,124,0,131,
+    1,1,0,136,0,160,1,124,0,124,1,161,2,1,0,100,
+    0,83,0,114,13,0,0,0,41,2,114,235,0,0,0,218,
+    11,95,95,100,101,108,97,116,116,114,95,95,114,239,0,0,
+    0,114,241,0,0,0,114,10,0,0,0,114,11,0,0,0,
+    114,242,0,0,0,251,4,0,0,115,4,0,0,0,0,1,
+    8,1,122,23,95,76,97,122,121,77,111,100,117,108,101,46,
+    95,95,100,101,108,97,116,116,114,95,95,78,41,7,114,1,
+    0,0,0,114,0,0,0,0,114,2,0,0,0,114,3,0,
+    0,0,114,232,0,0,0,114,233,0,0,0,114,242,0,0,
+    0,114,10,0,0,0,114,241,0,0,0,114,10,0,0,0,
+    114,11,0,0,0,114,231,0,0,0,238,4,0,0,115,8,
+    0,0,0,8,2,4,3,12,4,12,4,114,231,0,0,0,
+    41,3,114,23,0,0,0,114,193,0,0,0,114,63,0,0,
+    0,78,41,16,114,56,0,0,0,114,15,0,0,0,114,14,
+    0,0,0,114,91,0,0,0,218,5,105,116,101,109,115,114,
+    197,0,0,0,114,77,0,0,0,114,162,0,0,0,114,87,
+    0,0,0,114,175,0,0,0,114,141,0,0,0,114,147,0,
+    0,0,114,231,0,0,0,114,1,0,0,0,114,238,0,0,
+    0,114,5,0,0,0,41,9,218,10,115,121,115,95,109,111,
+    100,117,108,101,218,11,95,105,109,112,95,109,111,100,117,108,
+    101,114,17,0,0,0,114,95,0,0,0,114,108,0,0,0,
+    114,94,0,0,0,90,11,115,101,108,102,95,109,111,100,117,
+    108,101,90,12,98,117,105,108,116,105,110,95,110,97,109,101,
+    90,14,98,117,105,108,116,105,110,95,109,111,100,117,108,101,
+    114,10,0,0,0,114,241,0,0,0,114,11,0,0,0,218,
+    6,95,115,101,116,117,112,213,4,0,0,115,38,0,0,0,
+    0,9,4,1,4,3,8,1,18,1,10,1,10,1,6,1,
+    10,1,6,2,2,1,10,1,12,2,20,18,10,1,8,1,
+    10,1,10,2,10,1,114,246,0,0,0,99,2,0,0,0,
+    0,0,0,0,0,0,0,0,2,0,0,0,3,0,0,0,
+    67,0,0,0,115,38,0,0,0,116,0,124,0,124,1,131,
+    2,1,0,116,1,106,2,160,3,116,4,161,1,1,0,116,
+    1,106,2,160,3,116,5,161,1,1,0,100,1,83,0,41,
+    2,122,48,73,110,115,116,97,108,108,32,105,109,112,111,114,
+    116,101,114,115,32,102,111,114,32,98,117,105,108,116,105,110,
+    32,97,110,100,32,102,114,111,122,101,110,32,109,111,100,117,
+    108,101,115,78,41,6,114,246,0,0,0,114,15,0,0,0,
+    114,192,0,0,0,114,118,0,0,0,114,162,0,0,0,114,
+    175,0,0,0,41,2,114,244,0,0,0,114,245,0,0,0,
+    114,10,0,0,0,114,10,0,0,0,114,11,0,0,0,218,
+    8,95,105,110,115,116,97,108,108,9,5,0,0,115,6,0,
+    0,0,0,2,10,2,12,1,114,247,0,0,0,99,0,0,
+    0,0,0,0,0,0,0,0,0,0,1,0,0,0,4,0,
+    0,0,67,0,0,0,115,32,0,0,0,100,1,100,2,108,
+    0,125,0,124,0,97,1,124,0,160,2,116,3,106,4,116,
+    5,25,0,161,1,1,0,100,2,83,0,41,3,122,57,73,
+    110,115,116,97,108,108,32,105,109,112,111,114,116,101,114,115,
+    32,116,104,97,116,32,114,101,113,117,105,114,101,32,101,120,
+    116,101,114,110,97,108,32,102,105,108,101,115,121,115,116,101,
+    109,32,97,99,99,101,115,115,114,22,0,0,0,78,41,6,
+    218,26,95,102,114,111,122,101,110,95,105,109,112,111,114,116,
+    108,105,98,95,101,120,116,101,114,110,97,108,114,125,0,0,
+    0,114,247,0,0,0,114,15,0,0,0,114,91,0,0,0,
+    114,1,0,0,0,41,1,114,248,0,0,0,114,10,0,0,
+    0,114,10,0,0,0,114,11,0,0,0,218,27,95,105,110,
+    115,116,97,108,108,95,101,120,116,101,114,110,97,108,95,105,
+    109,112,111,114,116,101,114,115,17,5,0,0,115,6,0,0,
+    0,0,3,8,1,4,1,114,249,0,0,0,41,2,78,78,
+    41,1,78,41,1,70,41,1,70,41,2,78,114,22,0,0,
+    0,41,4,78,78,114,10,0,0,0,114,22,0,0,0,41,
+    2,78,114,22,0,0,0,41,4,78,78,114,10,0,0,0,
+    114,22,0,0,0,41,60,114,3,0,0,0,114,125,0,0,
+    0,114,12,0,0,0,114,18,0,0,0,114,59,0,0,0,
+    114,33,0,0,0,114,42,0,0,0,114,19,0,0,0,114,
+    20,0,0,0,114,48,0,0,0,114,49,0,0,0,114,52,
+    0,0,0,114,64,0,0,0,114,66,0,0,0,114,75,0,
+    0,0,114,85,0,0,0,114,89,0,0,0,114,96,0,0,
+    0,114,110,0,0,0,114,111,0,0,0,114,90,0,0,0,
+    114,141,0,0,0,114,147,0,0,0,114,151,0,0,0,114,
+    106,0,0,0,114,92,0,0,0,114,157,0,0,0,114,160,
+    0,0,0,114,93,0,0,0,114,162,0,0,0,114,175,0,
+    0,0,114,180,0,0,0,114,189,0,0,0,114,191,0,0,
+    0,114,196,0,0,0,114,202,0,0,0,90,15,95,69,82,
+    82,95,77,83,71,95,80,82,69,70,73,88,114,204,0,0,
+    0,114,210,0,0,0,218,6,111,98,106,101,99,116,114,211,
+    0,0,0,114,212,0,0,0,114,213,0,0,0,114,218,0,
+    0,0,114,224,0,0,0,114,227,0,0,0,114,228,0,0,
+    0,218,9,102,114,111,122,101,110,115,101,116,114,229,0,0,
+    0,114,231,0,0,0,114,230,0,0,0,114,206,0,0,0,
+    114,207,0,0,0,114,235,0,0,0,114,236,0,0,0,114,
+    237,0,0,0,114,238,0,0,0,114,246,0,0,0,114,247,
+    0,0,0,114,249,0,0,0,114,10,0,0,0,114,10,0,
+    0,0,114,10,0,0,0,114,11,0,0,0,218,8,60,109,
+    111,100,117,108,101,62,1,0,0,0,115,112,0,0,0,4,
+    24,4,2,8,8,8,8,4,2,4,3,16,4,14,68,14,
+    21,14,16,8,37,8,17,8,11,14,8,8,11,8,12,8,
+    16,8,36,14,101,16,26,10,45,14,72,8,17,8,17,8,
+    30,8,37,8,42,8,15,14,73,14,79,14,13,8,9,8,
+    9,10,47,8,16,4,1,8,2,10,32,6,3,10,20,10,
+    15,14,37,8,27,10,41,4,2,6,4,4,3,8,12,8,
+    11,8,10,8,24,10,9,10,24,8,7,8,52,8,8,
 };
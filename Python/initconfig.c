@@ -95,7 +95,10 @@ static const char usage_6[] =
 "PYTHONBREAKPOINT: if this variable is set to 0, it disables the default\n"
 "   debugger. It can be set to the callable of your debugger of choice.\n"
 "PYTHONDEVMODE: enable the development mode.\n"
-"PYTHONPYCACHEPREFIX: root directory for bytecode cache (pyc) files.\n";
+"PYTHONPYCACHEPREFIX: root directory for bytecode cache (pyc) files.\n"
+"PYTHONIMPORTINDEX: import index file used to find modules.\n"
+"PYTHONBYTECODEBUNDLE: bytecode bundle file to import modules from.\n"
+"PYTHONLAZYIMPORTS: defer the execution of imported modules until used.\n";
 
 #if defined(MS_WINDOWS)
 #  define PYTHONHOMEHELP "<prefix>\\python{major}{minor}"
@@ -598,6 +601,7 @@ _PyConfig_InitCompatConfig(PyConfig *config)
     config->_install_importlib = 1;
     config->check_hash_pycs_mode = NULL;
     config->pathconfig_warnings = -1;
+    config->use_frozen_modules = 1;
     config->_init_main = 1;
 #ifdef MS_WINDOWS
     config->legacy_windows_stdio = -1;
@@ -769,6 +773,8 @@ _PyConfig_Copy(PyConfig *config, const PyConfig *config2)
     COPY_ATTR(faulthandler);
     COPY_ATTR(tracemalloc);
     COPY_ATTR(import_time);
+    COPY_ATTR(lazy_imports);
+    COPY_ATTR(use_frozen_modules);
     COPY_ATTR(show_ref_count);
     COPY_ATTR(show_alloc_count);
     COPY_ATTR(dump_refs);
@@ -872,6 +878,8 @@ config_as_dict(const PyConfig *config)
     SET_ITEM_INT(faulthandler);
     SET_ITEM_INT(tracemalloc);
     SET_ITEM_INT(import_time);
+    SET_ITEM_INT(lazy_imports);
+    SET_ITEM_INT(use_frozen_modules);
     SET_ITEM_INT(show_ref_count);
     SET_ITEM_INT(show_alloc_count);
     SET_ITEM_INT(dump_refs);
@@ -1375,6 +1383,28 @@ config_init_pycache_prefix(PyConfig *config)
 }
 
 
+static PyStatus
+config_init_frozen_modules(PyConfig *config)
+{
+    const wchar_t *xoption = config_get_xoption(config, L"frozen_modules");
+    if (xoption == NULL) {
+        return _PyStatus_OK();
+    }
+
+    const wchar_t *sep = wcschr(xoption, L'=');
+    if (sep == NULL || wcscmp(sep + 1, L"on") == 0) {
+        config->use_frozen_modules = 1;
+    }
+    else if (wcscmp(sep + 1, L"off") == 0) {
+        config->use_frozen_modules = 0;
+    }
+    else {
+        return _PyStatus_ERR("invalid -X frozen_modules option value");
+    }
+    return _PyStatus_OK();
+}
+
+
 static PyStatus
 config_read_complex_options(PyConfig *config)
 {
@@ -1389,6 +1419,10 @@ config_read_complex_options(PyConfig *config)
        || config_get_xoption(config, L"importtime")) {
         config->import_time = 1;
     }
+    if (config_get_env(config, "PYTHONLAZYIMPORTS")
+       || config_get_xoption(config, L"lazy_imports")) {
+        config->lazy_imports = 1;
+    }
 
     PyStatus status;
     if (config->tracemalloc < 0) {
@@ -1404,6 +1438,11 @@ config_read_complex_options(PyConfig *config)
             return status;
         }
     }
+
+    status = config_init_frozen_modules(config);
+    if (_PyStatus_EXCEPTION(status)) {
+        return status;
+    }
     return _PyStatus_OK();
 }
 
@@ -987,6 +987,7 @@ pyinit_main(_PyRuntimeState *runtime, PyThreadState *tstate)
             return status;
         }
     }
+    interp->lazy_imports = config->lazy_imports;
 
 #ifndef MS_WINDOWS
     emit_stderr_warning_for_legacy_locale(runtime);
@@ -1528,6 +1529,7 @@ new_interpreter(PyThreadState **tstate_p)
                 return status;
             }
         }
+        interp->lazy_imports = config->lazy_imports;
     }
 
     if (_PyErr_Occurred(tstate)) {
@@ -0,0 +1,95 @@
+"""Benchmark the per-callback overhead and latency of the asyncio event loop.
+
+Measures the throughput of callbacks scheduled with call_soon(), and the
+round trip latency of messages bounced through many socket pairs which are
+all ready at the same time, so that each iteration of the loop dispatches
+many readiness events.
+
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+
+
+def bench_call_soon(loop, n):
+    done = loop.create_future()
+    remaining = n
+
+    def callback():
+        nonlocal remaining
+        remaining -= 1
+        if remaining > 0:
+            loop.call_soon(callback)
+        elif not done.done():
+            done.set_result(None)
+
+    # Keep several callbacks ready at once, as a busy server does
+    for _ in range(100):
+        loop.call_soon(callback)
+    t0 = time.perf_counter()
+    loop.run_until_complete(done)
+    return n / (time.perf_counter() - t0)
+
+
+def bench_sockets(loop, nsockets, rounds):
+    pairs = [socket.socketpair() for _ in range(nsockets)]
+    latencies = []
+    pending = 0
+    done = None
+    sent_at = {}
+
+    def on_readable(sock):
+        nonlocal pending
+        sock.recv(1)
+        latencies.append(time.perf_counter() - sent_at[sock])
+        pending -= 1
+        if not pending:
+            done.set_result(None)
+
+    try:
+        for a, b in pairs:
+            a.setblocking(False)
+            b.setblocking(False)
+            loop.add_reader(b.fileno(), on_readable, b)
+        for _ in range(rounds):
+            done = loop.create_future()
+            pending = nsockets
+            for a, b in pairs:
+                sent_at[b] = time.perf_counter()
+                a.send(b'x')
+            loop.run_until_complete(done)
+    finally:
+        for a, b in pairs:
+            loop.remove_reader(b.fileno())
+            a.close()
+            b.close()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--callbacks', type=int, default=200000,
+                        help='number of callbacks (default: 200000)')
+    parser.add_argument('-s', '--sockets', type=int, default=1000,
+                        help='number of socket pairs (default: 1000)')
+    parser.add_argument('-r', '--rounds', type=int, default=20,
+                        help='number of messages per socket pair '
+                             '(default: 20)')
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    try:
+        rate = bench_call_soon(loop, args.callbacks)
+        print("call_soon(): {:,.0f} callbacks/s".format(rate))
+        median, p99 = bench_sockets(loop, args.sockets, args.rounds)
+        print("{} sockets: median latency {:.3f} ms, 99th percentile "
+              "{:.3f} ms".format(args.sockets, median * 1e3, p99 * 1e3))
+    finally:
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark scheduling overhead of concurrent.futures executors.
+
+Submits many tiny calls to a ThreadPoolExecutor, with and without the
+work-stealing mode, using submit(), submit_many() and map() with various
+chunk sizes, and reports the number of calls completed per second.
+
+"""
+import argparse
+import concurrent.futures
+import functools
+import time
+
+
+def noop(x):
+    return x
+
+
+def bench_submit(executor, n):
+    fs = [executor.submit(noop, i) for i in range(n)]
+    concurrent.futures.wait(fs)
+    return n
+
+
+def bench_submit_many(executor, n):
+    fs = executor.submit_many(noop, [(i,) for i in range(n)])
+    concurrent.futures.wait(fs)
+    return n
+
+
+def bench_map(executor, n, chunksize):
+    for _ in executor.map(noop, range(n), chunksize=chunksize):
+        pass
+    return n
+
+
+def fan_out(executor, n):
+    fs = executor.submit_many(noop, [(i,) for i in range(n)])
+    concurrent.futures.wait(fs)
+
+
+def bench_nested(executor, n):
+    # Calls submitted from a worker thread
+    executor.submit(fan_out, executor, n).result()
+    return n
+
+
+BENCHMARKS = [
+    ('submit', bench_submit),
+    ('submit_many', bench_submit_many),
+    ('map', functools.partial(bench_map, chunksize=1)),
+    ('map chunksize=64', functools.partial(bench_map, chunksize=64)),
+    ('map chunksize=1024', functools.partial(bench_map, chunksize=1024)),
+    ('nested submit_many', bench_nested),
+]
+
+
+def run(workers, calls, repeat):
+    modes = [('shared queue', False), ('work stealing', True)]
+    print("{:<20}".format(''), end='')
+    for mode, _ in modes:
+        print("{:>16}".format(mode), end='')
+    print()
+    for name, bench in BENCHMARKS:
+        print("{:<20}".format(name), end='', flush=True)
+        for _, work_stealing in modes:
+            best = 0
+            for _ in range(repeat):
+                with concurrent.futures.ThreadPoolExecutor(
+                        workers, work_stealing=work_stealing) as executor:
+                    # Start all the worker threads before timing
+                    executor.submit_many(time.sleep, [(0.01,)] * workers)
+                    t0 = time.perf_counter()
+                    done = bench(executor, calls)
+                    dt = time.perf_counter() - t0
+                best = max(best, done / dt)
+            print("{:>16}".format("{:,.0f}/s".format(best)), end='',
+                  flush=True)
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-w', '--workers', type=int, default=8,
+                        help='number of worker threads (default: 8)')
+    parser.add_argument('-n', '--calls', type=int, default=100000,
+                        help='number of calls per benchmark '
+                             '(default: 100000)')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='number of repetitions; the best one is '
+                             'reported (default: 3)')
+    args = parser.parse_args()
+    run(args.workers, args.calls, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
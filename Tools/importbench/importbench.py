@@ -5,15 +5,20 @@ thus has no external changes made to import-related attributes in sys.
 
 """
 from test.test_importlib import util
+import compileall
 import decimal
 import imp
 import importlib
 import importlib.machinery
+import importlib.util
 import json
 import os
 import py_compile
+import subprocess
 import sys
 import tabnanny
+import tempfile
+import time
 import timeit
 
 
@@ -162,6 +167,53 @@ tabnanny_using_bytecode = _using_bytecode(tabnanny)
 decimal_using_bytecode = _using_bytecode(decimal)
 
 
+def _cold_start(use_index):
+    def cold_start_benchmark(seconds, repeat):
+        """Cold start: 100 packages{}"""
+        with tempfile.TemporaryDirectory() as directory, \
+             tempfile.TemporaryDirectory() as index_dir:
+            directory = os.path.realpath(directory)
+            names = []
+            for i in range(100):
+                package = os.path.join(directory, 'pkg{}'.format(i))
+                os.mkdir(package)
+                for name in '__init__', 'a', 'b':
+                    path = os.path.join(package, name + '.py')
+                    with open(path, 'w') as file:
+                        file.write('x = 1\n')
+                names += ['pkg{}.a'.format(i), 'pkg{}.b'.format(i)]
+            compileall.compile_dir(directory, quiet=1)
+            # The script is run in the directory, which is sys.path[0]
+            args = [sys.executable, '-E', '-c', 'import ' + ', '.join(names)]
+            # The index is kept out of the indexed directory, as writing it
+            # there would change the directory's mtime and invalidate it.
+            if use_index:
+                index = os.path.join(index_dir, 'import.index')
+                importlib.util.write_import_index(index,
+                                                  [directory] + sys.path)
+                args[1:1] = ['-X', 'importindex=' + index]
+            for x in range(repeat):
+                total_time = 0
+                count = 0
+                while total_time < seconds:
+                    start = time.perf_counter()
+                    subprocess.run(args, cwd=directory, check=True)
+                    total_time += time.perf_counter() - start
+                    count += 1
+                else:
+                    # One execution too far
+                    if total_time > seconds:
+                        count -= 1
+                yield count // seconds
+
+    cold_start_benchmark.__doc__ = cold_start_benchmark.__doc__.format(
+                                        ' w/ import index' if use_index else '')
+    return cold_start_benchmark
+
+cold_start = _cold_start(False)
+cold_start_index = _cold_start(True)
+
+
 def main(import_, options):
     if options.source_file:
         with options.source_file:
@@ -176,6 +228,7 @@ def main(import_, options):
                   tabnanny_wo_bytecode, tabnanny_using_bytecode,
                   decimal_writing_bytecode,
                   decimal_wo_bytecode, decimal_using_bytecode,
+                  cold_start, cold_start_index,
                 )
     if options.benchmark:
         for b in benchmarks:
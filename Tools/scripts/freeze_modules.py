@@ -0,0 +1,125 @@
+#! /usr/bin/env python3
+"""Freeze standard library modules into the interpreter.
+
+Usage: freeze_modules.py [-l LIBDIR] [-d DESTDIR] [-o OUTPUT] [module ...]
+
+Write the header included by Python/frozen.c, which holds the marshalled
+code objects of the given modules of LIBDIR, the Lib directory of the
+source tree by default.  The header must be written by the interpreter
+being built, started with -X frozen_modules=off, since the code objects are
+loaded without checking their magic number.  This is what
+"make regen-frozen-stdlib" does, with the modules listed in the
+FROZEN_STDLIB_MODULES variable of the Makefile.
+
+A frozen package can only import frozen submodules, so naming a package
+freezes the package and all its submodules and subpackages.  The file name
+of the code objects is the path of their source with LIBDIR replaced by
+DESTDIR, the directory where the standard library is installed, so that
+tracebacks and inspect find the sources of the installed interpreter.
+"""
+
+import argparse
+import marshal
+import os
+import sys
+
+
+HEADER = """\
+/* Auto-generated by Tools/scripts/freeze_modules.py */
+
+/* Standard library modules frozen in the interpreter, see Python/frozen.c.
+   Regenerate with "make regen-frozen-stdlib FROZEN_STDLIB_MODULES=...". */
+"""
+
+
+def add_package(modules, name, path):
+    modules[name] = os.path.join(path, '__init__.py'), True
+    for entry in sorted(os.listdir(path)):
+        subpath = os.path.join(path, entry)
+        base, ext = os.path.splitext(entry)
+        if ext == '.py' and base.isidentifier() and base != '__init__':
+            modules[name + '.' + base] = subpath, False
+        elif (entry.isidentifier()
+              and os.path.isfile(os.path.join(subpath, '__init__.py'))):
+            add_package(modules, name + '.' + entry, subpath)
+
+
+def find_modules(libdir, names):
+    """Return a dict mapping the names of the modules to freeze to the path
+    of their source and whether they are packages."""
+    modules = {}
+    for name in names:
+        path = os.path.join(libdir, *name.split('.'))
+        if os.path.isfile(os.path.join(path, '__init__.py')):
+            add_package(modules, name, path)
+        elif os.path.isfile(path + '.py'):
+            modules[name] = path + '.py', False
+        else:
+            raise ValueError('no source for module {!r} in {!r}'
+                             .format(name, libdir))
+    return modules
+
+
+def freeze_modules(libdir, names, destdir=None):
+    """Return the source of the header freezing the modules."""
+    if destdir is None:
+        destdir = os.path.abspath(libdir)
+    lines = [HEADER]
+    entries = []
+    symbols = set()
+    modules = find_modules(libdir, names)
+    for name, (path, is_package) in sorted(modules.items()):
+        symbol = 'M_' + name.replace('.', '_')
+        if symbol in symbols:
+            raise ValueError('duplicate symbol {} for module {!r}'
+                             .format(symbol, name))
+        symbols.add(symbol)
+        with open(path, 'rb') as file:
+            source = file.read()
+        filename = os.path.join(destdir, os.path.relpath(path, libdir))
+        code = compile(source, filename, 'exec', dont_inherit=True)
+        data = marshal.dumps(code)
+        lines.append('static const unsigned char {}[] = {{'.format(symbol))
+        for i in range(0, len(data), 16):
+            lines.append('    ' + ''.join('{},'.format(byte)
+                                          for byte in data[i:i+16]))
+        lines.append('};')
+        lines.append('')
+        # A negative size indicates a package.
+        size = '(int)sizeof({})'.format(symbol)
+        if is_package:
+            size = '-' + size
+        entries.append('    {{"{}", {}, {}}},'.format(name, symbol, size))
+    lines.append('#define _Py_FROZEN_STDLIB_MODULES' +
+                 ''.join(' \\\n' + entry for entry in entries))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    srcdir = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(
+        description='Freeze standard library modules into the interpreter.')
+    parser.add_argument('-l', '--libdir', default=os.path.join(srcdir, 'Lib'),
+                        help='directory of the modules (default: %(default)s)')
+    parser.add_argument('-d', '--destdir',
+                        help=('directory of the modules in the file names '
+                              'of the code objects (default: LIBDIR)'))
+    parser.add_argument('-o', '--output',
+                        default=os.path.join(srcdir, 'Python',
+                                             'frozen_stdlib.h'),
+                        help='header to write (default: %(default)s)')
+    parser.add_argument('modules', nargs='*', metavar='module',
+                        help='module or package to freeze')
+    args = parser.parse_args(args)
+    try:
+        source = freeze_modules(args.libdir, args.modules, args.destdir)
+    except (OSError, SyntaxError, ValueError) as exc:
+        sys.exit('{}: {}'.format(parser.prog, exc))
+    with open(args.output, 'w') as file:
+        file.write(source)
+
+
+if __name__ == '__main__':
+    main()
@@ -1685,6 +1685,15 @@ class PyBuildExt(build_ext):
         else:
             self.missing.append('_uuid')
 
+    def detect_uring(self):
+        # io_uring completion queues, used by asyncio on Linux
+        if not HOST_PLATFORM.startswith('linux'):
+            return
+        if find_file('linux/io_uring.h', self.inc_dirs, []) is not None:
+            self.add(Extension('_uring', ['_uringmodule.c']))
+        else:
+            self.missing.append('_uring')
+
     def detect_modules(self):
         self.configure_compiler()
         self.init_inc_lib_dirs()
@@ -1710,6 +1719,7 @@ class PyBuildExt(build_ext):
         if not self.detect_tkinter():
             self.missing.append('_tkinter')
         self.detect_uuid()
+        self.detect_uring()
 
 ##         # Uncomment these lines if you want to play with xxmodule.c
 ##         self.add(Extension('xx', ['xxmodule.c']))